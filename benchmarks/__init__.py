@@ -0,0 +1,12 @@
+"""
+Performance benchmarks.
+
+Run against the project's own simulators on loopback and emit one JSON
+document per run, so results from two commits can be compared:
+
+    python -m benchmarks -o before.json
+    git checkout <other commit>
+    python -m benchmarks -o after.json --compare before.json
+
+See `python -m benchmarks --help`.
+"""
@@ -0,0 +1,63 @@
+"""Command line entry point: `python -m benchmarks`."""
+import argparse
+import json
+import logging
+import sys
+import tempfile
+
+from benchmarks import harness
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks',
+                                     description="Run the SCADA Scout performance benchmarks.")
+    parser.add_argument('-o', '--output', help="write the result document to this JSON file")
+    parser.add_argument('--only', action='append', metavar='NAME',
+                        help="run only this benchmark or group (e.g. 'scd', 'modbus.poll'); repeatable")
+    parser.add_argument('--quick', action='store_true', help="smaller sizes and fewer rounds")
+    parser.add_argument('--compare', metavar='BASELINE', help="compare against an earlier result file")
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help="relative change counted as a regression (default: 0.10)")
+    parser.add_argument('--list', action='store_true', help="list the benchmarks and exit")
+    parser.add_argument('-v', '--verbose', action='store_true', help="show application log output")
+    args = parser.parse_args(argv)
+
+    harness.ensure_repo_on_path()
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.ERROR)
+
+    if args.list:
+        for bench in harness.all_benchmarks():
+            print(f"{bench.name:<28} {bench.description}")
+        return 0
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    with tempfile.TemporaryDirectory(prefix='scadascout-bench-') as work_dir:
+        ctx = harness.BenchContext(quick=args.quick, work_dir=work_dir)
+        document = harness.run(args.only, ctx, log=lambda msg: print(msg, file=sys.stderr))
+
+    text = json.dumps(document, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + "\n")
+    elif not baseline:
+        print(text)
+
+    if baseline is None:
+        return 0
+    if baseline.get('quick') != document['quick']:
+        print("warning: comparing a --quick run with a full run", file=sys.stderr)
+    rows = harness.compare(baseline, document, args.threshold)
+    print(harness.format_comparison(rows))
+    regressions = [r for r in rows if r['regression']]
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) above {args.threshold:.0%}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
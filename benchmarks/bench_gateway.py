@@ -0,0 +1,84 @@
+"""
+Gateway throughput: IEC/Modbus signal updates mirrored into a Modbus slave
+datastore through `GatewayCore`.
+
+Updates are emitted on an `EventEmitter` standing in for the device
+manager, so the measurement covers lookup, scale/deadband, register
+encoding and the datastore write, in both the immediate and the batched
+(coalescing) mode. The slave's datastore is used without opening a socket.
+"""
+import random
+import time
+from types import SimpleNamespace
+
+from benchmarks.harness import BenchContext, BenchSkipped, benchmark, latency_summary
+
+
+def _gateway(mappings: int, batch_interval_ms: int):
+    try:
+        import numpy  # noqa: F401  (GatewayCore encodes with numpy)
+    except ImportError:
+        raise BenchSkipped("numpy is not installed")
+    from src.core.events import EventEmitter
+    from src.core.gateway_core import GatewayCore, GatewayMapping
+    from src.models.device_models import ModbusDataType
+    from src.protocols.modbus.slave_server import ModbusSlaveConfig, ModbusSlaveServer
+
+    slave = ModbusSlaveServer(ModbusSlaveConfig(holding_registers_count=2 * mappings + 16, log_writes=False))
+    slave.running = True  # datastore only; the gateway never touches the socket
+    source = EventEmitter()
+    gateway = GatewayCore(source, slave, batch_interval_ms=batch_interval_ms)
+    signals = []
+    for i in range(mappings):
+        address = f"LD0/MMXU{i // 20}.A.phs{i % 20}.cVal.mag.f"
+        gateway.add_mapping(GatewayMapping("IED", address, "holding", 2 * i,
+                                           scale=10.0, data_type=ModbusDataType.FLOAT32))
+        signals.append(SimpleNamespace(address=address, value=0.0))
+    if not gateway.start():
+        raise RuntimeError("gateway did not start")
+    return gateway, source, signals
+
+
+@benchmark('gateway.immediate')
+def immediate(ctx: BenchContext):
+    """Unbatched mode: every update is encoded and written on arrival."""
+    mappings, updates = ctx.scale(2000, 200), ctx.scale(50000, 5000)
+    gateway, source, signals = _gateway(mappings, 0)
+    rng = random.Random(11)
+    try:
+        start = time.perf_counter()
+        for _ in range(updates):
+            signal = signals[rng.randrange(mappings)]
+            signal.value = rng.random() * 1000
+            source.emit('signal_updated', "IED", signal)
+        elapsed = time.perf_counter() - start
+    finally:
+        gateway.stop()
+    return {'mappings': mappings, 'updates': updates, 'updates_per_s': updates / elapsed}
+
+
+@benchmark('gateway.batched')
+def batched(ctx: BenchContext):
+    """Batched mode: coalesce updates, then one vectorised flush per tick."""
+    mappings, ticks, per_tick = ctx.scale(2000, 200), ctx.scale(50, 10), ctx.scale(5000, 500)
+    # The flush timer never fires on its own; ticks are driven explicitly
+    gateway, source, signals = _gateway(mappings, 10**6)
+    rng = random.Random(13)
+    flushes, written = [], 0
+    try:
+        start = time.perf_counter()
+        for _ in range(ticks):
+            for _ in range(per_tick):
+                signal = signals[rng.randrange(mappings)]
+                signal.value = rng.random() * 1000
+                source.emit('signal_updated', "IED", signal)
+            t = time.perf_counter()
+            written += gateway.flush()
+            flushes.append(time.perf_counter() - t)
+        elapsed = time.perf_counter() - start
+    finally:
+        gateway.stop()
+    result = {'mappings': mappings, 'updates': ticks * per_tick, 'written': written,
+              'updates_per_s': ticks * per_tick / elapsed}
+    result.update(latency_summary(flushes, 'flush'))
+    return result
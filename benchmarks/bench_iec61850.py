@@ -0,0 +1,150 @@
+"""
+IEC 61850 benchmarks against an `IEC61850ServerAdapter` simulator on
+loopback, loaded from the bundled ABBK3A03A1.iid.
+
+Measures connect + discovery time, single-read latency, batched poll
+throughput through the device's `IEC61850Worker`, and SBO/direct control
+round trip. Requires the native libiec61850 library.
+"""
+import os
+import threading
+import time
+
+from benchmarks.bench_scd import _first_ied_name, _sample
+from benchmarks.harness import (BenchContext, BenchSkipped, benchmark, free_port, latency_summary,
+                                timed, wait_for_port, wait_until)
+
+
+def _require_library():
+    from src.protocols.iec61850 import iec61850_wrapper
+    if not iec61850_wrapper.is_library_loaded():
+        raise BenchSkipped("libiec61850 native library not found (set LIBIEC61850_PATH)")
+
+
+def _walk_signals(node):
+    yield from node.signals
+    for child in node.children:
+        yield from _walk_signals(child)
+
+
+class _Loopback:
+    """Simulated IED (server adapter) plus a connected DeviceManagerCore client."""
+
+    def __init__(self, ctx: BenchContext):
+        _require_library()
+        from src.core.device_manager_core import DeviceManagerCore
+        from src.models.device_models import DeviceConfig, DeviceType
+        from src.protocols.iec61850.server_adapter import IEC61850ServerAdapter
+
+        iid = _sample()
+        ied_name = _first_ied_name(iid)
+        self.port = free_port()
+        self.server = IEC61850ServerAdapter(DeviceConfig(
+            name='BenchSim', ip_address='127.0.0.1', port=self.port,
+            device_type=DeviceType.IEC61850_SERVER, scd_file_path=iid,
+            protocol_params={'ied_name': ied_name}))
+        if not self.server.connect() or not wait_for_port(self.port, 10.0):
+            raise BenchSkipped("IEC 61850 simulator did not start")
+
+        self.name = 'BenchIED'
+        self.dm = DeviceManagerCore(os.path.join(ctx.work_dir, 'iec_devices.json'))
+        self.updates = 0
+        self._lock = threading.Lock()
+        self.dm.on('signal_updated', self._on_update)
+        self.dm.on('signal_unchanged', self._on_update)  # answered, filtered as unchanged
+        self.dm.add_device(DeviceConfig(
+            name=self.name, ip_address='127.0.0.1', port=self.port, device_type=DeviceType.IEC61850_IED,
+            scd_file_path=iid, use_scd_discovery=False, protocol_params={'ied_name': ied_name}),
+            save=False, run_offline_discovery=False)
+
+    def _on_update(self, device_name, signal):
+        with self._lock:
+            self.updates += 1
+
+    def connect(self) -> float:
+        """connect_device() until connected and discovered (online); returns seconds."""
+        device = self.dm.get_device(self.name)
+        start = time.perf_counter()
+        self.dm.connect_device(self.name)
+        if not wait_until(lambda: device.connected and device.root_node is not None
+                          and device.root_node.children, 60.0, 0.005):
+            raise RuntimeError("IEC 61850 device did not connect")
+        return time.perf_counter() - start
+
+    def signals(self):
+        return list(_walk_signals(self.dm.get_device(self.name).root_node))
+
+    def protocol(self):
+        return self.dm.get_protocol(self.name)
+
+    def close(self):
+        try:
+            self.dm.clear_all_devices()
+        finally:
+            self.server.disconnect()
+
+
+@benchmark('iec61850.poll')
+def poll(ctx: BenchContext):
+    """Connect/discovery time, single-read latency and batched poll throughput."""
+    loop = _Loopback(ctx)
+    try:
+        connect_s = loop.connect()
+        all_signals = loop.signals()
+        readable = [s for s in all_signals if getattr(s, 'fc', '') in ('ST', 'MX')]
+        readable = readable[:ctx.scale(500, 100)]
+        if not readable:
+            raise RuntimeError("no ST/MX signals discovered")
+        protocol = loop.protocol()
+
+        single = []
+        for signal in readable:
+            _, elapsed = timed(protocol.read_signal, signal)
+            single.append(elapsed)
+
+        cycles = []
+        for _ in range(ctx.scale(10, 3)):
+            target = loop.updates + len(readable)
+            start = time.perf_counter()
+            loop.dm.read_signals(loop.name, readable)
+            if not wait_until(lambda: loop.updates >= target, 60.0, 0.0005):
+                raise RuntimeError("poll cycle did not complete")
+            cycles.append(time.perf_counter() - start)
+    finally:
+        loop.close()
+
+    result = {'discovered_signals': len(all_signals), 'polled_signals': len(readable),
+              'connect_discover_ms': connect_s * 1000}
+    result.update(latency_summary(single, 'read'))
+    result.update(latency_summary(cycles, 'cycle'))
+    result['poll_signals_per_s'] = len(readable) * len(cycles) / sum(cycles)
+    return result
+
+
+@benchmark('iec61850.control_roundtrip')
+def control_roundtrip(ctx: BenchContext):
+    """Operate a boolean control object on the simulator (select/operate round trip)."""
+    loop = _Loopback(ctx)
+    try:
+        loop.connect()
+        protocol = loop.protocol()
+        candidates = [s for s in loop.signals() if s.address.endswith('.Oper.ctlVal')]
+        target = None
+        for signal in candidates[:20]:
+            if protocol.send_command(signal, True):
+                target = signal
+                break
+        if target is None:
+            raise RuntimeError(f"no operable control among {len(candidates)} candidates")
+        samples = []
+        for i in range(ctx.scale(50, 10)):
+            start = time.perf_counter()
+            ok = protocol.send_command(target, bool(i % 2))
+            samples.append(time.perf_counter() - start)
+            if not ok:
+                raise RuntimeError(f"control {target.address} rejected")
+    finally:
+        loop.close()
+    result = {'controls_available': len(candidates)}
+    result.update(latency_summary(samples, 'control'))
+    return result
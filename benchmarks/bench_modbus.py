@@ -0,0 +1,131 @@
+"""
+Modbus benchmarks against a `ModbusSlaveServer` on loopback.
+
+The client side is the full application stack: a `DeviceManagerCore` with
+a Modbus TCP device, its `ModbusWorker` and the `signal_updated` fan-out,
+so the numbers include queueing and dispatch, not just the wire.
+"""
+import os
+import threading
+import time
+
+from benchmarks.harness import (BenchContext, BenchSkipped, benchmark, free_port, latency_summary,
+                                timed, wait_for_port, wait_until)
+
+
+class _Loopback:
+    """A started slave server plus a connected DeviceManagerCore client."""
+
+    def __init__(self, ctx: BenchContext, registers: int):
+        from src.protocols.modbus import slave_server
+        if not slave_server.HAS_PYMODBUS_SERVER:
+            raise BenchSkipped("pymodbus server API not available (ModbusSlaveServer needs pymodbus 3.x datastore)")
+        from src.core.device_manager_core import DeviceManagerCore
+        from src.models.device_models import DeviceConfig, DeviceType, ModbusDataType, ModbusRegisterMap
+
+        self.port = free_port()
+        self.server = slave_server.ModbusSlaveServer(slave_server.ModbusSlaveConfig(
+            listen_address='127.0.0.1', port=self.port, holding_registers_count=max(registers, 16),
+            log_writes=False))
+        if not self.server.start() or not wait_for_port(self.port):
+            raise BenchSkipped("Modbus slave server did not start")
+        self.server.bulk_write_registers(0, [a % 65536 for a in range(registers)])
+
+        self.name = 'BenchPLC'
+        self.dm = DeviceManagerCore(os.path.join(ctx.work_dir, 'modbus_devices.json'))
+        self.updates = 0
+        self._lock = threading.Lock()
+        self.dm.on('signal_updated', self._on_update)
+        self.dm.on('signal_unchanged', self._on_update)  # answered, filtered as unchanged
+        self.dm.add_device(DeviceConfig(
+            name=self.name, ip_address='127.0.0.1', port=self.port, device_type=DeviceType.MODBUS_TCP,
+            modbus_timeout=2.0,
+            modbus_register_maps=[ModbusRegisterMap(start_address=0, count=registers, function_code=3,
+                                                    data_type=ModbusDataType.UINT16, name_prefix='HR')]),
+            save=False, run_offline_discovery=False)
+
+    def _on_update(self, device_name, signal):
+        with self._lock:
+            self.updates += 1
+
+    def connect(self) -> float:
+        """connect_device() until connected and discovered; returns seconds."""
+        device = self.dm.get_device(self.name)
+        start = time.perf_counter()
+        self.dm.connect_device(self.name)
+        if not wait_until(lambda: device.connected and device.root_node is not None
+                          and device.root_node.children, 15.0):
+            raise RuntimeError("Modbus device did not connect")
+        return time.perf_counter() - start
+
+    def signals(self):
+        return [s for node in self.dm.get_device(self.name).root_node.children for s in node.signals]
+
+    def protocol(self):
+        return self.dm.get_protocol(self.name)
+
+    def close(self):
+        try:
+            self.dm.clear_all_devices()
+        finally:
+            self.server.stop()
+
+
+@benchmark('modbus.poll')
+def poll(ctx: BenchContext):
+    """Connect/discovery time, single-read latency and batched poll throughput."""
+    registers = ctx.scale(500, 100)
+    loop = _Loopback(ctx, registers)
+    try:
+        connect_s = loop.connect()
+        signals = loop.signals()
+        protocol = loop.protocol()
+
+        # Synchronous single reads straight through the adapter
+        single = []
+        for signal in signals[:ctx.scale(500, 100)]:
+            _, elapsed = timed(protocol.read_signal, signal)
+            single.append(elapsed)
+
+        # Batched poll cycles through the worker queue, as the watch list does
+        cycles = []
+        for _ in range(ctx.scale(20, 5)):
+            target = loop.updates + len(signals)
+            start = time.perf_counter()
+            loop.dm.read_signals(loop.name, signals)
+            if not wait_until(lambda: loop.updates >= target, 30.0, 0.0005):
+                raise RuntimeError("poll cycle did not complete")
+            cycles.append(time.perf_counter() - start)
+    finally:
+        loop.close()
+
+    result = {'signals': len(signals), 'connect_discover_ms': connect_s * 1000}
+    result.update(latency_summary(single, 'read'))
+    result.update(latency_summary(cycles, 'cycle'))
+    result['poll_signals_per_s'] = len(signals) * len(cycles) / sum(cycles)
+    return result
+
+
+@benchmark('modbus.write_roundtrip')
+def write_roundtrip(ctx: BenchContext):
+    """Write a holding register and read it back (command round trip)."""
+    loop = _Loopback(ctx, 16)
+    try:
+        loop.connect()
+        protocol = loop.protocol()
+        signal = loop.signals()[3]
+        samples = []
+        for i in range(ctx.scale(300, 50)):
+            value = (i * 7) % 1000
+            start = time.perf_counter()
+            if not protocol.write_signal(signal, value):
+                raise RuntimeError("write rejected")
+            protocol.read_signal(signal)
+            samples.append(time.perf_counter() - start)
+            if signal.value != value:
+                raise RuntimeError(f"read back {signal.value}, wrote {value}")
+    finally:
+        loop.close()
+    result = latency_summary(samples, 'roundtrip')
+    result['roundtrips_per_s'] = len(samples) / sum(samples)
+    return result
@@ -0,0 +1,152 @@
+"""
+SCD benchmarks: parse, structure expansion (eager and lazy), memory, and
+offline discovery of many devices sharing one station file.
+
+The station file is synthesised from the bundled ABBK3A03A1.iid by cloning
+its IED under new names, so the same input can be regenerated on any
+checkout.
+"""
+import copy
+import os
+import threading
+import xml.etree.ElementTree as ET
+
+from benchmarks.harness import (SAMPLE_IID, BenchContext, BenchSkipped, benchmark, timed, traced,
+                                wait_until)
+
+
+def _sample() -> str:
+    if not os.path.exists(SAMPLE_IID):
+        raise BenchSkipped(f"sample file not found: {SAMPLE_IID}")
+    return SAMPLE_IID
+
+
+def _clear_caches():
+    from src.core.scd_parser import SCDParser
+    SCDParser._cache.clear()
+
+
+def _first_ied_name(path: str) -> str:
+    for _, elem in ET.iterparse(path, events=('start',)):
+        if elem.tag.endswith('}IED') or elem.tag == 'IED':
+            return elem.get('name')
+    raise BenchSkipped(f"no IED in {path}")
+
+
+def make_station(iid_path: str, ied_count: int, out_path: str) -> list:
+    """Write an SCD holding `ied_count` renamed copies of the IED in `iid_path`."""
+    tree = ET.parse(iid_path)
+    root = tree.getroot()
+    ns_uri = root.tag.split('}')[0].strip('{') if '}' in root.tag else ''
+    ET.register_namespace('', ns_uri)
+    q = (lambda tag: f'{{{ns_uri}}}{tag}') if ns_uri else (lambda tag: tag)
+    ied = root.find(q('IED'))
+    base = ied.get('name')
+    index = list(root).index(ied)
+    root.remove(ied)
+    names = []
+    for i in range(ied_count):
+        clone = copy.deepcopy(ied)
+        name = f"{base}_{i:03d}"
+        clone.set('name', name)
+        root.insert(index + i, clone)
+        names.append(name)
+    tree.write(out_path, xml_declaration=True, encoding='utf-8')
+    return names
+
+
+def _count(node):
+    signals = len(node.signals)
+    nodes = 1
+    for child in node.children:
+        n, s = _count(child)
+        nodes += n
+        signals += s
+    return nodes, signals
+
+
+@benchmark('scd.parse_expand')
+def parse_expand(ctx: BenchContext):
+    """Parse the sample IID and expand its structure, eagerly and lazily."""
+    from src.core.scd_parser import SCDParser
+    path = _sample()
+    ied = _first_ied_name(path)
+
+    def _parse():
+        _clear_caches()
+        return SCDParser(path)
+
+    # Timings: best of N untraced rounds; memory: one tracemalloc run per stage
+    parse_s, eager_s, lazy_s, open_s = [], [], [], []
+    for _ in range(ctx.scale(5, 2)):
+        parser, elapsed = timed(_parse)
+        parse_s.append(elapsed)
+        root, elapsed = timed(parser.get_structure, ied)
+        eager_s.append(elapsed)
+        lazy, elapsed = timed(_parse().get_structure, ied, True)
+        lazy_s.append(elapsed)
+        _, elapsed = timed(_count, lazy)  # opens every LN
+        open_s.append(elapsed)
+    nodes, signals = _count(root)
+
+    parser, _, peak_parse = traced(_parse)
+    _, _, peak_eager = traced(parser.get_structure, ied)
+    _, _, peak_lazy = traced(_parse().get_structure, ied, True)
+
+    return {
+        'file_bytes': os.path.getsize(path),
+        'nodes': nodes,
+        'signals': signals,
+        'parse_ms': min(parse_s) * 1000,
+        'parse_peak_mb': peak_parse / 2**20,
+        'expand_eager_ms': min(eager_s) * 1000,
+        'expand_eager_peak_mb': peak_eager / 2**20,
+        'expand_lazy_ms': min(lazy_s) * 1000,
+        'expand_lazy_peak_mb': peak_lazy / 2**20,
+        'lazy_open_all_ms': min(open_s) * 1000,
+        'signals_per_s': signals / min(eager_s),
+    }
+
+
+@benchmark('scd.station_discovery')
+def station_discovery(ctx: BenchContext):
+    """Offline discovery of N devices that share one multi-IED station file."""
+    from src.core.device_manager_core import DeviceManagerCore
+    from src.models.device_models import DeviceConfig, DeviceType
+    ied_count = ctx.scale(20, 4)
+    station = os.path.join(ctx.work_dir, f'station_{ied_count}.scd')
+    names = make_station(_sample(), ied_count, station)
+    _clear_caches()
+
+    dm = DeviceManagerCore(os.path.join(ctx.work_dir, 'devices.json'))
+    done = set()
+    lock = threading.Lock()
+
+    def _completed(name):
+        with lock:
+            done.add(name)
+    dm.on('scd_parse_completed', _completed)
+
+    def _add_all():
+        for name in names:
+            dm.add_device(DeviceConfig(name=name, ip_address='127.0.0.1', port=102,
+                                       device_type=DeviceType.IEC61850_IED, scd_file_path=station,
+                                       protocol_params={'ied_name': name}),
+                          save=False, run_offline_discovery=True)
+
+    try:
+        _, add_s = timed(_add_all)
+        _, total_s = timed(wait_until, lambda: len(done) == len(names), 300.0, 0.005)
+        if len(done) != len(names):
+            raise RuntimeError(f"only {len(done)} of {len(names)} devices discovered")
+        signals = sum(_count(dm.get_device(n).root_node)[1] for n in names)
+    finally:
+        dm.clear_all_devices()
+    return {
+        'ieds': ied_count,
+        'file_bytes': os.path.getsize(station),
+        'add_devices_ms': add_s * 1000,
+        'discovery_ms': (add_s + total_s) * 1000,
+        'devices_per_s': ied_count / (add_s + total_s),
+        'signals': signals,
+    }
@@ -0,0 +1,126 @@
+"""
+UI update throughput with the offscreen Qt platform.
+
+Live updates are pushed into the watch list and signal table models while
+a QTableView is showing them; every batch ends with the same work a real
+frame does (flush, processEvents, repaint of the visible rows).
+"""
+import os
+import random
+import sys
+import time
+
+from benchmarks.harness import BenchContext, BenchSkipped, benchmark, latency_summary
+
+
+def _app():
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    try:
+        from PySide6.QtWidgets import QApplication
+    except ImportError:
+        raise BenchSkipped("PySide6 is not installed")
+    app = QApplication.instance() or QApplication([])
+    _check_emit_refcount()
+    return app
+
+
+def _check_emit_refcount():
+    """Some PySide6 builds drop a reference to True on every emit; tens of
+    thousands of updates would then abort the interpreter."""
+    from PySide6.QtCore import QObject, Signal
+
+    class _Probe(QObject):
+        fired = Signal(int)
+
+    probe = _Probe()
+    before = sys.getrefcount(True)
+    for i in range(10):
+        probe.fired.emit(i)
+    if sys.getrefcount(True) < before:
+        import PySide6
+        raise BenchSkipped(f"PySide6 {PySide6.__version__} leaks a bool reference per signal emit")
+
+
+def _view(model):
+    from PySide6.QtWidgets import QTableView
+    view = QTableView()
+    view.setModel(model)
+    view.resize(1200, 800)
+    view.show()
+    return view
+
+
+def _signals(n):
+    from src.models.device_models import Signal, SignalQuality
+    return [Signal(name=f"S{i}", address=f"LD0/MMXU{i // 20}.A.phs{i % 20}.cVal.mag.f",
+                   value=0.0, quality=SignalQuality.GOOD) for i in range(n)]
+
+
+def _drive(app, rows, updates, batch, apply_update, end_frame):
+    rng = random.Random(7)
+    frames = []
+    start = time.perf_counter()
+    for first in range(0, updates, batch):
+        for _ in range(min(batch, updates - first)):
+            apply_update(rng.randrange(rows), rng.random() * 1000)
+        t = time.perf_counter()
+        end_frame()
+        app.processEvents()
+        frames.append(time.perf_counter() - t)
+    return time.perf_counter() - start, frames
+
+
+@benchmark('ui.watch_list_updates')
+def watch_list_updates(ctx: BenchContext):
+    """Watch list model: keyed updates, coalesced flush, visible repaint."""
+    app = _app()
+    from src.core.watch_list_manager import WatchedSignal
+    from src.ui.models.watch_list_model import WatchListModel
+
+    rows, updates, batch = ctx.scale(2000, 500), ctx.scale(50000, 5000), 200
+    signals = _signals(rows)
+    watched = [WatchedSignal(device_name="IED", signal=s, watch_id=f"IED::{s.address}") for s in signals]
+    model = WatchListModel(flush_interval_ms=10**6)
+    model.set_watched(watched)
+    view = _view(model)
+    app.processEvents()
+
+    def apply_update(row, value):
+        signal = signals[row]
+        signal.value = value
+        model.update_signal(watched[row].watch_id, signal, 3)
+
+    try:
+        total, frames = _drive(app, rows, updates, batch, apply_update, model.flush)
+    finally:
+        view.close()
+    result = {'rows': rows, 'updates': updates, 'updates_per_s': updates / total}
+    result.update(latency_summary(frames, 'frame'))
+    return result
+
+
+@benchmark('ui.signal_table_updates')
+def signal_table_updates(ctx: BenchContext):
+    """Signals view table model: per-update dataChanged with a visible view."""
+    app = _app()
+    from src.ui.models.signal_table_model import SignalTableModel
+
+    rows, updates, batch = ctx.scale(2000, 500), ctx.scale(20000, 2000), 200
+    signals = _signals(rows)
+    model = SignalTableModel()
+    model.set_signals(signals)
+    view = _view(model)
+    app.processEvents()
+
+    def apply_update(row, value):
+        signal = signals[row]
+        signal.value = value
+        model.update_signal(signal)
+
+    try:
+        total, frames = _drive(app, rows, updates, batch, apply_update, lambda: None)
+    finally:
+        view.close()
+    result = {'rows': rows, 'updates': updates, 'updates_per_s': updates / total}
+    result.update(latency_summary(frames, 'frame'))
+    return result
@@ -0,0 +1,269 @@
+"""
+Benchmark harness: registration, timing helpers, environment capture,
+JSON output and comparison between two result files.
+
+A benchmark is a function registered with `@benchmark(name)` that takes a
+`BenchContext` and returns a flat dict of numbers. The unit is part of the
+key, which is also what `compare()` uses to decide direction:
+
+    *_ms, *_s, *_bytes, *_mb    lower is better
+    *_per_s                     higher is better
+    anything else               informational (counts, sizes)
+
+Raise `BenchSkipped` when a prerequisite (native library, optional
+package) is missing; the run records the reason and carries on.
+"""
+import datetime
+import gc
+import importlib
+import os
+import platform
+import socket
+import subprocess
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+SCHEMA_VERSION = 1
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+SAMPLE_IID = os.path.join(REPO_ROOT, 'ABBK3A03A1.iid')
+
+LOWER_IS_BETTER = ('_ms', '_s', '_bytes', '_mb')
+HIGHER_IS_BETTER = ('_per_s',)
+
+
+class BenchSkipped(Exception):
+    """Raised by a benchmark whose prerequisites are not available."""
+
+
+@dataclass
+class BenchContext:
+    """Per-run settings handed to every benchmark."""
+    quick: bool = False
+    work_dir: str = ''
+    options: Dict[str, str] = field(default_factory=dict)
+
+    def scale(self, full: int, quick: int) -> int:
+        """Iteration/size knob: `quick` in --quick runs, `full` otherwise."""
+        return quick if self.quick else full
+
+
+@dataclass
+class Benchmark:
+    name: str
+    func: Callable[[BenchContext], Dict[str, float]]
+    description: str
+
+
+_REGISTRY: Dict[str, Benchmark] = {}
+
+# Modules whose import registers benchmarks
+BENCH_MODULES = (
+    'benchmarks.bench_scd',
+    'benchmarks.bench_modbus',
+    'benchmarks.bench_iec61850',
+    'benchmarks.bench_ui',
+    'benchmarks.bench_gateway',
+)
+
+
+def benchmark(name: str):
+    """Register a benchmark function under `name` (group.case)."""
+    def register(func):
+        doc = (func.__doc__ or '').strip().splitlines()
+        _REGISTRY[name] = Benchmark(name, func, doc[0] if doc else '')
+        return func
+    return register
+
+
+def all_benchmarks() -> List[Benchmark]:
+    for module in BENCH_MODULES:
+        importlib.import_module(module)
+    return [_REGISTRY[name] for name in sorted(_REGISTRY)]
+
+
+# ---------------------------------------------------------------------------
+# Measurement helpers
+# ---------------------------------------------------------------------------
+
+def percentile(sorted_samples: List[float], q: float) -> float:
+    if not sorted_samples:
+        return 0.0
+    index = min(len(sorted_samples) - 1, max(0, int(round(q * (len(sorted_samples) - 1)))))
+    return sorted_samples[index]
+
+
+def latency_summary(samples_s: List[float], prefix: str) -> Dict[str, float]:
+    """p50/p90/p99/max/mean in milliseconds for a list of durations in seconds."""
+    s = sorted(samples_s)
+    if not s:
+        return {f'{prefix}_samples': 0}
+    return {
+        f'{prefix}_samples': len(s),
+        f'{prefix}_mean_ms': sum(s) / len(s) * 1000,
+        f'{prefix}_p50_ms': percentile(s, 0.50) * 1000,
+        f'{prefix}_p90_ms': percentile(s, 0.90) * 1000,
+        f'{prefix}_p99_ms': percentile(s, 0.99) * 1000,
+        f'{prefix}_max_ms': s[-1] * 1000,
+    }
+
+
+def timed(func, *args, **kwargs):
+    """(result, seconds) of one call."""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def traced(func, *args, **kwargs):
+    """(result, seconds, peak traced allocation in bytes) of one call."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def wait_until(predicate, timeout: float, interval: float = 0.001) -> bool:
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if predicate():
+            return True
+        time.sleep(interval)
+    return predicate()
+
+
+def free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def wait_for_port(port: int, timeout: float = 5.0) -> bool:
+    def _open():
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=0.2):
+                return True
+        except OSError:
+            return False
+    return wait_until(_open, timeout, interval=0.02)
+
+
+# ---------------------------------------------------------------------------
+# Run and compare
+# ---------------------------------------------------------------------------
+
+def _git(*args) -> Optional[str]:
+    try:
+        out = subprocess.run(['git', *args], cwd=REPO_ROOT, capture_output=True, text=True, timeout=10)
+        return out.stdout.strip() if out.returncode == 0 else None
+    except Exception:
+        return None
+
+
+def environment() -> dict:
+    """Where the numbers came from; compare only like with like."""
+    versions = {}
+    for module in ('PySide6', 'pymodbus', 'numpy'):
+        try:
+            versions[module] = importlib.import_module(module).__version__
+        except Exception:
+            versions[module] = None
+    return {
+        'commit': _git('rev-parse', 'HEAD'),
+        'dirty': bool(_git('status', '--porcelain', '--untracked-files=no')),
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'packages': versions,
+    }
+
+
+def run(names: Optional[List[str]] = None, ctx: Optional[BenchContext] = None,
+        log=print) -> dict:
+    """Run the selected benchmarks (all by default) and return the result document."""
+    ctx = ctx or BenchContext()
+    selected = [b for b in all_benchmarks()
+                if not names or any(b.name == n or b.name.startswith(n + '.') for n in names)]
+    results = {}
+    for bench in selected:
+        log(f"{bench.name} ...")
+        start = time.perf_counter()
+        try:
+            values = bench.func(ctx)
+            results[bench.name] = {k: round(v, 4) if isinstance(v, float) else v for k, v in values.items()}
+            status = 'ok'
+        except BenchSkipped as e:
+            results[bench.name] = {'skipped': str(e)}
+            status = f'skipped: {e}'
+        except Exception as e:
+            results[bench.name] = {'error': f'{type(e).__name__}: {e}'}
+            status = f'error: {e}'
+        log(f"{bench.name}: {status} ({time.perf_counter() - start:.1f} s)")
+    return {
+        'schema': SCHEMA_VERSION,
+        'created': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'quick': ctx.quick,
+        'environment': environment(),
+        'results': results,
+    }
+
+
+def direction(key: str) -> int:
+    """-1 when lower is better, +1 when higher is better, 0 when informational."""
+    if key.endswith(HIGHER_IS_BETTER):
+        return 1
+    if key.endswith(LOWER_IS_BETTER):
+        return -1
+    return 0
+
+
+def compare(baseline: dict, current: dict, threshold: float = 0.10) -> List[dict]:
+    """
+    Per-metric changes between two result documents.
+
+    Each row carries `regression` when the metric moved in the bad direction
+    by more than `threshold` (relative).
+    """
+    rows = []
+    base_results = baseline.get('results', {})
+    for bench, values in sorted(current.get('results', {}).items()):
+        base = base_results.get(bench, {})
+        for key, value in sorted(values.items()):
+            sense = direction(key)
+            old = base.get(key)
+            if not sense or not isinstance(value, (int, float)) or not isinstance(old, (int, float)) or not old:
+                continue
+            change = (value - old) / abs(old)
+            rows.append({
+                'benchmark': bench,
+                'metric': key,
+                'baseline': old,
+                'current': value,
+                'change': round(change, 4),
+                'regression': change * sense < -threshold,
+            })
+    return rows
+
+
+def format_comparison(rows: List[dict]) -> str:
+    lines = [f"{'benchmark':<34} {'metric':<34} {'baseline':>12} {'current':>12} {'change':>8}"]
+    for r in rows:
+        flag = '  REGRESSION' if r['regression'] else ''
+        lines.append(f"{r['benchmark']:<34} {r['metric']:<34} {r['baseline']:>12.4g} "
+                     f"{r['current']:>12.4g} {r['change'] * 100:>7.1f}%{flag}")
+    return "\n".join(lines)
+
+
+def ensure_repo_on_path():
+    if REPO_ROOT not in sys.path:
+        sys.path.insert(0, REPO_ROOT)
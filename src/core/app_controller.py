@@ -1,6 +1,8 @@
 import logging
+import os
 from PySide6.QtCore import QObject, Slot
 
+from src.core import profiler
 from src.core.device_manager import DeviceManager
 from src.core.update_engine import UpdateEngine
 from src.core.watch_list_manager import WatchListManager
@@ -19,7 +21,13 @@ class AppController(QObject):
         self.device_manager = device_manager
         self.update_engine = UpdateEngine(interval_ms=1000)
         self.event_logger = EventLogger()
+        self._attach_event_journal()
         self.watch_list_manager = WatchListManager(self.device_manager)
+        self.historian = None
+        self._attach_historian()
+        self.metrics_server = None
+        self._start_metrics_endpoint()
+        profiler.start_from_env()
         
         # Connect event logger to device manager
         self.device_manager.event_logger = self.event_logger
@@ -29,6 +37,45 @@ class AppController(QObject):
         # Watch for device connection events so we can create IEC worker
         self.device_manager.device_status_changed.connect(self._on_device_status_changed)
 
+    def _attach_event_journal(self):
+        """Persist event/transaction history to an on-disk journal (disable with SCADASCOUT_JOURNAL=0)."""
+        if os.environ.get('SCADASCOUT_JOURNAL', '1') == '0':
+            return
+        try:
+            from src.core.event_journal import EventJournal
+            journal_dir = os.environ.get('SCADASCOUT_JOURNAL_DIR') or os.path.expanduser("~/.scada_scout/journal")
+            # 64 x 16 MB segments keeps roughly 1 GB of history on disk
+            self.event_logger.attach_journal(EventJournal(journal_dir, max_segments=64))
+        except Exception as e:
+            logger.warning(f"Event journal disabled: {e}")
+
+    def _attach_historian(self):
+        """Record signal value history (disable with SCADASCOUT_HISTORIAN=0)."""
+        if os.environ.get('SCADASCOUT_HISTORIAN', '1') == '0':
+            return
+        try:
+            from src.core.historian import Historian
+            history_dir = os.environ.get('SCADASCOUT_HISTORIAN_DIR') or os.path.expanduser("~/.scada_scout/history")
+            self.historian = Historian(history_dir)
+            # Recorded on the worker thread, before the GUI batching
+            self.device_manager.on('signal_updated', self.historian.on_signal_updated)
+        except Exception as e:
+            self.historian = None
+            logger.warning(f"Historian disabled: {e}")
+
+    def _start_metrics_endpoint(self):
+        """Serve runtime metrics at /metrics when SCADASCOUT_METRICS_PORT is set."""
+        port = os.environ.get('SCADASCOUT_METRICS_PORT')
+        if not port:
+            return
+        try:
+            from src.core.metrics import MetricsServer
+            self.metrics_server = MetricsServer(port=int(port))
+            self.metrics_server.start()
+        except Exception as e:
+            self.metrics_server = None
+            logger.warning(f"Metrics endpoint disabled: {e}")
+
     def init_iec_worker(self, iec_client, device_name: str):
         """Deprecated: Worker management moved to DeviceManager."""
         pass
@@ -115,6 +162,24 @@ class AppController(QObject):
         except Exception:
             pass
             
+        if self.historian is not None:
+            try:
+                self.historian.close()
+            except Exception:
+                pass
+
+        if self.metrics_server is not None:
+            self.metrics_server.stop()
+
+        profiler.stop_and_save()
+
+        journal = self.event_logger.journal
+        if journal is not None:
+            try:
+                journal.close()
+            except Exception:
+                pass
+
         # logger.info("Shutting down IEC workers...")
         # Legacy cleanup - can be removed if strictly using DeviceManager
 
@@ -0,0 +1,547 @@
+"""
+Zero-copy-ish packet capture pipeline.
+
+The capture thread hands raw frames to `CapturePipeline.on_frame`, which only
+copies the bytes into a preallocated ring buffer and (optionally) appends them
+to a buffered, rotating pcapng file. Nothing is dissected on the hot path:
+one-line summaries are produced from the raw headers when the UI drains new
+frames, and full scapy dissection happens only for a frame the user opens.
+"""
+import json
+import os
+import struct
+import threading
+import time
+from array import array
+from datetime import datetime
+from typing import Iterator, List, Optional, Tuple
+
+# ---- Ring buffer ----
+
+
+class FrameRing:
+    """
+    Fixed-size ring of raw frames plus per-frame metadata.
+
+    Frame bytes live in one preallocated bytearray; metadata (timestamp,
+    offset, captured length, wire length) lives in parallel typed arrays.
+    Frames are addressed by a monotonically increasing sequence number; once
+    newer frames have overwritten a frame's bytes, `get()` returns None.
+    """
+
+    def __init__(self, capacity_bytes: int = 32 * 1024 * 1024, max_frames: int = 65536):
+        self._buf = bytearray(capacity_bytes)
+        self._view = memoryview(self._buf)
+        self._capacity = capacity_bytes
+        self._slots = max_frames
+        self._ts = array('d', bytes(8 * max_frames))
+        self._off = array('q', bytes(8 * max_frames))
+        self._len = array('I', bytes(4 * max_frames))
+        self._wire = array('I', bytes(4 * max_frames))
+        self._write_pos = 0
+        self._next_seq = 0
+        self._oldest = 0
+        self._lock = threading.Lock()
+
+    @property
+    def next_seq(self) -> int:
+        return self._next_seq
+
+    @property
+    def oldest_seq(self) -> int:
+        return self._oldest
+
+    def __len__(self):
+        return self._next_seq - self._oldest
+
+    def append(self, ts: float, data, wire_len: Optional[int] = None) -> int:
+        """Copy one frame into the ring. Returns its sequence number."""
+        n = len(data)
+        if n > self._capacity:
+            data = data[:self._capacity]
+            n = self._capacity
+        with self._lock:
+            pos = self._write_pos
+            # Wrapping abandons the tail [tail_start, capacity); frames there are the oldest
+            tail_start = self._capacity
+            if pos + n > self._capacity:
+                tail_start = pos
+                pos = 0
+            end = pos + n
+
+            # Invalidate frames whose bytes we are about to overwrite (always the oldest ones)
+            seq = self._next_seq
+            slots = self._slots
+            oldest = max(self._oldest, seq - slots + 1)
+            while oldest < seq:
+                i = oldest % slots
+                o = self._off[i]
+                if o >= tail_start or (o < end and pos < o + self._len[i]):
+                    oldest += 1
+                else:
+                    break
+            self._oldest = oldest
+
+            self._view[pos:end] = data
+            i = seq % slots
+            self._ts[i] = ts
+            self._off[i] = pos
+            self._len[i] = n
+            self._wire[i] = wire_len if wire_len is not None else n
+            self._write_pos = end
+            self._next_seq = seq + 1
+            return seq
+
+    def get(self, seq: int) -> Optional[Tuple[float, bytes, int]]:
+        """(timestamp, frame bytes, wire length) or None if the frame has been overwritten."""
+        with self._lock:
+            if seq < self._oldest or seq >= self._next_seq:
+                return None
+            i = seq % self._slots
+            o = self._off[i]
+            return self._ts[i], bytes(self._view[o:o + self._len[i]]), self._wire[i]
+
+    def clear(self):
+        with self._lock:
+            self._oldest = self._next_seq
+            self._write_pos = 0
+
+
+# ---- Buffered rotating writers ----
+
+
+def _rotate_files(path: str, max_files: int):
+    """path -> path.1, path.1 -> path.2, ... keeping `max_files` rotated files."""
+    for i in range(max_files - 1, 0, -1):
+        src = f"{path}.{i}"
+        if os.path.exists(src):
+            try:
+                os.replace(src, f"{path}.{i + 1}")
+            except OSError:
+                pass
+    try:
+        os.replace(path, f"{path}.1")
+    except OSError:
+        pass
+
+
+class _RotatingBufferedFile:
+    """Buffered binary file that tracks its size in memory and rotates without stat() per write."""
+
+    def __init__(self, path: str, max_bytes: int = 0, max_files: int = 5, buffer_size: int = 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_files = max(1, max_files)
+        self._buffer_size = buffer_size
+        self._fh = None
+        self._size = 0
+        self._header_len = 0
+        self._lock = threading.Lock()
+        dirname = os.path.dirname(path)
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+        self._open()
+
+    def _header(self) -> bytes:
+        return b""
+
+    def _open_mode(self) -> str:
+        return 'ab'
+
+    def _open(self):
+        self._fh = open(self.path, self._open_mode(), buffering=self._buffer_size)
+        self._size = self._fh.tell()
+        self._header_len = 0
+        if self._size == 0:
+            header = self._header()
+            if header:
+                self._fh.write(header)
+                self._size = self._header_len = len(header)
+
+    def write(self, data: bytes):
+        with self._lock:
+            if self._fh is None:
+                return
+            if self.max_bytes and self._size + len(data) > self.max_bytes and self._size > self._header_len:
+                self._fh.close()
+                _rotate_files(self.path, self.max_files)
+                self._open()
+            self._fh.write(data)
+            self._size += len(data)
+
+    def flush(self):
+        with self._lock:
+            if self._fh is not None:
+                self._fh.flush()
+
+    def close(self):
+        with self._lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+
+
+LINKTYPE_ETHERNET = 1
+
+_SHB = struct.Struct("<IIIHHq")
+_IDB = struct.Struct("<IIHHI")
+_EPB = struct.Struct("<IIIIIII")
+
+
+class PcapngWriter(_RotatingBufferedFile):
+    """Minimal pcapng writer (one section, one Ethernet interface, microsecond timestamps)."""
+
+    def __init__(self, path: str, max_bytes: int = 0, max_files: int = 5,
+                 snaplen: int = 65535, linktype: int = LINKTYPE_ETHERNET):
+        self._snaplen = snaplen
+        self._linktype = linktype
+        super().__init__(path, max_bytes, max_files)
+
+    def _open_mode(self) -> str:
+        # Each capture run starts a fresh section; appending to an old file would need a new SHB anyway
+        return 'wb'
+
+    def _header(self) -> bytes:
+        shb = _SHB.pack(0x0A0D0D0A, 28, 0x1A2B3C4D, 1, 0, -1) + struct.pack("<I", 28)
+        idb = _IDB.pack(0x00000001, 20, self._linktype, 0, self._snaplen) + struct.pack("<I", 20)
+        return shb + idb
+
+    def write_frame(self, ts: float, data, wire_len: Optional[int] = None):
+        n = len(data)
+        pad = (-n) & 3
+        total = 32 + n + pad
+        usec = int(ts * 1_000_000)
+        self.write(b"".join((
+            _EPB.pack(0x00000006, total, 0, (usec >> 32) & 0xFFFFFFFF, usec & 0xFFFFFFFF, n,
+                      wire_len if wire_len is not None else n),
+            bytes(data), b"\0" * pad, struct.pack("<I", total),
+        )))
+
+
+class TextLineWriter(_RotatingBufferedFile):
+    """Buffered, rotating UTF-8 line log."""
+
+    def _header(self) -> bytes:
+        return f"# Packet log created at {datetime.now().isoformat()}\n".encode('utf-8')
+
+    def write_line(self, line: str):
+        self.write((line + "\n").encode('utf-8', 'replace'))
+
+
+def read_capture_file(path: str) -> Iterator[Tuple[float, bytes, int]]:
+    """
+    Yield (timestamp, frame bytes, wire length) from a pcap or pcapng file.
+
+    Pure-Python reader so offline analysis works without scapy/libpcap.
+    Only Enhanced/Simple Packet Blocks (pcapng) and classic records (pcap) are read.
+    """
+    with open(path, 'rb') as f:
+        head = f.read(4)
+        if len(head) < 4:
+            return
+        if head == b"\x0a\x0d\x0d\x0a":
+            yield from _read_pcapng(f, head)
+            return
+        magic_le = struct.unpack("<I", head)[0]
+        if magic_le in (0xA1B2C3D4, 0xA1B23C4D):
+            endian = "<"
+        elif magic_le in (0xD4C3B2A1, 0x4D3CB2A1):
+            endian = ">"
+        else:
+            raise ValueError(f"Not a pcap/pcapng file: {path}")
+        nano = magic_le in (0xA1B23C4D, 0x4D3CB2A1)
+        f.read(20)  # rest of the global header
+        rec = struct.Struct(endian + "IIII")
+        scale = 1e-9 if nano else 1e-6
+        while True:
+            hdr = f.read(rec.size)
+            if len(hdr) < rec.size:
+                return
+            sec, frac, incl, orig = rec.unpack(hdr)
+            data = f.read(incl)
+            if len(data) < incl:
+                return
+            yield sec + frac * scale, data, orig
+
+
+def _read_pcapng(f, first4: bytes) -> Iterator[Tuple[float, bytes, int]]:
+    endian = "<"
+    resolutions = []
+    block_type_raw = first4
+    while True:
+        if block_type_raw is None:
+            block_type_raw = f.read(4)
+        if len(block_type_raw) < 4:
+            return
+        len_raw = f.read(4)
+        if len(len_raw) < 4:
+            return
+        if block_type_raw == b"\x0a\x0d\x0d\x0a":
+            bom = f.read(4)
+            endian = "<" if bom == b"\x4d\x3c\x2b\x1a" else ">"
+            total = struct.unpack(endian + "I", len_raw)[0]
+            f.read(total - 12)
+            resolutions = []
+            block_type_raw = None
+            continue
+        block_type = struct.unpack(endian + "I", block_type_raw)[0]
+        total = struct.unpack(endian + "I", len_raw)[0]
+        body = f.read(total - 8)
+        block_type_raw = None
+        if len(body) < total - 8:
+            return
+        if block_type == 1:  # Interface Description Block
+            resolutions.append(_idb_resolution(body, endian))
+        elif block_type == 6:  # Enhanced Packet Block
+            iface, ts_hi, ts_lo, cap_len, orig_len = struct.unpack_from(endian + "IIIII", body)
+            res = resolutions[iface] if iface < len(resolutions) else 1e-6
+            yield ((ts_hi << 32) | ts_lo) * res, body[20:20 + cap_len], orig_len
+        elif block_type == 3:  # Simple Packet Block (no timestamp)
+            orig_len = struct.unpack_from(endian + "I", body)[0]
+            yield 0.0, body[4:4 + orig_len], orig_len
+
+
+def _idb_resolution(body: bytes, endian: str) -> float:
+    """Timestamp resolution from the if_tsresol option of an IDB body (default microseconds)."""
+    pos = 8
+    end = len(body) - 4
+    while pos + 4 <= end:
+        code, length = struct.unpack_from(endian + "HH", body, pos)
+        if code == 0:
+            break
+        if code == 9 and length >= 1:
+            v = body[pos + 4]
+            return 2.0 ** -(v & 0x7F) if v & 0x80 else 10.0 ** -v
+        pos += 4 + length + ((-length) & 3)
+    return 1e-6
+
+
+# ---- Lightweight header parsing (for summaries) ----
+
+ETH_P_IP = 0x0800
+ETH_P_VLAN = 0x8100
+ETH_P_GOOSE = 0x88B8
+ETH_P_SV = 0x88BA
+
+
+def _mac(b) -> str:
+    return ":".join(f"{x:02x}" for x in b)
+
+
+def _ip(b) -> str:
+    return f"{b[0]}.{b[1]}.{b[2]}.{b[3]}"
+
+
+def parse_headers(data) -> dict:
+    """
+    Parse Ethernet/VLAN/IPv4/TCP/UDP headers from a raw frame without scapy.
+    Returns a dict with whatever could be decoded; `payload_offset` points past the L4 header.
+    """
+    info = {}
+    if len(data) < 14:
+        return info
+    info['eth_dst'] = _mac(data[0:6])
+    info['eth_src'] = _mac(data[6:12])
+    ethertype = (data[12] << 8) | data[13]
+    pos = 14
+    while ethertype == ETH_P_VLAN and len(data) >= pos + 4:
+        info['vlan'] = ((data[pos] << 8) | data[pos + 1]) & 0x0FFF
+        ethertype = (data[pos + 2] << 8) | data[pos + 3]
+        pos += 4
+    info['ethertype'] = ethertype
+    info['payload_offset'] = pos
+
+    if ethertype != ETH_P_IP or len(data) < pos + 20:
+        return info
+    ihl = (data[pos] & 0x0F) * 4
+    total_len = (data[pos + 2] << 8) | data[pos + 3]
+    proto = data[pos + 9]
+    info['src'] = _ip(data[pos + 12:pos + 16])
+    info['dst'] = _ip(data[pos + 16:pos + 20])
+    info['proto'] = proto
+    ip_end = min(len(data), pos + total_len) if total_len else len(data)
+    info['ip_end'] = ip_end
+    pos += ihl
+
+    if proto == 6 and len(data) >= pos + 20:
+        info['sport'] = (data[pos] << 8) | data[pos + 1]
+        info['dport'] = (data[pos + 2] << 8) | data[pos + 3]
+        info['seq'] = int.from_bytes(data[pos + 4:pos + 8], 'big')
+        info['ack'] = int.from_bytes(data[pos + 8:pos + 12], 'big')
+        data_off = (data[pos + 12] >> 4) * 4
+        info['tcp_flags'] = data[pos + 13]
+        pos += data_off
+    elif proto == 17 and len(data) >= pos + 8:
+        info['sport'] = (data[pos] << 8) | data[pos + 1]
+        info['dport'] = (data[pos + 2] << 8) | data[pos + 3]
+        pos += 8
+    info['payload_offset'] = pos
+    info['payload_len'] = max(0, ip_end - pos)
+    return info
+
+
+_TCP_FLAG_NAMES = ((0x02, 'S'), (0x10, 'A'), (0x08, 'P'), (0x01, 'F'), (0x04, 'R'), (0x20, 'U'))
+
+
+def summarize_frame(data, local_ips=()) -> str:
+    """One-line summary of a raw frame, computed from headers only."""
+    h = parse_headers(data)
+    if not h:
+        return f"<{len(data)} bytes>"
+    ethertype = h.get('ethertype')
+    if 'src' in h:
+        src, dst = h['src'], h['dst']
+        direction = 'TX' if src in local_ips else ('RX' if dst in local_ips else 'UNK')
+        proto = h.get('proto')
+        if 'sport' in h:
+            name = 'TCP' if proto == 6 else 'UDP'
+            text = f"[{direction}] {name} {src}:{h['sport']} → {dst}:{h['dport']} len={h.get('payload_len', 0)}"
+            if proto == 6:
+                flags = "".join(c for bit, c in _TCP_FLAG_NAMES if h['tcp_flags'] & bit)
+                text += f" [{flags}]"
+            return text
+        return f"[{direction}] IP proto={proto} {src} → {dst}"
+    if ethertype == ETH_P_GOOSE:
+        return f"GOOSE {h['eth_src']} → {h['eth_dst']} len={len(data)}"
+    if ethertype == ETH_P_SV:
+        return f"SV {h['eth_src']} → {h['eth_dst']} len={len(data)}"
+    return f"ETH 0x{ethertype:04x} {h['eth_src']} → {h['eth_dst']} len={len(data)}"
+
+
+def dissect_frame(data) -> str:
+    """Full human-readable dissection. Imports scapy lazily; falls back to a hex dump."""
+    try:
+        from scapy.all import Ether
+        return Ether(bytes(data)).show(dump=True)
+    except Exception:
+        text = bytes(data).hex()
+        return "\n".join(text[i:i + 64] for i in range(0, len(text), 64))
+
+
+# ---- Pipeline ----
+
+
+class CapturePipeline:
+    """
+    Receives raw frames from a capture thread and keeps them for lazy viewing.
+
+    `on_frame` is the only hot-path call: ring copy + optional buffered file
+    write + counters. The UI calls `drain()` on a timer to pick up new
+    sequence numbers in bulk, `summary()` for rows it actually shows, and
+    `dissect()` when the user opens a frame.
+    """
+
+    def __init__(self, ring_bytes: int = 32 * 1024 * 1024, ring_frames: int = 65536):
+        self.ring = FrameRing(ring_bytes, ring_frames)
+        self.local_ips = set()
+        self._pcap_writer: Optional[PcapngWriter] = None
+        self._text_writer: Optional[TextLineWriter] = None
+        self._text_json = False
+        self._read_cursor = 0
+        self.frames_captured = 0
+        self.bytes_captured = 0
+        self.frames_dropped_ui = 0
+        self.started_at = None
+        # Optional live decoder (e.g. protocol_decoder.ProtocolAnalyzer) fed with every frame
+        self.analyzer = None
+
+    # Writers
+
+    def set_pcapng_output(self, path: Optional[str], max_bytes: int = 0, max_files: int = 5):
+        self._close_writer('_pcap_writer')
+        if path:
+            self._pcap_writer = PcapngWriter(path, max_bytes=max_bytes, max_files=max_files)
+
+    def set_text_output(self, path: Optional[str], max_bytes: int = 0, max_files: int = 5, json_format: bool = False):
+        self._close_writer('_text_writer')
+        self._text_json = bool(json_format)
+        if path:
+            self._text_writer = TextLineWriter(path, max_bytes=max_bytes, max_files=max_files)
+
+    def set_rotation(self, max_bytes: int, max_files: int = 5):
+        for writer in (self._pcap_writer, self._text_writer):
+            if writer is not None:
+                writer.max_bytes = max_bytes
+                writer.max_files = max(1, max_files)
+
+    def _close_writer(self, attr: str):
+        writer = getattr(self, attr)
+        setattr(self, attr, None)
+        if writer is not None:
+            try:
+                writer.close()
+            except Exception:
+                pass
+
+    # Hot path
+
+    def on_frame(self, ts: Optional[float], data, wire_len: Optional[int] = None) -> int:
+        if ts is None:
+            ts = time.time()
+        seq = self.ring.append(ts, data, wire_len)
+        self.frames_captured += 1
+        self.bytes_captured += len(data)
+        pcap = self._pcap_writer
+        if pcap is not None:
+            pcap.write_frame(ts, data, wire_len)
+        text = self._text_writer
+        analyzer = self.analyzer
+        if analyzer is not None:
+            try:
+                analyzer.feed(ts, data)
+            except Exception:
+                pass
+        if text is not None:
+            if self._text_json:
+                record = parse_headers(data)
+                record.pop('payload_offset', None)
+                record.pop('ip_end', None)
+                record['time'] = datetime.fromtimestamp(ts).strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3]
+                record['seq'] = seq
+                record['len'] = len(data)
+                text.write_line(json.dumps(record))
+            else:
+                stamp = datetime.fromtimestamp(ts).strftime("%H:%M:%S.%f")[:-3]
+                text.write_line(f"[{stamp}] #{seq} {summarize_frame(data, self.local_ips)}")
+        return seq
+
+    # Consumer side
+
+    def drain(self, max_items: int = 0) -> List[int]:
+        """Sequence numbers captured since the last drain (oldest first).
+
+        If more than `max_items` are pending, only the newest are returned and the
+        rest are counted in `frames_dropped_ui` (they remain in the ring and the files).
+        """
+        end = self.ring.next_seq
+        start = max(self._read_cursor, self.ring.oldest_seq)
+        self.frames_dropped_ui += start - self._read_cursor
+        if max_items and end - start > max_items:
+            self.frames_dropped_ui += (end - start) - max_items
+            start = end - max_items
+        self._read_cursor = end
+        return list(range(start, end))
+
+    def summary(self, seq: int) -> Optional[str]:
+        frame = self.ring.get(seq)
+        if frame is None:
+            return None
+        return summarize_frame(frame[1], self.local_ips)
+
+    def dissect(self, seq: int) -> Optional[str]:
+        frame = self.ring.get(seq)
+        if frame is None:
+            return None
+        ts, data, wire_len = frame
+        stamp = datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M:%S.%f")
+        header = f"Frame #{seq}  {stamp}  {len(data)} bytes captured ({wire_len} on wire)\n"
+        return header + summarize_frame(data, self.local_ips) + "\n\n" + dissect_frame(data)
+
+    def flush(self):
+        for writer in (self._pcap_writer, self._text_writer):
+            if writer is not None:
+                writer.flush()
+
+    def close(self):
+        self._close_writer('_pcap_writer')
+        self._close_writer('_text_writer')
@@ -0,0 +1,110 @@
+"""
+Change detection for polled signals (report by exception).
+
+Protocol adapters run every read result through a `ChangeFilter` before
+calling the data callback, so a value that has not changed is dropped
+before the device manager, Qt bridge, views, gateway and OPC mirror see
+it. A read result is passed on when:
+
+- the signal has not been reported yet,
+- its quality or error text changed,
+- an analog value moved by more than the deadband from the last reported
+  value (absolute, or percent of that value; the larger wins), or any
+  other value is no longer equal,
+- the integrity period elapsed since it was last reported.
+
+Settings come from `DeviceConfig.protocol_params`:
+
+    change_filter         bool, default True
+    deadband              absolute analog deadband, default 0 (any change)
+    deadband_percent      relative analog deadband in %, default 0
+    integrity_period_s    re-report unchanged values after this long, default 60 (0 = never)
+
+SCADASCOUT_CHANGE_FILTER=0 turns filtering off for every device.
+"""
+import math
+import os
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from src.core import metrics
+
+_suppressed_total = metrics.counter(
+    'scadascout_updates_suppressed_total', 'Read results dropped as unchanged', ('device',))
+_passed_total = metrics.counter(
+    'scadascout_updates_passed_total', 'Read results passed on to subscribers', ('device',))
+
+DEFAULT_INTEGRITY_PERIOD_S = 60.0
+
+
+def _is_analog(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+class ChangeFilter:
+    """Per-signal deadband/change filter; one instance per protocol adapter."""
+
+    def __init__(self, device_name: str = "", deadband: float = 0.0, deadband_percent: float = 0.0,
+                 integrity_period_s: float = DEFAULT_INTEGRITY_PERIOD_S):
+        self.deadband = abs(deadband)
+        self.deadband_percent = abs(deadband_percent)
+        self.integrity_period_s = integrity_period_s
+        # address -> (value, quality, error, monotonic time reported)
+        self._last: Dict[str, Tuple[Any, Any, str, float]] = {}
+        self._suppressed = _suppressed_total.labels(device_name)
+        self._passed = _passed_total.labels(device_name)
+
+    @classmethod
+    def from_config(cls, config) -> Optional['ChangeFilter']:
+        """The filter configured for a device, or None when filtering is off."""
+        if os.environ.get('SCADASCOUT_CHANGE_FILTER', '1') == '0':
+            return None
+        params = getattr(config, 'protocol_params', None) or {}
+        if not params.get('change_filter', True):
+            return None
+        try:
+            return cls(getattr(config, 'name', ''),
+                       deadband=float(params.get('deadband', 0.0)),
+                       deadband_percent=float(params.get('deadband_percent', 0.0)),
+                       integrity_period_s=float(params.get('integrity_period_s', DEFAULT_INTEGRITY_PERIOD_S)))
+        except (TypeError, ValueError):
+            return cls(getattr(config, 'name', ''))
+
+    def _value_changed(self, old, new) -> bool:
+        if _is_analog(old) and _is_analog(new):
+            if isinstance(old, float) and math.isnan(old) or isinstance(new, float) and math.isnan(new):
+                return not (isinstance(old, float) and isinstance(new, float) and math.isnan(old) and math.isnan(new))
+            threshold = max(self.deadband, abs(old) * self.deadband_percent / 100.0)
+            if threshold <= 0:
+                return new != old
+            return abs(new - old) > threshold
+        try:
+            return bool(new != old)
+        except Exception:
+            return True
+
+    def accept(self, signal) -> bool:
+        """True if this read result should be reported to subscribers."""
+        address = signal.address
+        value = signal.value
+        quality = signal.quality
+        error = signal.error
+        now = time.monotonic()
+        last = self._last.get(address)
+        if (last is None
+                or quality != last[1]
+                or error != last[2]
+                or (self.integrity_period_s > 0 and now - last[3] >= self.integrity_period_s)
+                or self._value_changed(last[0], value)):
+            self._last[address] = (value, quality, error, now)
+            self._passed.inc()
+            return True
+        self._suppressed.inc()
+        return False
+
+    def reset(self, address: Optional[str] = None):
+        """Forget the last reported state (all signals, or one address)."""
+        if address is None:
+            self._last.clear()
+        else:
+            self._last.pop(address, None)
@@ -0,0 +1,153 @@
+"""
+Connection supervision with automatic reconnect.
+
+One `ConnectionSupervisor` thread runs per connected device whose protocol
+adapter offers `check_connection(keepalive_s)` and `reconnect()` (currently
+the IEC 61850 client). It wakes every `check_interval_s`, or immediately
+when the adapter reports a lost association, and when the connection is
+gone re-establishes it with exponential backoff (with jitter, so a whole
+substation of IEDs does not retry in lock step). `reconnect()` skips the
+ping/port diagnostics and discovery of a manual connect: the device model,
+control contexts and polling subscriptions are kept and resume on their own.
+
+Settings come from `DeviceConfig.protocol_params`:
+
+    auto_reconnect          bool, default True
+    keepalive_s             probe an idle connection after this long, default 5 (0 = state check only)
+    reconnect_backoff_max_s upper bound of the retry delay, default 5
+
+SCADASCOUT_AUTO_RECONNECT=0 turns supervision off for every device.
+"""
+import logging
+import os
+import random
+import threading
+import time
+from typing import Callable, Optional
+
+from src.core import metrics
+
+logger = logging.getLogger(__name__)
+
+_losses_total = metrics.counter(
+    'scadascout_connection_losses_total', 'Connections found lost by the supervisor', ('device',))
+_reconnect_attempts_total = metrics.counter(
+    'scadascout_reconnect_attempts_total', 'Reconnect attempts made by the supervisor', ('device',))
+_reconnects_total = metrics.counter(
+    'scadascout_reconnects_total', 'Connections re-established by the supervisor', ('device',))
+_recovery_seconds = metrics.histogram(
+    'scadascout_reconnect_seconds', 'Time from detecting a lost connection to having it back', ('device',))
+
+
+class ConnectionSupervisor:
+    """Keeps one device connection alive; see the module docstring."""
+
+    def __init__(self, device_name: str, protocol, on_status: Callable[[str, bool], None],
+                 check_interval_s: float = 1.0, keepalive_s: float = 5.0,
+                 backoff_initial_s: float = 0.5, backoff_max_s: float = 5.0):
+        self.device_name = device_name
+        self.protocol = protocol
+        self._on_status = on_status
+        self.check_interval_s = check_interval_s
+        self.keepalive_s = keepalive_s
+        self.backoff_initial_s = backoff_initial_s
+        self.backoff_max_s = max(backoff_initial_s, backoff_max_s)
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._losses = _losses_total.labels(device_name)
+        self._attempts = _reconnect_attempts_total.labels(device_name)
+        self._reconnects = _reconnects_total.labels(device_name)
+        self._recovery = _recovery_seconds.labels(device_name)
+
+    @staticmethod
+    def supports(protocol) -> bool:
+        return hasattr(protocol, 'check_connection') and hasattr(protocol, 'reconnect')
+
+    @classmethod
+    def from_config(cls, device_name: str, protocol, config,
+                    on_status: Callable[[str, bool], None]) -> Optional['ConnectionSupervisor']:
+        """The supervisor configured for a device, or None when it is off or unsupported."""
+        if os.environ.get('SCADASCOUT_AUTO_RECONNECT', '1') == '0' or not cls.supports(protocol):
+            return None
+        params = getattr(config, 'protocol_params', None) or {}
+        if not params.get('auto_reconnect', True):
+            return None
+        try:
+            return cls(device_name, protocol, on_status,
+                       keepalive_s=float(params.get('keepalive_s', 5.0)),
+                       backoff_max_s=float(params.get('reconnect_backoff_max_s', 5.0)))
+        except (TypeError, ValueError):
+            return cls(device_name, protocol, on_status)
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name=f"Supervisor-{self.device_name}", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """
+        Stop supervising. Does not wait unless `timeout` is given; a reconnect
+        that completes after the stop is closed again by the supervisor thread.
+        """
+        self._stopped.set()
+        self._wake.set()
+        thread = self._thread
+        if timeout is not None and thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+
+    def wake(self):
+        """Check the connection now (called by the adapter when it sees the association drop)."""
+        self._wake.set()
+
+    def _notify(self, connected: bool):
+        try:
+            self._on_status(self.device_name, connected)
+        except Exception:
+            logger.exception(f"Connection status callback failed for {self.device_name}")
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._wake.wait(self.check_interval_s)
+            self._wake.clear()
+            if self._stopped.is_set():
+                break
+            try:
+                alive = self.protocol.check_connection(self.keepalive_s)
+            except Exception as e:
+                logger.debug(f"Connection check failed for {self.device_name}: {e}")
+                alive = False
+            if not alive:
+                self._recover()
+
+    def _recover(self):
+        lost_at = time.monotonic()
+        self._losses.inc()
+        logger.warning(f"Connection to {self.device_name} lost; reconnecting")
+        self._notify(False)
+        delay = self.backoff_initial_s
+        while not self._stopped.is_set():
+            self._attempts.inc()
+            try:
+                ok = self.protocol.reconnect()
+            except Exception as e:
+                logger.debug(f"Reconnect of {self.device_name} raised: {e}")
+                ok = False
+            if self._stopped.is_set():
+                if ok:
+                    # Raced with a disconnect/remove of the device
+                    try:
+                        self.protocol.disconnect()
+                    except Exception:
+                        pass
+                return
+            if ok:
+                elapsed = time.monotonic() - lost_at
+                self._reconnects.inc()
+                self._recovery.observe(elapsed)
+                logger.info(f"Connection to {self.device_name} restored after {elapsed:.1f}s")
+                self._notify(True)
+                return
+            self._stopped.wait(delay * random.uniform(0.8, 1.2))
+            delay = min(delay * 2, self.backoff_max_s)
@@ -1,9 +1,11 @@
 from typing import List, Dict, Optional, Any
 import logging
-from PySide6.QtCore import QObject, Signal as QtSignal
+import threading
+from PySide6.QtCore import QMetaMethod, QObject, Qt, Signal as QtSignal, Slot
 
 from src.models.device_models import Device, DeviceConfig, Signal
 from src.core.device_manager_core import DeviceManagerCore
+from src.core.events import BatchChannel
 
 logger = logging.getLogger(__name__)
 
@@ -11,6 +13,13 @@ class DeviceManager(QObject):
     """
     Qt Adapter for DeviceManagerCore.
     Exposes Qt Signals and Slots for the UI while delegating logic to the Core.
+
+    Signal updates from protocol threads are not queued to the GUI thread one
+    by one: they go through a BatchChannel (coalesced per signal) and arrive
+    as one `signal_updates` list per event-loop pass, followed by the
+    per-update `signal_updated` emits, which are then same-thread calls.
+    Reads the change filter dropped take the same route through their own
+    channel (`signals_unchanged`, then `signal_unchanged`).
     """
     # Signals to notify UI of changes (matching original interface)
     device_added = QtSignal(Device)
@@ -20,6 +29,14 @@ class DeviceManager(QObject):
     device_renamed = QtSignal(str, str)
     connection_progress = QtSignal(str, str, int) 
     signal_updated = QtSignal(str, Signal) 
+    # [(device_name, Signal), ...] delivered in one GUI-thread call; prefer this for per-update work
+    signal_updates = QtSignal(list)
+    _updates_ready = QtSignal()
+    # Read completed but the change filter dropped it (value/quality unchanged)
+    signal_unchanged = QtSignal(str, Signal)
+    # Batched form of signal_unchanged: [(device_name, Signal), ...]
+    signals_unchanged = QtSignal(list)
+    _unchanged_ready = QtSignal()
     # Variable lifecycle & updates: (owner, name, ...) — owner may be None
     variable_added = QtSignal(object, str, str)        # owner, var_name, unique_address
     variable_removed = QtSignal(object, str)          # owner, var_name
@@ -48,7 +65,18 @@ class DeviceManager(QObject):
         except Exception:
             pass
         self._core.on("connection_progress", self.connection_progress.emit)
-        self._core.on("signal_updated", self.signal_updated.emit)
+        self._gui_thread = threading.get_ident()
+        self._update_channel = BatchChannel('signal_updated', self._deliver_updates, self._updates_ready.emit,
+                                            key=lambda device_name, signal: (device_name, signal.address))
+        self._updates_ready.connect(self._drain_updates, Qt.QueuedConnection)
+        self._signal_updated_method = QMetaMethod.fromSignal(self.signal_updated)
+        self._core.on("signal_updated", self._on_core_signal_updated)
+        self._unchanged_channel = BatchChannel('signal_unchanged', self._deliver_unchanged,
+                                               self._unchanged_ready.emit,
+                                               key=lambda device_name, signal: (device_name, signal.address))
+        self._unchanged_ready.connect(self._drain_unchanged, Qt.QueuedConnection)
+        self._signal_unchanged_method = QMetaMethod.fromSignal(self.signal_unchanged)
+        self._core.on("signal_unchanged", self._on_core_signal_unchanged)
         # Variable lifecycle/events (optional)
         try:
             self._core.on('variable_added', self.variable_added.emit)
@@ -67,6 +95,51 @@ class DeviceManager(QObject):
         except Exception:
             pass
 
+    def _on_core_signal_updated(self, device_name: str, signal: Signal):
+        if threading.get_ident() == self._gui_thread:
+            # Already on the GUI thread: deliver now, after anything still queued
+            self._update_channel.drain()
+            self._deliver_updates([(device_name, signal)])
+        else:
+            self._update_channel.post(device_name, signal)
+
+    def _on_core_signal_unchanged(self, device_name: str, signal: Signal):
+        if threading.get_ident() == self._gui_thread:
+            self._unchanged_channel.drain()
+            self._deliver_unchanged([(device_name, signal)])
+        else:
+            self._unchanged_channel.post(device_name, signal)
+
+    def on(self, event_name: str, callback, executor=None):
+        """Subscribe to a core event; the callback runs on the emitting (worker) thread."""
+        self._core.on(event_name, callback, executor)
+
+    def off(self, event_name: str, callback):
+        self._core.off(event_name, callback)
+
+    @Slot()
+    def _drain_updates(self):
+        self._update_channel.drain()
+
+    @Slot()
+    def _drain_unchanged(self):
+        self._unchanged_channel.drain()
+
+    def _deliver_unchanged(self, items: list):
+        self.signals_unchanged.emit(items)
+        if self.isSignalConnected(self._signal_unchanged_method):
+            emit = self.signal_unchanged.emit
+            for device_name, signal in items:
+                emit(device_name, signal)
+
+    def _deliver_updates(self, items: list):
+        self.signal_updates.emit(items)
+        # Per-update emits only for listeners still on the single-update signal
+        if self.isSignalConnected(self._signal_updated_method):
+            emit = self.signal_updated.emit
+            for device_name, signal in items:
+                emit(device_name, signal)
+
     @property
     def event_logger(self):
         return self._core.event_logger
@@ -134,9 +207,15 @@ class DeviceManager(QObject):
     def read_signal(self, device_name: str, signal: Signal) -> Optional[Signal]:
         return self._core.read_signal(device_name, signal)
 
+    def read_signals(self, device_name: str, signals: List[Signal]) -> Optional[List[Signal]]:
+        return self._core.read_signals(device_name, signals)
+
     def write_signal(self, device_name: str, signal: Signal, value: Any) -> bool:
         return self._core.write_signal(device_name, signal, value)
 
+    def write_signals(self, device_name: str, writes: List[tuple]) -> List[bool]:
+        return self._core.write_signals(device_name, writes)
+
     def send_control_command(self, device_name: str, signal: Signal, command: str, value: Any):
         return self._core.send_control_command(device_name, signal, command, value)
 
@@ -158,6 +237,9 @@ class DeviceManager(QObject):
     def list_user_scripts(self):
         return self._core.list_user_scripts()
 
+    def get_user_script_stats(self, name: str = None):
+        return self._core.get_user_script_stats(name)
+
     def save_user_script(self, name: str, code: str, interval: float = 0.5):
         return self._core.save_user_script(name, code, interval)
 
@@ -206,6 +288,9 @@ class DeviceManager(QObject):
     def get_signal_by_unique_address(self, unique_address: str) -> Optional[Signal]:
         return self._core.get_signal_by_unique_address(unique_address)
 
+    def resolve_unique_addresses(self, unique_addresses) -> Dict[str, Signal]:
+        return self._core.resolve_unique_addresses(unique_addresses)
+
     def list_unique_addresses(self, device_name: Optional[str] = None):
         return self._core.list_unique_addresses(device_name)
 
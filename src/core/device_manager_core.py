@@ -2,17 +2,28 @@ import logging
 import json
 import os
 import threading
+import time
 from typing import List, Dict, Optional, Any
 
+from src.core import metrics
+from src.core.connection_supervisor import ConnectionSupervisor
 from src.core.events import EventEmitter
-from src.models.device_models import Device, DeviceConfig, DeviceType, Node, Signal, SignalQuality
+from src.models.device_models import Device, DeviceConfig, DeviceType, LazyNode, Node, Signal, SignalQuality
 from src.protocols.base_protocol import BaseProtocol
 from src.core.subscription_manager import IECSubscriptionManager
 from src.core.script_tag_manager import ScriptTagManager
 from src.core.variable_manager import VariableManager
+from src.core.script_scheduler import ScriptScheduler
 
 logger = logging.getLogger(__name__)
 
+_read_requests = metrics.counter(
+    'scadascout_read_requests_total',
+    'read_signal calls by route (worker queue, direct protocol call, device disconnected)',
+    ('device', 'route'))
+_direct_read_seconds = metrics.histogram(
+    'scadascout_direct_read_seconds', 'Latency of read_signal calls answered synchronously', ('device',))
+
 class DeviceManagerCore(EventEmitter):
     """
     Manages the lifecycle of devices.
@@ -21,20 +32,39 @@ class DeviceManagerCore(EventEmitter):
     """
     def __init__(self, config_path="devices.json"):
         super().__init__()
+        # Pre-bound slots for the per-update events
+        self._signal_updated = self.slot("signal_updated")
+        self._signal_unchanged = self.slot("signal_unchanged")
         self._devices: Dict[str, Device] = {}
         self._protocols: Dict[str, BaseProtocol] = {}
         self.event_logger = None 
         self.protocol_workers: Dict[str, object] = {}
+        # Reconnect supervisors of connected devices (see connection_supervisor)
+        self._supervisors: Dict[str, ConnectionSupervisor] = {}
         self.config_path = config_path
         self.folder_descriptions: Dict[str, str] = {} # folder_name -> description
         self._active_workers = []
         self._script_manager = None
         self._script_tag_manager = ScriptTagManager(self)
         self._saved_scripts = {}
+        # One deadline scheduler + bounded pool for tick scripts and continuous variables
+        self._script_scheduler = ScriptScheduler()
         # Variable manager (script-scoped and global variables bound to device signals)
-        self._variable_manager = VariableManager(self)
+        self._variable_manager = VariableManager(self, scheduler=self._script_scheduler)
         # Executor for background SCD parsing (lazy-created)
         self._scd_executor = None
+        # In-flight SCD parses: {(path, mtime): (future, [waiting device names])}
+        self._scd_inflight = {}
+        self._scd_lock = threading.Lock()
+        # Unloaded LN subtrees per device: {device: {LN path: LazyNode}}
+        self._lazy_nodes: Dict[str, Dict[str, LazyNode]] = {}
+        self._lazy_lock = threading.Lock()
+        # Batch reads of devices without a worker (lazy-created pool).
+        # {device: {id(signal): signal}} -- present while a batch is in
+        # flight; holds the signals requested meanwhile for one follow-up read
+        self._read_executor = None
+        self._batch_reads: Dict[str, Dict[int, Signal]] = {}
+        self._batch_lock = threading.Lock()
         # Load persisted user scripts and update token internals
         try:
             self._load_user_scripts()
@@ -61,7 +91,7 @@ class DeviceManagerCore(EventEmitter):
         protocol = self._create_protocol(config)
         if protocol:
             # CRITICAL: Set callback immediately so updates are propagated
-            protocol.set_data_callback(lambda sig: self._on_signal_update(config.name, sig))
+            self._attach_callbacks(config.name, protocol)
             self._protocols[config.name] = protocol
             
         logger.info(f"Device added: {config.name} ({config.device_type.value})")
@@ -93,6 +123,8 @@ class DeviceManagerCore(EventEmitter):
                 del self._devices[device_name]
             except KeyError:
                 pass
+            with self._lazy_lock:
+                self._lazy_nodes.pop(device_name, None)
 
             # Remove protocol wrapper
             if device_name in self._protocols:
@@ -182,6 +214,10 @@ class DeviceManagerCore(EventEmitter):
                     old_name = name
                     break
 
+        # The old adapter is discarded below; its supervisor must not keep
+        # reconnecting it (the device reads as disconnected while it retries)
+        self._stop_supervisor(old_name or config.name)
+
         # If device was connected, disconnect before changing config
         try:
             if device.connected:
@@ -208,9 +244,12 @@ class DeviceManagerCore(EventEmitter):
         if old_name and old_name != new_name:
             # Move device entry
             self._devices[new_name] = self._devices.pop(old_name)
+            with self._lazy_lock:
+                self._lazy_nodes.pop(old_name, None)
             # Move protocol mapping if present
             if old_name in self._protocols:
                 self._protocols[new_name] = self._protocols.pop(old_name)
+                self._attach_callbacks(new_name, self._protocols[new_name])
 
             # Recalculate unique addresses if present
             if device.root_node:
@@ -269,6 +308,7 @@ class DeviceManagerCore(EventEmitter):
 
     def disconnect_device(self, device_name: str):
         """Disconnects a device."""
+        self._stop_supervisor(device_name)
         if device_name in self._protocols:
             try:
                 self._protocols[device_name].disconnect()
@@ -308,7 +348,7 @@ class DeviceManagerCore(EventEmitter):
         if device_name not in self._protocols:
              protocol = self._create_protocol(device.config)
              if protocol:
-                 protocol.set_data_callback(lambda sig: self._on_signal_update(device_name, sig))
+                 self._attach_callbacks(device_name, protocol)
                  self._protocols[device_name] = protocol
         
         protocol = self._protocols.get(device_name)
@@ -320,6 +360,11 @@ class DeviceManagerCore(EventEmitter):
         # If parse already cached, do synchronous fast-path (cache hit => fast)
         from src.core.scd_parser import SCDParser
         cached = SCDParser._cache.get(scd_path)
+        try:
+            if cached and cached[0] != os.path.getmtime(scd_path):
+                cached = None  # file changed since it was parsed
+        except OSError:
+            pass
         if cached:
             try:
                 root = protocol.discover()
@@ -348,15 +393,30 @@ class DeviceManagerCore(EventEmitter):
         """Lazily create a ThreadPoolExecutor for background SCD parsing."""
         if getattr(self, '_scd_executor', None) is None:
             from concurrent.futures import ThreadPoolExecutor
-            # Keep a small pool to avoid oversubscription
-            self._scd_executor = ThreadPoolExecutor(max_workers=2)
+            # Small pool: parses are single-flight per file, the rest is
+            # per-device structure building
+            self._scd_executor = ThreadPoolExecutor(max_workers=min(4, os.cpu_count() or 2))
         return self._scd_executor
 
+    def _get_read_executor(self):
+        """Lazily create the pool that runs batch reads of devices without a worker."""
+        if self._read_executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+            self._read_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="ReadBatch")
+        return self._read_executor
+
+    @staticmethod
+    def _scd_key(scd_path: str):
+        """Single-flight key of an SCD file: (normalised path, mtime)."""
+        return (os.path.normcase(os.path.abspath(scd_path)), os.path.getmtime(scd_path))
+
     def _schedule_scd_parse(self, device_name: str, scd_path: str):
         """Schedule parsing of an SCD file off the main thread and update device when done.
 
-        This is best-effort and non-blocking. The cache will be populated with a
-        lightweight 4-tuple; templates remain deferred until requested.
+        Parses are single-flight per (path, mtime): devices that reference a
+        file already being parsed join the in-flight parse instead of
+        starting another one, and all of them are populated (in parallel)
+        once it completes. Returns the shared parse future.
         """
         if not scd_path or not os.path.exists(scd_path):
             logger.warning(f"SCD path does not exist for device {device_name}: {scd_path}")
@@ -370,7 +430,22 @@ class DeviceManagerCore(EventEmitter):
         except Exception:
             pass
 
+        key = self._scd_key(scd_path)
+        with self._scd_lock:
+            inflight = self._scd_inflight.get(key)
+            if inflight is not None:
+                fut, waiters = inflight
+                if device_name not in waiters:
+                    waiters.append(device_name)
+                logger.debug(f"{device_name} joined in-flight parse of {scd_path}")
+                return fut
+            waiters = [device_name]
+            fut = executor.submit(_parse_scd_file, scd_path)
+            self._scd_inflight[key] = (fut, waiters)
+
         def _on_done(fut):
+            with self._scd_lock:
+                _, devices = self._scd_inflight.pop(key, (None, waiters))
             try:
                 result = fut.result()
             except Exception as e:
@@ -382,46 +457,71 @@ class DeviceManagerCore(EventEmitter):
                 return
 
             mtime, tree, root, ns = result
-            # Store lightweight 4-tuple (templates deferred)
+            # Build DataTypeTemplates once here rather than in every device's discover()
+            templates = {}
+            try:
+                from src.core.scd_parser import SCDParser
+                parser = SCDParser.__new__(SCDParser)
+                parser.tree, parser.root, parser.ns = tree, root, ns
+                parser._ensure_templates()
+                templates = parser._templates or {}
+            except Exception:
+                logger.debug("Failed to build SCD templates (best-effort)")
             try:
                 from src.core.scd_parser import SCDParser
-                SCDParser._cache[scd_path] = (mtime, tree, root, ns)
+                entry = (mtime, tree, root, ns, templates)
+                # Devices may spell the same file differently; cache under each spelling
+                paths = {scd_path}
+                for waiting in devices:
+                    device = self._devices.get(waiting)
+                    if device and device.config.scd_file_path:
+                        paths.add(device.config.scd_file_path)
+                for path in paths:
+                    SCDParser._cache[path] = entry
             except Exception:
                 logger.debug("Failed to write SCDParser cache (best-effort)")
 
-            # Populate device root_node using the protocol discover() fast-path
+            # Fan out: build each waiting device's structure in parallel
+            for waiting in devices:
+                try:
+                    executor.submit(self._populate_from_scd, waiting)
+                except RuntimeError:
+                    # Executor shut down (project cleared); build inline
+                    self._populate_from_scd(waiting)
+
+        fut.add_done_callback(_on_done)
+        return fut
+
+    def _populate_from_scd(self, device_name: str):
+        """Populate a device's tree from the (now cached) SCD parse."""
+        try:
+            device = self._devices.get(device_name)
+            if not device:
+                return
+            # Reuse existing protocol adapter if present
+            proto = self._protocols.get(device_name)
+            if not proto:
+                proto = self._create_protocol(device.config)
+                if proto:
+                    self._attach_callbacks(device_name, proto)
+                    self._protocols[device_name] = proto
+
+            # Call discover() now that cache exists; this should be fast
+            root_node = proto.discover()
+            device.root_node = root_node
+            self._assign_unique_addresses(device_name, device.root_node)
+            # Notify listeners/UI
             try:
-                device = self._devices.get(device_name)
-                if not device:
-                    return
-                # Reuse existing protocol adapter if present
-                proto = self._protocols.get(device_name)
-                if not proto:
-                    proto = self._create_protocol(device.config)
-                    if proto:
-                        proto.set_data_callback(lambda sig: self._on_signal_update(device_name, sig))
-                        self._protocols[device_name] = proto
-
-                # Call discover() now that cache exists; this should be fast
-                root_node = proto.discover()
-                device.root_node = root_node
-                self._assign_unique_addresses(device_name, device.root_node)
-                # Notify listeners/UI
+                self.emit("device_updated", device_name)
+                logger.info(f"Background SCD parse complete for {device_name}")
                 try:
-                    self.emit("device_updated", device_name)
-                    logger.info(f"Background SCD parse complete for {device_name}")
-                    try:
-                        self.emit('scd_parse_completed', device_name)
-                    except Exception:
-                        pass
+                    self.emit('scd_parse_completed', device_name)
                 except Exception:
                     pass
             except Exception:
-                logger.exception(f"Failed to populate device tree after background parse for {device_name}")
-
-        fut = executor.submit(_parse_scd_file, scd_path)
-        fut.add_done_callback(_on_done)
-        return fut
+                pass
+        except Exception:
+            logger.exception(f"Failed to populate device tree after background parse for {device_name}")
 
     def clear_all_devices(self):
         """Remove all devices and cleanup protocols and workers."""
@@ -451,6 +551,14 @@ class DeviceManagerCore(EventEmitter):
         except Exception:
             pass
 
+        # Shutdown the batch read pool if present
+        if self._read_executor is not None:
+            try:
+                self._read_executor.shutdown(wait=False)
+            except Exception:
+                pass
+            self._read_executor = None
+
         # Shutdown SCD executor if present
         try:
             if getattr(self, '_scd_executor', None):
@@ -459,6 +567,8 @@ class DeviceManagerCore(EventEmitter):
                 except Exception:
                     pass
                 self._scd_executor = None
+            with self._scd_lock:
+                self._scd_inflight.clear()
         except Exception:
             pass
 
@@ -538,12 +648,15 @@ class DeviceManagerCore(EventEmitter):
                 self.emit("connection_progress", device_name, "Error: No protocol handler", 0)
                 return
             
-            protocol.set_data_callback(lambda sig: self._on_signal_update(device_name, sig))
+            self._attach_callbacks(device_name, protocol)
             self._protocols[device_name] = protocol
 
         from src.core.workers import ConnectionWorker, IEC61850Worker, ModbusWorker
         
         protocol = self._protocols[device_name]
+        # A manual connect replaces any reconnect in progress; the supervisor is
+        # started again once the connection worker has finished
+        previous_supervisor = self._stop_supervisor(device_name)
         
         # Start Connection Worker (for initial connect/discovery)
         worker = ConnectionWorker(device_name, device, protocol)
@@ -562,20 +675,26 @@ class DeviceManagerCore(EventEmitter):
                 # iec_worker.on("data_ready", lambda dn, sig: self.emit("signal_updated", dn, sig))
                 iec_worker.on("error", lambda msg: logger.error(f"IEC Worker Error: {msg}"))
                 
-                t_iec = threading.Thread(target=iec_worker.run, daemon=True)
+                t_iec = threading.Thread(target=iec_worker.run, name=f"IECWorker-{device_name}", daemon=True)
                 t_iec.start()
                 
                 self.protocol_workers[device_name] = iec_worker
 
         elif device.config.device_type in [DeviceType.MODBUS_TCP, DeviceType.MODBUS_SERVER]:
             modbus_worker = ModbusWorker(protocol, device_name)
-            t_mb = threading.Thread(target=modbus_worker.run, daemon=True)
+            t_mb = threading.Thread(target=modbus_worker.run, name=f"ModbusWorker-{device_name}", daemon=True)
             t_mb.start()
             self.protocol_workers[device_name] = modbus_worker
 
         self._active_workers.append(worker)
         
-        t = threading.Thread(target=worker.run, daemon=True)
+        def run_worker():
+            if previous_supervisor:
+                # Let an in-flight reconnect return before connect() reuses the handle
+                previous_supervisor.stop(timeout=10.0)
+            worker.run()
+
+        t = threading.Thread(target=run_worker, name=f"Connect-{device_name}", daemon=True)
         t.start()
 
     def _handle_device_update_signal(self, old_name: str, new_name: str):
@@ -585,7 +704,13 @@ class DeviceManagerCore(EventEmitter):
                 if device:
                     device.config.name = new_name
                     self._devices[new_name] = self._devices.pop(old_name)
+                    with self._lazy_lock:
+                        self._lazy_nodes.pop(old_name, None)
                     self._protocols[new_name] = self._protocols.pop(old_name)
+                    supervisor = self._supervisors.pop(old_name, None)
+                    if supervisor:
+                        supervisor.device_name = new_name
+                        self._supervisors[new_name] = supervisor
                     if device.root_node:
                         self._assign_unique_addresses(new_name, device.root_node)
 
@@ -616,6 +741,38 @@ class DeviceManagerCore(EventEmitter):
     def _on_connection_finished(self, worker):
         if worker in self._active_workers:
             self._active_workers.remove(worker)
+        if getattr(worker.protocol, 'connected', False):
+            # The device may have been renamed during discovery
+            for name, protocol in list(self._protocols.items()):
+                if protocol is worker.protocol:
+                    self._start_supervisor(name, protocol)
+                    break
+
+    def _start_supervisor(self, device_name: str, protocol):
+        """Keep a connected device connected (reconnect with backoff after a loss)."""
+        if device_name in self._supervisors:
+            return
+        device = self._devices.get(device_name)
+        if not device:
+            return
+        supervisor = ConnectionSupervisor.from_config(device_name, protocol, device.config,
+                                                      self.update_connection_status)
+        if supervisor is None:
+            return
+        if hasattr(protocol, 'set_connection_lost_callback'):
+            protocol.set_connection_lost_callback(supervisor.wake)
+        self._supervisors[device_name] = supervisor
+        supervisor.start()
+
+    def _stop_supervisor(self, device_name: str) -> Optional[ConnectionSupervisor]:
+        """Stop (without waiting) and return the device's supervisor, if any."""
+        supervisor = self._supervisors.pop(device_name, None)
+        if supervisor is None:
+            return None
+        supervisor.stop()
+        if hasattr(supervisor.protocol, 'set_connection_lost_callback'):
+            supervisor.protocol.set_connection_lost_callback(None)
+        return supervisor
 
     def _create_protocol(self, config: DeviceConfig) -> Optional[BaseProtocol]:
         """Factory method to instantiate the correct protocol adapter."""
@@ -650,13 +807,19 @@ class DeviceManagerCore(EventEmitter):
             return OPCUAServerAdapter(config, event_logger=self.event_logger)
         return None
 
+    def _attach_callbacks(self, device_name: str, protocol):
+        """Route a protocol's updates (and filtered-out unchanged reads) to our events."""
+        protocol.set_data_callback(lambda sig: self._on_signal_update(device_name, sig))
+        if hasattr(protocol, 'set_unchanged_callback'):
+            unchanged = self._signal_unchanged.emit
+            protocol.set_unchanged_callback(lambda sig: unchanged(device_name, sig))
+
     def _on_signal_update(self, device_name: str, signal: Signal):
         """Internal callback when a protocol pushes data."""
         if not getattr(signal, 'unique_address', ''):
             signal.unique_address = f"{device_name}::{signal.address}"
-        if self.event_logger:
-            self.event_logger.debug("DeviceManager", f"Received update for {signal.address} Value={signal.value}")
-        self.emit("signal_updated", device_name, signal)
+        # Reads are already traced by the adapters; no per-update event log line here
+        self._signal_updated.emit(device_name, signal)
 
     def update_connection_status(self, device_name: str, connected: bool):
         device = self._devices.get(device_name)
@@ -682,6 +845,7 @@ class DeviceManagerCore(EventEmitter):
     def read_signal(self, device_name: str, signal: Signal) -> Optional[Signal]:
         protocol = self._protocols.get(device_name)
         if not protocol:
+            _read_requests.labels(device_name, 'disconnected').inc()
             # FIX: Return signal synchronously with error if not connected, 
             # so WatchList doesn't hang waiting for async update.
             signal.quality = SignalQuality.NOT_CONNECTED
@@ -696,12 +860,16 @@ class DeviceManagerCore(EventEmitter):
                     'action': 'read',
                     'signal': signal
                 })
+                _read_requests.labels(device_name, 'worker').inc()
                 return None
             except Exception as e:
                 logger.debug(f"Failed to enqueue read to IEC worker for {device_name}: {e}")
 
+        _read_requests.labels(device_name, 'direct').inc()
+        start = time.perf_counter()
         try:
             updated_signal = protocol.read_signal(signal)
+            _direct_read_seconds.labels(device_name).observe(time.perf_counter() - start)
 
             # Sync connection status if protocol has it
             if hasattr(protocol, 'connected'):
@@ -713,6 +881,97 @@ class DeviceManagerCore(EventEmitter):
             logger.warning(f"Failed to read signal {signal.address} from {device_name}: {e}")
             return None
 
+    def read_signals(self, device_name: str, signals: List[Signal]) -> Optional[List[Signal]]:
+        """
+        Batched read of several signals of one device.
+
+        Returns the signals when answered synchronously (device not
+        connected). Otherwise the batch is handed to the device's protocol
+        worker as a single task, or read on a shared bounded pool for
+        protocols without one, and returns None; results arrive through
+        `signal_updated`. Adapters with their own `read_signals` (Modbus
+        TCP) read contiguous addresses with one request per span; others
+        are read signal by signal.
+
+        On the pool a device has at most one batch in flight: signals
+        requested while it runs are collected and read once, right after
+        it, so a slow device skips poll cycles instead of piling up reads.
+        """
+        signals = list(signals)
+        protocol = self._protocols.get(device_name)
+        if not protocol:
+            for signal in signals:
+                signal.quality = SignalQuality.NOT_CONNECTED
+                signal.error = "Device Disconnected"
+            return signals
+
+        worker = self.protocol_workers.get(device_name)
+        if worker is not None:
+            try:
+                worker.enqueue({
+                    'action': 'read_batch',
+                    'signals': signals
+                })
+                return None
+            except Exception as e:
+                logger.debug(f"Failed to enqueue batch read to worker for {device_name}: {e}")
+
+        with self._batch_lock:
+            follow_up = self._batch_reads.get(device_name)
+            if follow_up is not None:
+                for signal in signals:
+                    follow_up[id(signal)] = signal
+                return None
+            self._batch_reads[device_name] = {}
+        try:
+            self._get_read_executor().submit(self._run_batch_reads, device_name, signals)
+        except RuntimeError:
+            # Pool shut down (project cleared)
+            self._run_batch_reads(device_name, signals)
+        return None
+
+    def _run_batch_reads(self, device_name: str, signals: List[Signal]):
+        """Read a batch, then any follow-up collected meanwhile, until none is left."""
+        while signals:
+            protocol = self._protocols.get(device_name)
+            if protocol is not None:
+                try:
+                    self._read_batch_sync(device_name, protocol, signals)
+                except Exception:
+                    logger.exception(f"Batch read from {device_name} failed")
+            with self._batch_lock:
+                follow_up = self._batch_reads.get(device_name)
+                if follow_up and protocol is not None:
+                    self._batch_reads[device_name] = {}
+                    signals = list(follow_up.values())
+                else:
+                    self._batch_reads.pop(device_name, None)
+                    signals = []
+
+    def _read_batch_sync(self, device_name: str, protocol, signals: List[Signal]):
+        """Background read for protocols without a dedicated worker."""
+        if hasattr(protocol, 'read_signals'):
+            try:
+                # Results are reported through the adapter's data callback
+                protocol.read_signals(signals)
+                signals = []
+            except Exception as e:
+                logger.debug(f"Batched read from {device_name} failed, reading one by one: {e}")
+        for signal in signals:
+            try:
+                updated = protocol.read_signal(signal)
+            except Exception as e:
+                logger.debug(f"Batch read of {signal.address} from {device_name} failed: {e}")
+                signal.quality = SignalQuality.INVALID
+                signal.error = str(e)
+                updated = signal
+            if updated is not None:
+                self._on_signal_update(device_name, updated)
+        if hasattr(protocol, 'connected'):
+            device = self._devices.get(device_name)
+            if device is not None and protocol.connected != device.connected:
+                self.update_connection_status(device_name, protocol.connected)
+
     def write_signal(self, device_name: str, signal: Signal, value: Any) -> bool:
         protocol = self._protocols.get(device_name)
         if not protocol or not hasattr(protocol, 'write_signal'):
@@ -723,6 +982,26 @@ class DeviceManagerCore(EventEmitter):
             logger.warning(f"Failed to write signal {signal.address} to {device_name}: {e}")
             return False
 
+    def write_signals(self, device_name: str, writes: List[tuple]) -> List[bool]:
+        """
+        Write several (signal, value) pairs of one device.
+
+        Uses the protocol's own `write_signals` when it has one (Modbus TCP:
+        one request per contiguous span), otherwise writes them in turn.
+        Returns a success flag per pair.
+        """
+        writes = list(writes)
+        protocol = self._protocols.get(device_name)
+        if not protocol:
+            return [False] * len(writes)
+        if hasattr(protocol, 'write_signals'):
+            try:
+                return [bool(ok) for ok in protocol.write_signals(writes)]
+            except Exception as e:
+                logger.warning(f"Batched write to {device_name} failed: {e}")
+                return [False] * len(writes)
+        return [self.write_signal(device_name, signal, value) for signal, value in writes]
+
     def parse_unique_address(self, unique_address: str):
         if not unique_address or "::" not in unique_address:
             return None, None
@@ -741,6 +1020,44 @@ class DeviceManagerCore(EventEmitter):
             return None
         return self._find_signal_in_node(device.root_node, address, unique_address)
 
+    def resolve_unique_addresses(self, unique_addresses) -> Dict[str, Signal]:
+        """
+        Look up many tags at once: {unique_address: Signal} for those found.
+
+        Walks each device's tree once instead of once per tag.
+        """
+        wanted: Dict[str, Dict[str, str]] = {}
+        for unique_address in unique_addresses:
+            device_name, address = self.parse_unique_address(unique_address)
+            if device_name and address:
+                wanted.setdefault(device_name, {})[unique_address] = address
+
+        resolved: Dict[str, Signal] = {}
+        for device_name, tags in wanted.items():
+            device = self._devices.get(device_name)
+            if not device or not device.root_node:
+                continue
+            for address in tags.values():
+                self.expand_address(address, device_name)
+            by_unique: Dict[str, Signal] = {}
+            by_address: Dict[str, Signal] = {}
+            stack = [device.root_node]
+            while stack:
+                node = stack.pop()
+                if isinstance(node, LazyNode) and not node.is_loaded:
+                    continue
+                for sig in getattr(node, 'signals', None) or []:
+                    by_address.setdefault(sig.address, sig)
+                    unique = getattr(sig, 'unique_address', '')
+                    if unique:
+                        by_unique.setdefault(unique, sig)
+                stack.extend(reversed(getattr(node, 'children', None) or []))
+            for unique_address, address in tags.items():
+                sig = by_unique.get(unique_address) or by_address.get(address)
+                if sig is not None:
+                    resolved[unique_address] = sig
+        return resolved
+
     def list_unique_addresses(self, device_name: Optional[str] = None):
         addresses = []
         devices = [self._devices.get(device_name)] if device_name else self._devices.values()
@@ -753,7 +1070,7 @@ class DeviceManagerCore(EventEmitter):
     def start_user_script(self, name: str, code: str, interval: float = 0.5):
         if not self._script_manager:
             from src.core.script_runtime import UserScriptManager
-            self._script_manager = UserScriptManager(self, self.event_logger)
+            self._script_manager = UserScriptManager(self, self.event_logger, scheduler=self._script_scheduler)
         # Persist script so it survives restarts
         try:
             self.save_user_script(name, code, interval)
@@ -904,6 +1221,12 @@ class DeviceManagerCore(EventEmitter):
             return []
         return self._script_manager.list_scripts()
 
+    def get_user_script_stats(self, name: Optional[str] = None):
+        """Scheduling stats (runs, jitter, overruns) of running tick scripts."""
+        if not self._script_manager:
+            return None if name is not None else {}
+        return self._script_manager.get_script_stats(name)
+
     # VariableManager convenience helpers (preferred: use ctx.bind_variable from scripts)
     def create_variable(self, owner: Optional[str], name: str, unique_address: str, mode: str = 'on_demand', interval_ms: Optional[int] = None):
         """Create or update a variable bound to a device signal. Returns a handle."""
@@ -921,18 +1244,77 @@ class DeviceManagerCore(EventEmitter):
     def _assign_unique_addresses(self, device_name: str, node: Optional[Node]):
         if not node:
             return
+        # Unloaded LN subtrees are skipped here and registered by their path;
+        # they get their addresses when something first opens them
+        lazy_nodes: Dict[str, LazyNode] = {}
+        assigned = self._assign_subtree(device_name, node, lazy_nodes)
+        with self._lazy_lock:
+            self._lazy_nodes[device_name] = lazy_nodes
+        for lazy in lazy_nodes.values():
+            lazy.on_loaded = lambda n, device_name=device_name: self._on_lazy_node_loaded(device_name, n)
+        # Keep the token resolver's address index in step with the tree
+        tag_mgr = getattr(self, '_script_tag_manager', None)
+        if tag_mgr is not None:
+            tag_mgr.index_device(device_name, assigned)
+
+    def _assign_subtree(self, device_name: str, node: Node, lazy_nodes: Dict[str, 'LazyNode']) -> List[tuple]:
+        """Assign unique addresses below `node`; returns the (address, unique_address) pairs."""
         seen = {}
+        assigned = []
 
         def _walk(n: Node):
+            if isinstance(n, LazyNode) and not n.is_loaded:
+                lazy_nodes[n.path or n.name] = n
+                return
             for sig in getattr(n, 'signals', []) or []:
                 base = f"{device_name}::{sig.address}"
                 count = seen.get(base, 0) + 1
                 seen[base] = count
                 sig.unique_address = f"{base}#{count}" if count > 1 else base
+                assigned.append((sig.address, sig.unique_address))
             for child in getattr(n, 'children', []) or []:
                 _walk(child)
 
         _walk(node)
+        return assigned
+
+    def _on_lazy_node_loaded(self, device_name: str, node: 'LazyNode'):
+        """A lazily built LN was opened: name its signals and index them."""
+        with self._lazy_lock:
+            nodes = self._lazy_nodes.get(device_name)
+            if nodes is not None:
+                nodes.pop(node.path or node.name, None)
+        nested: Dict[str, LazyNode] = {}
+        assigned = self._assign_subtree(device_name, node, nested)
+        if nested:
+            with self._lazy_lock:
+                self._lazy_nodes.setdefault(device_name, {}).update(nested)
+            for lazy in nested.values():
+                lazy.on_loaded = lambda n, device_name=device_name: self._on_lazy_node_loaded(device_name, n)
+        tag_mgr = getattr(self, '_script_tag_manager', None)
+        if tag_mgr is not None and assigned:
+            tag_mgr.add_to_index(device_name, assigned)
+
+    def expand_address(self, address: str, device_name: Optional[str] = None) -> bool:
+        """
+        Load the lazily built LN that `address` (e.g. 'IED1LD0/XCBR1.Pos.stVal')
+        lives in, on `device_name` or on every device. Returns True if
+        anything was loaded.
+        """
+        if not address:
+            return False
+        path = address.split('#', 1)[0].split('.', 1)[0]
+        with self._lazy_lock:
+            if device_name is not None:
+                nodes = [self._lazy_nodes.get(device_name, {}).get(path)]
+            else:
+                nodes = [by_path.get(path) for by_path in self._lazy_nodes.values()]
+        loaded = False
+        for node in nodes:
+            if node is not None and not node.is_loaded:
+                node.load()
+                loaded = True
+        return loaded
 
     def _collect_unique_addresses(self, device_name: str, node: Node):
         collected = []
@@ -948,6 +1330,12 @@ class DeviceManagerCore(EventEmitter):
         return collected
 
     def _find_signal_in_node(self, node: Node, address: str, unique_address: Optional[str] = None) -> Optional[Signal]:
+        if isinstance(node, LazyNode) and not node.is_loaded:
+            # Only the LN the address points into is worth loading
+            path = address.split('.', 1)[0]
+            if (node.path or node.name) != path:
+                return None
+            node.load()
         if hasattr(node, 'signals') and node.signals:
             for sig in node.signals:
                 if unique_address and getattr(sig, 'unique_address', None) == unique_address:
@@ -0,0 +1,377 @@
+"""
+Append-only binary journal for event log / transaction records.
+
+Records are written to size-rotated segment files in a journal directory:
+
+    journal-000001.seg        length-prefixed binary records
+    journal-000001.idx.json   sparse index written when the segment is sealed
+
+Segment layout: 8-byte header (b"SSJ1" + uint32 version) followed by records.
+Each record is:
+
+    uint32  length of the remainder of the record
+    float64 timestamp (epoch seconds)
+    uint8   level length,   uint16 source length,   uint32 message length
+    bytes   level, source, message (UTF-8)
+
+All integers are little-endian. The sparse index stores (timestamp, offset)
+every `index_interval` records, the first/last timestamps and the set of
+sources per segment, so time-range and device queries skip whole segments
+and seek directly to the first candidate record.
+"""
+import bisect
+import csv
+import json
+import logging
+import os
+import re
+import struct
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"SSJ1"
+VERSION = 1
+FILE_HEADER = struct.Struct("<4sI")
+RECORD_PREFIX = struct.Struct("<I")
+RECORD_HEADER = struct.Struct("<dBHI")
+
+_SEGMENT_RE = re.compile(r"^journal-(\d{6})\.seg$")
+
+
+class _Segment:
+    """Index metadata for one segment file."""
+
+    def __init__(self, seq: int, path: str):
+        self.seq = seq
+        self.path = path
+        self.first_ts: Optional[float] = None
+        self.last_ts: Optional[float] = None
+        self.count = 0
+        self.sources = set()
+        self.index_ts: List[float] = []
+        self.index_off: List[int] = []
+
+    @property
+    def index_path(self) -> str:
+        return self.path[:-len(".seg")] + ".idx.json"
+
+    def note(self, ts: float, source: str, offset: int, index_interval: int):
+        if self.count % index_interval == 0:
+            self.index_ts.append(ts)
+            self.index_off.append(offset)
+        if self.first_ts is None or ts < self.first_ts:
+            self.first_ts = ts
+        if self.last_ts is None or ts > self.last_ts:
+            self.last_ts = ts
+        self.sources.add(source)
+        self.count += 1
+
+    def overlaps(self, start: Optional[float], end: Optional[float]) -> bool:
+        if self.count == 0:
+            return False
+        if start is not None and self.last_ts < start:
+            return False
+        if end is not None and self.first_ts > end:
+            return False
+        return True
+
+    def seek_offset(self, start: Optional[float]) -> int:
+        """Offset of the last indexed record at or before `start`."""
+        if start is None or not self.index_off:
+            return FILE_HEADER.size
+        pos = bisect.bisect_right(self.index_ts, start) - 1
+        return self.index_off[pos] if pos >= 0 else FILE_HEADER.size
+
+    def to_dict(self) -> dict:
+        return {
+            'version': VERSION,
+            'first_ts': self.first_ts,
+            'last_ts': self.last_ts,
+            'count': self.count,
+            'sources': sorted(self.sources),
+            'index': list(zip(self.index_ts, self.index_off)),
+        }
+
+    def load_dict(self, data: dict):
+        self.first_ts = data.get('first_ts')
+        self.last_ts = data.get('last_ts')
+        self.count = int(data.get('count', 0))
+        self.sources = set(data.get('sources', []))
+        index = data.get('index', [])
+        self.index_ts = [float(ts) for ts, _ in index]
+        self.index_off = [int(off) for _, off in index]
+
+
+class EventJournal:
+    """
+    Persistent, append-only event journal with a sparse time/source index.
+
+    Appends go through a buffered file handle and are flushed when the buffer
+    grows past `flush_bytes` or `flush_interval` seconds have passed, so a
+    burst of transactions never turns into a multi-second save. Segments are
+    rotated at `max_segment_bytes`; `max_segments` (if set) bounds the disk
+    footprint by deleting the oldest sealed segments.
+    """
+
+    def __init__(self, directory: str, max_segment_bytes: int = 16 * 1024 * 1024,
+                 max_segments: Optional[int] = None, index_interval: int = 256,
+                 flush_interval: float = 1.0, flush_bytes: int = 64 * 1024):
+        self.directory = directory
+        self.max_segment_bytes = max_segment_bytes
+        self.max_segments = max_segments
+        self.index_interval = max(1, index_interval)
+        self.flush_interval = flush_interval
+        self.flush_bytes = flush_bytes
+
+        self._lock = threading.RLock()
+        self._segments: List[_Segment] = []
+        self._active: Optional[_Segment] = None
+        self._fh = None
+        self._offset = 0
+        self._unflushed = 0
+        self._last_flush = time.monotonic()
+
+        os.makedirs(directory, exist_ok=True)
+        self._load_segments()
+        self._open_active()
+
+    # ---- Segment management ----
+
+    def _segment_path(self, seq: int) -> str:
+        return os.path.join(self.directory, f"journal-{seq:06d}.seg")
+
+    def _load_segments(self):
+        seqs = []
+        for name in os.listdir(self.directory):
+            m = _SEGMENT_RE.match(name)
+            if m:
+                seqs.append(int(m.group(1)))
+        for seq in sorted(seqs):
+            seg = _Segment(seq, self._segment_path(seq))
+            loaded = False
+            if os.path.exists(seg.index_path):
+                try:
+                    with open(seg.index_path, 'r') as f:
+                        seg.load_dict(json.load(f))
+                    loaded = True
+                except Exception as e:
+                    logger.warning(f"Rebuilding corrupt journal index {seg.index_path}: {e}")
+            if not loaded:
+                self._rebuild_index(seg)
+            self._segments.append(seg)
+
+    def _rebuild_index(self, seg: _Segment):
+        """Scan a segment (typically the unsealed one from a previous run) to rebuild its index."""
+        for offset, ts, _level, source, _message in self._scan(seg.path, FILE_HEADER.size):
+            seg.note(ts, source, offset, self.index_interval)
+
+    def _open_active(self):
+        # Reopen the newest unsealed segment if it still has room, otherwise start a new one
+        if self._segments:
+            last = self._segments[-1]
+            if not os.path.exists(last.index_path) and os.path.getsize(last.path) < self.max_segment_bytes:
+                self._active = last
+                self._truncate_partial_tail(last)
+                self._fh = open(last.path, 'ab', buffering=self.flush_bytes)
+                self._offset = os.path.getsize(last.path)
+                return
+        seq = self._segments[-1].seq + 1 if self._segments else 1
+        seg = _Segment(seq, self._segment_path(seq))
+        self._fh = open(seg.path, 'wb', buffering=self.flush_bytes)
+        self._fh.write(FILE_HEADER.pack(MAGIC, VERSION))
+        self._offset = FILE_HEADER.size
+        self._segments.append(seg)
+        self._active = seg
+
+    def _truncate_partial_tail(self, seg: _Segment):
+        """Drop a half-written record left by a crash so new appends stay readable."""
+        end = FILE_HEADER.size
+        for offset, *_ in self._scan(seg.path, FILE_HEADER.size, with_end=True):
+            end = offset
+        if os.path.getsize(seg.path) > end:
+            with open(seg.path, 'r+b') as f:
+                f.truncate(end)
+
+    def _seal_active(self):
+        seg = self._active
+        if seg is None:
+            return
+        self._fh.close()
+        self._fh = None
+        try:
+            with open(seg.index_path, 'w') as f:
+                json.dump(seg.to_dict(), f)
+        except Exception as e:
+            logger.error(f"Failed to write journal index {seg.index_path}: {e}")
+        self._active = None
+
+    def _rotate(self):
+        self._seal_active()
+        self._open_active()
+        if self.max_segments:
+            while len(self._segments) > self.max_segments:
+                old = self._segments.pop(0)
+                for path in (old.path, old.index_path):
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+
+    # ---- Writing ----
+
+    def append(self, timestamp: float, level: str, source: str, message: str):
+        """Append one record. Thread-safe."""
+        lvl = str(level).encode('utf-8')[:255]
+        src = str(source).encode('utf-8')[:65535]
+        msg = str(message).encode('utf-8')
+        body_len = RECORD_HEADER.size + len(lvl) + len(src) + len(msg)
+        record = b"".join((
+            RECORD_PREFIX.pack(body_len),
+            RECORD_HEADER.pack(timestamp, len(lvl), len(src), len(msg)),
+            lvl, src, msg,
+        ))
+        with self._lock:
+            if self._fh is None:
+                return
+            self._active.note(timestamp, str(source), self._offset, self.index_interval)
+            self._fh.write(record)
+            self._offset += len(record)
+            self._unflushed += len(record)
+
+            if self._offset >= self.max_segment_bytes:
+                self._rotate()
+            elif self._unflushed >= self.flush_bytes or time.monotonic() - self._last_flush >= self.flush_interval:
+                self._flush_locked()
+
+    def _flush_locked(self):
+        if self._fh is not None:
+            self._fh.flush()
+        self._unflushed = 0
+        self._last_flush = time.monotonic()
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def close(self):
+        with self._lock:
+            if self._fh is not None:
+                self._seal_active()
+
+    # ---- Reading ----
+
+    @staticmethod
+    def _scan(path: str, offset: int, with_end: bool = False) -> Iterator[tuple]:
+        """Yield (offset, ts, level, source, message) from `offset` until EOF or a torn record."""
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            read = f.read
+            while True:
+                prefix = read(RECORD_PREFIX.size)
+                if len(prefix) < RECORD_PREFIX.size:
+                    break
+                (body_len,) = RECORD_PREFIX.unpack(prefix)
+                body = read(body_len)
+                if len(body) < body_len or body_len < RECORD_HEADER.size:
+                    break
+                ts, lvl_len, src_len, msg_len = RECORD_HEADER.unpack_from(body)
+                pos = RECORD_HEADER.size
+                level = body[pos:pos + lvl_len].decode('utf-8', 'replace')
+                pos += lvl_len
+                source = body[pos:pos + src_len].decode('utf-8', 'replace')
+                pos += src_len
+                message = body[pos:pos + msg_len].decode('utf-8', 'replace')
+                yield offset, ts, level, source, message
+                offset += RECORD_PREFIX.size + body_len
+            if with_end:
+                yield (offset, None, None, None, None)
+
+    def query(self, start: Optional[float] = None, end: Optional[float] = None,
+              sources: Optional[List[str]] = None, levels: Optional[List[str]] = None,
+              limit: Optional[int] = None) -> Iterator[Dict]:
+        """
+        Iterate records with start <= time <= end, optionally restricted to
+        the given sources (device names) and levels. Streams from disk.
+        """
+        with self._lock:
+            self._flush_locked()
+            segments = list(self._segments)
+        source_set = set(sources) if sources else None
+        level_set = set(levels) if levels else None
+        produced = 0
+
+        for seg in segments:
+            if not seg.overlaps(start, end):
+                continue
+            if source_set is not None and not (seg.sources & source_set):
+                continue
+            for _offset, ts, level, source, message in self._scan(seg.path, seg.seek_offset(start)):
+                if start is not None and ts < start:
+                    continue
+                if end is not None and ts > end:
+                    # Indexed timestamps are (nearly) monotonic; stop at the first record past the range
+                    break
+                if source_set is not None and source not in source_set:
+                    continue
+                if level_set is not None and level not in level_set:
+                    continue
+                yield self._to_event(ts, level, source, message)
+                produced += 1
+                if limit is not None and produced >= limit:
+                    return
+
+    @staticmethod
+    def _to_event(ts: float, level: str, source: str, message: str) -> Dict:
+        return {
+            'time': ts,
+            'timestamp': datetime.fromtimestamp(ts).strftime("%H:%M:%S.%f")[:-3],
+            'level': level,
+            'source': source,
+            'message': message,
+        }
+
+    def sources(self) -> List[str]:
+        with self._lock:
+            result = set()
+            for seg in self._segments:
+                result |= seg.sources
+        return sorted(result)
+
+    def time_range(self):
+        """(first_ts, last_ts) across all segments, or (None, None) when empty."""
+        with self._lock:
+            firsts = [s.first_ts for s in self._segments if s.count]
+            lasts = [s.last_ts for s in self._segments if s.count]
+        if not firsts:
+            return None, None
+        return min(firsts), max(lasts)
+
+    # ---- Export ----
+
+    def export_csv(self, filepath: str, **query_args) -> int:
+        """Write a query slice to CSV. Returns the number of rows written."""
+        count = 0
+        with open(filepath, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['datetime', 'level', 'source', 'message'])
+            for ev in self.query(**query_args):
+                writer.writerow([datetime.fromtimestamp(ev['time']).isoformat(), ev['level'], ev['source'], ev['message']])
+                count += 1
+        return count
+
+    def export_json(self, filepath: str, **query_args) -> int:
+        """Write a query slice as a JSON list (same shape as EventLogger history). Returns the row count."""
+        count = 0
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write('[')
+            for ev in self.query(**query_args):
+                if count:
+                    f.write(',\n')
+                json.dump(ev, f)
+                count += 1
+            f.write(']\n')
+        return count
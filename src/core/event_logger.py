@@ -2,24 +2,39 @@ from PySide6.QtCore import QObject, Signal as QtSignal
 from datetime import datetime
 import json
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
 class EventLogger(QObject):
     """
     Centralized event logger that maintains history and can be saved/loaded.
+
+    The in-memory history is a bounded tail for the UI. When an EventJournal
+    is attached every event is also appended to it, giving persistent,
+    queryable history without growing RAM.
     """
     event_logged = QtSignal(str, str, str)  # level, source, message
     history_cleared = QtSignal()
 
-    def __init__(self, max_history=1000):
+    def __init__(self, max_history=1000, journal=None):
         super().__init__()
         self._history = []
         self._max_history = max_history
+        self._journal = journal
+
+    @property
+    def journal(self):
+        return self._journal
+
+    def attach_journal(self, journal):
+        """Persist all subsequent events to `journal` (an EventJournal), or detach with None."""
+        self._journal = journal
 
     def log(self, level: str, source: str, message: str):
         """Record and emit a log event."""
-        timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
+        now = time.time()
+        timestamp = datetime.fromtimestamp(now).strftime("%H:%M:%S.%f")[:-3]
         event = {
             'timestamp': timestamp,
             'level': level,
@@ -30,7 +45,13 @@ class EventLogger(QObject):
         self._history.append(event)
         if len(self._history) > self._max_history:
             self._history.pop(0)
-            
+
+        if self._journal is not None:
+            try:
+                self._journal.append(now, level, source, message)
+            except Exception as e:
+                logger.error(f"Failed to append to event journal: {e}")
+
         self.event_logged.emit(level, source, message)
 
     def transaction(self, source: str, message: str):
@@ -1,37 +1,207 @@
-from typing import Callable, Dict, List, Any
+"""
+Core event dispatch.
+
+`EventEmitter` replaces Qt signals in framework-agnostic code. Each event
+name maps to an `EventSlot` that holds its listeners as an immutable tuple
+(rebuilt on `on`/`off`, so emitting never takes a lock and listeners can
+be added or removed from any thread) plus its pre-bound metric children.
+Hot paths keep the slot from `emitter.slot(name)` and call `slot.emit`
+directly, skipping the name lookup.
+
+A listener may be registered with an `executor`, any `executor(fn, *args)`
+callable such as `ThreadPoolExecutor.submit`, to run it somewhere other
+than the emitting thread.
+
+`BatchChannel` moves high-rate events across threads: producers `post`
+items, the consumer side is woken once per batch and receives everything
+pending in a single `deliver(items)` call.
+"""
+import logging
+import threading
+import time
+from collections import deque
+from functools import partial
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from src.core import metrics
+
+logger = logging.getLogger(__name__)
+
+_dispatch_seconds = metrics.histogram(
+    'scadascout_event_dispatch_seconds', 'Time to run all listeners of one emitted event', ('event',))
+_listener_errors = metrics.counter(
+    'scadascout_event_listener_errors_total', 'Exceptions raised by event listeners', ('event',))
+
+_channel_pending = metrics.gauge(
+    'scadascout_channel_pending', 'Items waiting in a cross-thread batch channel', ('channel',))
+_channel_items = metrics.counter(
+    'scadascout_channel_items_total', 'Items delivered by a batch channel', ('channel',))
+_channel_batches = metrics.counter(
+    'scadascout_channel_batches_total', 'Batches delivered by a batch channel', ('channel',))
+_channel_coalesced = metrics.counter(
+    'scadascout_channel_coalesced_total', 'Items replaced by a newer item with the same key', ('channel',))
+_channel_dropped = metrics.counter(
+    'scadascout_channel_dropped_total', 'Items dropped because the channel was full', ('channel',))
+_channel_latency = metrics.histogram(
+    'scadascout_channel_latency_seconds', 'Age of the oldest item of a batch when delivered', ('channel',))
+
+
+class EventSlot:
+    """One named event: its listeners and metrics. Obtain via `EventEmitter.slot()`."""
+    __slots__ = ('name', 'listeners', '_entries', '_dispatch', '_errors')
+
+    def __init__(self, name: str):
+        self.name = name
+        # (callback, invoker) pairs; `listeners` is the invokers alone, for emit
+        self._entries: Tuple[Tuple[Callable, Callable], ...] = ()
+        self.listeners: Tuple[Callable, ...] = ()
+        self._dispatch = _dispatch_seconds.labels(name)
+        self._errors = _listener_errors.labels(name)
+
+    def _set_entries(self, entries):
+        self._entries = entries
+        self.listeners = tuple(invoker for _, invoker in entries)
+
+    def emit(self, *args, **kwargs):
+        """Call every listener with the given arguments."""
+        listeners = self.listeners
+        if not listeners:
+            return
+        start = time.perf_counter()
+        for invoke in listeners:
+            try:
+                invoke(*args, **kwargs)
+            except Exception:
+                # Prevent one listener from crashing the emitter
+                self._errors.inc()
+                logger.exception(f"Error in event listener for '{self.name}'")
+        self._dispatch.observe(time.perf_counter() - start)
+
 
 class EventEmitter:
     """
     Simple event emitter implementation to replace Qt Signals in core logic.
-    Thread-safe enough for our use case (callbacks run in the emitter's thread).
+    Listeners run in the emitting thread unless registered with an executor.
     """
     def __init__(self):
-        self._listeners: Dict[str, List[Callable]] = {}
+        self._slots: Dict[str, EventSlot] = {}
+        self._slots_lock = threading.Lock()
 
-    def on(self, event_name: str, callback: Callable):
-        """Register a callback for an event."""
-        if event_name not in self._listeners:
-            self._listeners[event_name] = []
-        self._listeners[event_name].append(callback)
+    def slot(self, event_name: str) -> EventSlot:
+        """The slot for `event_name`; stays valid across on/off/clear."""
+        slot = self._slots.get(event_name)
+        if slot is None:
+            with self._slots_lock:
+                slot = self._slots.get(event_name)
+                if slot is None:
+                    slot = self._slots[event_name] = EventSlot(event_name)
+        return slot
+
+    def on(self, event_name: str, callback: Callable, executor: Optional[Callable] = None):
+        """Register a callback for an event, optionally run through `executor(callback, *args)`."""
+        slot = self.slot(event_name)
+        invoker = callback if executor is None else partial(executor, callback)
+        with self._slots_lock:
+            slot._set_entries(slot._entries + ((callback, invoker),))
 
     def off(self, event_name: str, callback: Callable):
         """Unregister a callback."""
-        if event_name in self._listeners:
-            try:
-                self._listeners[event_name].remove(callback)
-            except ValueError:
-                pass
+        slot = self._slots.get(event_name)
+        if slot is None:
+            return
+        with self._slots_lock:
+            entries = list(slot._entries)
+            for i, (registered, _) in enumerate(entries):
+                if registered == callback:
+                    del entries[i]
+                    slot._set_entries(tuple(entries))
+                    break
 
     def emit(self, event_name: str, *args, **kwargs):
         """Emit an event, calling all registered listeners."""
-        if event_name in self._listeners:
-            for callback in self._listeners[event_name]:
-                try:
-                    callback(*args, **kwargs)
-                except Exception as e:
-                    # Prevent one listener from crashing the emitter
-                    print(f"Error in event listener for '{event_name}': {e}")
+        slot = self._slots.get(event_name)
+        if slot is not None:
+            slot.emit(*args, **kwargs)
 
     def clear(self):
         """Remove all listeners."""
-        self._listeners.clear()
+        with self._slots_lock:
+            for slot in self._slots.values():
+                slot._set_entries(())
+
+
+class BatchChannel:
+    """
+    Hands items posted from any thread to a consumer in batches.
+
+    `post(*item)` queues an item; the first post after a drain calls
+    `wakeup()`, which must arrange for `drain()` to run on the consumer side
+    (e.g. one queued call into the GUI thread). `drain()` passes everything
+    pending to `deliver(items)` in one call, items being the posted tuples.
+
+    With `key(*item)`, a pending item is replaced by a newer one with the
+    same key (latest wins, original position kept), which bounds the backlog
+    by the number of distinct keys. Without it, the oldest items beyond
+    `max_pending` are dropped. Both are counted in the channel metrics.
+    """
+
+    def __init__(self, name: str, deliver: Callable[[List[tuple]], Any], wakeup: Callable[[], Any],
+                 key: Optional[Callable[..., Hashable]] = None, max_pending: int = 100_000):
+        self.name = name
+        self._deliver = deliver
+        self._wakeup = wakeup
+        self._key = key
+        self.max_pending = max_pending
+        self._lock = threading.Lock()
+        self._pending = {} if key is not None else deque()
+        self._scheduled = False
+        self._oldest = 0.0
+        self._items = _channel_items.labels(name)
+        self._batches = _channel_batches.labels(name)
+        self._coalesced = _channel_coalesced.labels(name)
+        self._dropped = _channel_dropped.labels(name)
+        self._latency = _channel_latency.labels(name)
+        _channel_pending.labels(name).set_function(self.pending)
+
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def post(self, *item):
+        key = self._key
+        with self._lock:
+            pending = self._pending
+            if key is not None:
+                k = key(*item)
+                if k in pending:
+                    self._coalesced.inc()
+                pending[k] = item
+            else:
+                pending.append(item)
+                if len(pending) > self.max_pending:
+                    pending.popleft()
+                    self._dropped.inc()
+            if self._scheduled:
+                return
+            self._scheduled = True
+            self._oldest = time.perf_counter()
+        self._wakeup()
+
+    def drain(self) -> int:
+        """Deliver everything pending; returns the number of items."""
+        with self._lock:
+            pending = self._pending
+            self._pending = {} if self._key is not None else deque()
+            self._scheduled = False
+            oldest = self._oldest
+        if not pending:
+            return 0
+        items = list(pending.values()) if self._key is not None else list(pending)
+        self._latency.observe(time.perf_counter() - oldest)
+        self._items.inc(len(items))
+        self._batches.inc()
+        self._deliver(items)
+        return len(items)
+
+    def close(self):
+        """Stop exporting the pending gauge (the channel is going away)."""
+        _channel_pending.remove(self.name)
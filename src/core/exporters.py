@@ -708,7 +708,21 @@ def export_diagnostics_report(devices: List[Device], filepath: str) -> Tuple[boo
                     f.write(f"  Signals: {signal_count}\n")
                 
                 f.write("\n")
-            
+
+            # Last start-up profile (python src/main.py --profile-startup)
+            from src.utils import startup_profile
+            profile = startup_profile.last_report()
+            if profile:
+                f.write(profile)
+                f.write("\n")
+
+            # Last runtime profile (View -> Start Profiling or SCADASCOUT_PROFILE=1)
+            from src.core import profiler
+            runtime_profile = profiler.last_report()
+            if runtime_profile:
+                f.write(runtime_profile)
+                f.write("\n")
+
             f.write("=" * 80 + "\n")
             f.write("END OF REPORT\n")
             f.write("=" * 80 + "\n")
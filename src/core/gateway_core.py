@@ -0,0 +1,491 @@
+"""
+Protocol gateway logic without a GUI event loop.
+
+`GatewayCore` holds the mapping table, batching and register encoding.
+`ProtocolGateway` (protocol_gateway.py) is the Qt flavour used by the
+application; the headless runner uses this class directly.
+"""
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+from dataclasses import dataclass
+import numpy as np
+
+from src.core.events import EventEmitter
+from src.models.device_models import ModbusDataType, ModbusEndianness
+from src.protocols.modbus.register_mapping import encode_mapped_value, encode_mapped_values
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class GatewayMapping:
+    """Maps a source signal to destination register"""
+    source_device: str
+    source_signal_address: str
+    dest_register_type: str  # "holding", "input", "coils", "discrete"
+    dest_address: int
+    scale: float = 1.0
+    offset: float = 0.0
+    enabled: bool = True
+    # None keeps the legacy single-register behaviour (int, two's complement)
+    data_type: Optional[ModbusDataType] = None
+    endianness: ModbusEndianness = ModbusEndianness.BIG_ENDIAN
+    # Minimum change (after scale/offset) before the value is written again
+    deadband: float = 0.0
+
+
+class GatewayCore(EventEmitter):
+    """
+    Bridges protocols by listening to device updates and writing to Modbus slave.
+    Event-driven architecture: listens to the device manager's `signal_updated`.
+
+    By default updates are batched: the latest value per mapping is kept until
+    the next tick, then all changed values are encoded per data type in one
+    numpy pass, sorted by destination address and written as contiguous runs
+    with the slave's bulk writers. An update interval of 0 writes immediately.
+
+    Events: 'mapping_updated' (mapping_id, immediate mode only),
+    'batch_written' (count) and 'error_occurred' (message).
+    """
+
+    DEFAULT_BATCH_INTERVAL_MS = 50
+
+    def __init__(self, device_manager, modbus_slave_server, event_logger=None,
+                 batch_interval_ms: int = DEFAULT_BATCH_INTERVAL_MS):
+        EventEmitter.__init__(self)
+        self.device_manager = device_manager
+        self.modbus_slave = modbus_slave_server
+        self.event_logger = event_logger
+        
+        self.mappings: Dict[str, GatewayMapping] = {}
+        self.enabled = False
+        
+        # Cache for fast lookup: (source_device, source_signal) -> list[mapping_id]
+        self._lookup_cache: Dict[Tuple[str, str], List[str]] = {}
+
+        # Batching state: latest raw value per mapping and last value written
+        self.batch_interval_ms = max(0, int(batch_interval_ms))
+        self._pending: Dict[str, Any] = {}
+        self._pending_lock = threading.Lock()
+        self._last_sent: Dict[str, float] = {}
+        self._timer: Optional[threading.Timer] = None
+
+        self.stats = {
+            'flushes': 0,
+            'values_written': 0,
+            'runs_written': 0,
+            'suppressed': 0,
+        }
+
+    # ---- Hooks (overridden by the Qt ProtocolGateway) ----
+
+    def _notify(self, event: str, *args):
+        self.emit(event, *args)
+
+    def _connect_source(self):
+        self.device_manager.on('signal_updated', self._on_signal_updated)
+
+    def _disconnect_source(self):
+        self.device_manager.off('signal_updated', self._on_signal_updated)
+
+    def _flush_timer_active(self) -> bool:
+        return self._timer is not None
+
+    def _start_flush_timer(self):
+        self._timer = threading.Timer(self.batch_interval_ms / 1000.0, self._on_flush_timer)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _stop_flush_timer(self):
+        timer, self._timer = self._timer, None
+        if timer is not None:
+            timer.cancel()
+
+    def _on_flush_timer(self):
+        self._timer = None
+        try:
+            self.flush()
+        except Exception as e:
+            logger.debug(f"Gateway flush error: {e}")
+
+    # ---- Mappings ----
+
+    def add_mapping(self, mapping: GatewayMapping) -> str:
+        """Add a new gateway mapping"""
+        mapping_id = f"{mapping.source_device}::{mapping.source_signal_address}->MB:{mapping.dest_address}"
+        self.mappings[mapping_id] = mapping
+        
+        # Update cache
+        key = (mapping.source_device, mapping.source_signal_address)
+        if key not in self._lookup_cache:
+            self._lookup_cache[key] = []
+        self._lookup_cache[key].append(mapping_id)
+        
+        if self.event_logger:
+            self.event_logger.info("Gateway", f"Added mapping: {mapping_id}")
+        
+        return mapping_id
+    
+    def remove_mapping(self, mapping_id: str):
+        """Remove a gateway mapping"""
+        if mapping_id in self.mappings:
+            mapping = self.mappings[mapping_id]
+            
+            # Remove from cache
+            key = (mapping.source_device, mapping.source_signal_address)
+            if key in self._lookup_cache:
+                if mapping_id in self._lookup_cache[key]:
+                    self._lookup_cache[key].remove(mapping_id)
+                if not self._lookup_cache[key]:
+                    del self._lookup_cache[key]
+
+            del self.mappings[mapping_id]
+            with self._pending_lock:
+                self._pending.pop(mapping_id, None)
+            self._last_sent.pop(mapping_id, None)
+            
+            if self.event_logger:
+                self.event_logger.info("Gateway", f"Removed mapping: {mapping_id}")
+    
+    def start(self):
+        """Start gateway operation"""
+        if not self.modbus_slave or not self.modbus_slave.running:
+            logger.error("Cannot start gateway: Modbus slave not running")
+            self._notify('error_occurred', "Modbus slave server must be running")
+            return False
+        
+        if not self.enabled:
+            self._connect_source()
+            self.enabled = True
+            
+            if self.event_logger:
+                self.event_logger.info("Gateway", f"Started with {len(self.mappings)} mappings")
+        
+        return True
+    
+    def stop(self):
+        """Stop gateway operation"""
+        if self.enabled:
+            try:
+                self._disconnect_source()
+            except Exception:
+                pass
+            self._stop_flush_timer()
+            self.enabled = False
+            self.flush()
+        # Resend everything on the next start
+        self._last_sent.clear()
+        
+        if self.event_logger:
+            self.event_logger.info("Gateway", "Stopped")
+            
+    def _on_signal_updated(self, device_name: str, signal):
+        """Handle signal update events from the device manager"""
+        if not self.enabled:
+            return
+            
+        key = (device_name, signal.address)
+        ids = self._lookup_cache.get(key)
+        
+        if ids:
+            if self.batch_interval_ms > 0:
+                # Coalesce: only the latest value per mapping is written on the next tick
+                with self._pending_lock:
+                    for mapping_id in ids:
+                        self._pending[mapping_id] = signal.value
+                    if not self._flush_timer_active():
+                        self._start_flush_timer()
+                return
+
+            for mapping_id in ids:
+                mapping = self.mappings.get(mapping_id)
+                if mapping and mapping.enabled:
+                    self._process_mapping(mapping_id, mapping, signal.value)
+
+    @staticmethod
+    def _to_number(value) -> Optional[float]:
+        """Convert a signal value to float, or None if it is not numeric"""
+        if value is None:
+            return None
+        if isinstance(value, bool):
+            return 1.0 if value else 0.0
+        try:
+            return float(value)
+        except (ValueError, TypeError):
+            return None
+
+    def _transform(self, mapping_id: str, mapping: GatewayMapping, value) -> Optional[float]:
+        """
+        Apply scale/offset and the deadband; returns None if nothing should be
+        written. The caller records the value in `_last_sent` once it has been
+        written, so a failed write is retried on the next update.
+        """
+        number = self._to_number(value)
+        if number is None:
+            return None
+        number = (number * mapping.scale) + mapping.offset
+        last = self._last_sent.get(mapping_id)
+        if last is not None and abs(number - last) <= mapping.deadband:
+            self.stats['suppressed'] += 1
+            return None
+        return number
+
+    @staticmethod
+    def _encode_registers(values: List[float], data_type: Optional[ModbusDataType],
+                          endianness: ModbusEndianness):
+        """Encode already-transformed values into register words, one row per value"""
+        if data_type is None:
+            # Legacy behaviour: truncate to int, negative values as two's complement
+            words = np.clip(np.trunc(np.asarray(values, dtype=np.float64)), -32768, 65535).astype(np.int64) & 0xFFFF
+            return words.reshape(-1, 1)
+        words = encode_mapped_values(values, data_type, endianness)
+        if words is not None:
+            return words
+        # STRING / BCD have no fixed numeric layout; use the scalar encoder
+        return [encode_mapped_value(v, data_type, endianness) for v in values]
+
+    def _process_mapping(self, mapping_id: str, mapping: GatewayMapping, value):
+        """Process a single mapping update"""
+        try:
+            transformed_value = self._transform(mapping_id, mapping, value)
+            if transformed_value is None:
+                return
+
+            # Write to Modbus slave
+            ok = None
+            if mapping.dest_register_type in ("holding", "input"):
+                registers = [int(w) for w in self._encode_registers(
+                    [transformed_value], mapping.data_type, mapping.endianness)[0]]
+                if mapping.dest_register_type == "holding":
+                    ok = self.modbus_slave.bulk_write_registers(mapping.dest_address, registers)
+                else:
+                    ok = self.modbus_slave.bulk_write_input_registers(mapping.dest_address, registers)
+            elif mapping.dest_register_type == "coils":
+                ok = self.modbus_slave.write_coil(mapping.dest_address, bool(int(transformed_value)))
+            elif mapping.dest_register_type == "discrete":
+                ok = self.modbus_slave.write_discrete_input(mapping.dest_address, bool(int(transformed_value)))
+            if ok is False:
+                logger.debug(f"Gateway write failed ({mapping_id})")
+                return
+
+            self._last_sent[mapping_id] = transformed_value
+            self._notify('mapping_updated', mapping_id)
+            
+        except Exception as e:
+            logger.debug(f"Gateway mapping error ({mapping_id}): {e}")
+
+    def flush(self) -> int:
+        """
+        Write all pending values to the Modbus slave.
+
+        Values are grouped by (register type, data type, endianness) and
+        encoded per group, then each register table is sorted by address and
+        written as contiguous runs. Mappings in a run the slave rejects are
+        queued again for the next flush (unless a newer value is already
+        pending). Returns the number of mappings written.
+        """
+        with self._pending_lock:
+            if not self._pending:
+                return 0
+            pending = self._pending
+            self._pending = {}
+
+        # (register_type, data_type, endianness) -> ([dest_address], [value], [mapping index])
+        groups: Dict[tuple, Tuple[List[int], List[float], List[int]]] = {}
+        sent: List[Tuple[str, float]] = []
+        for mapping_id, raw in pending.items():
+            mapping = self.mappings.get(mapping_id)
+            if mapping is None or not mapping.enabled:
+                continue
+            value = self._transform(mapping_id, mapping, raw)
+            if value is None:
+                continue
+            if mapping.dest_register_type in ("coils", "discrete"):
+                key = (mapping.dest_register_type, None, None)
+            else:
+                key = (mapping.dest_register_type, mapping.data_type, mapping.endianness)
+            group = groups.get(key)
+            if group is None:
+                group = groups[key] = ([], [], [])
+            group[0].append(mapping.dest_address)
+            group[1].append(value)
+            group[2].append(len(sent))
+            sent.append((mapping_id, value))
+
+        # register_type -> [(addresses, words, mapping index per word)] as flat arrays
+        tables: Dict[str, List[Tuple[np.ndarray, np.ndarray, np.ndarray]]] = {}
+        for (reg_type, data_type, endianness), (addresses, values, owners) in groups.items():
+            try:
+                if reg_type in ("coils", "discrete"):
+                    words = (np.asarray(values) != 0).astype(np.int64).reshape(-1, 1)
+                else:
+                    words = self._encode_registers(values, data_type, endianness)
+                    if not isinstance(words, np.ndarray):
+                        # Variable-width rows (strings): flatten row by row
+                        flat_addr = [a + i for a, row in zip(addresses, words) for i in range(len(row))]
+                        flat_words = [w for row in words for w in row]
+                        flat_owner = [o for o, row in zip(owners, words) for _ in row]
+                        tables.setdefault(reg_type, []).append(
+                            (np.asarray(flat_addr, dtype=np.int64), np.asarray(flat_words, dtype=np.int64),
+                             np.asarray(flat_owner, dtype=np.int64)))
+                        continue
+                width = words.shape[1]
+                addr = (np.asarray(addresses, dtype=np.int64)[:, None] + np.arange(width)).ravel()
+                tables.setdefault(reg_type, []).append(
+                    (addr, np.asarray(words, dtype=np.int64).ravel(), np.repeat(np.asarray(owners), width)))
+            except Exception as e:
+                logger.debug(f"Gateway encode error ({reg_type}, {data_type}): {e}")
+
+        writers = {
+            "holding": self.modbus_slave.bulk_write_registers,
+            "input": self.modbus_slave.bulk_write_input_registers,
+            "coils": self.modbus_slave.bulk_write_coils,
+            "discrete": self.modbus_slave.bulk_write_discrete_inputs,
+        }
+        written = 0
+        failed = set()
+        for reg_type, parts in tables.items():
+            writer = writers.get(reg_type)
+            if writer is None:
+                continue
+            addrs = np.concatenate([p[0] for p in parts])
+            words = np.concatenate([p[1] for p in parts])
+            owner = np.concatenate([p[2] for p in parts])
+            order = np.argsort(addrs, kind="stable")
+            addrs = addrs[order]
+            words = words[order]
+            owner = owner[order]
+            # Overlapping destinations: the mapping queued last wins
+            keep = np.append(addrs[1:] != addrs[:-1], True)
+            addrs = addrs[keep]
+            words = words[keep]
+            owner = owner[keep]
+            breaks = np.flatnonzero(np.diff(addrs) != 1) + 1
+            starts = np.concatenate(([0], breaks))
+            ends = np.concatenate((breaks, [len(addrs)]))
+            for s, e in zip(starts.tolist(), ends.tolist()):
+                if writer(int(addrs[s]), words[s:e].tolist()) is False:
+                    failed.update(owner[s:e].tolist())
+            self.stats['runs_written'] += len(starts)
+            written_ids = set(owner.tolist())
+            for index in written_ids - failed:
+                mapping_id, value = sent[index]
+                self._last_sent[mapping_id] = value
+            written += len(written_ids - failed)
+
+        if failed:
+            logger.debug(f"Gateway write failed for {len(failed)} mappings; retrying on the next flush")
+            with self._pending_lock:
+                for index in failed:
+                    mapping_id = sent[index][0]
+                    self._pending.setdefault(mapping_id, pending[mapping_id])
+                if self.enabled and self.batch_interval_ms > 0 and not self._flush_timer_active():
+                    self._start_flush_timer()
+
+        self.stats['flushes'] += 1
+        self.stats['values_written'] += written
+        if written:
+            self._notify('batch_written', written)
+        return written
+
+    def set_update_interval(self, interval_ms: int):
+        """Set the batching interval; 0 writes every update immediately"""
+        self.batch_interval_ms = max(0, int(interval_ms))
+        if self.batch_interval_ms == 0:
+            self._stop_flush_timer()
+            self.flush()
+    
+    def _find_signal(self, device, address: str):
+        """Legacy helper"""
+        pass
+
+    def get_mapping_status(self, mapping_id: str) -> Dict:
+        """Get status of a specific mapping"""
+        if mapping_id not in self.mappings:
+            return {}
+        
+        mapping = self.mappings[mapping_id]
+        
+        status = {
+            'mapping_id': mapping_id,
+            'enabled': mapping.enabled,
+            'source_device': mapping.source_device,
+            'source_address': mapping.source_signal_address,
+            'dest_address': mapping.dest_address,
+            'dest_type': mapping.dest_register_type,
+            'last_value': None,
+            'last_update': None
+        }
+        
+        # Try to get current value from Modbus slave
+        try:
+            if mapping.dest_register_type == "holding":
+                status['last_value'] = self.modbus_slave.read_register(mapping.dest_address)
+            elif mapping.dest_register_type == "coils":
+                status['last_value'] = self.modbus_slave.read_coil(mapping.dest_address)
+        except Exception as e:
+            logger.debug(f"Error reading status for mapping {mapping.source_signal_address}: {e}")
+        
+        return status
+    
+    def export_mappings(self, filepath: str):
+        """Export mappings to CSV"""
+        import csv
+        
+        try:
+            with open(filepath, 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow([
+                    'source_device', 'source_signal', 'dest_register_type',
+                    'dest_address', 'scale', 'offset', 'enabled',
+                    'data_type', 'endianness', 'deadband'
+                ])
+                
+                for mapping in self.mappings.values():
+                    writer.writerow([
+                        mapping.source_device,
+                        mapping.source_signal_address,
+                        mapping.dest_register_type,
+                        mapping.dest_address,
+                        mapping.scale,
+                        mapping.offset,
+                        mapping.enabled,
+                        mapping.data_type.name if mapping.data_type else '',
+                        mapping.endianness.name,
+                        mapping.deadband
+                    ])
+            
+            return True
+        except Exception as e:
+            logger.error(f"Export error: {e}")
+            return False
+    
+    def import_mappings(self, filepath: str) -> int:
+        """Import mappings from CSV"""
+        import csv
+        
+        try:
+            count = 0
+            with open(filepath, 'r') as f:
+                reader = csv.DictReader(f)
+                for row in reader:
+                    mapping = GatewayMapping(
+                        source_device=row['source_device'],
+                        source_signal_address=row['source_signal'],
+                        dest_register_type=row['dest_register_type'],
+                        dest_address=int(row['dest_address']),
+                        scale=float(row.get('scale', 1.0)),
+                        offset=float(row.get('offset', 0.0)),
+                        enabled=row.get('enabled', 'True').lower() == 'true',
+                        data_type=ModbusDataType[row['data_type']] if row.get('data_type') else None,
+                        endianness=ModbusEndianness[row.get('endianness') or 'BIG_ENDIAN'],
+                        deadband=float(row.get('deadband') or 0.0)
+                    )
+                    self.add_mapping(mapping)
+                    count += 1
+            
+            return count
+        except Exception as e:
+            logger.error(f"Import error: {e}")
+            return 0
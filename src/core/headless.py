@@ -0,0 +1,680 @@
+"""
+Headless service mode.
+
+Runs a project (devices.json or a .mss bundle) without the GUI: devices are
+connected, the project's watch list is polled, selected user scripts and an
+optional Modbus gateway run, and a local HTTP API serves reads, writes and a
+Server-Sent Events stream of signal updates.
+
+    python src/main.py --headless project.mss --api-port 8765 --script Totals
+
+API (JSON, bound to 127.0.0.1 by default):
+    GET  /api/devices                      configured devices and link state
+    GET  /api/tags[?device=D]              unique addresses
+    GET  /api/values?tag=T[&tag=...]       last known values
+    POST /api/read   {"tags": [...], "timeout": 1.0}
+    POST /api/write  {"values": {"Dev::Addr": value, ...}}
+    GET  /api/stream[?tag=T][&device=D]    text/event-stream of updates
+    GET  /api/stats                        polling, script and API counters
+    GET  /metrics                          runtime metrics, Prometheus text format
+
+With a token configured every request must carry `Authorization: Bearer
+<token>` (or `?token=` for EventSource clients that cannot set headers).
+The service generates and prints a random token unless one is given.
+Requests from a browser page of another origin (a foreign `Origin`, or a
+non-loopback `Host` on a loopback-bound server) are refused, and POST bodies
+must be sent as `application/json`, so web pages the operator opens cannot
+reach the write API through simple CORS requests or DNS rebinding.
+"""
+import argparse
+import json
+import logging
+import os
+import queue
+import secrets
+import signal as _signal
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+from src.core import metrics, profiler
+from src.core.device_manager_core import DeviceManagerCore
+from src.core.poll_planner import PollPlanner
+from src.core.project_bundle import extract_project
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_API_PORT = 8765
+LOOPBACK_HOSTS = ('127.0.0.1', 'localhost', '::1')
+
+
+def signal_to_dict(device_name: str, signal) -> dict:
+    """JSON-friendly view of a Signal."""
+    quality = getattr(signal, 'quality', None)
+    timestamp = getattr(signal, 'timestamp', None)
+    return {
+        'tag': getattr(signal, 'unique_address', '') or f"{device_name}::{signal.address}",
+        'device': device_name,
+        'address': signal.address,
+        'value': getattr(signal, 'value', None),
+        'quality': getattr(quality, 'value', quality),
+        'timestamp': timestamp.isoformat() if hasattr(timestamp, 'isoformat') else timestamp,
+    }
+
+
+def _dumps(data) -> bytes:
+    return json.dumps(data, default=str).encode('utf-8')
+
+
+# ---------------------------------------------------------------------------
+# Watch list polling
+# ---------------------------------------------------------------------------
+
+@dataclass
+class _Watched:
+    device_name: str
+    address: str
+    watch_id: str
+    signal: object = None
+
+
+class WatchPoller:
+    """
+    Polls watched signals the way `WatchListManager` does (one batched read
+    per device per cycle, skipping reads still outstanding), driven by a
+    `ScriptScheduler` job instead of a QTimer.
+
+    Signals are looked up by address on every cycle until found, so entries
+    for devices whose model is still being discovered start polling as soon
+    as it arrives.
+    """
+    JOB = ('headless', 'watch_poll')
+
+    def __init__(self, device_manager, scheduler, interval_ms: int = 1000):
+        self._dm = device_manager
+        self._scheduler = scheduler
+        self._lock = threading.Lock()
+        self._watched: Dict[str, _Watched] = {}
+        self.interval_ms = max(100, int(interval_ms))
+        self._planner = PollPlanner(timeout_s=max(10.0, 5 * self.interval_ms / 1000.0))
+        self._running = False
+
+    def add(self, device_name: str, address: str):
+        watch_id = f"{device_name}::{address}"
+        with self._lock:
+            self._watched.setdefault(watch_id, _Watched(device_name, address, watch_id))
+
+    def load_file(self, path: str) -> int:
+        """Add the signals of a saved watch list (WatchListManager.save_to_file format)."""
+        with open(path, 'r') as f:
+            data = json.load(f)
+        if data.get('poll_interval_ms'):
+            self.set_interval(data['poll_interval_ms'])
+        entries = data.get('signals', [])
+        for entry in entries:
+            self.add(entry['device_name'], entry['signal_address'])
+        return len(entries)
+
+    def set_interval(self, interval_ms: int):
+        """Set the poll interval (before `start`); the read timeout follows it."""
+        self.interval_ms = max(100, int(interval_ms))
+        self._planner.timeout_s = max(10.0, 5 * self.interval_ms / 1000.0)
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._dm.on('signal_updated', self._on_signal_updated)
+        self._dm.on('signal_unchanged', self._on_signal_updated)
+        self._scheduler.add(self.JOB, self.poll_once, self.interval_ms / 1000.0)
+
+    def stop(self):
+        if not self._running:
+            return
+        self._running = False
+        self._scheduler.remove(self.JOB)
+        self._dm.off('signal_updated', self._on_signal_updated)
+        self._dm.off('signal_unchanged', self._on_signal_updated)
+
+    def poll_once(self):
+        now = time.time()
+        with self._lock:
+            for watched in self._watched.values():
+                if watched.signal is None:
+                    watched.signal = self._dm.get_signal_by_unique_address(watched.watch_id)
+            ready = [w for w in self._watched.values() if w.signal is not None]
+            batches = self._planner.plan(ready, now)
+            for device_name, batch in batches.items():
+                self._planner.mark_sent(device_name, [w.watch_id for w in batch], now)
+
+        for device_name, batch in batches.items():
+            try:
+                results = self._dm.read_signals(device_name, [w.signal for w in batch])
+                if results is not None:
+                    # Answered synchronously (e.g. device disconnected)
+                    with self._lock:
+                        for watched in batch:
+                            self._planner.complete(watched.watch_id)
+            except Exception as e:
+                logger.debug(f"Failed to poll {device_name}: {e}")
+                with self._lock:
+                    for watched in batch:
+                        self._planner.forget(watched.watch_id)
+
+    def _on_signal_updated(self, device_name: str, signal):
+        watch_id = f"{device_name}::{signal.address}"
+        if watch_id in self._watched:
+            with self._lock:
+                self._planner.complete(watch_id)
+
+    def stats(self) -> Dict[str, dict]:
+        with self._lock:
+            return self._planner.stats()
+
+
+# ---------------------------------------------------------------------------
+# Local API
+# ---------------------------------------------------------------------------
+
+class _Subscriber:
+    """One streaming client: a bounded queue of pending updates."""
+    __slots__ = ('queue', 'tags', 'devices', 'dropped')
+
+    def __init__(self, tags, devices, maxsize: int):
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.tags = set(tags) or None
+        self.devices = set(devices) or None
+        self.dropped = 0
+
+    def wants(self, device_name: str, item: dict) -> bool:
+        if self.devices is None and self.tags is None:
+            return True
+        return ((self.devices is not None and device_name in self.devices) or
+                (self.tags is not None and item['tag'] in self.tags))
+
+
+class LocalApiServer:
+    """
+    Small HTTP API over a DeviceManagerCore, for local clients only.
+
+    Runs on a `ThreadingHTTPServer`; reads, writes and value lookups go
+    through a `ScriptContext`, so they are batched per device exactly like
+    script bulk access. Streaming clients get their own bounded queue; when
+    a client falls behind its oldest updates are dropped (and counted)
+    rather than blocking the protocol threads.
+    """
+    STREAM_KEEPALIVE_S = 15.0
+
+    def __init__(self, device_manager, host: str = '127.0.0.1', port: int = DEFAULT_API_PORT,
+                 token: Optional[str] = None, stats_provider: Optional[Callable[[], dict]] = None,
+                 stream_queue_size: int = 1000):
+        from src.core.script_runtime import ScriptContext
+        self._dm = device_manager
+        self._ctx = ScriptContext(device_manager)
+        self.host = host
+        self._port = port
+        self._token = token
+        self._stats_provider = stats_provider
+        self._stream_queue_size = stream_queue_size
+        self._subscribers: List[_Subscriber] = []
+        self._sub_lock = threading.Lock()
+        self._httpd: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self.requests = 0
+
+    @property
+    def port(self) -> int:
+        """Bound port (useful when started with port 0)."""
+        return self._httpd.server_address[1] if self._httpd else self._port
+
+    def start(self):
+        if self._httpd is not None:
+            return
+        self._stopping.clear()
+        self._httpd = ThreadingHTTPServer((self.host, self._port), _make_handler(self))
+        self._httpd.daemon_threads = True
+        self._dm.on('signal_updated', self._fan_out)
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="LocalApiServer", daemon=True)
+        self._thread.start()
+        logger.info(f"Local API listening on http://{self.host}:{self.port}/api")
+
+    def stop(self):
+        if self._httpd is None:
+            return
+        self._stopping.set()
+        self._dm.off('signal_updated', self._fan_out)
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        self._httpd = None
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+
+    # ---- Streaming ----
+
+    def subscribe(self, tags: Iterable[str] = (), devices: Iterable[str] = ()) -> _Subscriber:
+        sub = _Subscriber(tags, devices, self._stream_queue_size)
+        with self._sub_lock:
+            self._subscribers = self._subscribers + [sub]
+        return sub
+
+    def unsubscribe(self, sub: _Subscriber):
+        with self._sub_lock:
+            self._subscribers = [s for s in self._subscribers if s is not sub]
+
+    def _fan_out(self, device_name: str, signal):
+        subscribers = self._subscribers
+        if not subscribers:
+            return
+        item = signal_to_dict(device_name, signal)
+        for sub in subscribers:
+            if not sub.wants(device_name, item):
+                continue
+            try:
+                sub.queue.put_nowait(item)
+            except queue.Full:
+                sub.dropped += 1
+                try:
+                    sub.queue.get_nowait()
+                    sub.queue.put_nowait(item)
+                except (queue.Empty, queue.Full):
+                    pass
+
+    # ---- Endpoints ----
+
+    def trusted_origin(self, headers) -> bool:
+        """
+        False for requests a browser sends on behalf of another site: an
+        `Origin` that differs from the `Host` it was sent to, or (when bound
+        to loopback) a `Host` that is not loopback, as after DNS rebinding.
+        """
+        host = headers.get('Host', '')
+        if self.host in LOOPBACK_HOSTS and urlparse(f"//{host}").hostname not in LOOPBACK_HOSTS:
+            return False
+        origin = headers.get('Origin')
+        if origin is None:
+            return True
+        return urlparse(origin).netloc.lower() == host.lower()
+
+    def authorized(self, headers, query) -> bool:
+        if not self._token:
+            return True
+        if headers.get('Authorization', '') == f"Bearer {self._token}":
+            return True
+        return query.get('token', [None])[0] == self._token
+
+    def devices(self) -> list:
+        return [{
+            'name': d.config.name,
+            'type': d.config.device_type.value,
+            'address': f"{d.config.ip_address}:{d.config.port}",
+            'connected': bool(d.connected),
+        } for d in self._dm.get_all_devices()]
+
+    def tags(self, device_name: Optional[str] = None) -> list:
+        return list(self._dm.list_unique_addresses(device_name))
+
+    def values(self, tags: List[str]) -> dict:
+        return self._ctx.get_many(tags)
+
+    def read(self, tags: List[str], timeout: float) -> dict:
+        return self._ctx.read_many(tags, timeout=min(max(0.0, timeout), 30.0))
+
+    def write(self, values: Dict[str, object]) -> dict:
+        return self._ctx.set_many(values)
+
+    def stats(self) -> dict:
+        with self._sub_lock:
+            streams = [{'queued': s.queue.qsize(), 'dropped': s.dropped} for s in self._subscribers]
+        data = {'api': {'requests': self.requests, 'streams': streams}}
+        if self._stats_provider is not None:
+            data.update(self._stats_provider())
+        return data
+
+
+def _make_handler(api: LocalApiServer):
+
+    class Handler(BaseHTTPRequestHandler):
+        server_version = "ScadaScout"
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, fmt, *args):
+            logger.debug("api: " + fmt % args)
+
+        def _send(self, status: int, data):
+            body = _dumps(data)
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _send_text(self, text: str, content_type: str):
+            body = text.encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _body(self) -> dict:
+            length = int(self.headers.get('Content-Length') or 0)
+            return json.loads(self.rfile.read(length) or b'{}') if length else {}
+
+        def _is_json(self) -> bool:
+            content_type = self.headers.get('Content-Type', '')
+            return content_type.split(';', 1)[0].strip().lower() == 'application/json'
+
+        def _route(self, method: str):
+            api.requests += 1
+            url = urlparse(self.path)
+            query = parse_qs(url.query)
+            if not api.trusted_origin(self.headers):
+                self.close_connection = True
+                return self._send(403, {'error': 'cross-origin requests are not allowed'})
+            if not api.authorized(self.headers, query):
+                return self._send(401, {'error': 'unauthorized'})
+            if method == 'POST' and not self._is_json():
+                self.close_connection = True
+                return self._send(415, {'error': 'POST bodies must be application/json'})
+            try:
+                if method == 'GET' and url.path == '/api/devices':
+                    return self._send(200, api.devices())
+                if method == 'GET' and url.path == '/api/tags':
+                    return self._send(200, api.tags(query.get('device', [None])[0]))
+                if method == 'GET' and url.path == '/api/values':
+                    return self._send(200, api.values(query.get('tag', [])))
+                if method == 'GET' and url.path == '/api/stats':
+                    return self._send(200, api.stats())
+                if method == 'GET' and url.path == '/metrics':
+                    return self._send_text(metrics.render_text(), metrics.CONTENT_TYPE)
+                if method == 'GET' and url.path == '/api/stream':
+                    return self._stream(query.get('tag', []), query.get('device', []))
+                if method == 'POST' and url.path == '/api/read':
+                    body = self._body()
+                    return self._send(200, api.read(list(body.get('tags', [])), float(body.get('timeout', 0.0))))
+                if method == 'POST' and url.path == '/api/write':
+                    values = self._body().get('values')
+                    if not isinstance(values, dict):
+                        return self._send(400, {'error': "expected {'values': {tag: value}}"})
+                    return self._send(200, api.write(values))
+                return self._send(404, {'error': f'no route for {method} {url.path}'})
+            except (ValueError, TypeError) as e:
+                return self._send(400, {'error': str(e)})
+            except Exception as e:
+                logger.exception(f"API error on {method} {url.path}")
+                return self._send(500, {'error': str(e)})
+
+        def _stream(self, tags, devices):
+            sub = api.subscribe(tags, devices)
+            try:
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/event-stream')
+                self.send_header('Cache-Control', 'no-cache')
+                self.send_header('Connection', 'close')
+                self.end_headers()
+                self.close_connection = True
+                self.wfile.write(b": connected\n\n")
+                self.wfile.flush()
+                while not api._stopping.is_set():
+                    try:
+                        item = sub.queue.get(timeout=api.STREAM_KEEPALIVE_S)
+                    except queue.Empty:
+                        self.wfile.write(b": keepalive\n\n")
+                        self.wfile.flush()
+                        continue
+                    # Send whatever else is already queued in the same write
+                    items = [item]
+                    while len(items) < 256:
+                        try:
+                            items.append(sub.queue.get_nowait())
+                        except queue.Empty:
+                            break
+                    self.wfile.write(b"".join(b"data: " + _dumps(i) + b"\n\n" for i in items))
+                    self.wfile.flush()
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+            finally:
+                api.unsubscribe(sub)
+
+        def do_GET(self):
+            self._route('GET')
+
+        def do_POST(self):
+            self._route('POST')
+
+    return Handler
+
+
+# ---------------------------------------------------------------------------
+# Service
+# ---------------------------------------------------------------------------
+
+class HeadlessService:
+    """
+    Runs a project as a long-lived data collector.
+
+    `project_path` is a devices.json or a .mss bundle; .mss bundles are
+    unpacked under ~/.scada_scout/projects/headless. User scripts, token
+    choices and the device configuration are kept in `state_dir` (the
+    folder of the devices.json, or the current directory for bundles),
+    like the GUI does.
+
+    `api_token=None` generates a random API token, printed at start-up;
+    pass an empty string to run the API without one.
+    """
+
+    def __init__(self, project_path: str, state_dir: Optional[str] = None,
+                 api_host: str = '127.0.0.1', api_port: Optional[int] = DEFAULT_API_PORT,
+                 api_token: Optional[str] = None, connect: bool = True,
+                 scripts: Iterable[str] = (), watchlist_path: Optional[str] = None,
+                 poll_interval_ms: Optional[int] = None,
+                 gateway_mappings: Optional[str] = None, gateway_device: Optional[str] = None):
+        self.project_path = project_path
+        self.state_dir = state_dir
+        self.api_host = api_host
+        self.api_port = api_port
+        self.api_token = api_token
+        self.connect = connect
+        self.scripts = list(scripts)
+        self.watchlist_path = watchlist_path
+        self.poll_interval_ms = poll_interval_ms
+        self.gateway_mappings = gateway_mappings
+        self.gateway_device = gateway_device
+
+        self.device_manager: Optional[DeviceManagerCore] = None
+        self.poller: Optional[WatchPoller] = None
+        self.api: Optional[LocalApiServer] = None
+        self.gateway = None
+        self.historian = None
+        self._stop_event = threading.Event()
+
+    def start(self):
+        t0 = time.perf_counter()
+        profiler.start_from_env()
+        is_bundle = self.project_path.lower().endswith('.mss')
+        if is_bundle:
+            bundle = extract_project(self.project_path, os.path.expanduser("~/.scada_scout/projects/headless"))
+            state_dir = self.state_dir or os.getcwd()
+            devices_path = bundle['devices']
+            watchlist = self.watchlist_path or bundle['watchlist']
+        else:
+            state_dir = self.state_dir or os.path.dirname(os.path.abspath(self.project_path))
+            devices_path = self.project_path
+            watchlist = self.watchlist_path
+
+        dm = DeviceManagerCore(config_path=os.path.join(state_dir, 'devices.json') if is_bundle else devices_path)
+        self.device_manager = dm
+        self._attach_historian()
+        if devices_path:
+            dm.load_configuration(devices_path)
+
+        if self.gateway_mappings and self.gateway_device:
+            dm.on('device_status_changed', self._on_device_status_changed)
+        if self.connect:
+            for device in dm.get_all_devices():
+                dm.connect_device(device.config.name)
+
+        self.poller = WatchPoller(dm, dm._script_scheduler)
+        if watchlist and os.path.exists(watchlist):
+            count = self.poller.load_file(watchlist)
+            logger.info(f"Watching {count} signals from {watchlist}")
+        if self.poll_interval_ms:
+            self.poller.set_interval(self.poll_interval_ms)
+        self.poller.start()
+
+        saved = dm.get_saved_scripts()
+        for name in self.scripts:
+            meta = saved.get(name)
+            if meta is None:
+                logger.error(f"No saved user script named '{name}'")
+                continue
+            dm.start_user_script(name, meta.get('code', ''), meta.get('interval', 0.5))
+
+        if self.api_port is not None:
+            if self.api_token is None:
+                self.api_token = secrets.token_urlsafe(24)
+                print(f"Local API token: {self.api_token}", flush=True)
+            self.api = LocalApiServer(dm, self.api_host, self.api_port, self.api_token or None,
+                                      stats_provider=self.stats)
+            self.api.start()
+
+        logger.info(f"Headless service started in {time.perf_counter() - t0:.2f}s "
+                    f"({len(dm.get_all_devices())} devices)")
+
+    def _attach_historian(self):
+        """Record signal value history (disable with SCADASCOUT_HISTORIAN=0)."""
+        if os.environ.get('SCADASCOUT_HISTORIAN', '1') == '0':
+            return
+        try:
+            from src.core.historian import Historian
+            history_dir = os.environ.get('SCADASCOUT_HISTORIAN_DIR') or os.path.expanduser("~/.scada_scout/history")
+            self.historian = Historian(history_dir)
+            self.device_manager.on('signal_updated', self.historian.on_signal_updated)
+        except Exception as e:
+            self.historian = None
+            logger.warning(f"Historian disabled: {e}")
+
+    def _on_device_status_changed(self, device_name: str, connected: bool):
+        """Start the gateway once its Modbus slave device is up."""
+        if device_name != self.gateway_device or not connected or self.gateway is not None:
+            return
+        server = getattr(self.device_manager.get_protocol(device_name), 'server', None)
+        if server is None:
+            logger.error(f"Gateway device '{device_name}' is not a Modbus server")
+            return
+        from src.core.gateway_core import GatewayCore
+        gateway = GatewayCore(self.device_manager, server)
+        count = gateway.import_mappings(self.gateway_mappings)
+        if gateway.start():
+            self.gateway = gateway
+            logger.info(f"Gateway started with {count} mappings into {device_name}")
+
+    def stats(self) -> dict:
+        dm = self.device_manager
+        data = {
+            'polling': self.poller.stats() if self.poller else {},
+            'scripts': dm.get_user_script_stats() if dm else {},
+        }
+        if dm is not None:
+            data['scheduler'] = {'/'.join(map(str, k)) if isinstance(k, tuple) else str(k): v
+                                 for k, v in dm._script_scheduler.stats().items()}
+        if self.gateway is not None:
+            data['gateway'] = dict(self.gateway.stats)
+        return data
+
+    def stop(self):
+        self._stop_event.set()
+        profiler.stop_and_save()
+        if self.api is not None:
+            self.api.stop()
+        if self.gateway is not None:
+            self.gateway.stop()
+        if self.poller is not None:
+            self.poller.stop()
+        dm = self.device_manager
+        if dm is None:
+            return
+        try:
+            dm.stop_all_user_scripts()
+        except Exception:
+            logger.exception("Failed to stop user scripts")
+        for device in dm.get_all_devices():
+            try:
+                dm.disconnect_device(device.config.name)
+            except Exception:
+                pass
+        dm._script_scheduler.shutdown()
+        if self.historian is not None:
+            try:
+                self.historian.close()
+            except Exception:
+                pass
+
+    def run_forever(self) -> int:
+        """Start, then block until SIGINT/SIGTERM."""
+        for sig in (_signal.SIGINT, _signal.SIGTERM):
+            try:
+                _signal.signal(sig, lambda *_: self._stop_event.set())
+            except (ValueError, OSError):
+                pass  # not the main thread
+        self.start()
+        try:
+            while not self._stop_event.wait(1.0):
+                pass
+        finally:
+            self.stop()
+        return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="scada-scout --headless",
+                                     description="Run a SCADA Scout project without the GUI.")
+    parser.add_argument('project', help="devices.json or .mss project")
+    parser.add_argument('--state-dir', help="folder for devices.json, user scripts and token choices")
+    parser.add_argument('--api-host', default='127.0.0.1')
+    parser.add_argument('--api-port', type=int, default=DEFAULT_API_PORT)
+    parser.add_argument('--no-api', action='store_true', help="do not start the local API")
+    parser.add_argument('--api-token', default=os.environ.get('SCADASCOUT_API_TOKEN'),
+                        help="require this bearer token (default: $SCADASCOUT_API_TOKEN, "
+                             "else a random token printed at start-up)")
+    parser.add_argument('--no-api-token', action='store_true', help="serve the local API without a token")
+    parser.add_argument('--no-connect', action='store_true', help="load devices without connecting")
+    parser.add_argument('--script', action='append', default=[], metavar='NAME',
+                        help="start a saved user script (repeatable)")
+    parser.add_argument('--watchlist', help="watch list JSON to poll (default: the project's)")
+    parser.add_argument('--poll-interval-ms', type=int)
+    parser.add_argument('--gateway-mappings', help="gateway mapping CSV (ProtocolGateway export format)")
+    parser.add_argument('--gateway-device', help="Modbus server device the gateway writes into")
+    parser.add_argument('--log-level', default='INFO')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=getattr(logging, args.log_level.upper(), logging.INFO))
+    if args.no_api_token:
+        args.api_token = ''
+        if args.api_host not in LOOPBACK_HOSTS:
+            logger.warning("Local API is exposed beyond localhost without a token")
+
+    service = HeadlessService(
+        args.project,
+        state_dir=args.state_dir,
+        api_host=args.api_host,
+        api_port=None if args.no_api else args.api_port,
+        api_token=args.api_token,
+        connect=not args.no_connect,
+        scripts=args.script,
+        watchlist_path=args.watchlist,
+        poll_interval_ms=args.poll_interval_ms,
+        gateway_mappings=args.gateway_mappings,
+        gateway_device=args.gateway_device,
+    )
+    return service.run_forever()
+
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(main())
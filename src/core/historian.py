@@ -0,0 +1,569 @@
+"""
+Embedded time-series historian for live signal values.
+
+Samples (timestamp, value, quality) are kept per signal in columnar
+in-memory buffers and periodically flushed to immutable block files in the
+history directory:
+
+    signals.json          signal key -> numeric id
+    block-00000001.hdb    one flush worth of samples for all signals
+
+Block layout: 8-byte header (b"SSH1" + uint32 version), then one
+zlib-compressed payload per signal, then the catalog and a trailer.
+
+    payload   zlib(int64 time deltas [us], float64 values, uint8 qualities),
+              time and value columns byte-shuffled before compression
+    catalog   uint32 ids[n] (sorted), then n CATALOG_DTYPE rows
+    trailer   uint64 catalog offset, uint32 n, float64 t0, float64 t1, b"SSHE"
+
+Catalogs are memory-mapped, so a range query only touches the catalog pages
+and payloads of the requested signal. Storage is reduced by a per-signal
+deadband (with a heartbeat so flat signals still get periodic samples) and
+retention is enforced by age and total size, deleting whole blocks.
+"""
+import json
+import logging
+import os
+import re
+import struct
+import threading
+import time
+import zlib
+from array import array
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"SSH1"
+TRAILER_MAGIC = b"SSHE"
+VERSION = 1
+FILE_HEADER = struct.Struct("<4sI")
+TRAILER = struct.Struct("<QIdd4s")
+
+CATALOG_DTYPE = np.dtype([
+    ('count', '<u4'),
+    ('length', '<u4'),
+    ('offset', '<u8'),
+    ('t0', '<f8'),
+    ('t1', '<f8'),
+    ('vmin', '<f8'),
+    ('vmax', '<f8'),
+])
+
+# Timestamps are stored as whole microseconds
+TIME_RESOLUTION = 1e-6
+
+# Quality codes stored per sample (higher is worse)
+QUALITY_GOOD = 0
+QUALITY_CODES = {"Good": 0, "Blocked": 1, "Invalid": 2, "Not Connected": 3}
+
+_BLOCK_RE = re.compile(r"^block-(\d{8})\.hdb$")
+
+
+def _shuffle(data: np.ndarray) -> bytes:
+    """Byte-transpose an 8-byte column so zlib sees runs of similar bytes."""
+    return data.view(np.uint8).reshape(-1, 8).T.tobytes()
+
+
+def _unshuffle(raw: bytes, count: int, dtype) -> np.ndarray:
+    return np.frombuffer(raw, dtype=np.uint8).reshape(8, count).T.copy().view(dtype).ravel()
+
+
+def encode_payload(ts: np.ndarray, values: np.ndarray, quality: np.ndarray) -> bytes:
+    micros = np.round(ts * 1e6).astype(np.int64)
+    deltas = np.diff(micros, prepend=np.int64(0))
+    return zlib.compress(_shuffle(deltas) + _shuffle(values.astype(np.float64)) + quality.astype(np.uint8).tobytes(), 1)
+
+
+def decode_payload(raw: bytes, count: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    data = zlib.decompress(raw)
+    n8 = count * 8
+    ts = np.cumsum(_unshuffle(data[:n8], count, np.int64)) / 1e6
+    values = _unshuffle(data[n8:2 * n8], count, np.float64)
+    quality = np.frombuffer(data[2 * n8:2 * n8 + count], dtype=np.uint8).copy()
+    return ts, values, quality
+
+
+def downsample(t: np.ndarray, values: np.ndarray, quality: np.ndarray, buckets: int,
+               start: Optional[float] = None, end: Optional[float] = None) -> Dict[str, np.ndarray]:
+    """
+    Reduce samples to at most `buckets` equal-time buckets.
+
+    Returns arrays t (bucket start), min, max, avg, count and quality (worst
+    in bucket); empty buckets are omitted.
+    """
+    if len(t) == 0:
+        empty = np.empty(0)
+        return {'t': empty, 'min': empty, 'max': empty, 'avg': empty,
+                'count': np.empty(0, dtype=np.int64), 'quality': np.empty(0, dtype=np.uint8)}
+    lo = t[0] if start is None else start
+    hi = t[-1] if end is None else end
+    edges = np.linspace(lo, hi, max(1, buckets) + 1)
+    idx = np.searchsorted(t, edges[:-1], side='left')
+    counts = np.diff(np.append(idx, len(t)))
+    keep = counts > 0
+    starts = idx[keep]
+    return {
+        't': edges[:-1][keep],
+        'min': np.minimum.reduceat(values, starts),
+        'max': np.maximum.reduceat(values, starts),
+        'avg': np.add.reduceat(values, starts) / counts[keep],
+        'count': counts[keep],
+        'quality': np.maximum.reduceat(quality, starts),
+    }
+
+
+def signal_key(device_name: str, signal) -> str:
+    """Key under which a signal's samples are stored."""
+    return getattr(signal, 'unique_address', '') or f"{device_name}::{signal.address}"
+
+
+def to_float(value) -> Optional[float]:
+    """Numeric value of a signal sample (bools as 0/1), or None."""
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return 1.0 if value else 0.0
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class _Series:
+    """In-memory tail of one signal."""
+    __slots__ = ("id", "ts", "val", "q", "last_t", "last_v", "last_q", "deadband")
+
+    def __init__(self, sid: int, deadband: float):
+        self.id = sid
+        self.ts = array('d')
+        self.val = array('d')
+        self.q = array('B')
+        self.last_t = None
+        self.last_v = None
+        self.last_q = None
+        self.deadband = deadband
+
+
+class _Block:
+    """Trailer metadata of one block file; catalog is opened on demand."""
+
+    def __init__(self, seq: int, path: str, cat_offset: int, n: int, t0: float, t1: float, size: int):
+        self.seq = seq
+        self.path = path
+        self.cat_offset = cat_offset
+        self.n = n
+        self.t0 = t0
+        self.t1 = t1
+        self.size = size
+
+
+class Historian:
+    """
+    Per-signal value history with on-disk blocks and in-memory tails.
+
+    `record()` is cheap enough to call for every update; flushing to disk
+    happens on a background thread every `flush_interval` seconds or when
+    `max_buffer_samples` samples are buffered.
+    """
+
+    def __init__(self, directory: str,
+                 deadband: float = 0.0,
+                 heartbeat: float = 60.0,
+                 retention_seconds: Optional[float] = 7 * 24 * 3600,
+                 max_bytes: Optional[int] = 2 * 1024 * 1024 * 1024,
+                 flush_interval: float = 300.0,
+                 max_buffer_samples: int = 2_000_000,
+                 catalog_cache: int = 256):
+        self.directory = directory
+        self.default_deadband = float(deadband)
+        self.heartbeat = float(heartbeat)
+        self.retention_seconds = retention_seconds
+        self.max_bytes = max_bytes
+        self.flush_interval = float(flush_interval)
+        self.max_buffer_samples = int(max_buffer_samples)
+
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._series: Dict[str, _Series] = {}
+        self._ids: Dict[str, int] = {}
+        self._ids_dirty = False
+        self._deadbands: Dict[str, float] = {}
+        self._dirty: List[_Series] = []
+        self._buffered = 0
+        # Snapshot being written by the flush thread: {id: (ts, val, q)}
+        self._flushing: Dict[int, Tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
+        self._flush_thread: Optional[threading.Thread] = None
+        self._next_flush = time.monotonic() + self.flush_interval
+
+        self._blocks: List[_Block] = []
+        self._catalogs: "OrderedDict[int, Tuple[np.ndarray, np.ndarray]]" = OrderedDict()
+        self._catalog_cache = catalog_cache
+        self._next_seq = 1
+        self._closed = False
+
+        self.stats = {'recorded': 0, 'suppressed': 0, 'out_of_order': 0, 'non_numeric': 0,
+                      'flushes': 0, 'blocks_deleted': 0}
+
+        os.makedirs(directory, exist_ok=True)
+        self._load()
+
+    # ---- Opening ----
+
+    @property
+    def _ids_path(self) -> str:
+        return os.path.join(self.directory, "signals.json")
+
+    def _load(self):
+        try:
+            with open(self._ids_path, "r", encoding="utf-8") as f:
+                self._ids = {k: int(v) for k, v in json.load(f).items()}
+        except FileNotFoundError:
+            self._ids = {}
+        except Exception as e:
+            logger.warning(f"Historian signal index unreadable, starting empty: {e}")
+            self._ids = {}
+
+        for name in sorted(os.listdir(self.directory)):
+            m = _BLOCK_RE.match(name)
+            if not m:
+                if name.endswith(".tmp"):
+                    try:
+                        os.remove(os.path.join(self.directory, name))
+                    except OSError:
+                        pass
+                continue
+            path = os.path.join(self.directory, name)
+            block = self._read_trailer(int(m.group(1)), path)
+            if block is not None:
+                self._blocks.append(block)
+        self._blocks.sort(key=lambda b: b.seq)
+        if self._blocks:
+            self._next_seq = self._blocks[-1].seq + 1
+
+    @staticmethod
+    def _read_trailer(seq: int, path: str) -> Optional[_Block]:
+        try:
+            size = os.path.getsize(path)
+            with open(path, "rb") as f:
+                magic, version = FILE_HEADER.unpack(f.read(FILE_HEADER.size))
+                if magic != MAGIC:
+                    raise ValueError("bad header")
+                f.seek(size - TRAILER.size)
+                cat_offset, n, t0, t1, tail = TRAILER.unpack(f.read(TRAILER.size))
+                if tail != TRAILER_MAGIC:
+                    raise ValueError("bad trailer")
+            return _Block(seq, path, cat_offset, n, t0, t1, size)
+        except Exception as e:
+            logger.warning(f"Skipping unreadable history block {path}: {e}")
+            return None
+
+    # ---- Recording ----
+
+    def set_deadband(self, key: str, deadband: float):
+        """Override the deadband for one signal (absolute, in engineering units)."""
+        with self._lock:
+            self._deadbands[key] = float(deadband)
+            series = self._series.get(key)
+            if series is not None:
+                series.deadband = float(deadband)
+
+    def record(self, key: str, timestamp: float, value, quality: int = QUALITY_GOOD) -> bool:
+        """Store a sample unless it is non-numeric, out of order or inside the deadband."""
+        v = to_float(value)
+        if v is None:
+            self.stats['non_numeric'] += 1
+            return False
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._new_series(key)
+            last_t = series.last_t
+            if last_t is not None:
+                if timestamp <= last_t:
+                    self.stats['out_of_order'] += 1
+                    return False
+                if (quality == series.last_q and abs(v - series.last_v) <= series.deadband
+                        and timestamp - last_t < self.heartbeat):
+                    self.stats['suppressed'] += 1
+                    return False
+            if not series.ts:
+                self._dirty.append(series)
+            series.ts.append(timestamp)
+            series.val.append(v)
+            series.q.append(quality)
+            series.last_t = timestamp
+            series.last_v = v
+            series.last_q = quality
+            self._buffered += 1
+            self.stats['recorded'] += 1
+            due = self._buffered >= self.max_buffer_samples or (
+                (self._buffered & 0x3FF) == 0 and time.monotonic() >= self._next_flush)
+        if due:
+            self.flush(wait=False)
+        return True
+
+    def _new_series(self, key: str) -> _Series:
+        sid = self._ids.get(key)
+        if sid is None:
+            sid = len(self._ids) + 1
+            self._ids[key] = sid
+            self._ids_dirty = True
+        series = _Series(sid, self._deadbands.get(key, self.default_deadband))
+        self._series[key] = series
+        return series
+
+    def on_signal_updated(self, device_name: str, signal):
+        """Slot for DeviceManager.signal_updated; timestamps samples on arrival."""
+        key = signal_key(device_name, signal)
+        quality = getattr(signal, 'quality', None)
+        code = QUALITY_GOOD
+        if quality is not None:
+            code = QUALITY_CODES.get(getattr(quality, 'value', quality), QUALITY_CODES["Invalid"])
+        self.record(key, time.time(), signal.value, code)
+
+    # ---- Flushing ----
+
+    def flush(self, wait: bool = True):
+        """Write buffered samples to a new block (in the background unless `wait`)."""
+        if wait:
+            thread = self._flush_thread
+            if thread is not None and thread.is_alive():
+                thread.join()
+            self._flush()
+            return
+        if self._flush_thread is not None and self._flush_thread.is_alive():
+            return
+        self._flush_thread = threading.Thread(target=self._flush, name="HistorianFlush", daemon=True)
+        self._flush_thread.start()
+
+    def _flush(self):
+        with self._flush_lock:
+            with self._lock:
+                self._next_flush = time.monotonic() + self.flush_interval
+                if not self._dirty:
+                    return
+                snapshot = {}
+                for series in self._dirty:
+                    snapshot[series.id] = (np.frombuffer(series.ts, dtype=np.float64),
+                                           np.frombuffer(series.val, dtype=np.float64),
+                                           np.frombuffer(series.q, dtype=np.uint8))
+                    series.ts = array('d')
+                    series.val = array('d')
+                    series.q = array('B')
+                self._dirty = []
+                self._buffered = 0
+                self._flushing = snapshot
+                ids_to_save = dict(self._ids) if self._ids_dirty else None
+                self._ids_dirty = False
+
+            try:
+                if ids_to_save is not None:
+                    self._save_ids(ids_to_save)
+                block = self._write_block(snapshot)
+            except Exception as e:
+                logger.error(f"Historian flush failed: {e}")
+                block = None
+
+            with self._lock:
+                if block is not None:
+                    self._blocks.append(block)
+                    self._flushing = {}
+                else:
+                    # Keep the samples queryable in memory; they are retried on the next flush
+                    self._requeue(snapshot)
+            self.stats['flushes'] += 1
+            self._apply_retention()
+
+    def _requeue(self, snapshot):
+        by_id = {s.id: s for s in self._series.values()}
+        for sid, (ts, val, q) in snapshot.items():
+            series = by_id.get(sid)
+            if series is None:
+                continue
+            if not series.ts:
+                self._dirty.append(series)
+            series.ts = array('d', ts.tobytes()) + series.ts
+            series.val = array('d', val.tobytes()) + series.val
+            series.q = array('B', q.tobytes()) + series.q
+            self._buffered += len(ts)
+        self._flushing = {}
+
+    def _save_ids(self, ids: Dict[str, int]):
+        tmp = self._ids_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(ids, f)
+        os.replace(tmp, self._ids_path)
+
+    def _write_block(self, snapshot) -> _Block:
+        seq = self._next_seq
+        self._next_seq += 1
+        path = os.path.join(self.directory, f"block-{seq:08d}.hdb")
+        tmp = path + ".tmp"
+
+        ids = np.array(sorted(snapshot), dtype=np.uint32)
+        catalog = np.zeros(len(ids), dtype=CATALOG_DTYPE)
+        t0, t1 = float("inf"), float("-inf")
+        with open(tmp, "wb") as f:
+            f.write(FILE_HEADER.pack(MAGIC, VERSION))
+            offset = FILE_HEADER.size
+            for i, sid in enumerate(ids.tolist()):
+                ts, val, q = snapshot[sid]
+                payload = encode_payload(ts, val, q)
+                f.write(payload)
+                finite = val[np.isfinite(val)]
+                vmin, vmax = (finite.min(), finite.max()) if finite.size else (np.nan, np.nan)
+                catalog[i] = (len(ts), len(payload), offset, ts[0], ts[-1], vmin, vmax)
+                offset += len(payload)
+                t0 = min(t0, ts[0])
+                t1 = max(t1, ts[-1])
+            cat_offset = offset
+            f.write(ids.tobytes())
+            f.write(catalog.tobytes())
+            f.write(TRAILER.pack(cat_offset, len(ids), t0, t1, TRAILER_MAGIC))
+        os.replace(tmp, path)
+        return _Block(seq, path, cat_offset, len(ids), t0, t1, os.path.getsize(path))
+
+    def _apply_retention(self):
+        now = time.time()
+        with self._lock:
+            blocks = list(self._blocks)
+        doomed = []
+        if self.retention_seconds is not None:
+            cutoff = now - self.retention_seconds
+            doomed.extend(b for b in blocks if b.t1 < cutoff)
+        if self.max_bytes is not None:
+            remaining = [b for b in blocks if b not in doomed]
+            total = sum(b.size for b in remaining)
+            for b in remaining[:-1]:  # never delete the newest block
+                if total <= self.max_bytes:
+                    break
+                doomed.append(b)
+                total -= b.size
+        if not doomed:
+            return
+        with self._lock:
+            doomed_seqs = {b.seq for b in doomed}
+            self._blocks = [b for b in self._blocks if b.seq not in doomed_seqs]
+            for seq in doomed_seqs:
+                self._catalogs.pop(seq, None)
+        for b in doomed:
+            try:
+                os.remove(b.path)
+                self.stats['blocks_deleted'] += 1
+            except OSError as e:
+                logger.debug(f"Could not delete history block {b.path}: {e}")
+
+    # ---- Queries ----
+
+    def keys(self) -> List[str]:
+        with self._lock:
+            return sorted(self._ids)
+
+    def _catalog(self, block: _Block) -> Tuple[np.ndarray, np.ndarray]:
+        # Queries and the writer's retention pass share the LRU; map outside the lock
+        with self._lock:
+            cached = self._catalogs.get(block.seq)
+            if cached is not None:
+                self._catalogs.move_to_end(block.seq)
+                return cached
+        ids = np.memmap(block.path, dtype=np.uint32, mode='r', offset=block.cat_offset, shape=(block.n,))
+        rows = np.memmap(block.path, dtype=CATALOG_DTYPE, mode='r',
+                         offset=block.cat_offset + 4 * block.n, shape=(block.n,))
+        with self._lock:
+            self._catalogs[block.seq] = (ids, rows)
+            while len(self._catalogs) > self._catalog_cache:
+                self._catalogs.popitem(last=False)
+        return ids, rows
+
+    def query(self, key: str, start: Optional[float] = None, end: Optional[float] = None,
+              max_points: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """
+        Samples of `key` in [start, end] as numpy arrays t/value/quality.
+
+        With `max_points`, ranges holding more samples are reduced to
+        min/max/avg buckets (see `downsample`).
+        """
+        # Widen by the storage resolution so bounds equal to a sample time
+        # still match it after rounding
+        lo = -np.inf if start is None else start - TIME_RESOLUTION
+        hi = np.inf if end is None else end + TIME_RESOLUTION
+        with self._lock:
+            sid = self._ids.get(key)
+            blocks = [b for b in self._blocks if b.t1 >= lo and b.t0 <= hi]
+            flushing = self._flushing.get(sid)
+            series = self._series.get(key)
+            tail = None
+            if series is not None and series.ts:
+                tail = (np.array(series.ts, dtype=np.float64), np.array(series.val, dtype=np.float64),
+                        np.array(series.q, dtype=np.uint8))
+
+        parts = []
+        if sid is not None:
+            for block in blocks:
+                part = self._read_block_series(block, sid, lo, hi)
+                if part is not None:
+                    parts.append(part)
+        if flushing is not None:
+            parts.append(flushing)
+        if tail is not None:
+            parts.append(tail)
+
+        if parts:
+            t = np.concatenate([p[0] for p in parts])
+            v = np.concatenate([p[1] for p in parts])
+            q = np.concatenate([p[2] for p in parts])
+            mask = (t >= lo) & (t <= hi)
+            if not mask.all():
+                t, v, q = t[mask], v[mask], q[mask]
+        else:
+            t, v, q = np.empty(0), np.empty(0), np.empty(0, dtype=np.uint8)
+
+        if max_points is not None and len(t) > max_points:
+            return downsample(t, v, q, max_points, start, end)
+        return {'t': t, 'value': v, 'quality': q}
+
+    def _read_block_series(self, block: _Block, sid: int, lo: float, hi: float):
+        try:
+            ids, rows = self._catalog(block)
+            i = int(np.searchsorted(ids, sid))
+            if i >= block.n or int(ids[i]) != sid:
+                return None
+            row = rows[i]
+            if row['t1'] < lo or row['t0'] > hi:
+                return None
+            with open(block.path, "rb") as f:
+                f.seek(int(row['offset']))
+                raw = f.read(int(row['length']))
+            return decode_payload(raw, int(row['count']))
+        except Exception as e:
+            logger.debug(f"History block {block.path} read failed: {e}")
+            return None
+
+    def latest(self, key: str):
+        """(timestamp, value, quality) of the last stored sample, or None."""
+        with self._lock:
+            series = self._series.get(key)
+            if series is not None and series.last_t is not None:
+                return series.last_t, series.last_v, series.last_q
+        result = self.query(key)
+        if len(result['t']):
+            return float(result['t'][-1]), float(result['value'][-1]), int(result['quality'][-1])
+        return None
+
+    def disk_usage(self) -> int:
+        with self._lock:
+            return sum(b.size for b in self._blocks)
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self.flush(wait=True)
+        with self._lock:
+            self._catalogs.clear()
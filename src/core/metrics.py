@@ -0,0 +1,379 @@
+"""
+Runtime metrics
+Counters, gauges and latency histograms for the protocol workers, the
+device manager and the UI update path.
+
+Metrics are declared once at module level next to the code they measure
+and resolved per label set with `labels(...)`; the hot path only touches
+the returned child, so recording a sample is a short locked add with no
+allocation. Histograms use HDR-style log-linear buckets (power-of-two
+ranges split into 16 linear sub-buckets, about 6% relative error), which
+keeps percentiles accurate from microseconds to hours in fixed memory.
+
+`render_text()` produces the Prometheus text exposition format. It is
+served at /metrics by the headless API and, when SCADASCOUT_METRICS_PORT
+is set, by a `MetricsServer` started with the GUI. Recording is switched
+off with SCADASCOUT_METRICS=0.
+"""
+import logging
+import math
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_enabled = os.environ.get('SCADASCOUT_METRICS', '1') != '0'
+
+# HDR bucket layout over integer microseconds
+_SUB_BITS = 4
+_SUB_COUNT = 1 << _SUB_BITS
+_MAX_EXPONENT = 38  # ~76 hours; larger samples land in the last bucket
+_BUCKETS = (_MAX_EXPONENT + 2) * _SUB_COUNT
+
+# `le` boundaries (seconds) of the exported Prometheus histogram
+EXPORT_BOUNDS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+                 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def set_enabled(enabled: bool):
+    global _enabled
+    _enabled = bool(enabled)
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def _bucket_index(us: int) -> int:
+    exponent = us.bit_length() - _SUB_BITS - 1
+    if exponent <= 0:
+        return us
+    if exponent > _MAX_EXPONENT:
+        return _BUCKETS - 1
+    return exponent * _SUB_COUNT + (us >> exponent)
+
+
+def _bucket_bounds(index: int) -> Tuple[int, int]:
+    """[low, high) of a bucket in microseconds."""
+    if index < 2 * _SUB_COUNT:
+        return index, index + 1
+    exponent = index // _SUB_COUNT - 1
+    mantissa = index - exponent * _SUB_COUNT
+    return mantissa << exponent, (mantissa + 1) << exponent
+
+
+class _CounterChild:
+    __slots__ = ('value', '_lock')
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        if _enabled:
+            with self._lock:
+                self.value += amount
+
+
+class _GaugeChild:
+    __slots__ = ('_value', '_fn', '_lock')
+
+    def __init__(self):
+        self._value = 0.0
+        self._fn: Optional[Callable[[], float]] = None
+        self._lock = threading.Lock()
+
+    def set(self, value: float):
+        self._value = float(value)
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1.0):
+        self.inc(-amount)
+
+    def set_function(self, fn: Optional[Callable[[], float]]):
+        """Sample `fn()` at collection time instead of tracking a value."""
+        self._fn = fn
+
+    @property
+    def value(self) -> float:
+        fn = self._fn
+        if fn is None:
+            return self._value
+        try:
+            return float(fn())
+        except Exception:
+            return math.nan
+
+
+class _HistogramChild:
+    __slots__ = ('count', 'sum', 'max', '_counts', '_lock')
+
+    def __init__(self):
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self._counts = [0] * _BUCKETS
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float):
+        if not _enabled:
+            return
+        index = _bucket_index(int(seconds * 1e6)) if seconds > 0 else 0
+        with self._lock:
+            self._counts[index] += 1
+            self.count += 1
+            self.sum += seconds
+            if seconds > self.max:
+                self.max = seconds
+
+    def percentile(self, q: float) -> float:
+        """Value (seconds) below which a fraction `q` of the samples fall."""
+        with self._lock:
+            counts = list(self._counts)
+            total = self.count
+            largest = self.max
+        if not total:
+            return 0.0
+        rank = max(1, math.ceil(q * total))
+        seen = 0
+        for index, n in enumerate(counts):
+            seen += n
+            if n and seen >= rank:
+                low, high = _bucket_bounds(index)
+                return min((low + high) / 2e6, largest)
+        return largest
+
+    def cumulative(self, bounds=EXPORT_BOUNDS) -> List[int]:
+        """Sample counts at or below each bound (bucket resolution)."""
+        with self._lock:
+            counts = list(self._counts)
+        out = []
+        seen = 0
+        index = 0
+        for bound in bounds:
+            limit = bound * 1e6
+            while index < _BUCKETS and _bucket_bounds(index)[1] <= limit:
+                seen += counts[index]
+                index += 1
+            out.append(seen)
+        return out
+
+
+class _Metric:
+    kind = ''
+    _child_type = None
+
+    def __init__(self, name: str, documentation: str, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[tuple, object] = {}
+        self._lock = threading.Lock()
+        if not self.labelnames:
+            self._children[()] = self._child_type()
+
+    def labels(self, *values):
+        """Child for one label set (created on first use); pass strings."""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+            with self._lock:
+                child = self._children.get(values)
+                if child is None:
+                    child = self._child_type()
+                    # Copy-on-write so readers never see the dict resize
+                    children = dict(self._children)
+                    children[values] = child
+                    self._children = children
+        return child
+
+    def remove(self, *values):
+        with self._lock:
+            if values in self._children:
+                children = dict(self._children)
+                del children[values]
+                self._children = children
+
+    def children(self) -> List[Tuple[tuple, object]]:
+        return list(self._children.items())
+
+
+class Counter(_Metric):
+    """Monotonic count (requests, errors, overruns)."""
+    kind = 'counter'
+    _child_type = _CounterChild
+
+    def inc(self, amount: float = 1.0):
+        self._children[()].inc(amount)
+
+
+class Gauge(_Metric):
+    """Current level (queue depth, connected devices)."""
+    kind = 'gauge'
+    _child_type = _GaugeChild
+
+    def set(self, value: float):
+        self._children[()].set(value)
+
+    def set_function(self, fn):
+        self._children[()].set_function(fn)
+
+
+class Histogram(_Metric):
+    """Latency distribution in seconds."""
+    kind = 'histogram'
+    _child_type = _HistogramChild
+
+    def observe(self, seconds: float):
+        self._children[()].observe(seconds)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _labels_text(names, values, extra: str = '') -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+
+def _num(value: float) -> str:
+    if value != value:
+        return 'NaN'
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+class MetricsRegistry:
+    """Named metrics; declaring the same name twice returns the same metric."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, cls, name, documentation, labelnames):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = cls(name, documentation, labelnames)
+                self._metrics[name] = metric
+            elif not isinstance(metric, cls) or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"metric {name} already registered as {metric.kind} {metric.labelnames}")
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames=()) -> Counter:
+        return self._get(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames=()) -> Gauge:
+        return self._get(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames=()) -> Histogram:
+        return self._get(Histogram, name, documentation, labelnames)
+
+    def metrics(self) -> List[_Metric]:
+        with self._lock:
+            return sorted(self._metrics.values(), key=lambda m: m.name)
+
+    def render_text(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        lines = []
+        for metric in self.metrics():
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            names = metric.labelnames
+            for values, child in metric.children():
+                if metric.kind == 'histogram':
+                    for bound, n in zip(EXPORT_BOUNDS, child.cumulative()):
+                        le = _labels_text(names, values, 'le="%s"' % bound)
+                        lines.append(f"{metric.name}_bucket{le} {n}")
+                    le = _labels_text(names, values, 'le="+Inf"')
+                    lines.append(f"{metric.name}_bucket{le} {child.count}")
+                    lines.append(f"{metric.name}_sum{_labels_text(names, values)} {_num(child.sum)}")
+                    lines.append(f"{metric.name}_count{_labels_text(names, values)} {child.count}")
+                else:
+                    lines.append(f"{metric.name}{_labels_text(names, values)} {_num(child.value)}")
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self) -> List[dict]:
+        """One row per metric and label set, with percentiles for histograms."""
+        rows = []
+        for metric in self.metrics():
+            for values, child in metric.children():
+                row = {
+                    'name': metric.name,
+                    'kind': metric.kind,
+                    'labels': dict(zip(metric.labelnames, values)),
+                }
+                if metric.kind == 'histogram':
+                    row.update(count=child.count, sum=child.sum, max=child.max,
+                               p50=child.percentile(0.50), p90=child.percentile(0.90),
+                               p99=child.percentile(0.99))
+                else:
+                    row['value'] = child.value
+                rows.append(row)
+        return rows
+
+
+REGISTRY = MetricsRegistry()
+
+counter = REGISTRY.counter
+gauge = REGISTRY.gauge
+histogram = REGISTRY.histogram
+render_text = REGISTRY.render_text
+snapshot = REGISTRY.snapshot
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class MetricsServer:
+    """Serves `render_text()` at http://host:port/metrics on a daemon thread."""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 9108, registry: MetricsRegistry = REGISTRY):
+        self.host = host
+        self._port = port
+        self._registry = registry
+        self._httpd: Optional[ThreadingHTTPServer] = None
+
+    @property
+    def port(self) -> int:
+        return self._httpd.server_address[1] if self._httpd else self._port
+
+    def start(self):
+        if self._httpd is not None:
+            return
+        registry = self._registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, fmt, *args):
+                logger.debug("metrics: " + fmt % args)
+
+            def do_GET(self):
+                if self.path.split('?', 1)[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = registry.render_text().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self._httpd = ThreadingHTTPServer((self.host, self._port), Handler)
+        self._httpd.daemon_threads = True
+        threading.Thread(target=self._httpd.serve_forever, name="MetricsServer", daemon=True).start()
+        logger.info(f"Metrics endpoint on http://{self.host}:{self.port}/metrics")
+
+    def stop(self):
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
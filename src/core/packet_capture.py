@@ -1,9 +1,6 @@
 from PySide6.QtCore import QObject, Signal, QSettings
-from datetime import datetime
-import binascii
 import socket
 import psutil
-import json
 import os
 import threading
 import shutil
@@ -11,15 +8,21 @@ import subprocess
 import tempfile
 import time
 import signal
+from typing import Optional
+
+from src.core.capture_pipeline import CapturePipeline
+from src.core.protocol_decoder import ProtocolAnalyzer
 
 
 class PacketCaptureWorker(QObject):
     """Background packet capture helper using scapy.
 
     Features:
-    - Uses scapy AsyncSniffer when available to capture in background
-    - Emits detailed packet text via `packet_captured` signal
-    - Optional file logging (plain text or JSON)
+    - Reads raw frames from a scapy L2 listen socket (AsyncSniffer as fallback)
+      without dissecting them; frames go into `self.pipeline` (ring buffer +
+      buffered pcapng/text writers) and are summarised or dissected lazily
+    - Emits status/debug text via `packet_captured` signal
+    - Optional file logging (pcapng for .pcap/.pcapng paths, otherwise text or JSON lines)
     - Interface selection or local IP override for TX/RX detection
     """
     packet_captured = Signal(str)
@@ -27,10 +30,16 @@ class PacketCaptureWorker(QObject):
 
     def __init__(self, parent=None):
         super().__init__(parent)
+        self.pipeline = CapturePipeline()
+        # Live MMS/Modbus/GOOSE latency and throughput statistics
+        self.pipeline.analyzer = ProtocolAnalyzer()
         self._sniffer = None
+        self._raw_socket = None
+        self._raw_thread = None
+        # scapy takes about a second to import; it is loaded on first use (_load_scapy)
         self._AsyncSniffer = None
-        self._scapy_available = False
-        self._scapy_error = None
+        self._scapy_checked = False
+        self._scapy_import_error = None
 
         # dumpcap / FIFO fallback
         self._dumpcap_path = shutil.which('dumpcap')
@@ -47,17 +56,9 @@ class PacketCaptureWorker(QObject):
         self._max_log_size = 10 * 1024 * 1024  # 10 MB default
         self._max_log_files = 5
 
-        # Interface/local IP detection
+        # Interface/local IP detection (shared with the pipeline for TX/RX summaries)
         self._iface = None
-        self._local_ips = set()
-
-        try:
-            from scapy.all import AsyncSniffer
-            self._AsyncSniffer = AsyncSniffer
-            self._scapy_available = True
-        except Exception as e:
-            self._scapy_available = False
-            self._scapy_error = str(e)
+        self._local_ips = self.pipeline.local_ips
 
         # Populate local IPs by default
         self._gather_local_ips()
@@ -78,6 +79,26 @@ class PacketCaptureWorker(QObject):
         except Exception:
             self._preferred_backend = 'auto'
 
+    def _load_scapy(self) -> bool:
+        """Import scapy once, on first capture-related use."""
+        if not self._scapy_checked:
+            self._scapy_checked = True
+            try:
+                from scapy.all import AsyncSniffer
+                self._AsyncSniffer = AsyncSniffer
+            except Exception as e:
+                self._scapy_import_error = str(e)
+        return self._AsyncSniffer is not None
+
+    @property
+    def _scapy_available(self) -> bool:
+        return self._load_scapy()
+
+    @property
+    def _scapy_error(self) -> Optional[str]:
+        self._load_scapy()
+        return self._scapy_import_error
+
     def _gather_local_ips(self, iface: str = None):
         """Populate `self._local_ips` either for given interface or all interfaces."""
         self._local_ips.clear()
@@ -100,23 +121,27 @@ class PacketCaptureWorker(QObject):
                 pass
 
     def set_log_file(self, path: str, json_format: bool = False):
-        """Enable logging to `path`. Pass `None` to disable."""
+        """Enable logging to `path`. Pass `None` to disable.
+
+        Paths ending in .pcap/.pcapng receive raw frames in pcapng format;
+        anything else receives one summary line (or JSON object) per frame.
+        """
         self._log_file = path
         self._log_json = bool(json_format)
-        # Try to create the file and write a header so the file exists immediately
-        if self._log_file:
+        try:
+            self.pipeline.set_pcapng_output(None)
+            self.pipeline.set_text_output(None)
+            if not path:
+                return
+            if path.lower().endswith(('.pcap', '.pcapng')):
+                self.pipeline.set_pcapng_output(path, self._max_log_size, self._max_log_files)
+            else:
+                self.pipeline.set_text_output(path, self._max_log_size, self._max_log_files, json_format=self._log_json)
+        except Exception as e:
             try:
-                dirname = os.path.dirname(self._log_file)
-                if dirname and not os.path.exists(dirname):
-                    os.makedirs(dirname, exist_ok=True)
-                header = f"# Packet log created at {datetime.now().isoformat()}\n"
-                with open(self._log_file, 'a', encoding='utf-8') as f:
-                    f.write(header)
-            except Exception as e:
-                try:
-                    self.error_occurred.emit(f"Failed to create log file: {e}")
-                except Exception:
-                    pass
+                self.error_occurred.emit(f"Failed to create log file: {e}")
+            except Exception:
+                pass
 
     def set_interface(self, iface: str):
         """Select a network interface name for capture and local IP detection."""
@@ -128,6 +153,7 @@ class PacketCaptureWorker(QObject):
         try:
             self._max_log_size = int(max_bytes) if max_bytes else 0
             self._max_log_files = max(1, int(max_files))
+            self.pipeline.set_rotation(self._max_log_size, self._max_log_files)
         except Exception:
             # ignore invalid inputs
             pass
@@ -143,156 +169,62 @@ class PacketCaptureWorker(QObject):
         for ip in ips:
             self._local_ips.add(ip)
 
-    def _emit_and_maybe_log(self, text: str, pkt=None):
-        # Emit to UI
+    def _packet_callback(self, pkt):
+        """AsyncSniffer fallback: the packet is already dissected by scapy, keep only its bytes."""
         try:
-            self.packet_captured.emit(text)
-        except Exception:
-            pass
-
-        # Optionally append to file
-        if self._log_file:
+            data = bytes(pkt)
+            self.pipeline.on_frame(float(getattr(pkt, 'time', 0) or time.time()), data, getattr(pkt, 'wirelen', None))
+        except Exception as e:
             try:
-                # Ensure rotation if needed
-                try:
-                    if self._max_log_size and os.path.exists(self._log_file):
-                        if os.path.getsize(self._log_file) >= self._max_log_size:
-                            # rotate files: logfile -> logfile.1, logfile.1 -> logfile.2, ...
-                            for i in range(self._max_log_files - 1, 0, -1):
-                                src = f"{self._log_file}.{i}"
-                                dst = f"{self._log_file}.{i+1}"
-                                if os.path.exists(src):
-                                    try:
-                                        os.replace(src, dst)
-                                    except Exception:
-                                        pass
-                            # move current to .1
-                            try:
-                                os.replace(self._log_file, f"{self._log_file}.1")
-                            except Exception:
-                                pass
-                except Exception:
-                    pass
-                with self._log_lock:
-                    mode = 'a'
-                    with open(self._log_file, mode, encoding='utf-8') as f:
-                        if self._log_json and pkt is not None:
-                            # Build structured JSON
-                            try:
-                                from scapy.all import IP, TCP, Raw
-                                data = {}
-                                ts = datetime.now().strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3]
-                                data['time'] = ts
-                                if IP in pkt:
-                                    ip = pkt[IP]
-                                    data['src'] = getattr(ip, 'src', None)
-                                    data['dst'] = getattr(ip, 'dst', None)
-                                if TCP in pkt:
-                                    tcp = pkt[TCP]
-                                    data['sport'] = getattr(tcp, 'sport', None)
-                                    data['dport'] = getattr(tcp, 'dport', None)
-                                    data['seq'] = getattr(tcp, 'seq', None)
-                                    data['ack'] = getattr(tcp, 'ack', None)
-                                    data['flags'] = str(getattr(tcp, 'flags', None))
-                                if Raw in pkt:
-                                    payload = pkt[Raw].load
-                                    try:
-                                        data['payload_hex'] = binascii.hexlify(payload).decode()
-                                    except Exception:
-                                        data['payload_hex'] = None
-                                data['raw'] = text
-                                f.write(json.dumps(data, ensure_ascii=False) + '\n')
-                            except Exception:
-                                # Fallback: write raw text
-                                f.write(text + '\n')
-                        else:
-                            f.write(text + '\n')
-            except Exception as e:
-                try:
-                    self.error_occurred.emit(f"Failed to write packet log: {e}")
-                except Exception:
-                    pass
+                self.error_occurred.emit(f"Packet processing error: {e}")
+            except Exception:
+                pass
 
-    def _packet_callback(self, pkt):
+    def _start_raw_listen(self, filter_str: str = "") -> bool:
+        """Open a scapy L2 listen socket and read raw frames on a thread (no per-packet dissection)."""
+        from scapy.config import conf
+        kwargs = {}
+        if filter_str:
+            kwargs['filter'] = filter_str
+        if self._iface:
+            kwargs['iface'] = self._iface
+        sock = conf.L2listen(**kwargs)
+        if not hasattr(sock, 'recv_raw'):
+            sock.close()
+            raise RuntimeError("L2 listen socket does not support raw reads")
+        self._raw_socket = sock
+        self._stop_event.clear()
+        self._raw_thread = threading.Thread(target=self._raw_listen_loop, args=(sock,), daemon=True)
+        self._raw_thread.start()
+        return True
+
+    def _raw_listen_loop(self, sock):
+        import select
+        on_frame = self.pipeline.on_frame
+        stop = self._stop_event
         try:
-            ts = datetime.now().strftime("%H:%M:%S.%f")[:-3]
-
-            from scapy.all import Ether, IP, TCP, Raw
-
-            direction = 'UNK'
-            details = []
-            if IP in pkt:
-                ip = pkt[IP]
-                src = getattr(ip, 'src', '?')
-                dst = getattr(ip, 'dst', '?')
-                # Determine direction based on local IPs
-                if src in self._local_ips:
-                    direction = 'TX'
-                elif dst in self._local_ips:
-                    direction = 'RX'
-
-                ethtxt = ''
+            while not stop.is_set():
                 try:
-                    eth = pkt[Ether]
-                    ethtxt = f"  ETH  {eth.src} → {eth.dst}\n"
-                except Exception:
-                    pass
-
-                iptxt = f"  IP   {src} → {dst}  TTL={getattr(ip,'ttl', '?')}\n"
-
-                if TCP in pkt:
-                    tcp = pkt[TCP]
-                    tcptxt = (
-                        f"  TCP  {getattr(tcp,'sport','?')} → {getattr(tcp,'dport','?')}\n"
-                        f"       SEQ={getattr(tcp,'seq','?')} ACK={getattr(tcp,'ack','?')} WIN={getattr(tcp,'window','?')}\n"
-                        f"       FLAGS={getattr(tcp,'flags','?')}\n"
-                    )
-                else:
-                    tcptxt = ''
-
-                payload_txt = ''
-                if Raw in pkt:
-                    payload = pkt[Raw].load
-                    try:
-                        payload_hex = binascii.hexlify(payload).decode()
-                    except Exception:
-                        payload_hex = str(payload)
-                    try:
-                        payload_ascii = payload.decode(errors='replace')
-                    except Exception:
-                        payload_ascii = str(payload)
-                    payload_txt = f"  PAYLOAD ({len(payload)} bytes)\n  HEX : {payload_hex}\n  ASCII: {payload_ascii}\n"
-                else:
-                    payload_txt = "  PAYLOAD: <none>\n"
-
-                # Add header
-                details.append(f"[{ts}] [{direction}] PACKET\n")
-                if ethtxt:
-                    details.append(ethtxt)
-                details.append(iptxt)
-                if tcptxt:
-                    details.append(tcptxt)
-                details.append(payload_txt)
-
-                # Full scapy dump (no color)
+                    ready, _, _ = select.select([sock], [], [], 0.2)
+                except (ValueError, OSError, TypeError):
+                    # Some pcap-backed sockets are not selectable; fall back to blocking reads
+                    ready = [sock]
+                if not ready:
+                    continue
+                _cls, data, ts = sock.recv_raw(65535)
+                if data:
+                    on_frame(ts, data)
+        except Exception as e:
+            if not stop.is_set():
                 try:
-                    scapy_dump = pkt.show(dump=True)
-                    details.append("\n-- Scapy dump --\n")
-                    details.append(scapy_dump)
+                    self.error_occurred.emit(f"Capture reader error: {e}")
                 except Exception:
                     pass
+        finally:
+            self.pipeline.flush()
 
-                full = "".join(details)
-            else:
-                full = f"[{ts}] [UNK] PACKET\n" + pkt.show(dump=True)
-
-            # Emit and optionally log
-            self._emit_and_maybe_log(full, pkt=pkt)
-        except Exception as e:
-            try:
-                self.error_occurred.emit(f"Packet processing error: {e}")
-            except Exception:
-                pass
+    def is_capturing(self) -> bool:
+        return self._raw_socket is not None or self._sniffer is not None or self._dumpcap_proc is not None
 
     def start_capture(self, filter_str: str = "", iface: str = None):
         """Start capturing packets.
@@ -304,7 +236,7 @@ class PacketCaptureWorker(QObject):
             self.error_occurred.emit(f"Scapy not available: {self._scapy_error}")
             return
 
-        if self._sniffer is not None:
+        if self.is_capturing():
             # already running
             return
 
@@ -320,8 +252,16 @@ class PacketCaptureWorker(QObject):
         except Exception:
             is_posix = False
 
-        # Helper to try AsyncSniffer
+        # Helper to try the raw socket reader, then AsyncSniffer
         def try_async():
+            try:
+                return self._start_raw_listen(filter_str), None
+            except Exception as e:
+                self._raw_socket = None
+                try:
+                    self.packet_captured.emit(f"DEBUG: raw listen socket unavailable ({e}), using AsyncSniffer")
+                except Exception:
+                    pass
             try:
                 kwargs = {'prn': self._packet_callback, 'filter': filter_str, 'store': False}
                 if self._iface:
@@ -390,6 +330,18 @@ class PacketCaptureWorker(QObject):
             return
 
         try:
+            # Stop raw socket reader if running
+            if self._raw_socket is not None:
+                self._stop_event.set()
+                if self._raw_thread is not None:
+                    self._raw_thread.join(timeout=2)
+                    self._raw_thread = None
+                try:
+                    self._raw_socket.close()
+                except Exception:
+                    pass
+                self._raw_socket = None
+
             # Stop AsyncSniffer if running
             if self._sniffer is not None:
                 try:
@@ -434,6 +386,8 @@ class PacketCaptureWorker(QObject):
                     pass
                 finally:
                     self._fifo_path = None
+
+            self.pipeline.flush()
         except Exception as e:
             self.error_occurred.emit(f"Failed to stop sniffer: {e}")
 
@@ -489,6 +443,7 @@ class PacketCaptureWorker(QObject):
                 time.sleep(0.05)
 
             from scapy.utils import RawPcapReader
+            on_frame = self.pipeline.on_frame
             while not self._stop_event.is_set():
                 try:
                     reader = RawPcapReader(self._fifo_path)
@@ -502,14 +457,8 @@ class PacketCaptureWorker(QObject):
                         if self._stop_event.is_set():
                             break
                         try:
-                            # build scapy packet from raw bytes
-                            from scapy.all import Ether
-                            pkt = Ether(pkt_data)
-                            # dispatch to processing
-                            try:
-                                self._packet_callback(pkt)
-                            except Exception:
-                                pass
+                            ts = pkt_meta.sec + pkt_meta.usec / 1e6 if hasattr(pkt_meta, 'sec') else None
+                            on_frame(ts, pkt_data, getattr(pkt_meta, 'wirelen', None))
                         except Exception:
                             pass
                 except Exception:
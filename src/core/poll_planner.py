@@ -0,0 +1,131 @@
+"""
+Poll planning for periodically read signals (watch list).
+
+Groups the signals due for a poll by device so each device receives one
+batched read request per cycle, and skips signals whose previous read has
+not been answered yet instead of piling more requests onto a slow device.
+"""
+import time
+from dataclasses import dataclass, asdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+@dataclass
+class DevicePollStats:
+    """Per-device polling counters."""
+    cycles: int = 0            # cycles in which a batch was sent
+    requested: int = 0         # signals requested in total
+    completed: int = 0         # responses received
+    skipped: int = 0           # signals skipped because a read was still outstanding
+    overruns: int = 0          # cycles that started with reads still outstanding
+    timeouts: int = 0          # outstanding reads given up on
+    last_batch: int = 0
+    last_latency_ms: Optional[float] = None
+    max_latency_ms: Optional[float] = None
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class PollPlanner:
+    """
+    Plans poll cycles over items exposing `device_name` and `watch_id`
+    (e.g. `WatchedSignal`).
+
+    Not thread-safe; intended to be driven from a single (GUI) thread.
+    """
+
+    def __init__(self, timeout_s: float = 10.0):
+        self.timeout_s = timeout_s
+        # watch_id -> (device_name, sent_ts)
+        self._outstanding: Dict[str, Tuple[str, float]] = {}
+        self._stats: Dict[str, DevicePollStats] = {}
+
+    def _device_stats(self, device_name: str) -> DevicePollStats:
+        stats = self._stats.get(device_name)
+        if stats is None:
+            stats = self._stats[device_name] = DevicePollStats()
+        return stats
+
+    def plan(self, items: Iterable, now: Optional[float] = None) -> Dict[str, List]:
+        """Return {device_name: [items to read]} for this cycle."""
+        now = time.time() if now is None else now
+        self._expire(now)
+
+        batches: Dict[str, List] = {}
+        overrun = set()
+        outstanding = self._outstanding
+        for item in items:
+            device_name = item.device_name
+            if item.watch_id in outstanding:
+                self._device_stats(device_name).skipped += 1
+                overrun.add(device_name)
+                continue
+            batch = batches.get(device_name)
+            if batch is None:
+                batch = batches[device_name] = []
+            batch.append(item)
+
+        for device_name in overrun:
+            self._device_stats(device_name).overruns += 1
+        for device_name, batch in batches.items():
+            stats = self._device_stats(device_name)
+            stats.cycles += 1
+            stats.requested += len(batch)
+            stats.last_batch = len(batch)
+        return batches
+
+    def mark_sent(self, device_name: str, watch_ids: Iterable[str], now: Optional[float] = None):
+        now = time.time() if now is None else now
+        for watch_id in watch_ids:
+            self._outstanding[watch_id] = (device_name, now)
+
+    def complete(self, watch_id: str, now: Optional[float] = None) -> Optional[float]:
+        """Mark a read as answered; returns its latency in ms if it was outstanding."""
+        entry = self._outstanding.pop(watch_id, None)
+        if entry is None:
+            return None
+        device_name, sent = entry
+        latency_ms = ((time.time() if now is None else now) - sent) * 1000.0
+        stats = self._device_stats(device_name)
+        stats.completed += 1
+        stats.last_latency_ms = latency_ms
+        if stats.max_latency_ms is None or latency_ms > stats.max_latency_ms:
+            stats.max_latency_ms = latency_ms
+        return latency_ms
+
+    def forget(self, watch_id: str):
+        """Drop any outstanding read for a signal (e.g. removed from the list)."""
+        self._outstanding.pop(watch_id, None)
+
+    def clear(self):
+        self._outstanding.clear()
+
+    def _expire(self, now: float):
+        if not self._outstanding:
+            return
+        limit = now - self.timeout_s
+        expired = [wid for wid, (_, sent) in self._outstanding.items() if sent < limit]
+        for watch_id in expired:
+            device_name, _ = self._outstanding.pop(watch_id)
+            self._device_stats(device_name).timeouts += 1
+
+    def is_outstanding(self, watch_id: str) -> bool:
+        return watch_id in self._outstanding
+
+    def outstanding_count(self, device_name: Optional[str] = None) -> int:
+        if device_name is None:
+            return len(self._outstanding)
+        return sum(1 for dev, _ in self._outstanding.values() if dev == device_name)
+
+    def stats(self) -> Dict[str, dict]:
+        """Per-device statistics including the current outstanding count."""
+        per_device = {dev: 0 for dev in self._stats}
+        for dev, _ in self._outstanding.values():
+            per_device[dev] = per_device.get(dev, 0) + 1
+        result = {}
+        for dev, stats in self._stats.items():
+            d = stats.to_dict()
+            d['outstanding'] = per_device.get(dev, 0)
+            result[dev] = d
+        return result
@@ -0,0 +1,347 @@
+"""
+Runtime profiling
+Wall-clock stack sampling of every thread, written as collapsed stacks
+
+A daemon thread takes `sys._current_frames()` every `interval` seconds and
+counts the Python stack of each thread (device workers, the script
+scheduler, the GUI thread). Nothing is hooked into the profiled code, so
+the cost is one stack walk per thread per sample and the sampler can stay
+on for a few minutes in production; the report states the measured cost.
+
+Threads parked in a wait (queue get, condition wait, select) are counted as
+idle and left out of the stacks, so the output shows where work happens.
+So is a thread whose innermost Python frame is calling a Qt event loop
+(`app.exec()`, `dialog.exec_()`): the GUI thread waiting for events has
+`main` on top of its stack, while a busy one has the slot being run.
+Blocking C calls (sleep, socket reads) do look busy to a stack sampler, so
+the report also gives each thread's CPU time where the OS provides it.
+
+Output, written on stop to ~/.scada_scout/profiles/:
+- `profile-<stamp>.collapsed`: `thread;frame;frame count` lines, the input
+  format of flamegraph.pl, speedscope and inferno.
+- `profile-<stamp>.txt`: per-function inclusive/self time estimated from
+  the sample counts, the polling/read/UI-update hot paths first.
+
+Started from View → Start Profiling, or for a fixed time with
+SCADASCOUT_PROFILE=1 (SCADASCOUT_PROFILE_SECONDS, default 300;
+SCADASCOUT_PROFILE_INTERVAL_MS, default 10).
+"""
+import datetime
+import dis
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PROFILE_ENV = "SCADASCOUT_PROFILE"
+PROFILE_DIR = os.path.expanduser("~/.scada_scout/profiles")
+DEFAULT_INTERVAL = 0.01
+DEFAULT_SECONDS = 300
+
+# Reported first: polling, reads, signal fan-out and model updates
+HOT_PATHS = ('read_signal', 'read_signals', '_execute_polling', '_on_signal_update',
+             '_on_signal_updated', 'update_signal', 'flush')
+
+# (file, function) of the innermost frame while a thread is blocked
+_IDLE_LEAVES = {
+    ('threading.py', 'wait'),
+    ('threading.py', '_wait_for_tstate_lock'),
+    ('queue.py', 'get'),
+    ('selectors.py', 'select'),
+    ('socket.py', 'accept'),
+}
+
+# Methods that enter a Qt event loop in C++
+_EVENT_LOOP_CALLS = {'exec', 'exec_'}
+
+_SRC_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_DEFAULT_THREAD_NAME = re.compile(r"^Thread-\d+ ?")
+
+
+def _frame_label(code) -> Tuple[str, bool]:
+    """('module:function', is_idle_leaf) for a code object."""
+    path = code.co_filename
+    base = os.path.basename(path)
+    if path.startswith(_SRC_ROOT):
+        module = "src." + os.path.relpath(path, _SRC_ROOT)[:-3].replace(os.sep, ".")
+    else:
+        module = base[:-3] if base.endswith(".py") else base
+    name = getattr(code, 'co_qualname', code.co_name)
+    return f"{module}:{name}", (base, code.co_name) in _IDLE_LEAVES
+
+
+def _calls_event_loop(code, lasti: int) -> bool:
+    """True if the instruction at `lasti` of `code` calls `.exec()` / `.exec_()`."""
+    name = None
+    for ins in dis.get_instructions(code):
+        if ins.offset > lasti:
+            break
+        if ins.opname in ('LOAD_ATTR', 'LOAD_METHOD'):
+            name = ins.argval
+        elif ins.opname.startswith('CALL') and ins.offset < lasti:
+            name = None  # an earlier call consumed it
+    return name in _EVENT_LOOP_CALLS
+
+
+def _thread_cpu_seconds(ident: int) -> Optional[float]:
+    """CPU time consumed by a thread so far (POSIX only)."""
+    try:
+        return time.clock_gettime(time.pthread_getcpuclockid(ident))
+    except (AttributeError, OSError, ValueError, OverflowError):
+        return None
+
+
+def _cpu_by_thread() -> Dict[int, Tuple[str, float]]:
+    out = {}
+    for t in threading.enumerate():
+        cpu = _thread_cpu_seconds(t.ident)
+        if cpu is not None:
+            out[t.ident] = (_thread_label(t.name), cpu)
+    return out
+
+
+def _thread_label(name: str) -> str:
+    # "Thread-12 (run)" -> "Thread(run)": unnamed threads of one kind merge
+    name = _DEFAULT_THREAD_NAME.sub("Thread", name)
+    return name.replace(";", ",")
+
+
+class SamplingProfiler:
+    """Samples all thread stacks on a background thread; see module docstring."""
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL):
+        self.interval = interval
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._labels: Dict[object, Tuple[str, bool]] = {}
+        # (code, lasti) -> whether that call site enters an event loop
+        self._loop_calls: Dict[Tuple[object, int], bool] = {}
+        self._thread_names: Dict[int, str] = {}
+        self._reset()
+
+    def _reset(self):
+        self._stacks: Dict[Tuple[str, Tuple[str, ...]], int] = {}
+        self.samples = 0
+        self.idle_samples = 0
+        self.sampling_seconds = 0.0
+        self.cpu_seconds: Dict[str, float] = {}
+        self.started: Optional[float] = None
+        self.stopped: Optional[float] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, interval: Optional[float] = None, duration: Optional[float] = None,
+              save_to: Optional[str] = None) -> bool:
+        """
+        Start sampling (clears the previous profile). With `duration` the
+        sampler stops by itself and, if `save_to` is given, writes the files.
+        """
+        if self.running:
+            return False
+        if interval:
+            self.interval = interval
+        self._reset()
+        self._stop.clear()
+        self.started = time.time()
+        self._thread = threading.Thread(target=self._run, args=(duration, save_to),
+                                        name="ProfileSampler", daemon=True)
+        self._thread.start()
+        logger.info(f"Profiling started ({self.interval * 1000:.0f} ms interval)")
+        return True
+
+    def stop(self):
+        thread = self._thread
+        if thread is None:
+            return
+        self._stop.set()
+        if thread is not threading.current_thread():
+            thread.join(timeout=2.0)
+
+    def _run(self, duration: Optional[float], save_to: Optional[str]):
+        own = threading.get_ident()
+        cpu_start = _cpu_by_thread()
+        deadline = time.perf_counter() + duration if duration else None
+        next_at = time.perf_counter()
+        while not self._stop.is_set():
+            t0 = time.perf_counter()
+            self._sample(own)
+            t1 = time.perf_counter()
+            self.sampling_seconds += t1 - t0
+            if deadline is not None and t1 >= deadline:
+                break
+            next_at += self.interval
+            if next_at < t1:
+                next_at = t1  # fell behind; skip rather than burst
+            self._stop.wait(next_at - t1)
+        self.stopped = time.time()
+        for ident, (name, cpu) in _cpu_by_thread().items():
+            if ident != own:
+                used = cpu - cpu_start.get(ident, (name, 0.0))[1]
+                self.cpu_seconds[name] = self.cpu_seconds.get(name, 0.0) + used
+        logger.info(f"Profiling stopped after {self.samples} samples")
+        if save_to and not self._stop.is_set():
+            try:
+                self.save(save_to)
+            except Exception as e:
+                logger.warning(f"Could not write profile: {e}")
+
+    def _sample(self, own: int):
+        labels = self._labels
+        names = self._thread_names
+        stacks = self._stacks
+        loop_calls = self._loop_calls
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            code = frame.f_code
+            info = labels.get(code) or labels.setdefault(code, _frame_label(code))
+            site = (code, frame.f_lasti)
+            in_loop = loop_calls.get(site)
+            if in_loop is None:
+                in_loop = loop_calls[site] = _calls_event_loop(code, frame.f_lasti)
+            if info[1] or in_loop:
+                self.idle_samples += 1
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                info = labels.get(code) or labels.setdefault(code, _frame_label(code))
+                stack.append(info[0])
+                frame = frame.f_back
+            stack.reverse()
+            name = names.get(ident)
+            if name is None:
+                names = self._refresh_thread_names()
+                # Not a threading.Thread; remember the fallback so we refresh once
+                name = names.setdefault(ident, f"Thread-{ident}")
+            key = (name, tuple(stack))
+            stacks[key] = stacks.get(key, 0) + 1
+        self.samples += 1
+
+    def _refresh_thread_names(self) -> Dict[int, str]:
+        self._thread_names = {t.ident: _thread_label(t.name) for t in threading.enumerate()}
+        return self._thread_names
+
+    # ---- Results ----
+
+    def stacks(self) -> Dict[Tuple[str, Tuple[str, ...]], int]:
+        return dict(self._stacks)
+
+    def collapsed(self) -> str:
+        """Collapsed stacks, one `thread;frame;...;frame count` line each."""
+        lines = [f"{';'.join((thread,) + stack)} {count}"
+                 for (thread, stack), count in sorted(self.stacks().items())]
+        return "\n".join(lines) + ("\n" if lines else "")
+
+    def functions(self) -> List[Tuple[str, int, int]]:
+        """[(function, inclusive samples, self samples)], most inclusive first."""
+        inclusive: Dict[str, int] = {}
+        own: Dict[str, int] = {}
+        for (_, stack), count in self.stacks().items():
+            for label in set(stack):
+                inclusive[label] = inclusive.get(label, 0) + count
+            own[stack[-1]] = own.get(stack[-1], 0) + count
+        return sorted(((f, n, own.get(f, 0)) for f, n in inclusive.items()), key=lambda r: (-r[1], r[0]))
+
+    def threads(self) -> List[Tuple[str, int]]:
+        per_thread: Dict[str, int] = {}
+        for (thread, _), count in self.stacks().items():
+            per_thread[thread] = per_thread.get(thread, 0) + count
+        return sorted(per_thread.items(), key=lambda r: -r[1])
+
+    def format_report(self, top: int = 40) -> str:
+        ms = self.interval * 1000
+        end = self.stopped or time.time()
+        wall = (end - self.started) if self.started else 0.0
+        lines = ["RUNTIME PROFILE", "-" * 80]
+        if self.started:
+            stamp = datetime.datetime.fromtimestamp(self.started).strftime('%Y-%m-%d %H:%M:%S')
+            lines.append(f"Started {stamp}, {wall:.1f} s, {self.samples} samples every {ms:.0f} ms")
+        if wall > 0:
+            lines.append(f"Sampler cost: {self.sampling_seconds / wall * 100:.2f}% of one core "
+                         f"({self.sampling_seconds / max(self.samples, 1) * 1e6:.0f} us per sample)")
+        lines.append(f"Idle thread samples skipped: {self.idle_samples}")
+        lines.append("")
+        # Sampled time includes blocking C calls (sleep, socket reads); CPU time does not
+        lines.append("Threads")
+        lines.append(f"  {'thread':<50} {'samples':>8} {'busy s':>9} {'cpu s':>9}")
+        for thread, count in self.threads():
+            cpu = self.cpu_seconds.get(thread)
+            cpu_text = f"{cpu:>9.2f}" if cpu is not None else f"{'-':>9}"
+            lines.append(f"  {thread:<50} {count:>8} {count * ms / 1000:>9.2f} {cpu_text}")
+
+        functions = self.functions()
+        header = f"  {'function':<62} {'incl s':>8} {'self s':>8}"
+
+        def _row(name, incl, own):
+            return f"  {name[-62:]:<62} {incl * ms / 1000:>8.2f} {own * ms / 1000:>8.2f}"
+
+        lines.append("")
+        lines.append("Hot paths")
+        lines.append(header)
+        for name, incl, own in functions:
+            if name.rsplit(".", 1)[-1].rsplit(":", 1)[-1] in HOT_PATHS:
+                lines.append(_row(name, incl, own))
+        lines.append("")
+        lines.append(f"Top {top} functions (inclusive)")
+        lines.append(header)
+        for name, incl, own in functions[:top]:
+            lines.append(_row(name, incl, own))
+        return "\n".join(lines) + "\n"
+
+    def save(self, directory: str = PROFILE_DIR) -> Tuple[str, str]:
+        """Write the collapsed stacks and the text report; returns both paths."""
+        os.makedirs(directory, exist_ok=True)
+        stamp = datetime.datetime.fromtimestamp(self.started or time.time()).strftime('%Y%m%d-%H%M%S')
+        base = os.path.join(directory, f"profile-{stamp}")
+        with open(base + ".collapsed", "w", encoding="utf-8") as f:
+            f.write(self.collapsed())
+        with open(base + ".txt", "w", encoding="utf-8") as f:
+            f.write(self.format_report())
+        logger.info(f"Profile written to {base}.collapsed / .txt")
+        return base + ".collapsed", base + ".txt"
+
+
+PROFILER = SamplingProfiler()
+
+
+def start_from_env() -> bool:
+    """Start the shared profiler when SCADASCOUT_PROFILE is set."""
+    if os.environ.get(PROFILE_ENV, "") in ("", "0"):
+        return False
+    try:
+        interval = float(os.environ.get("SCADASCOUT_PROFILE_INTERVAL_MS", "")) / 1000
+    except ValueError:
+        interval = DEFAULT_INTERVAL
+    try:
+        seconds = float(os.environ.get("SCADASCOUT_PROFILE_SECONDS", DEFAULT_SECONDS))
+    except ValueError:
+        seconds = DEFAULT_SECONDS
+    return PROFILER.start(interval, duration=seconds or None, save_to=PROFILE_DIR)
+
+
+def stop_and_save(directory: str = PROFILE_DIR) -> Optional[Tuple[str, str]]:
+    """Stop the shared profiler if it is running and write its files."""
+    if not PROFILER.running:
+        return None
+    PROFILER.stop()
+    return PROFILER.save(directory)
+
+
+def last_report(directory: str = PROFILE_DIR) -> Optional[str]:
+    """The most recent text report, for the diagnostics export."""
+    try:
+        reports = sorted(f for f in os.listdir(directory) if f.startswith("profile-") and f.endswith(".txt"))
+        if not reports:
+            return None
+        with open(os.path.join(directory, reports[-1]), encoding="utf-8") as f:
+            return f.read()
+    except OSError:
+        return None
@@ -0,0 +1,72 @@
+"""
+Reading .mss project bundles without the GUI.
+
+A bundle is a zip holding devices.json (device configs, SCD paths relative
+to the bundle), watchlist.json, events.json, project.json (metadata) and
+optionally the saved window layout.
+"""
+import json
+import logging
+import os
+import shutil
+import zipfile
+from typing import Dict
+
+logger = logging.getLogger(__name__)
+
+
+def extract_project(filepath: str, extract_base: str) -> Dict[str, object]:
+    """
+    Unpack a .mss bundle into `extract_base` (replacing its contents) and
+    make device resource paths absolute.
+
+    Returns {'metadata': dict, 'devices': path|None, 'watchlist': path|None,
+    'events': path|None, 'root': extract_base}.
+    """
+    if os.path.exists(extract_base):
+        shutil.rmtree(extract_base)
+    os.makedirs(extract_base, exist_ok=True)
+
+    with zipfile.ZipFile(filepath, 'r') as zipf:
+        zipf.extractall(extract_base)
+
+    metadata = {}
+    project_json = os.path.join(extract_base, "project.json")
+    if os.path.exists(project_json):
+        with open(project_json, 'r') as f:
+            metadata = json.load(f)
+
+    def _member(name):
+        path = os.path.join(extract_base, name)
+        return path if os.path.exists(path) else None
+
+    devices_path = _member("devices.json")
+    if devices_path:
+        fix_device_paths(devices_path, extract_base)
+
+    return {
+        'metadata': metadata,
+        'devices': devices_path,
+        'watchlist': _member("watchlist.json"),
+        'events': _member("events.json"),
+        'root': extract_base,
+    }
+
+
+def fix_device_paths(devices_json_path: str, bundle_root: str):
+    """
+    Relocates relative paths in loaded config to absolute paths in the extraction dir.
+    """
+    with open(devices_json_path, 'r') as f:
+        data = json.load(f)
+
+    configs = data.get('devices', []) if isinstance(data, dict) else data
+    for cfg in configs:
+        scd_path = cfg.get('scd_file_path')
+        if scd_path and not os.path.isabs(scd_path):
+            # It's a bundle-relative path like "resources/file.scd"
+            abs_path = os.path.abspath(os.path.join(bundle_root, scd_path))
+            cfg['scd_file_path'] = abs_path
+
+    with open(devices_json_path, 'w') as f:
+        json.dump(data, f, indent=4)
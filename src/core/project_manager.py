@@ -7,6 +7,8 @@ import tempfile
 from typing import Optional, List
 from PySide6.QtCore import QObject, Signal as QtSignal
 
+from src.core.project_bundle import extract_project, fix_device_paths
+
 logger = logging.getLogger(__name__)
 
 class ProjectManager(QObject):
@@ -109,29 +111,18 @@ class ProjectManager(QObject):
             # Use a persistent extraction directory for resources
             # We'll use a hidden folder in the user's home or local app data
             extract_base = os.path.expanduser("~/.scada_scout/projects/active")
-            if os.path.exists(extract_base):
-                shutil.rmtree(extract_base)
-            os.makedirs(extract_base, exist_ok=True)
-            
-            with zipfile.ZipFile(filepath, 'r') as zipf:
-                zipf.extractall(extract_base)
+            bundle = extract_project(filepath, extract_base)
             
             # 1. Load Metadata
             self.progress_updated.emit(30, "Restoring configuration...")
-            project_json = os.path.join(extract_base, "project.json")
-            metadata = {}
-            if os.path.exists(project_json):
-                with open(project_json, 'r') as f:
-                    metadata = json.load(f)
+            metadata = bundle['metadata']
             
             # 2. Restore Devices
+            # (paths in devices.json already point to the current extraction dir,
+            # so the project stays portable even if it was moved)
             self.progress_updated.emit(50, "Restoring devices...")
-            devices_path = os.path.join(extract_base, "devices.json")
-            if os.path.exists(devices_path):
-                # Update paths in devices.json to point to the current extraction dir
-                # This ensures portability even if the project was moved
-                self._fix_device_paths(devices_path, extract_base)
-                self.device_manager.load_configuration(devices_path)
+            if bundle['devices']:
+                self.device_manager.load_configuration(bundle['devices'])
             
             # 3. Restore Watchlist
             self.progress_updated.emit(70, "Restoring watch list...")
@@ -223,16 +214,4 @@ class ProjectManager(QObject):
         """
         Relocates relative paths in loaded config to absolute paths in the extraction dir.
         """
-        with open(devices_json_path, 'r') as f:
-            data = json.load(f)
-            
-        configs = data.get('devices', [])
-        for cfg in configs:
-            scd_path = cfg.get('scd_file_path')
-            if scd_path and not os.path.isabs(scd_path):
-                # It's a bundle-relative path like "resources/file.scd"
-                abs_path = os.path.abspath(os.path.join(bundle_root, scd_path))
-                cfg['scd_file_path'] = abs_path
-                
-        with open(devices_json_path, 'w') as f:
-            json.dump(data, f, indent=4)
+        fix_device_paths(devices_json_path, bundle_root)
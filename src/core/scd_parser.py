@@ -3,7 +3,7 @@ from typing import Optional, List, Dict, Any
 import os
 import logging
 
-from src.models.device_models import Node, Signal, SignalType, SignalQuality
+from src.models.device_models import LazyNode, Node, Signal, SignalType, SignalQuality
 
 logger = logging.getLogger(__name__)
 
@@ -97,10 +97,13 @@ class SCDParser:
         except Exception as e:
             logger.error(f"Failed to parse SCD file: {e}")
 
-    def get_structure(self, ied_name: Optional[str] = None) -> Node:
+    def get_structure(self, ied_name: Optional[str] = None, lazy: bool = False) -> Node:
         """
         Builds a Node hierarchy (IED -> LD -> LN -> DO) from the file.
         If ied_name is None, picks the first IED found.
+
+        With lazy=True only the IED/LD/LN skeleton is built; each LN is a
+        `LazyNode` that expands its DOs/DAs when first accessed.
         """
         if self.root is None:
             return Node(name="Error_No_SCD")
@@ -157,119 +160,134 @@ class SCDParser:
                 inst = ln.get("inst", "")
                 ln_class_or_inst = f"{prefix}{ln_class}{inst}"
                 
-                ln_node = Node(name=ln_class_or_inst, description=f"Logical Node ({ln_class})")
+                ln_path = f"{ld_name}/{ln_class_or_inst}"
+                if lazy:
+                    # DOs/DAs and control blocks are built when the LN is first opened
+                    ln_node = LazyNode(
+                        name=ln_class_or_inst, description=f"Logical Node ({ln_class})", path=ln_path,
+                        loader=lambda node, ln=ln, ld_name=ld_name, ln0=ln0_element: self._build_ln(node, ln, ld_name, ln0))
+                else:
+                    ln_node = Node(name=ln_class_or_inst, description=f"Logical Node ({ln_class})")
+                    self._build_ln(ln_node, ln, ld_name, ln0_element)
                 ld_node.children.append(ln_node)
-                
-                # Get LN Type for expansion
-                ln_type_id = ln.get("lnType")
-                
-                if ln_type_id:
-                    # Build the path prefix for this LN: "LD_NAME/LN_NAME"
-                    ln_path = f"{ld_name}/{ln_class_or_inst}"
-                    
-                    # Expand the LN Type to get DOs and DAs, passing ld_name
-                    self._expand_ln_type_with_path(ln_node, ln_type_id, ln_path, ld_name, depth=0)
-                    
-                # --- Advanced Features: DataSets, Reporting, GOOSE ---
-                
-                # 1. DataSets Branch
-                dataset_elements = ln.findall("scl:DataSet", self.ns) + ln.findall("DataSet")
-                if dataset_elements:
-                    datasets_root = Node(name="DataSets", description="Container")
-                    
-                    for ds in dataset_elements:
-                        ds_name = ds.get("name")
-                        ds_node = Node(name=ds_name, description=f"Type=DataSet")
-                        datasets_root.children.append(ds_node)
-                        
-                        # Parse FCDAs (Entries)
-                        for fcda in ds.findall("scl:FCDA", self.ns) + ds.findall("FCDA"):
-                            ld_inst = fcda.get("ldInst", "")
-                            prefix = fcda.get("prefix", "")
-                            ln_class = fcda.get("lnClass", "")
-                            ln_inst = fcda.get("lnInst", "")
-                            do_name = fcda.get("doName", "")
-                            da_name = fcda.get("daName", "")
-                            fc = fcda.get("fc", "")
-                            
-                            # Construct a readable name
-                            entry_name = f"{prefix}{ln_class}{ln_inst}.{do_name}.{da_name} [{fc}]"
-                            if ld_inst:
-                                entry_name = f"{ld_inst}/{entry_name}"
-                                
-                            ds_entry_node = Node(name=entry_name, description="Type=FCDA")
-                            ds_node.children.append(ds_entry_node)
-                    
-                    ln_node.children.append(datasets_root)
-
-                # 2. Reports Branch
-                report_elements = ln.findall("scl:ReportControl", self.ns) + ln.findall("ReportControl")
-                if report_elements:
-                    reports_root = Node(name="Reports", description="Container")
-                    
-                    for rpt in report_elements:
-                        rpt_name = rpt.get("name")
-                        rpt_id = rpt.get("rptID", "")
-                        ds_ref = rpt.get("datSet", "")
-                        buffered = rpt.get("buffered", "false")
-                        buf_tm = rpt.get("bufTm", "")
-                        intg_pd = rpt.get("intgPd", "")
-                        trg_ops = self._attributes_to_kv(rpt.find("scl:TrgOps", self.ns) or rpt.find("TrgOps"))
-                        opt_flds = self._attributes_to_kv(rpt.find("scl:OptFields", self.ns) or rpt.find("OptFields"))
-                        
-                        desc = f"RptID={rpt_id} DataSet={ds_ref} Buf={buffered} Type=Report"
-                        rpt_node = Node(name=rpt_name, description=desc)
-
-                        # Details
-                        self._add_detail_leaf(rpt_node, "RptID", rpt_id)
-                        self._add_detail_leaf(rpt_node, "DataSet", ds_ref)
-                        self._add_detail_leaf(rpt_node, "Buffered", buffered)
-                        self._add_detail_leaf(rpt_node, "BufTm", buf_tm)
-                        self._add_detail_leaf(rpt_node, "IntgPd", intg_pd)
-                        if trg_ops:
-                            self._add_detail_leaf(rpt_node, "TrgOps", trg_ops)
-                        if opt_flds:
-                            self._add_detail_leaf(rpt_node, "OptFields", opt_flds)
-
-                        # DataSet Entries
-                        self._append_dataset_entries(rpt_node, ln, ds_ref, ln0_element)
-
-                        reports_root.children.append(rpt_node)
-                    
-                    ln_node.children.append(reports_root)
-
-                # 3. GOOSE Branch
-                goose_elements = ln.findall("scl:GSEControl", self.ns) + ln.findall("GSEControl")
-                if goose_elements:
-                    goose_root = Node(name="GOOSE", description="Container")
-                    
-                    for gse in goose_elements:
-                        gse_name = gse.get("name")
-                        app_id = gse.get("appID", "")
-                        ds_ref = gse.get("datSet", "")
-                        conf_rev = gse.get("confRev", "")
-                        go_id = gse.get("goID", "")
-                        fixed_offs = gse.get("fixedOffs", "")
-                        
-                        desc = f"AppID={app_id} DataSet={ds_ref} Type=GOOSE"
-                        gse_node = Node(name=gse_name, description=desc)
-
-                        # Details
-                        self._add_detail_leaf(gse_node, "AppID", app_id)
-                        self._add_detail_leaf(gse_node, "DataSet", ds_ref)
-                        self._add_detail_leaf(gse_node, "ConfRev", conf_rev)
-                        self._add_detail_leaf(gse_node, "GoID", go_id)
-                        self._add_detail_leaf(gse_node, "FixedOffs", fixed_offs)
-
-                        # DataSet Entries
-                        self._append_dataset_entries(gse_node, ln, ds_ref, ln0_element)
-
-                        goose_root.children.append(gse_node)
-                    
-                    ln_node.children.append(goose_root)
 
         return root_node
 
+    def _build_ln(self, ln_node: Node, ln, ld_name: str, ln0_element=None) -> None:
+        """Build an LN's DO/DA subtree and its DataSets/Reports/GOOSE branches."""
+        prefix = ln.get("prefix", "")
+        ln_class = ln.get("lnClass", "")
+        inst = ln.get("inst", "")
+        ln_class_or_inst = f"{prefix}{ln_class}{inst}"
+
+        # Get LN Type for expansion
+        ln_type_id = ln.get("lnType")
+
+        if ln_type_id:
+            # Build the path prefix for this LN: "LD_NAME/LN_NAME"
+            ln_path = f"{ld_name}/{ln_class_or_inst}"
+
+            # Expand the LN Type to get DOs and DAs, passing ld_name
+            self._expand_ln_type_with_path(ln_node, ln_type_id, ln_path, ld_name, depth=0)
+
+        # --- Advanced Features: DataSets, Reporting, GOOSE ---
+
+        # 1. DataSets Branch
+        dataset_elements = ln.findall("scl:DataSet", self.ns) + ln.findall("DataSet")
+        if dataset_elements:
+            datasets_root = Node(name="DataSets", description="Container")
+
+            for ds in dataset_elements:
+                ds_name = ds.get("name")
+                ds_node = Node(name=ds_name, description=f"Type=DataSet")
+                datasets_root.children.append(ds_node)
+
+                # Parse FCDAs (Entries)
+                for fcda in ds.findall("scl:FCDA", self.ns) + ds.findall("FCDA"):
+                    ld_inst = fcda.get("ldInst", "")
+                    prefix = fcda.get("prefix", "")
+                    ln_class = fcda.get("lnClass", "")
+                    ln_inst = fcda.get("lnInst", "")
+                    do_name = fcda.get("doName", "")
+                    da_name = fcda.get("daName", "")
+                    fc = fcda.get("fc", "")
+
+                    # Construct a readable name
+                    entry_name = f"{prefix}{ln_class}{ln_inst}.{do_name}.{da_name} [{fc}]"
+                    if ld_inst:
+                        entry_name = f"{ld_inst}/{entry_name}"
+
+                    ds_entry_node = Node(name=entry_name, description="Type=FCDA")
+                    ds_node.children.append(ds_entry_node)
+
+            ln_node.children.append(datasets_root)
+
+        # 2. Reports Branch
+        report_elements = ln.findall("scl:ReportControl", self.ns) + ln.findall("ReportControl")
+        if report_elements:
+            reports_root = Node(name="Reports", description="Container")
+
+            for rpt in report_elements:
+                rpt_name = rpt.get("name")
+                rpt_id = rpt.get("rptID", "")
+                ds_ref = rpt.get("datSet", "")
+                buffered = rpt.get("buffered", "false")
+                buf_tm = rpt.get("bufTm", "")
+                intg_pd = rpt.get("intgPd", "")
+                trg_ops = self._attributes_to_kv(rpt.find("scl:TrgOps", self.ns) or rpt.find("TrgOps"))
+                opt_flds = self._attributes_to_kv(rpt.find("scl:OptFields", self.ns) or rpt.find("OptFields"))
+
+                desc = f"RptID={rpt_id} DataSet={ds_ref} Buf={buffered} Type=Report"
+                rpt_node = Node(name=rpt_name, description=desc)
+
+                # Details
+                self._add_detail_leaf(rpt_node, "RptID", rpt_id)
+                self._add_detail_leaf(rpt_node, "DataSet", ds_ref)
+                self._add_detail_leaf(rpt_node, "Buffered", buffered)
+                self._add_detail_leaf(rpt_node, "BufTm", buf_tm)
+                self._add_detail_leaf(rpt_node, "IntgPd", intg_pd)
+                if trg_ops:
+                    self._add_detail_leaf(rpt_node, "TrgOps", trg_ops)
+                if opt_flds:
+                    self._add_detail_leaf(rpt_node, "OptFields", opt_flds)
+
+                # DataSet Entries
+                self._append_dataset_entries(rpt_node, ln, ds_ref, ln0_element)
+
+                reports_root.children.append(rpt_node)
+
+            ln_node.children.append(reports_root)
+
+        # 3. GOOSE Branch
+        goose_elements = ln.findall("scl:GSEControl", self.ns) + ln.findall("GSEControl")
+        if goose_elements:
+            goose_root = Node(name="GOOSE", description="Container")
+
+            for gse in goose_elements:
+                gse_name = gse.get("name")
+                app_id = gse.get("appID", "")
+                ds_ref = gse.get("datSet", "")
+                conf_rev = gse.get("confRev", "")
+                go_id = gse.get("goID", "")
+                fixed_offs = gse.get("fixedOffs", "")
+
+                desc = f"AppID={app_id} DataSet={ds_ref} Type=GOOSE"
+                gse_node = Node(name=gse_name, description=desc)
+
+                # Details
+                self._add_detail_leaf(gse_node, "AppID", app_id)
+                self._add_detail_leaf(gse_node, "DataSet", ds_ref)
+                self._add_detail_leaf(gse_node, "ConfRev", conf_rev)
+                self._add_detail_leaf(gse_node, "GoID", go_id)
+                self._add_detail_leaf(gse_node, "FixedOffs", fixed_offs)
+
+                # DataSet Entries
+                self._append_dataset_entries(gse_node, ln, ds_ref, ln0_element)
+
+                goose_root.children.append(gse_node)
+
+            ln_node.children.append(goose_root)
+
     def _add_detail_leaf(self, parent_node: Node, label: str, value: Any) -> None:
         """Add a detail leaf node with optional value."""
         if value is None or value == "":
@@ -1,7 +1,13 @@
+import asyncio
+import inspect
 import logging
 import threading
 import time
-from typing import Callable, Dict, Optional
+from typing import Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from src.core.script_scheduler import ScriptScheduler
 
 logger = logging.getLogger(__name__)
 
@@ -41,6 +47,128 @@ class ScriptContext:
             return getattr(sig, 'value', None)
         return getattr(updated, 'value', None)
 
+    # ----------------- Bulk tag access ------------------------------------
+    # Tags are resolved in one pass and grouped per device, so a script
+    # aggregating thousands of values issues one request per device.
+
+    def get_many(self, tag_addresses: Iterable[str], default=None, as_array: bool = False):
+        """Last known values of many tags: {tag: value}, or a float array
+        in the order given (NaN for unknown/non-numeric) with as_array=True."""
+        tags = list(tag_addresses)
+        signals = self._resolve_many(tags)
+        values = {tag: getattr(signals[tag], 'value', default) if tag in signals else default
+                  for tag in tags}
+        return self._as_array(tags, values) if as_array else values
+
+    def read_many(self, tag_addresses: Iterable[str], timeout: float = 0.0, as_array: bool = False):
+        """Force a read of many tags with one batched task per device.
+
+        Adapters that support it (Modbus TCP) answer a task with one request
+        per contiguous address span; others still read tag by tag.
+
+        Devices that answer asynchronously report through `signal_updated`
+        (or `signal_unchanged` when the value did not change);
+        with `timeout` > 0 the call waits up to that long for all of them,
+        otherwise (like `read`) their last known values are returned.
+        """
+        tags = list(tag_addresses)
+        signals = self._resolve_many(tags)
+        by_device: Dict[str, List[object]] = {}
+        seen = set()
+        for tag, sig in signals.items():
+            device_name, _ = self._dm.parse_unique_address(tag)
+            if device_name and id(sig) not in seen:
+                seen.add(id(sig))
+                by_device.setdefault(device_name, []).append(sig)
+
+        pending = {}
+        done = threading.Event()
+        lock = threading.Lock()
+
+        def _on_update(_device_name, signal):
+            with lock:
+                if pending.pop(id(signal), None) is not None and not pending:
+                    done.set()
+
+        can_wait = timeout and timeout > 0 and hasattr(self._dm, 'on')
+        if can_wait:
+            self._dm.on('signal_updated', _on_update)
+            self._dm.on('signal_unchanged', _on_update)
+        try:
+            if can_wait:
+                # Register every device up front: a fast device must not empty
+                # `pending` before the next one has been dispatched.
+                with lock:
+                    for device_signals in by_device.values():
+                        pending.update((id(sig), sig) for sig in device_signals)
+            for device_name, device_signals in by_device.items():
+                if hasattr(self._dm, 'read_signals'):
+                    result = self._dm.read_signals(device_name, device_signals)
+                else:
+                    result = [self._dm.read_signal(device_name, sig) for sig in device_signals]
+                if result is not None and can_wait:
+                    with lock:
+                        for sig in device_signals:
+                            pending.pop(id(sig), None)
+            if can_wait:
+                with lock:
+                    if not pending:
+                        done.set()
+                done.wait(timeout)
+        finally:
+            if can_wait:
+                self._dm.off('signal_updated', _on_update)
+                self._dm.off('signal_unchanged', _on_update)
+
+        values = {tag: getattr(signals[tag], 'value', None) if tag in signals else None for tag in tags}
+        return self._as_array(tags, values) if as_array else values
+
+    def set_many(self, values: Dict[str, object]) -> Dict[str, bool]:
+        """Write many tags ({tag: value}); returns {tag: success}.
+
+        Writes are grouped per device and, where the adapter supports it
+        (Modbus TCP), sent as one request per contiguous address span; tags
+        that only resolve to a control DO fall back to `set` (SELECT/OPERATE).
+        """
+        signals = self._resolve_many(list(values))
+        results: Dict[str, bool] = {}
+        by_device: Dict[str, List[str]] = {}
+        for tag in values:
+            device_name, _ = self._dm.parse_unique_address(tag)
+            if tag not in signals or not device_name:
+                results[tag] = self.set(tag, values[tag])
+            else:
+                by_device.setdefault(device_name, []).append(tag)
+
+        for device_name, tags in by_device.items():
+            writes = [(signals[tag], values[tag]) for tag in tags]
+            if hasattr(self._dm, 'write_signals'):
+                oks = self._dm.write_signals(device_name, writes)
+            else:
+                oks = [self._dm.write_signal(device_name, sig, value) for sig, value in writes]
+            results.update(zip(tags, (bool(ok) for ok in oks)))
+        return results
+
+    def _resolve_many(self, tags: List[str]) -> Dict[str, object]:
+        if hasattr(self._dm, 'resolve_unique_addresses'):
+            return self._dm.resolve_unique_addresses(tags)
+        resolved = {}
+        for tag in tags:
+            sig = self._dm.get_signal_by_unique_address(tag)
+            if sig:
+                resolved[tag] = sig
+        return resolved
+
+    @staticmethod
+    def _as_array(tags: List[str], values: Dict[str, object]) -> np.ndarray:
+        out = np.full(len(tags), np.nan)
+        for i, tag in enumerate(tags):
+            try:
+                out[i] = float(values[tag])
+            except (TypeError, ValueError):
+                pass
+        return out
+
     # ----------------- Variable binding API for user scripts -------------
     def bind_variable(self, name: str, tag_address: str, mode: str = 'on_demand', interval_ms: Optional[int] = None):
         """Bind a named variable to a device signal.
@@ -227,12 +355,20 @@ class ScriptContext:
 
 
 class UserScriptManager:
-    """Runs user-supplied Python scripts in background threads."""
-    def __init__(self, device_manager_core, event_logger=None):
+    """Runs user-supplied Python scripts in the background.
+
+    `tick(ctx)` scripts with a positive interval (plain or `async def`) are
+    periodic jobs on the shared `ScriptScheduler`; `loop`/`main` and raw
+    scripts own their loop and keep a dedicated thread.
+    """
+    def __init__(self, device_manager_core, event_logger=None, scheduler: Optional[ScriptScheduler] = None):
         self._dm = device_manager_core
         self._event_logger = event_logger
         self._scripts: Dict[str, Dict[str, object]] = {}
         self._lock = threading.Lock()
+        if scheduler is None:
+            scheduler = getattr(device_manager_core, '_script_scheduler', None)
+        self._scheduler = scheduler
 
     def start_script(self, name: str, code: str, interval: float = 0.5) -> None:
         with self._lock:
@@ -259,22 +395,34 @@ class UserScriptManager:
 
             mode, obj = compiled
 
+            if mode == "tick" and interval > 0:
+                self._log("info", f"Script '{name}' started")
+                self._scripts[name] = {
+                    "thread": None,
+                    "stop": stop_event,
+                    "code": code,
+                    "interval": interval,
+                    "last_resolved": code_to_compile,
+                }
+                self._get_scheduler().add(self._job_name(name), obj, interval, ctx,
+                                          on_error=lambda _job, exc: self._log("error", f"Script '{name}' error: {exc}"))
+                return
+
             def _runner():
                 self._log("info", f"Script '{name}' started")
                 try:
                     if mode == "tick":
                         # Call the tick function repeatedly at the given interval
+                        # (only interval <= 0 gets here: run back to back)
                         while not stop_event.is_set():
                             try:
-                                obj(ctx)
+                                _call_entry(obj, ctx)
                             except Exception as exc:
                                 self._log("error", f"Script '{name}' error: {exc}")
-                            if interval > 0:
-                                time.sleep(interval)
                     elif mode == "loop":
                         # The function manages its own loop; call it once and let it run
                         try:
-                            obj(ctx)
+                            _call_entry(obj, ctx)
                         except Exception as exc:
                             self._log("error", f"Script '{name}' error: {exc}")
                     else:
@@ -337,6 +485,9 @@ class UserScriptManager:
                 return
             entry["stop"].set()
             self._scripts.pop(name, None)
+        if entry.get("thread") is None and self._scheduler is not None:
+            self._scheduler.remove(self._job_name(name))
+            self._log("info", f"Script '{name}' stopped")
         # Best-effort: remove any variables created by this script
         try:
             if getattr(self._dm, '_variable_manager', None):
@@ -346,8 +497,10 @@ class UserScriptManager:
 
     def stop_all(self):
         with self._lock:
-            for entry in self._scripts.values():
+            for name, entry in self._scripts.items():
                 entry["stop"].set()
+                if entry.get("thread") is None and self._scheduler is not None:
+                    self._scheduler.remove(self._job_name(name))
             self._scripts.clear()
         try:
             if getattr(self._dm, '_variable_manager', None):
@@ -359,9 +512,37 @@ class UserScriptManager:
         with self._lock:
             return list(self._scripts.keys())
 
+    def get_script_stats(self, name: Optional[str] = None):
+        """Timing stats (runs, jitter, overruns, durations in ms) of scheduled tick scripts.
+
+        Returns the stats dict of one script (None if it is not a scheduled
+        tick script), or {name: stats} for all of them.
+        """
+        if self._scheduler is None:
+            return None if name is not None else {}
+        if name is not None:
+            return self._scheduler.stats(self._job_name(name))
+        with self._lock:
+            names = list(self._scripts.keys())
+        stats = {}
+        for script in names:
+            entry = self._scheduler.stats(self._job_name(script))
+            if entry is not None:
+                stats[script] = entry
+        return stats
+
+    def _get_scheduler(self) -> ScriptScheduler:
+        if self._scheduler is None:
+            self._scheduler = ScriptScheduler()
+        return self._scheduler
+
+    @staticmethod
+    def _job_name(name: str):
+        return ('script', name)
+
     def _compile_script(self, code: str, ctx: ScriptContext):
         # For compatibility we allow three styles:
-        # 1) tick(ctx) - called repeatedly by the runner
+        # 1) tick(ctx) - called repeatedly by the runner (may be `async def`)
         # 2) loop(ctx) or main(ctx) - called once and expected to manage its own loop
         # 3) raw top-level script - no function defined; executed with `ctx` present
         # This function returns a tuple (mode, obj) where mode is 'tick'|'loop'|'script'
@@ -393,6 +574,13 @@ class UserScriptManager:
         logger.info(message)
 
 
+def _call_entry(func, ctx):
+    """Call a script entry point; coroutine functions are run to completion."""
+    if inspect.iscoroutinefunction(func):
+        return asyncio.run(func(ctx))
+    return func(ctx)
+
+
 def run_script_once(code: str, device_manager_core, event_logger=None) -> None:
     ctx = ScriptContext(device_manager_core, event_logger)
     # Resolve any tag tokens if a tag manager is available
@@ -410,7 +598,7 @@ def run_script_once(code: str, device_manager_core, event_logger=None) -> None:
     func = sandbox.get("tick") or sandbox.get("loop") or sandbox.get("main")
     if callable(func):
         try:
-            func(ctx)
+            _call_entry(func, ctx)
         except TypeError:
             # In case the user defined a function that doesn't take ctx, call without args
             func()
@@ -0,0 +1,272 @@
+"""
+Shared scheduler for periodic script work (user script ticks, continuous
+script variables).
+
+Every periodic job is an entry on one deadline heap served by a single
+dispatcher thread; due jobs run on a bounded worker pool, so hundreds of
+scripts need a handful of threads instead of one each. Coroutine
+functions (`async def tick(ctx)`) run on a shared asyncio loop thread and
+do not hold a worker while they await.
+
+Jobs run at a fixed rate aligned to their first deadline and never
+overlap themselves: if a run is still busy (or the dispatcher is late)
+when a deadline passes, that deadline is skipped and counted as an
+overrun. Start jitter (actual start minus deadline) and run time are
+tracked per job; the start is taken on the worker (or the asyncio loop),
+so time spent waiting for a free worker counts as jitter.
+"""
+import asyncio
+import concurrent.futures
+import heapq
+import inspect
+import itertools
+import logging
+import math
+import threading
+import time
+from dataclasses import dataclass, asdict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class JobStats:
+    """Timing counters of one periodic job (times in ms)."""
+    runs: int = 0
+    errors: int = 0
+    overruns: int = 0          # deadlines skipped because the job was still busy or late
+    last_jitter_ms: float = 0.0
+    max_jitter_ms: float = 0.0
+    avg_jitter_ms: float = 0.0
+    last_duration_ms: float = 0.0
+    max_duration_ms: float = 0.0
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class _Job:
+    __slots__ = ("name", "func", "args", "interval", "on_error", "is_async",
+                 "deadline", "started", "running", "cancelled", "stats")
+
+    def __init__(self, name, func, args, interval, on_error):
+        self.name = name
+        self.func = func
+        self.args = args
+        self.interval = interval
+        self.on_error = on_error
+        self.is_async = inspect.iscoroutinefunction(func)
+        self.deadline = 0.0
+        self.started: Optional[float] = None
+        self.running = False
+        self.cancelled = False
+        self.stats = JobStats()
+
+
+class ScriptScheduler:
+    """
+    Deadline-heap scheduler with a bounded worker pool.
+
+    Threads (dispatcher, pool workers, asyncio loop) are only started when
+    first needed.
+    """
+
+    def __init__(self, max_workers: int = 8, name: str = "ScriptScheduler"):
+        self.max_workers = max_workers
+        self.name = name
+        self._jobs: Dict[Hashable, _Job] = {}
+        self._heap = []  # (deadline, seq, job)
+        self._seq = itertools.count()
+        # Re-entrant: a job that completes immediately runs its done
+        # callback on the dispatcher thread, which holds the lock
+        self._lock = threading.RLock()
+        self._cond = threading.Condition(self._lock)
+        self._thread: Optional[threading.Thread] = None
+        self._executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+        self._stopped = False
+        self._worker_local = threading.local()
+
+    # -- Public API -------------------------------------------------
+    def add(self, name: Hashable, func: Callable, interval: float, *args,
+            on_error: Optional[Callable[[Hashable, BaseException], Any]] = None,
+            first_run: Optional[float] = None) -> None:
+        """
+        Run `func(*args)` every `interval` seconds (first at `first_run`,
+        default now). Replaces any job with the same name.
+        """
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        job = _Job(name, func, args, interval, on_error)
+        with self._lock:
+            if self._stopped:
+                raise RuntimeError("scheduler is shut down")
+            old = self._jobs.get(name)
+            if old is not None:
+                old.cancelled = True
+            self._jobs[name] = job
+            job.deadline = time.monotonic() if first_run is None else first_run
+            heapq.heappush(self._heap, (job.deadline, next(self._seq), job))
+            self._ensure_thread()
+            self._cond.notify()
+
+    def remove(self, name: Hashable) -> bool:
+        """Stop scheduling a job (a run in progress finishes)."""
+        with self._lock:
+            job = self._jobs.pop(name, None)
+            if job is None:
+                return False
+            job.cancelled = True
+            self._cond.notify()
+            return True
+
+    def submit(self, func: Callable, *args) -> concurrent.futures.Future:
+        """Run a one-off call on the worker pool."""
+        with self._lock:
+            if self._stopped:
+                raise RuntimeError("scheduler is shut down")
+            executor = self._ensure_executor()
+        return executor.submit(func, *args)
+
+    def on_worker_thread(self) -> bool:
+        """True when called from one of this scheduler's pool workers."""
+        return getattr(self._worker_local, 'worker', False)
+
+    def has_job(self, name: Hashable) -> bool:
+        return name in self._jobs
+
+    def stats(self, name: Optional[Hashable] = None):
+        """Timing stats of one job, or {name: stats} of all jobs."""
+        with self._lock:
+            if name is not None:
+                job = self._jobs.get(name)
+                return job.stats.to_dict() if job else None
+            return {n: job.stats.to_dict() for n, job in self._jobs.items()}
+
+    def thread_count(self) -> int:
+        """Threads currently owned by the scheduler."""
+        count = sum(1 for t in (self._thread, self._loop_thread) if t is not None and t.is_alive())
+        if self._executor is not None:
+            count += len(getattr(self._executor, '_threads', ()))
+        return count
+
+    def shutdown(self, wait: bool = False):
+        with self._lock:
+            if self._stopped:
+                return
+            self._stopped = True
+            for job in self._jobs.values():
+                job.cancelled = True
+            self._jobs.clear()
+            self._heap.clear()
+            self._cond.notify_all()
+            executor, loop = self._executor, self._loop
+        if executor is not None:
+            executor.shutdown(wait=wait)
+        if loop is not None:
+            loop.call_soon_threadsafe(loop.stop)
+
+    # -- Internals --------------------------------------------------
+    def _ensure_thread(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._dispatch_loop, name=self.name, daemon=True)
+            self._thread.start()
+
+    def _ensure_executor(self) -> concurrent.futures.ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix=f"{self.name}Worker",
+                initializer=self._mark_worker)
+        return self._executor
+
+    def _mark_worker(self):
+        self._worker_local.worker = True
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        if self._loop is None:
+            loop = asyncio.new_event_loop()
+            self._loop_thread = threading.Thread(target=loop.run_forever, name=f"{self.name}Async", daemon=True)
+            self._loop_thread.start()
+            self._loop = loop
+        return self._loop
+
+    def _dispatch_loop(self):
+        with self._lock:
+            while not self._stopped:
+                now = time.monotonic()
+                while self._heap and self._heap[0][0] <= now:
+                    _, _, job = heapq.heappop(self._heap)
+                    if job.cancelled:
+                        continue
+                    self._start(job, now)
+                if self._heap:
+                    self._cond.wait(timeout=max(0.0, self._heap[0][0] - time.monotonic()))
+                else:
+                    self._cond.wait()
+
+    def _start(self, job: _Job, now: float):
+        """Hand a due job to the pool or the loop (lock held)."""
+        job.running = True
+        job.started = None
+        try:
+            if job.is_async:
+                future = asyncio.run_coroutine_threadsafe(self._run_async(job), self._ensure_loop())
+            else:
+                future = self._ensure_executor().submit(self._run, job)
+        except Exception as exc:
+            # Pool/loop already shut down
+            job.running = False
+            logger.debug(f"{self.name}: could not start {job.name!r}: {exc}")
+            return
+        future.add_done_callback(lambda f, job=job: self._finished(job, f))
+
+    @staticmethod
+    def _run(job: _Job):
+        job.started = time.monotonic()
+        return job.func(*job.args)
+
+    @staticmethod
+    async def _run_async(job: _Job):
+        job.started = time.monotonic()
+        return await job.func(*job.args)
+
+    def _finished(self, job: _Job, future):
+        """Record a run's timing (from its actual start) and queue its next deadline."""
+        now = time.monotonic()
+        error = None
+        try:
+            future.result()
+        except BaseException as exc:
+            error = exc
+        with self._lock:
+            stats = job.stats
+            started = job.started
+            if started is not None:
+                jitter_ms = (started - job.deadline) * 1000.0
+                stats.last_jitter_ms = jitter_ms
+                stats.max_jitter_ms = max(stats.max_jitter_ms, jitter_ms)
+                stats.avg_jitter_ms += (jitter_ms - stats.avg_jitter_ms) / (stats.runs + 1 if stats.runs < 100 else 100)
+                duration_ms = (now - started) * 1000.0
+                stats.last_duration_ms = duration_ms
+                stats.max_duration_ms = max(stats.max_duration_ms, duration_ms)
+            stats.runs += 1
+            if error is not None:
+                stats.errors += 1
+            job.running = False
+            if not job.cancelled and not self._stopped:
+                # Next deadline on the job's fixed-rate grid; skipped ones are overruns
+                next_deadline = job.deadline + job.interval
+                if next_deadline < now:
+                    missed = math.ceil((now - next_deadline) / job.interval)
+                    stats.overruns += missed
+                    next_deadline += missed * job.interval
+                job.deadline = next_deadline
+                heapq.heappush(self._heap, (next_deadline, next(self._seq), job))
+                self._cond.notify()
+        if error is not None and job.on_error is not None:
+            try:
+                job.on_error(job.name, error)
+            except Exception:
+                logger.exception(f"{self.name}: error handler failed for {job.name!r}")
@@ -1,6 +1,7 @@
 import re
 import logging
-from typing import List
+import threading
+from typing import Dict, Iterable, List, Set, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -12,10 +13,23 @@ class ScriptTagManager:
     Provides resolving tokens to current unique addresses and helpers for insertion.
     """
     TOKEN_RE = re.compile(r"\{\{TAG:([^\}]+)\}\}")
+    MAX_CACHED_CODES = 256
 
     def __init__(self, device_manager_core):
         self._dm = device_manager_core
         self._choices = {}
+        self._index_lock = threading.RLock()
+        self._indexed = False
+        self._index_gen = 0
+        self._by_part: Dict[str, Dict[str, List[str]]] = {}
+        self._device_parts: Dict[str, Dict[str, List[str]]] = {}
+        # code -> (resolved code, devices it depends on, unmatched address parts)
+        self._resolved_cache: Dict[str, Tuple[str, Set[str], Set[str]]] = {}
+        try:
+            if hasattr(self._dm, 'on'):
+                self._dm.on('device_removed', self.drop_device)
+        except Exception:
+            pass
         # load persisted choices from file alongside device config
         try:
             cfg = getattr(self._dm, 'config_path', 'devices.json')
@@ -42,31 +56,123 @@ class ScriptTagManager:
         except Exception:
             logger.exception('Failed to persist token choice')
 
-    def get_candidates(self, token_inner: str):
-        """Return list of candidate unique addresses matching the token's address portion."""
+    # ---- Address index ----
+    # {address part (no #n suffix): {device: [unique addresses]}}, kept up to
+    # date by DeviceManagerCore whenever a device's unique addresses are
+    # (re)assigned, so tokens resolve without walking device trees.
+
+    def index_device(self, device_name: str, entries: Iterable[Tuple[str, str]]) -> None:
+        """(Re)index a device from its (address, unique_address) pairs."""
+        parts: Dict[str, List[str]] = {}
+        for address, unique_address in entries:
+            parts.setdefault(address.split('#', 1)[0], []).append(unique_address)
+        with self._index_lock:
+            self._indexed = True
+            self._index_gen += 1
+            old = self._device_parts.pop(device_name, {})
+            for part in old:
+                owners = self._by_part.get(part)
+                if owners is not None:
+                    owners.pop(device_name, None)
+                    if not owners:
+                        del self._by_part[part]
+            for part, uniques in parts.items():
+                self._by_part.setdefault(part, {})[device_name] = uniques
+            self._device_parts[device_name] = parts
+            self._invalidate(device_name, set(old) ^ set(parts))
+
+    def add_to_index(self, device_name: str, entries: Iterable[Tuple[str, str]]) -> None:
+        """Add (address, unique_address) pairs of a device (e.g. a subtree that was just built)."""
+        added: Set[str] = set()
+        with self._index_lock:
+            self._indexed = True
+            self._index_gen += 1
+            parts = self._device_parts.setdefault(device_name, {})
+            for address, unique_address in entries:
+                part = address.split('#', 1)[0]
+                uniques = parts.get(part)
+                if uniques is None:
+                    uniques = parts[part] = []
+                    self._by_part.setdefault(part, {})[device_name] = uniques
+                    added.add(part)
+                uniques.append(unique_address)
+            self._invalidate(device_name, added)
+
+    def drop_device(self, device_name: str) -> None:
+        """Remove a device from the index (device removed or renamed away)."""
+        self.index_device(device_name, ())
+        with self._index_lock:
+            self._device_parts.pop(device_name, None)
+
+    def _invalidate(self, device_name: str, changed_parts: Set[str]) -> None:
+        """Drop cached resolutions that depend on `device_name` or on `changed_parts` (lock held)."""
+        stale = [code for code, (_, devices, parts) in self._resolved_cache.items()
+                 if device_name in devices or (changed_parts and not parts.isdisjoint(changed_parts))]
+        for code in stale:
+            del self._resolved_cache[code]
+
+    def _lookup(self, token_inner: str):
+        """
+        Return (exact, candidates) for a token.
+
+        `exact` is the unique address the token names directly (or the
+        first signal with that address on the token's device), else None;
+        `candidates` are all unique addresses with the same address part.
+        """
         try:
-            # If token_inner resolves directly, return that
-            sig = None
+            device_old, addr = self._dm.parse_unique_address(token_inner)
+        except Exception:
+            device_old, addr = (None, None)
+
+        if not self._indexed:
+            return self._lookup_by_scan(token_inner, addr)
+
+        if not addr:
+            return None, []
+        with self._index_lock:
+            known = addr in self._by_part
+        if not known and hasattr(self._dm, 'expand_address'):
+            # The address may be inside a device subtree that hasn't been built yet
             try:
-                sig = self._dm.get_signal_by_unique_address(token_inner)
+                self._dm.expand_address(addr)
             except Exception:
-                sig = None
+                logger.debug(f"ScriptTagManager: could not expand {addr}", exc_info=True)
+        with self._index_lock:
+            owners = self._by_part.get(addr) or {}
+            candidates = [u for uniques in owners.values() for u in uniques]
+            own = owners.get(device_old) or []
+        if token_inner in own:
+            return token_inner, candidates
+        return (own[0] if own else None), candidates
+
+    def _lookup_by_scan(self, token_inner: str, addr):
+        """Fallback for device managers that never fed the index."""
+        exact = None
+        try:
+            sig = self._dm.get_signal_by_unique_address(token_inner)
             if sig and getattr(sig, 'unique_address', None):
-                return [sig.unique_address]
-
-            device_old, addr = (None, None)
+                exact = sig.unique_address
+        except Exception:
+            pass
+        candidates = []
+        if exact is None and addr:
             try:
-                device_old, addr = self._dm.parse_unique_address(token_inner)
+                for u in self._dm.list_unique_addresses():
+                    # Compare base address portion ignoring any #n suffix
+                    part = u.split('::', 1)[1]
+                    part_base = part.split('#', 1)[0]
+                    if part_base == addr:
+                        candidates.append(u)
             except Exception:
-                pass
-            if not addr:
-                return []
-            candidates = []
-            for u in self._dm.list_unique_addresses():
-                part = u.split('::', 1)[1]
-                part_base = part.split('#', 1)[0]
-                if part_base == addr:
-                    candidates.append(u)
+                candidates = []
+        return exact, candidates
+
+    def get_candidates(self, token_inner: str):
+        """Return list of candidate unique addresses matching the token's address portion."""
+        try:
+            exact, candidates = self._lookup(token_inner)
+            if exact:
+                return [exact]
             return candidates
         except Exception:
             return []
@@ -74,93 +180,68 @@ class ScriptTagManager:
     def extract_tokens(self, code: str) -> List[str]:
         return [m.group(1) for m in self.TOKEN_RE.finditer(code)]
 
+    @staticmethod
+    def _quote(code: str, match, resolved: str) -> str:
+        s, e = match.span()
+        if s > 0 and e < len(code) and code[s-1] == code[e] and code[s-1] in ("'", '"'):
+            return resolved
+        return repr(resolved)
+
     def resolve_code(self, code: str) -> str:
         """Replace tokens with the current canonical unique address (quoted where appropriate).
 
         Replacement strategy:
-        - If the device manager can resolve the token exactly via `get_signal_by_unique_address`, use that signal's `unique_address`.
-        - Otherwise, parse the address portion and search all known unique addresses for the same address part.
+        - If the token names an existing unique address (or an address on its own device), use that.
+        - Otherwise search all known unique addresses for the same address part.
         - If multiple candidates exist, prefer one that keeps the original device name when possible.
+
+        Results are cached per code string until a device the code depends on
+        (or the set of devices providing one of its unmatched addresses)
+        changes.
         """
         if not code:
             return code
+        cached = self._resolved_cache.get(code)
+        if cached is not None:
+            return cached[0]
 
-        def _is_quoted(s, e):
-            return s > 0 and e < len(code) and code[s-1] == code[e] and code[s-1] in ("'", '"')
+        devices: Set[str] = set()
+        parts: Set[str] = set()
+        generation = self._index_gen
 
         def _replace(match):
             inner = match.group(1)
             try:
-                # Exact match first
-                sig = None
-                try:
-                    sig = self._dm.get_signal_by_unique_address(inner)
-                except Exception:
-                    sig = None
-
-                if sig and getattr(sig, 'unique_address', None):
-                    resolved = sig.unique_address
-                    s, e = match.span()
-                    if _is_quoted(s, e):
-                        return resolved
-                    return repr(resolved)
-
-                # Parse and search by address portion
-                try:
-                    device_old, addr = self._dm.parse_unique_address(inner)
-                except Exception:
-                    device_old, addr = (None, None)
-
-                if not addr:
-                    s, e = match.span()
-                    if _is_quoted(s, e):
-                        return inner
-                    return repr(inner)
-
-                candidates = []
-                try:
-                    for u in self._dm.list_unique_addresses():
-                        # Compare base address portion ignoring any #n suffix
-                        part = u.split('::', 1)[1]
-                        part_base = part.split('#', 1)[0]
-                        if part_base == addr:
-                            candidates.append(u)
-                except Exception:
-                    candidates = []
-
+                exact, candidates = self._lookup(inner)
+                device_old, addr = self._dm.parse_unique_address(inner)
+                devices.add(device_old)
+                if exact:
+                    return self._quote(code, match, exact)
+                if addr:
+                    parts.add(addr)
                 if not candidates:
-                    s, e = match.span()
-                    if _is_quoted(s, e):
-                        return inner
-                    return repr(inner)
-
-                # Prefer candidate with same device_old if possible
+                    return self._quote(code, match, inner)
+                # Prefer candidate with same device_old if possible, else the first
+                chosen = candidates[0]
                 if device_old:
-                    for c in candidates:
-                        if c.startswith(f"{device_old}::"):
-                            s, e = match.span()
-                            if _is_quoted(s, e):
-                                return c
-                            return repr(c)
-
-                # Otherwise if single candidate, pick it
-                if len(candidates) == 1:
-                    s, e = match.span()
-                    if _is_quoted(s, e):
-                        return candidates[0]
-                    return repr(candidates[0])
-
-                # Ambiguous: return the first candidate (respect quoting)
-                s, e = match.span()
-                if _is_quoted(s, e):
-                    return candidates[0]
-                return repr(candidates[0])
+                    chosen = next((c for c in candidates if c.startswith(f"{device_old}::")), chosen)
+                devices.add(chosen.split('::', 1)[0])
+                return self._quote(code, match, chosen)
             except Exception as e:
                 logger.debug(f"ScriptTagManager: Failed to resolve token {inner}: {e}")
                 return repr(inner)
 
         # Replace tokens in the code with quoted unique addresses so they can be used directly
-        return self.TOKEN_RE.sub(_replace, code)
+        resolved = self.TOKEN_RE.sub(_replace, code)
+        if self._indexed:
+            with self._index_lock:
+                if generation != self._index_gen:
+                    # The index changed while resolving; don't cache a possibly stale result
+                    return resolved
+                if len(self._resolved_cache) >= self.MAX_CACHED_CODES:
+                    self._resolved_cache.pop(next(iter(self._resolved_cache)))
+                self._resolved_cache[code] = (resolved, devices, parts)
+        return resolved
 
     def resolve_code_interactive(self, code: str, chooser) -> str:
         """Resolve tokens, but when multiple candidates are found call `chooser(token, candidates)`
@@ -169,84 +250,33 @@ class ScriptTagManager:
         if not code:
             return code
 
-        def _is_quoted(s, e):
-            return s > 0 and e < len(code) and code[s-1] == code[e] and code[s-1] in ("'", '"')
-
         def _replace(match):
             inner = match.group(1)
             try:
-                sig = None
-                try:
-                    sig = self._dm.get_signal_by_unique_address(inner)
-                except Exception:
-                    sig = None
-
-                if sig and getattr(sig, 'unique_address', None):
-                    resolved = sig.unique_address
-                    s, e = match.span()
-                    if _is_quoted(s, e):
-                        return resolved
-                    return repr(resolved)
-
-                device_old, addr = (None, None)
-                try:
-                    device_old, addr = self._dm.parse_unique_address(inner)
-                except Exception:
-                    device_old, addr = (None, None)
-
-                if not addr:
-                    s, e = match.span()
-                    if _is_quoted(s, e):
-                        return inner
-                    return repr(inner)
-
-                candidates = []
-                try:
-                    for u in self._dm.list_unique_addresses():
-                        part = u.split('::', 1)[1]
-                        part_base = part.split('#', 1)[0]
-                        if part_base == addr:
-                            candidates.append(u)
-                except Exception:
-                    candidates = []
-
+                exact, candidates = self._lookup(inner)
+                if exact:
+                    return self._quote(code, match, exact)
                 if not candidates:
-                    s, e = match.span()
-                    if _is_quoted(s, e):
-                        return inner
-                    return repr(inner)
-
+                    return self._quote(code, match, inner)
                 if len(candidates) == 1:
-                    s, e = match.span()
-                    if _is_quoted(s, e):
-                        return candidates[0]
-                    return repr(candidates[0])
+                    return self._quote(code, match, candidates[0])
 
                 # Ambiguous: check persisted choice first
                 persisted = self._choices.get(inner)
                 if persisted and persisted in candidates:
-                    s, e = match.span()
-                    if _is_quoted(s, e):
-                        return persisted
-                    return repr(persisted)
+                    return self._quote(code, match, persisted)
 
                 # Ask chooser for selection
                 if chooser:
                     try:
                         chosen = chooser(inner, candidates)
                         if chosen:
-                            s, e = match.span()
-                            if _is_quoted(s, e):
-                                return chosen
-                            return repr(chosen)
+                            return self._quote(code, match, chosen)
                     except Exception:
                         pass
 
                 # Fallback: pick first
-                s, e = match.span()
-                if _is_quoted(s, e):
-                    return candidates[0]
-                return repr(candidates[0])
+                return self._quote(code, match, candidates[0])
             except Exception as e:
                 logger.debug(f"ScriptTagManager: Failed to resolve token {inner}: {e}")
                 return repr(inner)
@@ -263,43 +293,16 @@ class ScriptTagManager:
         def _replace(match):
             inner = match.group(1)
             try:
-                # Try exact resolution first
-                sig = None
-                try:
-                    sig = self._dm.get_signal_by_unique_address(inner)
-                except Exception:
-                    sig = None
-
-                if sig and getattr(sig, 'unique_address', None):
-                    return self.make_token(sig.unique_address)
-
-                # Fall back to matching by address portion
-                try:
-                    device_old, addr = self._dm.parse_unique_address(inner)
-                except Exception:
-                    device_old, addr = (None, None)
-
-                if not addr:
-                    return match.group(0)
-
-                candidates = []
-                try:
-                    for u in self._dm.list_unique_addresses():
-                        part = u.split('::', 1)[1]
-                        part_base = part.split('#', 1)[0]
-                        if part_base == addr:
-                            candidates.append(u)
-                except Exception:
-                    candidates = []
-
+                exact, candidates = self._lookup(inner)
+                if exact:
+                    return self.make_token(exact)
                 if not candidates:
                     return match.group(0)
-
+                device_old, _ = self._dm.parse_unique_address(inner)
                 if device_old:
                     for c in candidates:
                         if c.startswith(f"{device_old}::"):
                             return self.make_token(c)
-
                 return self.make_token(candidates[0])
             except Exception:
                 return match.group(0)
@@ -0,0 +1,253 @@
+"""
+Ring buffers and decimation for trend plots.
+
+`TrendBuffer` keeps the most recent samples of one series in fixed-size
+numpy arrays, so memory use is bounded however long data streams in.
+`lttb` and `minmax_decimate` reduce a window of samples to a bounded
+number of points for drawing while preserving its visual shape.
+"""
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+def minmax_decimate(x: np.ndarray, y: np.ndarray, buckets: int,
+                    start: Optional[float] = None, end: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Keep the minimum and maximum sample of each time bucket, in time order
+    (at most 2 * buckets points), so spikes are never lost.
+
+    Buckets are `(end - start) / buckets` wide and aligned to multiples of
+    that width, so a sliding window keeps picking the same samples and the
+    plot does not shimmer while scrolling.
+    """
+    if buckets <= 0 or len(x) <= 2 * buckets:
+        return x, y
+    lo = x[0] if start is None else start
+    hi = x[-1] if end is None else end
+    width = (hi - lo) / buckets
+    if width <= 0:
+        return x[[0, -1]], y[[0, -1]]
+    return _minmax_by_width(x, y, width)
+
+
+def _minmax_by_width(x: np.ndarray, y: np.ndarray, width: float) -> Tuple[np.ndarray, np.ndarray]:
+    n = len(x)
+    bid = np.floor(x / width)
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(bid)) + 1))
+    if len(starts) * 2 >= n:
+        return x, y
+    gid = np.repeat(np.arange(len(starts)), np.diff(np.append(starts, n)))
+    keep = []
+    for reduce in (np.minimum, np.maximum):
+        extreme = reduce.reduceat(y, starts)
+        hits = np.flatnonzero(y == extreme[gid])
+        _, first = np.unique(gid[hits], return_index=True)
+        keep.append(hits[first])
+    keep = np.union1d(keep[0], keep[1])
+    return x[keep], y[keep]
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Largest-Triangle-Three-Buckets downsampling to `threshold` points.
+
+    The first and last samples are always kept; from every bucket in between
+    the sample forming the largest triangle with the previously selected
+    point and the average of the next bucket is chosen. The selection is
+    sequential, so feed it a `minmax_decimate`d series (a few points per
+    output bucket) when the input is large.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return x, y
+
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    counts = np.diff(edges)
+    # Averages of every bucket (used as the third triangle vertex)
+    avg_x = (np.add.reduceat(x[:-1], edges[:-1])[:len(counts)] / counts).tolist()
+    avg_y = (np.add.reduceat(y[:-1], edges[:-1])[:len(counts)] / counts).tolist()
+    avg_x.append(float(x[-1]))
+    avg_y.append(float(y[-1]))
+    xs = x.tolist()
+    ys = y.tolist()
+    bounds = edges.tolist()
+
+    out = [0] * threshold
+    out[-1] = n - 1
+    a = 0
+    for i in range(threshold - 2):
+        ax, ay = xs[a], ys[a]
+        cx, cy = avg_x[i + 1], avg_y[i + 1]
+        dx, dy = ax - cx, cy - ay
+        best, best_area = bounds[i], -1.0
+        for j in range(bounds[i], bounds[i + 1]):
+            area = abs(dx * (ys[j] - ay) - (ax - xs[j]) * dy)
+            if area > best_area:
+                best_area, best = area, j
+        a = best
+        out[i + 1] = a
+    return x[out], y[out]
+
+
+DECIMATORS = {
+    'minmax': lambda x, y, points, start, end: minmax_decimate(x, y, points // 2, start, end),
+    'lttb': lambda x, y, points, start, end: lttb(*minmax_decimate(x, y, 2 * points, start, end), points),
+}
+
+
+def decimate(x: np.ndarray, y: np.ndarray, max_points: int, method: str = 'minmax',
+             start: Optional[float] = None, end: Optional[float] = None):
+    """Reduce a series to about `max_points` points with the named method."""
+    if len(x) <= max_points:
+        return x, y
+    return DECIMATORS[method](x, y, max_points, start, end)
+
+
+class TrendBuffer:
+    """Fixed-capacity ring buffer of (time, value) samples in time order."""
+
+    def __init__(self, capacity: int = 200_000):
+        self.capacity = capacity
+        self._t = np.empty(capacity, dtype=np.float64)
+        self._v = np.empty(capacity, dtype=np.float64)
+        self._head = 0   # next write position
+        self._size = 0
+        # Bumped whenever existing samples change (clear/prepend), so
+        # incremental consumers know to start over.
+        self.generation = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def clear(self):
+        self._head = 0
+        self._size = 0
+        self.generation += 1
+
+    @property
+    def last_time(self) -> Optional[float]:
+        if not self._size:
+            return None
+        return float(self._t[self._head - 1])
+
+    @property
+    def first_time(self) -> Optional[float]:
+        if not self._size:
+            return None
+        return float(self._t[(self._head - self._size) % self.capacity])
+
+    def append(self, t: float, value: float) -> bool:
+        """Append one sample; samples older than the newest one are dropped."""
+        if self._size and t < self._t[self._head - 1]:
+            return False
+        self._t[self._head] = t
+        self._v[self._head] = value
+        self._head = (self._head + 1) % self.capacity
+        if self._size < self.capacity:
+            self._size += 1
+        return True
+
+    def extend(self, t: np.ndarray, values: np.ndarray):
+        """Append samples in time order (e.g. a backfill from the historian)."""
+        t = np.asarray(t, dtype=np.float64)
+        values = np.asarray(values, dtype=np.float64)
+        last = self.last_time
+        if last is not None:
+            keep = t >= last
+            t, values = t[keep], values[keep]
+        if len(t) > self.capacity:
+            t, values = t[-self.capacity:], values[-self.capacity:]
+        n = len(t)
+        if not n:
+            return
+        first = min(n, self.capacity - self._head)
+        self._t[self._head:self._head + first] = t[:first]
+        self._v[self._head:self._head + first] = values[:first]
+        if first < n:
+            self._t[:n - first] = t[first:]
+            self._v[:n - first] = values[first:]
+        self._head = (self._head + n) % self.capacity
+        self._size = min(self.capacity, self._size + n)
+
+    def prepend(self, t: np.ndarray, values: np.ndarray):
+        """Insert samples older than the buffered ones, as far as capacity allows."""
+        first = self.first_time
+        t = np.asarray(t, dtype=np.float64)
+        values = np.asarray(values, dtype=np.float64)
+        if first is not None:
+            keep = t < first
+            t, values = t[keep], values[keep]
+        room = self.capacity - self._size
+        if not len(t) or room <= 0:
+            return
+        cur_t, cur_v = self.window()
+        t, values = t[-room:], values[-room:]
+        self.clear()
+        self.extend(np.concatenate((t, cur_t)), np.concatenate((values, cur_v)))
+
+    def _segments(self):
+        start = (self._head - self._size) % self.capacity
+        if start + self._size <= self.capacity:
+            return [slice(start, start + self._size)]
+        return [slice(start, self.capacity), slice(0, self._head)]
+
+    def window(self, start: Optional[float] = None, end: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Samples with start <= t <= end, as new contiguous arrays."""
+        ts, vs = [], []
+        for seg in self._segments():
+            t = self._t[seg]
+            lo = 0 if start is None else int(np.searchsorted(t, start, side='left'))
+            hi = len(t) if end is None else int(np.searchsorted(t, end, side='right'))
+            if hi > lo:
+                ts.append(t[lo:hi])
+                vs.append(self._v[seg][lo:hi])
+        if not ts:
+            return np.empty(0), np.empty(0)
+        if len(ts) == 1:
+            return ts[0].copy(), vs[0].copy()
+        return np.concatenate(ts), np.concatenate(vs)
+
+
+class MinMaxCache:
+    """
+    Incremental min/max decimation of a `TrendBuffer` over a sliding window.
+
+    Because `minmax_decimate` buckets are aligned to absolute time, buckets
+    that are complete never change: they are kept between calls and only
+    samples newer than the last complete bucket are decimated again. A
+    live window therefore costs O(new samples) per frame instead of
+    O(window).
+    """
+
+    def __init__(self):
+        self._key = None          # (generation, bucket width)
+        self._start = None        # window start the cache covers
+        self._x = np.empty(0)
+        self._y = np.empty(0)
+        self._upto = None         # start time of the first incomplete bucket
+
+    def invalidate(self):
+        self._key = None
+
+    def get(self, buffer: TrendBuffer, start: float, end: float, buckets: int) -> Tuple[np.ndarray, np.ndarray]:
+        width = (end - start) / max(1, buckets)
+        if width <= 0:
+            self._key = None
+            return buffer.window(start, end)
+        key = (buffer.generation, width)
+        if key != self._key or start < self._start or end < self._upto:
+            x, y = _minmax_by_width(*buffer.window(start, end), width)
+        else:
+            new_x, new_y = _minmax_by_width(*buffer.window(self._upto, end), width)
+            keep = int(np.searchsorted(self._x, start, side='left'))
+            x = np.concatenate((self._x[keep:], new_x))
+            y = np.concatenate((self._y[keep:], new_y))
+
+        cutoff = np.floor(end / width) * width
+        complete = int(np.searchsorted(x, cutoff, side='left'))
+        self._key = key
+        self._start = start
+        self._x, self._y = x[:complete], y[:complete]
+        self._upto = cutoff
+        return x, y
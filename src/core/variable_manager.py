@@ -4,7 +4,8 @@ Variable manager for script-scoped and global variables bound to device signals.
 Features:
 - Bind a named variable to a device::signal address
 - Two update modes: on-demand and continuous (per-variable interval in ms)
-- Single scheduler thread + ThreadPoolExecutor for scalable, non-blocking reads
+- Periodic reads scheduled on a ScriptScheduler (shared deadline heap +
+  bounded worker pool) for scalable, non-blocking reads
 - Owner scoping so variables created by a script are cleaned up when the
   script stops
 - Thread-safe access to variable state (value, timestamp)
@@ -20,13 +21,14 @@ Designed to integrate with DeviceManagerCore (uses its read_signal/get_signal_by
 from __future__ import annotations
 
 import concurrent.futures
-import heapq
 import logging
 import threading
 import time
 from dataclasses import dataclass, field
 from typing import Any, Callable, Dict, Optional, Tuple
 
+from src.core.script_scheduler import ScriptScheduler
+
 logger = logging.getLogger(__name__)
 
 
@@ -89,24 +91,22 @@ class VariableManager:
     """Manage variables bound to device signals with efficient scheduling.
 
     Implementation notes:
-    - Uses a single scheduler thread that maintains a min-heap of (next_run_ts, key)
-      for variables in continuous mode.
-    - Uses a ThreadPoolExecutor to perform device reads so scheduler isn't blocked.
+    - Continuous variables are periodic jobs on a `ScriptScheduler` (one
+      deadline heap + bounded worker pool), normally the one shared with
+      user scripts; immediate reads run on the same pool, or inline when the
+      caller already is a pool worker (a tick blocking on a read it queued
+      behind itself could starve the pool).
     - Variables are namespaced by `owner` (e.g. script name). Variables with
       owner=None are considered global.
     """
 
-    def __init__(self, device_manager, max_workers: int = 6):
+    def __init__(self, device_manager, max_workers: int = 6, scheduler: Optional[ScriptScheduler] = None):
         self._dm = device_manager
         self._vars: Dict[Tuple[Optional[str], str], _Variable] = {}
-        self._heap = []  # list of tuples (next_run_ts, owner, name)
-        self._heap_entries = set()
         self._lock = threading.Lock()
-        self._cond = threading.Condition(self._lock)
-        self._stopped = False
-        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
-        self._scheduler_thread = threading.Thread(target=self._scheduler_loop, name="VariableScheduler", daemon=True)
-        self._scheduler_thread.start()
+        # Only a scheduler created here is shut down by stop_all()
+        self._owns_scheduler = scheduler is None
+        self._scheduler = scheduler or ScriptScheduler(max_workers=max_workers, name="VariableScheduler")
 
     # -- Public API -------------------------------------------------
     def create(self, owner: Optional[str], name: str, unique_address: str, *, mode: str = 'on_demand', interval_ms: Optional[int] = None) -> VariableHandle:
@@ -123,12 +123,7 @@ class VariableManager:
                 v = _Variable(owner=owner, name=name, unique_address=unique_address, mode=mode, interval_ms=interval_ms)
                 self._vars[key] = v
                 created = True
-            # If continuous, schedule next run immediately
-            if mode == 'continuous' and interval_ms and interval_ms > 0:
-                self._push_schedule(key, time.time())
-            else:
-                # ensure not in heap
-                self._remove_from_heap_if_present(key)
+            self._update_schedule(key, v)
         # Emit lifecycle event (core may bridge to UI)
         try:
             if created and hasattr(self._dm, 'emit'):
@@ -143,7 +138,7 @@ class VariableManager:
             v = self._vars.pop(key, None)
             if v:
                 v.cancelled = True
-            self._remove_from_heap_if_present(key)
+            self._scheduler.remove(self._job_name(key))
         try:
             if v and hasattr(self._dm, 'emit'):
                 self._dm.emit('variable_removed', owner, name)
@@ -161,6 +156,10 @@ class VariableManager:
         with self._lock:
             return [k[1] for k in self._vars.keys() if owner is None or k[0] == owner]
 
+    def stats(self, owner: Optional[str], name: str) -> Optional[dict]:
+        """Scheduling stats (jitter/overruns) of a continuous variable."""
+        return self._scheduler.stats(self._job_name((owner, name)))
+
     def stop_scope(self, owner: Optional[str]) -> None:
         """Remove and stop all variables for a given owner (used when a script stops)."""
         with self._lock:
@@ -173,49 +172,49 @@ class VariableManager:
             keys = list(self._vars.keys())
         for k in keys:
             self.remove(k[0], k[1])
-        # Stop scheduler and executor
-        self._shutdown()
+        if self._owns_scheduler:
+            self._shutdown()
 
     # -- Internal helpers ------------------------------------------
+    @staticmethod
+    def _job_name(key: Tuple[Optional[str], str]):
+        return ('variable',) + key
+
     def _set_mode(self, key: Tuple[Optional[str], str], mode: str) -> None:
         with self._lock:
             v = self._vars.get(key)
             if not v:
                 return
             v.mode = mode
-            if mode == 'continuous' and v.interval_ms and v.interval_ms > 0:
-                self._push_schedule(key, time.time())
-            else:
-                self._remove_from_heap_if_present(key)
+            self._update_schedule(key, v)
+
+    def _update_schedule(self, key: Tuple[Optional[str], str], v: _Variable) -> None:
+        """(Re)schedule or unschedule a variable's periodic read (lock held)."""
+        job = self._job_name(key)
+        if v.mode == 'continuous' and v.interval_ms and v.interval_ms > 0:
+            interval = v.interval_ms / 1000.0
+            self._scheduler.add(job, self._do_read_for_key, interval, key,
+                                first_run=time.monotonic() + interval)
+        else:
+            self._scheduler.remove(job)
 
     def _get_var(self, key: Tuple[Optional[str], str]) -> Optional[_Variable]:
         return self._vars.get(key)
 
-    def _push_schedule(self, key: Tuple[Optional[str], str], when_ts: float) -> None:
-        # next run is when_ts + interval
-        v = self._vars.get(key)
-        if not v or not v.interval_ms or v.interval_ms <= 0:
-            return
-        next_ts = when_ts + (v.interval_ms / 1000.0)
-        entry = (next_ts, key)
-        if key in self._heap_entries:
-            # leave duplicate removal to pop time (simpler)
-            pass
-        else:
-            heapq.heappush(self._heap, entry)
-            self._heap_entries.add(key)
-        self._cond.notify()
-
-    def _remove_from_heap_if_present(self, key: Tuple[Optional[str], str]) -> None:
-        # mark as removed by removing entry set; actual heap entries will be skipped when popped
-        if key in self._heap_entries:
-            self._heap_entries.discard(key)
-
     def _schedule_immediate_read(self, key: Tuple[Optional[str], str]) -> concurrent.futures.Future:
         """Schedule a single immediate read for the variable and return a Future that resolves
         to the protocol Signal (or None on failure)."""
-        # Submit to executor so caller may block on the returned future
-        return self._executor.submit(self._do_read_for_key, key)
+        if self._scheduler.on_worker_thread():
+            # Already on a pool worker (e.g. a tick script): read inline rather
+            # than wait for a free worker that may never come
+            fut = concurrent.futures.Future()
+            try:
+                fut.set_result(self._do_read_for_key(key))
+            except Exception as e:
+                fut.set_exception(e)
+            return fut
+        # Submit to the pool so caller may block on the returned future
+        return self._scheduler.submit(self._do_read_for_key, key)
 
     def _do_read_for_key(self, key: Tuple[Optional[str], str]):
         v = None
@@ -258,56 +257,11 @@ class VariableManager:
             logger.exception("VariableManager: read failed")
             return None
 
-    def _scheduler_loop(self):
-        with self._lock:
-            while not self._stopped:
-                now = time.time()
-                next_ts = None
-                while self._heap and (self._heap[0][0] <= now or self._heap[0][1] not in self._heap_entries):
-                    ts, key = heapq.heappop(self._heap)
-                    # skip stale/removed entries
-                    if key not in self._heap_entries:
-                        continue
-                    self._heap_entries.discard(key)
-                    # Dispatch read to executor
-                    v = self._vars.get(key)
-                    if not v or v.cancelled:
-                        continue
-                    # Submit read; when done, schedule next run if still continuous
-                    fut = self._executor.submit(self._do_read_and_reschedule, key)
-
-                # Compute next wake
-                if self._heap:
-                    next_ts = self._heap[0][0]
-                    timeout = max(0.0, next_ts - time.time())
-                else:
-                    timeout = None
-                # Wait until next schedule or until notified
-                if timeout is None:
-                    self._cond.wait()
-                else:
-                    self._cond.wait(timeout=timeout)
-
-    def _do_read_and_reschedule(self, key: Tuple[Optional[str], str]):
-        try:
-            res = self._do_read_for_key(key)
-        finally:
-            # If variable still exists and is continuous, schedule next run
-            with self._lock:
-                v = self._vars.get(key)
-                if v and not v.cancelled and v.mode == 'continuous' and v.interval_ms and v.interval_ms > 0:
-                    self._push_schedule(key, time.time())
-
     def _shutdown(self):
-        with self._lock:
-            if self._stopped:
-                return
-            self._stopped = True
-            self._cond.notify_all()
         try:
-            self._executor.shutdown(wait=False)
+            self._scheduler.shutdown()
         except Exception:
-            logger.debug("VariableManager executor shutdown failed", exc_info=True)
+            logger.debug("VariableManager scheduler shutdown failed", exc_info=True)
 
 
 # Backwards-compatible alias for other modules that may prefer this name
@@ -1,12 +1,18 @@
 import logging
+import time
 from typing import List, Dict, Optional
 from dataclasses import dataclass, asdict
 import json
 from PySide6.QtCore import QObject, Signal as QtSignal, QTimer
 from src.models.device_models import Signal
+from src.core import metrics
+from src.core.poll_planner import PollPlanner
 
 logger = logging.getLogger(__name__)
 
+_response_seconds = metrics.histogram(
+    'scadascout_watch_response_seconds', 'Watch list request-to-update time', ('device',))
+
 @dataclass
 class WatchedSignal:
     """Wrapper for a signal in the watch list"""
@@ -32,6 +38,10 @@ class WatchedSignal:
 class WatchListManager(QObject):
     """
     Manages a list of signals to monitor with periodic polling.
+
+    Each poll cycle is planned by a `PollPlanner`: watched signals are
+    grouped per device, every device gets one batched read request, and
+    signals whose previous read is still outstanding are skipped.
     """
     # Signals
     # Use `object` for the signal parameter to avoid Shiboken attempting to
@@ -50,10 +60,24 @@ class WatchListManager(QObject):
         # Polling timer
         self._poll_timer = QTimer()
         self._poll_timer.timeout.connect(self._poll_all_signals)
+
+        # Immediate poll after additions, coalesced so adding many signals costs one cycle
+        self._kick_timer = QTimer()
+        self._kick_timer.setSingleShot(True)
+        self._kick_timer.setInterval(0)
+        self._kick_timer.timeout.connect(self._poll_all_signals)
+
+        self._planner = PollPlanner(timeout_s=self._outstanding_timeout_s())
         
         # Connect to DeviceManager updates
-        if hasattr(self.device_manager, 'signal_updated'):
-             self.device_manager.signal_updated.connect(self._on_device_signal_updated)
+        if hasattr(self.device_manager, 'signal_updates'):
+            self.device_manager.signal_updates.connect(self._on_device_signal_updates)
+        elif hasattr(self.device_manager, 'signal_updated'):
+            self.device_manager.signal_updated.connect(self._on_device_signal_updated)
+        if hasattr(self.device_manager, 'signals_unchanged'):
+            self.device_manager.signals_unchanged.connect(self._on_device_signals_unchanged)
+        elif hasattr(self.device_manager, 'signal_unchanged'):
+            self.device_manager.signal_unchanged.connect(self._on_device_signal_unchanged)
         
     def add_signal(self, device_name: str, signal: Signal):
         """Add a signal to the watch list."""
@@ -77,14 +101,15 @@ class WatchListManager(QObject):
         if not self._poll_timer.isActive():
             self._poll_timer.start(self._poll_interval_ms)
         
-        # Trigger immediate poll for this signal
-        from PySide6.QtCore import QTimer
-        QTimer.singleShot(0, self._poll_all_signals)
+        # Trigger an immediate poll (coalesced with other additions)
+        if not self._kick_timer.isActive():
+            self._kick_timer.start()
     
     def remove_signal(self, watch_id: str):
         """Remove a signal from the watch list."""
         if watch_id in self._watched_signals:
             del self._watched_signals[watch_id]
+            self._planner.forget(watch_id)
             logger.info(f"Removed signal from watch list: {watch_id}")
             self.watch_list_changed.emit()
             
@@ -95,6 +120,7 @@ class WatchListManager(QObject):
     def clear_all(self):
         """Remove all signals from watch list."""
         self._watched_signals.clear()
+        self._planner.clear()
         self._poll_timer.stop()
         logger.info("Cleared watch list")
         self.watch_list_changed.emit()
@@ -118,6 +144,7 @@ class WatchListManager(QObject):
     def set_poll_interval(self, interval_ms: int):
         """Set the polling interval in milliseconds."""
         self._poll_interval_ms = max(100, interval_ms)  # Minimum 100ms
+        self._planner.timeout_s = self._outstanding_timeout_s()
         
         if self._poll_timer.isActive():
             self._poll_timer.stop()
@@ -129,75 +156,97 @@ class WatchListManager(QObject):
         """Get current poll interval."""
         return self._poll_interval_ms
     
+    def _outstanding_timeout_s(self) -> float:
+        """How long a read may stay unanswered before the signal is polled again."""
+        return max(10.0, 5 * self._poll_interval_ms / 1000.0)
+
+    def get_poll_statistics(self) -> Dict[str, dict]:
+        """Per-device poll statistics (batches, skipped signals, overruns, latency)."""
+        return self._planner.stats()
+
     def _poll_all_signals(self):
-        """Poll all watched signals for updates."""
-        for watch_id, watched in self._watched_signals.items():
-            try:
-                # Read signal from device
-                # Record request timestamp
-                import time
-                watched.last_request_ts = time.time()
+        """Poll all watched signals for updates, one batched request per device."""
+        now = time.time()
+        batches = self._planner.plan(self._watched_signals.values(), now)
+        read_signals = getattr(self.device_manager, 'read_signals', None)
 
-                updated_signal = self.device_manager.read_signal(
-                    watched.device_name,
-                    watched.signal
-                )
-                
-                if updated_signal:
-                    # Sync Result (from cache or blocking read)
-                    watched.signal = updated_signal
-                    # Compute RTT if possible
-                    try:
-                        import time
-                        if watched.last_request_ts:
-                            rtt_ms = int(round((time.time() - watched.last_request_ts) * 1000))
-                        else:
-                            rtt_ms = None
-                    except Exception:
-                        rtt_ms = None
+        for device_name, batch in batches.items():
+            for watched in batch:
+                watched.last_request_ts = now
+            self._planner.mark_sent(device_name, [w.watch_id for w in batch], now)
 
-                    watched.last_response_ms = rtt_ms
-                    if rtt_ms is not None:
-                        if watched.max_response_ms is None or rtt_ms > watched.max_response_ms:
-                            watched.max_response_ms = rtt_ms
-                        # Update the signal's last_rtt field for property dialog access
-                        updated_signal.last_rtt = float(rtt_ms)
-                        watched.signal.last_rtt = float(rtt_ms)
-                    self.signal_updated.emit(watch_id, updated_signal, rtt_ms)
-                else:
-                    # Async read enqueued - DO NOT invalidate signal yet.
-                    # Wait for _on_device_signal_updated to handle the result
-                    pass
-                    
+            try:
+                if read_signals is not None:
+                    results = read_signals(device_name, [w.signal for w in batch])
+                    if results is not None:
+                        # Answered synchronously (e.g. device disconnected)
+                        for watched, updated_signal in zip(batch, results):
+                            if updated_signal:
+                                self._handle_response(watched, updated_signal)
+                    # else: dispatched; results arrive via _on_device_signal_updated
+                    continue
+
+                for watched in batch:
+                    updated_signal = self.device_manager.read_signal(device_name, watched.signal)
+                    if updated_signal:
+                        self._handle_response(watched, updated_signal)
             except Exception as e:
-                logger.debug(f"Failed to poll {watch_id}: {e}")
+                logger.debug(f"Failed to poll {device_name}: {e}")
+                for watched in batch:
+                    self._planner.forget(watched.watch_id)
+
+    def _handle_response(self, watched: WatchedSignal, signal: Signal):
+        """Record a read result: RTT bookkeeping and UI notification."""
+        rtt_ms = self._record_response(watched, signal)
+        self.signal_updated.emit(watched.watch_id, signal, rtt_ms)
+
+    def _record_response(self, watched: WatchedSignal, signal: Signal):
+        """Complete the outstanding read and update RTT statistics; returns the RTT in ms."""
+        self._planner.complete(watched.watch_id)
+        watched.signal = signal
+        # Compute RTT if we have a request timestamp
+        rtt_ms = None
+        if watched.last_request_ts:
+            rtt_ms = int(round((time.time() - watched.last_request_ts) * 1000))
+
+        watched.last_response_ms = rtt_ms
+        if rtt_ms is not None:
+            _response_seconds.labels(watched.device_name).observe(rtt_ms / 1000.0)
+            if watched.max_response_ms is None or rtt_ms > watched.max_response_ms:
+                watched.max_response_ms = rtt_ms
+            # Update the signal's last_rtt field for property dialog access
+            signal.last_rtt = float(rtt_ms)
+        # Clear the last_request_ts to avoid reusing it for future unsolicited updates
+        watched.last_request_ts = None
+        return rtt_ms
 
     def _on_device_signal_updated(self, device_name: str, signal: Signal):
         """Handle signal updates from DeviceManager (e.g. from async workers)."""
-        watch_id = f"{device_name}::{signal.address}"
-        if watch_id in self._watched_signals:
-            watched = self._watched_signals[watch_id]
-            watched.signal = signal
-            # Compute RTT if we have a request timestamp
-            try:
-                import time
-                if watched.last_request_ts:
-                    rtt_ms = int(round((time.time() - watched.last_request_ts) * 1000))
-                else:
-                    rtt_ms = None
-            except Exception:
-                rtt_ms = None
+        watched = self._watched_signals.get(f"{device_name}::{signal.address}")
+        if watched is not None:
+            self._handle_response(watched, signal)
+
+    def _on_device_signal_updates(self, items: list):
+        """Batched form of _on_device_signal_updated: [(device_name, signal), ...]."""
+        watched_signals = self._watched_signals
+        for device_name, signal in items:
+            watched = watched_signals.get(f"{device_name}::{signal.address}")
+            if watched is not None:
+                self._handle_response(watched, signal)
+
+    def _on_device_signals_unchanged(self, items: list):
+        """Batched form of _on_device_signal_unchanged: [(device_name, signal), ...]."""
+        watched_signals = self._watched_signals
+        for device_name, signal in items:
+            watched = watched_signals.get(f"{device_name}::{signal.address}")
+            if watched is not None:
+                self._record_response(watched, signal)
 
-            watched.last_response_ms = rtt_ms
-            if rtt_ms is not None:
-                if watched.max_response_ms is None or rtt_ms > watched.max_response_ms:
-                    watched.max_response_ms = rtt_ms
-                # Update the signal's last_rtt field for property dialog access
-                signal.last_rtt = float(rtt_ms)
-                watched.signal.last_rtt = float(rtt_ms)
-            # Clear the last_request_ts to avoid reusing it for future unsolicited updates
-            watched.last_request_ts = None
-            self.signal_updated.emit(watch_id, signal, rtt_ms)
+    def _on_device_signal_unchanged(self, device_name: str, signal: Signal):
+        """A poll was answered with an unchanged value: bookkeeping only, no UI update."""
+        watched = self._watched_signals.get(f"{device_name}::{signal.address}")
+        if watched is not None:
+            self._record_response(watched, signal)
     
     def save_to_file(self, filepath: str):
         """Save watch list to JSON file."""
@@ -279,6 +328,7 @@ class WatchListManager(QObject):
                 # Insert under new key and remove old
                 self._watched_signals[new_key] = watched
                 del self._watched_signals[old_key]
+                self._planner.forget(old_key)
             except Exception:
                 logger.exception(f"Failed to migrate watched signal {old_key} to {new_name}")
 
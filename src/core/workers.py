@@ -6,11 +6,29 @@ import traceback
 from typing import Any, Dict, Optional
 
 from PySide6.QtCore import QThread, Signal
+from src.core import metrics
 from src.core.events import EventEmitter
 from src.models.device_models import Device
 
 logger = logging.getLogger(__name__)
 
+_queue_depth = metrics.gauge(
+    'scadascout_worker_queue_depth', 'Tasks waiting in a protocol worker queue', ('device',))
+_queue_wait = metrics.histogram(
+    'scadascout_worker_queue_wait_seconds', 'Time a task waited in a protocol worker queue', ('device',))
+_task_seconds = metrics.histogram(
+    'scadascout_worker_task_seconds', 'Time to execute one protocol worker task', ('device', 'action'))
+_task_errors = metrics.counter(
+    'scadascout_worker_errors_total', 'Protocol worker tasks that failed', ('device', 'action'))
+_read_seconds = metrics.histogram(
+    'scadascout_read_seconds', 'Latency of one signal read on the wire', ('device',))
+_read_errors = metrics.counter(
+    'scadascout_read_errors_total', 'Signal reads that raised', ('device',))
+_poll_cycle_seconds = metrics.histogram(
+    'scadascout_poll_cycle_seconds', 'Duration of one subscription poll cycle', ('device',))
+_poll_overruns = metrics.counter(
+    'scadascout_poll_overruns_total', 'Poll cycles that took longer than the poll interval', ('device',))
+
 def _parse_scd_file(file_path):
     """
     Helper function for parallel SCD parsing.
@@ -422,12 +440,17 @@ class IEC61850Worker(Worker):
         self._poll_interval = 1.0  
         self._last_poll_time = 0
 
+        self._read_seconds = _read_seconds.labels(device_name)
+        self._read_errors = _read_errors.labels(device_name)
+        _queue_depth.labels(device_name).set_function(self._queue.qsize)
+
     def run(self):
         while self._running:
             try:
                 # Use a timeout to allow "tick" logic if queue is empty
                 # We aim for ~1s polling cycle
-                task = self._queue.get(timeout=0.1)
+                enqueued_at, task = self._queue.get(timeout=0.1)
+                _queue_wait.labels(self._device_name).observe(time.perf_counter() - enqueued_at)
                 self._handle_task(task)
             except queue.Empty:
                 # No high-priority tasks, check if we should poll
@@ -452,6 +475,7 @@ class IEC61850Worker(Worker):
         if not subs:
             return
 
+        cycle_start = time.perf_counter()
         # Optimization: We could group by FC or Dataset here if adapter supports it.
         # For now, simplistic iteration.
         for sub in subs:
@@ -472,7 +496,9 @@ class IEC61850Worker(Worker):
 
                 if hasattr(self._client, 'read'):
                     # Direct read by address
+                    t_start = time.perf_counter()
                     val = self._client.read(sub.mms_path)
+                    self._read_seconds.observe(time.perf_counter() - t_start)
                     # The adapter handles updating its internal cache and emitting signal_update
                     # via the callback registered in DeviceManager.add_device
                 elif hasattr(self._client, 'read_signal'):
@@ -492,15 +518,33 @@ class IEC61850Worker(Worker):
                     rtt_ms = (t_end - t_start) * 1000.0
                     dummy.last_rtt = rtt_ms
                     dummy.rtt_state = RTTState.RECEIVED
+                    self._read_seconds.observe(rtt_ms / 1000.0)
             
             except Exception as e:
+                self._read_errors.inc()
                 logger.debug(f"Poll fail {self._device_name} {sub.mms_path}: {e}")
+
+        elapsed = time.perf_counter() - cycle_start
+        _poll_cycle_seconds.labels(self._device_name).observe(elapsed)
+        if elapsed > self._poll_interval:
+            _poll_overruns.labels(self._device_name).inc()
                 
 
+    def _timed_read(self, signal):
+        """read_signal with latency/error accounting; exceptions propagate."""
+        start = time.perf_counter()
+        try:
+            return self._client.read_signal(signal)
+        except Exception:
+            self._read_errors.inc()
+            raise
+        finally:
+            self._read_seconds.observe(time.perf_counter() - start)
+
     def _handle_task(self, task):
+            action = task.get("action")
+            start = time.perf_counter()
             try:
-                action = task.get("action")
-
                 if action == "read":
                     # Expect a Signal object in task['signal']
                     signal = task.get('signal')
@@ -509,7 +553,7 @@ class IEC61850Worker(Worker):
 
                     # Adapter's read_signal returns an updated Signal
                     if hasattr(self._client, 'read_signal'):
-                        updated = self._client.read_signal(signal)
+                        updated = self._timed_read(signal)
                     else:
                         # Fallback: try to call read by address if available
                         if hasattr(self._client, 'read'):
@@ -522,6 +566,22 @@ class IEC61850Worker(Worker):
                     # We can emit data_ready if needed, but usually the adapter calls back.
                     # self.emit("data_ready", self._device_name, updated)
 
+                elif action == "read_batch":
+                    # One task per poll cycle; a failing signal must not drop the rest
+                    for signal in task.get('signals') or []:
+                        try:
+                            if hasattr(self._client, 'read_signal'):
+                                self._timed_read(signal)
+                            elif hasattr(self._client, 'read'):
+                                signal.value = self._client.read(signal.address)
+                        except Exception as e:
+                            # Report the failure so the poll planner and views see it
+                            from src.models.device_models import SignalQuality
+                            signal.quality = SignalQuality.INVALID
+                            signal.error = str(e)
+                            if hasattr(self._client, '_emit_update'):
+                                self._client._emit_update(signal)
+
                 elif action == "write":
                     signal = task.get('signal')
                     value = task.get('value')
@@ -562,14 +622,18 @@ class IEC61850Worker(Worker):
                             self._client.select(signal)
 
             except Exception as e:
+                _task_errors.labels(self._device_name, str(action)).inc()
                 self.emit("error", str(e))
                 traceback.print_exc()
+            finally:
+                _task_seconds.labels(self._device_name, str(action)).observe(time.perf_counter() - start)
 
     def enqueue(self, task: dict):
-        self._queue.put(task)
+        self._queue.put((time.perf_counter(), task))
 
     def stop(self):
         self._running = False
+        _queue_depth.remove(self._device_name)
         self.emit("finished")
 
 class ModbusWorker(Worker):
@@ -585,53 +649,106 @@ class ModbusWorker(Worker):
         self._device_name = device_name
         self._queue = queue.Queue()
         self._running = True
+        self._read_seconds = _read_seconds.labels(device_name)
+        self._read_errors = _read_errors.labels(device_name)
+        _queue_depth.labels(device_name).set_function(self._queue.qsize)
 
     def run(self):
         while self._running:
             try:
-                task = self._queue.get(timeout=0.1)
+                enqueued_at, task = self._queue.get(timeout=0.1)
             except queue.Empty:
                 continue
-
+            start = time.perf_counter()
+            _queue_wait.labels(self._device_name).observe(start - enqueued_at)
+            action = task.get("action")
             try:
-                action = task.get("action")
-                signal = task.get('signal')
-                
-                if not signal:
-                    continue
+                self._run_task(task)
+            finally:
+                _task_seconds.labels(self._device_name, str(action)).observe(time.perf_counter() - start)
 
-                if action == "read":
-                    if hasattr(self._client, 'read_signal'):
-                        updated = self._client.read_signal(signal)
-                        # read_signal usually emits update via base protocol
-                        
-                elif action == "write":
-                    value = task.get('value')
-                    if hasattr(self._client, 'write_signal'):
-                        self._client.write_signal(signal, value)
+    def _timed_read(self, signal):
+        """read_signal with latency/error accounting; exceptions propagate."""
+        start = time.perf_counter()
+        try:
+            return self._client.read_signal(signal)
+        except Exception:
+            self._read_errors.inc()
+            raise
+        finally:
+            self._read_seconds.observe(time.perf_counter() - start)
 
-            except Exception as e:
-                # If an error occurs that wasn't handled by the adapter (e.g. crash in worker logic),
-                # we must ensure the signal is marked as invalid and UI is notified.
-                if signal:
-                    signal.quality = "Invalid" # Using string enum match or object
-                    # Try to set SignalQuality enum if possible, else string
-                    try:
-                         from src.models.device_models import SignalQuality
-                         signal.quality = SignalQuality.INVALID
-                    except:
-                         pass
-                         
-                    signal.error = str(e)
-                    # Force emit update if client has the mechanism
-                    if hasattr(self._client, '_emit_update'):
-                        self._client._emit_update(signal)
+    def _run_task(self, task):
+        if task.get("action") == "read_batch":
+            self._read_batch(task.get('signals') or [])
+            return
+
+        signal = None
+        try:
+            action = task.get("action")
+            signal = task.get('signal')
+            
+            if not signal:
+                return
+
+            if action == "read":
+                if hasattr(self._client, 'read_signal'):
+                    updated = self._timed_read(signal)
+                    # read_signal usually emits update via base protocol
                     
-                self.emit("error", str(e))
+            elif action == "write":
+                value = task.get('value')
+                if hasattr(self._client, 'write_signal'):
+                    self._client.write_signal(signal, value)
+
+        except Exception as e:
+            _task_errors.labels(self._device_name, str(action)).inc()
+            # If an error occurs that wasn't handled by the adapter (e.g. crash in worker logic),
+            # we must ensure the signal is marked as invalid and UI is notified.
+            if signal:
+                signal.quality = "Invalid" # Using string enum match or object
+                # Try to set SignalQuality enum if possible, else string
+                try:
+                     from src.models.device_models import SignalQuality
+                     signal.quality = SignalQuality.INVALID
+                except:
+                     pass
+                     
+                signal.error = str(e)
+                # Force emit update if client has the mechanism
+                if hasattr(self._client, '_emit_update'):
+                    self._client._emit_update(signal)
+                
+            self.emit("error", str(e))
+
+    def _read_batch(self, signals):
+        """Read a poll cycle's signals; failures are reported per signal."""
+        if hasattr(self._client, 'read_signals'):
+            # Contiguous addresses go out as one request per span
+            start = time.perf_counter()
+            try:
+                self._client.read_signals(signals)
+                return
+            except Exception as e:
+                self._read_errors.inc()
+                logger.debug(f"Batched read failed for {self._device_name}, reading one by one: {e}")
+            finally:
+                self._read_seconds.observe(time.perf_counter() - start)
+        for signal in signals:
+            try:
+                if hasattr(self._client, 'read_signal'):
+                    self._timed_read(signal)
+            except Exception as e:
+                from src.models.device_models import SignalQuality
+                signal.quality = SignalQuality.INVALID
+                signal.error = str(e)
+                if hasattr(self._client, '_emit_update'):
+                    self._client._emit_update(signal)
 
     def enqueue(self, task: dict):
-        self._queue.put(task)
+        self._queue.put((time.perf_counter(), task))
 
     def stop(self):
         self._running = False
+        _queue_depth.remove(self._device_name)
         self.emit("finished")
\ No newline at end of file
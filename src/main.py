@@ -28,6 +28,17 @@ def main():
     """
     Application Entry Point.
     """
+    # Headless service mode: no Qt application, no GUI imports
+    if "--headless" in sys.argv[1:]:
+        from src.core.headless import main as headless_main
+        return headless_main([a for a in sys.argv[1:] if a != "--headless"])
+
+    # Start-up profile: re-run under `-X importtime`, report written once the window is up
+    from src.utils import startup_profile
+    if "--profile-startup" in sys.argv[1:] and not startup_profile.enabled():
+        return startup_profile.relaunch_with_importtime(
+            [a for a in sys.argv[1:] if a != "--profile-startup"], os.path.abspath(__file__))
+
     try:
         # Prevent running the GUI with sudo on Linux/Unix: breaks DBus/X11 permissions
         # Windows Administrator mode is safe and sometimes needed (e.g., for port 102)
@@ -98,10 +109,12 @@ def main():
         from src.ui.main_window import MainWindow
         from src.core.device_manager import DeviceManager
         from src.core.app_controller import AppController
+        startup_profile.mark("imports (Qt, UI, core)")
 
         print("Initializing QApplication...")
         app = QApplication(sys.argv)
         app.setApplicationName("Scada Scout")
+        startup_profile.mark("QApplication")
         
         # Theme and font are applied from saved settings (or defaults) by MainWindow
         
@@ -109,12 +122,14 @@ def main():
         # Core Logic Initialization
         device_manager = DeviceManager()
         controller = AppController(device_manager)
+        startup_profile.mark("core components")
         
         # No default devices added on startup
         # User must add manually or import SCD
         # Create Main Window
         print("Creating main window...")
-        window = MainWindow(device_manager, event_logger=controller.event_logger)
+        window = MainWindow(device_manager, event_logger=controller.event_logger, historian=controller.historian)
+        startup_profile.mark("main window construction")
         
         # Connect Python Logging to event log widget
         # Centralized via QtLogHandler which signals the UI
@@ -132,6 +147,7 @@ def main():
         # Start the controller
         print("Starting controller...")
         controller.start_application()
+        startup_profile.mark("controller start (devices, scripts)")
 
         # Ensure controller can clean up background threads on exit
         app.aboutToQuit.connect(controller.shutdown)
@@ -146,6 +162,15 @@ def main():
         print("Showing main window...")
         window.show()
         print("Main window shown, starting event loop...")
+        startup_profile.mark("show main window")
+        if startup_profile.enabled():
+            from PySide6.QtCore import QTimer
+
+            def _write_startup_profile():
+                startup_profile.mark("first event loop turn")
+                startup_profile.write_report()
+                print(f"Startup profile written to {startup_profile.REPORT_PATH}")
+            QTimer.singleShot(0, _write_startup_profile)
         
         print("Calling app.exec()...")
         exit_code = app.exec()
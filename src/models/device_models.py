@@ -1,7 +1,8 @@
 from dataclasses import dataclass, field
 from enum import Enum, auto
-from typing import List, Optional, Dict, Any
+from typing import Callable, List, Optional, Dict, Any
 from datetime import datetime
+import threading
 
 class DeviceType(Enum):
     IEC104_RTU = "IEC 60870-5-104 RTU"
@@ -111,6 +112,78 @@ class Node:
     signals: List[Signal] = field(default_factory=list)
     children: List['Node'] = field(default_factory=list)
 
+
+class LazyNode(Node):
+    """
+    A Node whose children/signals are built on first access.
+
+    `loader(node)` fills `node.children` / `node.signals`; it runs once, the
+    first time either is read (tree expansion, address lookup, ...).
+    `path` is the address prefix of everything below the node (e.g.
+    'IED1LD0/XCBR1'), so lookups can find the node to load without
+    expanding anything else. `on_loaded(node)` is called after loading.
+    """
+    _load_lock = threading.RLock()
+
+    def __init__(self, name: str, description: str = "", loader: Optional[Callable[['LazyNode'], None]] = None,
+                 path: str = ""):
+        self._loader = loader
+        self._loading = False
+        self._children: List[Node] = []
+        self._signals: List[Signal] = []
+        self.path = path
+        self.on_loaded: Optional[Callable[['LazyNode'], None]] = None
+        super().__init__(name=name, description=description)
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._loader is None and not self._loading
+
+    def load(self) -> 'LazyNode':
+        """Build the subtree now (no-op if already built)."""
+        if self.is_loaded:
+            return self
+        with LazyNode._load_lock:
+            # Re-entrant: the loader itself may go through .children
+            loader = self._loader
+            if loader is None:
+                return self
+            self._loader = None
+            self._loading = True
+            try:
+                loader(self)
+            finally:
+                self._loading = False
+        callback = self.on_loaded
+        if callback is not None:
+            callback(self)
+        return self
+
+    @property
+    def children(self) -> List[Node]:
+        if not self.is_loaded:
+            self.load()
+        return self._children
+
+    @children.setter
+    def children(self, value: List[Node]):
+        self._children = value
+
+    @property
+    def signals(self) -> List[Signal]:
+        if not self.is_loaded:
+            self.load()
+        return self._signals
+
+    @signals.setter
+    def signals(self, value: List[Signal]):
+        self._signals = value
+
+    __hash__ = object.__hash__
+
+    def __eq__(self, other):
+        return self is other
+
 @dataclass
 class ModbusSignalMapping:
     """Definition for mapping higher-level values to raw registers on a slave"""
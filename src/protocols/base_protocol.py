@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 from typing import List, Optional, Callable
+from src.core.change_filter import ChangeFilter
 from src.models.device_models import DeviceConfig, Node, Signal
 
 class BaseProtocol(ABC):
@@ -8,14 +9,24 @@ class BaseProtocol(ABC):
     Ensures a consistent interface for IEC 104, IEC 61850, etc.
     """
     
+    # Class-level defaults for subclasses that do not call super().__init__()
+    change_filter: Optional[ChangeFilter] = None
+    _unchanged_callback: Optional[Callable[[Signal], None]] = None
+
     def __init__(self, config: DeviceConfig):
         self.config = config
         self._callback: Optional[Callable[[Signal], None]] = None
+        self._unchanged_callback = None
+        self.change_filter = ChangeFilter.from_config(config)
 
     def set_data_callback(self, callback: Callable[[Signal], None]):
         """Sets the callback function to receive asynchronous data updates."""
         self._callback = callback
 
+    def set_unchanged_callback(self, callback: Optional[Callable[[Signal], None]]):
+        """Sets the callback for read results dropped by the change filter (read completed, nothing new)."""
+        self._unchanged_callback = callback
+
     @abstractmethod
     def connect(self) -> bool:
         """Establish connection to the remote device."""
@@ -60,6 +71,11 @@ class BaseProtocol(ABC):
         raise NotImplementedError(f"{self.__class__.__name__} does not support cancel")
     
     def _emit_update(self, signal: Signal):
-        """Helper to invoke the data callback safely."""
+        """Helper to invoke the data callback; unchanged values stop here (see ChangeFilter)."""
         if self._callback:
+            change_filter = self.change_filter
+            if change_filter is not None and not change_filter.accept(signal):
+                if self._unchanged_callback is not None:
+                    self._unchanged_callback(signal)
+                return
             self._callback(signal)
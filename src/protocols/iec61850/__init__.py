@@ -2,8 +2,14 @@
 IEC 61850 Protocol Module
 
 This module provides IEC 61850 client functionality using libiec61850 via ctypes.
+The ctypes wrapper (which loads the native library) is imported on first use.
 """
 
-from . import iec61850_wrapper
-
 __all__ = ['iec61850_wrapper']
+
+
+def __getattr__(name):
+    if name == 'iec61850_wrapper':
+        import importlib
+        return importlib.import_module(f"{__name__}.iec61850_wrapper")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
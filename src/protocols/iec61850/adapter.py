@@ -10,12 +10,19 @@ from src.protocols.base_protocol import BaseProtocol
 from src.models.device_models import DeviceConfig, Node, Signal, SignalType, SignalQuality
 from src.core.scd_parser import SCDParser
 
-# Import the ctypes wrapper for libiec61850
-from . import iec61850_wrapper as iec61850
+# The ctypes wrapper for libiec61850 loads the native library when imported;
+# defer that until an adapter actually talks to an IED
+from src.utils.lazy_import import lazy_import
+iec61850 = lazy_import("src.protocols.iec61850.iec61850_wrapper")
 from .control_models import ControlObjectRuntime, ControlModel, ControlState
 
 logger = logging.getLogger(__name__)
 
+# Connect timeout applied to every association unless the device config sets
+# `connect_timeout_ms`; libiec61850's own default (10 s) makes reconnect
+# attempts to an unreachable IED needlessly slow
+DEFAULT_CONNECT_TIMEOUT_MS = 3000
+
 class VendorProfile(Enum):
     AUTO = "Auto"
     STANDARD = "Standard"
@@ -42,17 +49,23 @@ class IEC61850Adapter(BaseProtocol):
         self._last_read_times = {}
         self.controls: Dict[str, ControlObjectRuntime] = {} # Key: DO Object Reference
         self._lock = threading.Lock() # libiec61850 connection is not thread-safe
+        # Connection supervision: notified when a read finds the association gone;
+        # the last good object reference doubles as the keepalive probe
+        self._connection_lost_callback = None
+        self._keepalive_ref = None  # (object reference, fc)
+        self._last_ok = 0.0
         
-        # Diagnostic check for UTC time binding
-        if not hasattr(iec61850, 'MmsValue_newUtcTimeMs'):
-            logger.warning("iec61850_wrapper is missing MmsValue_newUtcTimeMs attribute!")
-        else:
-            logger.debug("iec61850_wrapper has MmsValue_newUtcTimeMs.")
         # Dump control MmsValue payloads when env var SCADAScout_DUMP_MMS is set (value ignored)
         self._dump_mms_enabled = bool(os.environ.get('SCADAScout_DUMP_MMS'))
         
     def connect(self) -> bool:
         """Establish connection to the IED with comprehensive diagnostics."""
+        # Diagnostic check for UTC time binding (first use loads the native library)
+        if not hasattr(iec61850, 'MmsValue_newUtcTimeMs'):
+            logger.warning("iec61850_wrapper is missing MmsValue_newUtcTimeMs attribute!")
+        else:
+            logger.debug("iec61850_wrapper has MmsValue_newUtcTimeMs.")
+
         if self.event_logger:
             self.event_logger.info("Connection", f"=== Starting connection to {self.config.ip_address}:{self.config.port} ===")
         
@@ -99,6 +112,7 @@ class IEC61850Adapter(BaseProtocol):
             
             logger.info(f"Connecting to {self.config.ip_address} using libiec61850...")
             self.connection = iec61850.IedConnection_create()
+            self._apply_timeouts()
             
             if self.event_logger:
                 self.event_logger.transaction("IEC61850", f"→ IedConnection_connect({self.config.ip_address}, {self.config.port})")
@@ -150,6 +164,7 @@ class IEC61850Adapter(BaseProtocol):
                 return False
             
             self.connected = True
+            self._last_ok = time.monotonic()
             if self.event_logger:
                 self.event_logger.transaction("IEC61850", f"← Connection SUCCESS")
                 self.event_logger.info("Connection", f"✓ IEC 61850 connection established")
@@ -171,6 +186,104 @@ class IEC61850Adapter(BaseProtocol):
                 self.connection = None
             return False
 
+    def _apply_timeouts(self):
+        """Apply connect/request timeouts from protocol_params to the connection handle."""
+        params = self.config.protocol_params or {}
+        try:
+            iec61850.IedConnection_setConnectTimeout(
+                self.connection, int(params.get('connect_timeout_ms', DEFAULT_CONNECT_TIMEOUT_MS)))
+            if 'request_timeout_ms' in params:
+                iec61850.IedConnection_setRequestTimeout(self.connection, int(params['request_timeout_ms']))
+        except Exception as e:
+            logger.debug(f"Could not set connection timeouts: {e}")
+
+    def set_connection_lost_callback(self, callback):
+        """Called (with no arguments) when an operation finds the association lost."""
+        self._connection_lost_callback = callback
+
+    def _mark_connection_lost(self, reason: str):
+        if not self.connected:
+            return
+        self.connected = False
+        logger.warning(f"Connection lost to {self.config.ip_address}: {reason}")
+        if self.event_logger:
+            self.event_logger.error("IEC61850", f"← CONNECTION LOST ({reason})")
+        callback = self._connection_lost_callback
+        if callback:
+            try:
+                callback()
+            except Exception:
+                logger.exception("Connection lost callback failed")
+
+    def check_connection(self, keepalive_s: float = 5.0) -> bool:
+        """
+        Cheap liveness check used by the connection supervisor.
+
+        Checks the connection state, and when nothing has been read for
+        `keepalive_s` re-reads the last successfully read object (or lists
+        the logical devices if nothing was read yet) so that a silently
+        dead peer, e.g. behind a rebooting switch, is noticed.
+        """
+        if not self.connected or not self.connection:
+            return False
+        with self._lock:
+            state = iec61850.IedConnection_getState(self.connection)
+        if state != iec61850.IED_STATE_CONNECTED:
+            self._mark_connection_lost(f"state {state}")
+            return False
+        if keepalive_s <= 0 or time.monotonic() - self._last_ok < keepalive_s:
+            return True
+
+        ref = self._keepalive_ref
+        with self._lock:
+            if ref is not None:
+                result, err = iec61850.IedConnection_readObject(self.connection, ref[0], ref[1])
+                if result:
+                    iec61850.MmsValue_delete(result)
+            else:
+                result, err = iec61850.IedConnection_getLogicalDeviceList(self.connection)
+                if result:
+                    iec61850.LinkedList_destroy(result)
+        if err in (iec61850.IED_ERROR_NOT_CONNECTED, iec61850.IED_ERROR_CONNECTION_LOST,
+                   iec61850.IED_ERROR_TIMEOUT):
+            self._mark_connection_lost(f"keepalive error {err}")
+            return False
+        # Any other answer (even an access error) proves the peer is there
+        self._last_ok = time.monotonic()
+        return True
+
+    def reconnect(self) -> bool:
+        """
+        Re-establish a lost association without the diagnostics and discovery
+        of `connect()`: the existing handle is closed and connected again, and
+        the discovered model and control contexts are kept as they are.
+        """
+        if not iec61850.is_library_loaded():
+            return False
+        with self._lock:
+            if self.connection is None:
+                self.connection = iec61850.IedConnection_create()
+                self._apply_timeouts()
+            else:
+                try:
+                    iec61850.IedConnection_close(self.connection)
+                except Exception as e:
+                    logger.debug(f"Error closing stale connection: {e}")
+            error = iec61850.IedConnection_connect(self.connection, self.config.ip_address, self.config.port)
+        if error != iec61850.IED_ERROR_OK:
+            logger.debug(f"Reconnect to {self.config.ip_address}:{self.config.port} failed (error {error})")
+            return False
+
+        # A selection does not survive the association it was made on
+        for ctx in list(self.controls.values()):
+            ctx.reset()
+        self._last_ok = time.monotonic()
+        self.connected = True
+        if self.event_logger:
+            self.event_logger.info("Connection", f"✓ Reconnected to {self.config.ip_address}:{self.config.port}")
+        logger.info(f"Reconnected to {self.config.ip_address}:{self.config.port}")
+        return True
+
     def _dump_mms_val(self, mms_val, label: str):
         """Write MmsValue_toString to dumps/ when SCADAScout_DUMP_MMS env var is set."""
         if not getattr(self, '_dump_mms_enabled', False) or not mms_val:
@@ -321,10 +434,12 @@ class IEC61850Adapter(BaseProtocol):
              return "[Complex Data]", SignalType.STATE, ""
 
     def disconnect(self):
-        if self.connection:
-            iec61850.IedConnection_close(self.connection)
-            self._cleanup_connection()
         self.connected = False
+        # Under the lock: a supervisor reconnect may be using the handle
+        with self._lock:
+            if self.connection:
+                iec61850.IedConnection_close(self.connection)
+                self._cleanup_connection()
         logger.info("Disconnected.")
 
     def _cleanup_connection(self):
@@ -359,7 +474,8 @@ class IEC61850Adapter(BaseProtocol):
         try:
             parser = SCDParser(self.config.scd_file_path)
             # Find IED in SCD that matches our config name, or take the first one
-            root = parser.get_structure(ied_name=self.config.name)
+            # LN subtrees are expanded on first access
+            root = parser.get_structure(ied_name=self.config.name, lazy=True)
             return root
         except Exception as e:
             logger.error(f"Offline discovery failed: {e}")
@@ -993,14 +1109,11 @@ class IEC61850Adapter(BaseProtocol):
         with self._lock:
             # Check actual connection state
             state = iec61850.IedConnection_getState(self.connection)
-            if state != iec61850.IED_STATE_CONNECTED:
-                self.connected = False
-                logger.warning(f"Connection lost detected during read for {self.config.ip_address} (State: {state})")
-                if self.event_logger:
-                    self.event_logger.error("IEC61850", f"← CONNECTION LOST (State: {state})")
-                signal.quality = SignalQuality.NOT_CONNECTED
-                self._emit_update(signal)
-                return signal
+        if state != iec61850.IED_STATE_CONNECTED:
+            self._mark_connection_lost(f"state {state} during read")
+            signal.quality = SignalQuality.NOT_CONNECTED
+            self._emit_update(signal)
+            return signal
 
         # Read from actual IED using correct pyiec61850 API
         try:
@@ -1124,6 +1237,7 @@ class IEC61850Adapter(BaseProtocol):
 
             value_read = False
             last_error = None
+            connection_error = None
             # Try each FC
             val = None
             err = None
@@ -1175,7 +1289,11 @@ class IEC61850Adapter(BaseProtocol):
                 if err == iec61850.IED_ERROR_OK:
                     if final_addr != address and self.event_logger:
                          self.event_logger.debug("IEC61850", f"  ✓ Success with alt format: {final_addr}")
+                    self._keepalive_ref = (final_addr, fc_code)
                     break # Success!
+                elif err in (iec61850.IED_ERROR_NOT_CONNECTED, iec61850.IED_ERROR_CONNECTION_LOST):
+                    connection_error = err
+                    break # No point trying other FCs
                 elif err == iec61850.IED_ERROR_OBJECT_DOES_NOT_EXIST:
                     # Don't log as error immediately, try next FC
                     if self.event_logger:
@@ -1185,6 +1303,12 @@ class IEC61850Adapter(BaseProtocol):
                          self.event_logger.debug("IEC61850", f"IED Error: {err} for {address}")
                     last_error = err
 
+            if connection_error is not None:
+                self._mark_connection_lost(f"error {connection_error} during read")
+                signal.quality = SignalQuality.NOT_CONNECTED
+                self._emit_update(signal)
+                return signal
+
             successful_fc = None  # Track which FC succeeded
             
             def extract_val(res, expected_types=None):
@@ -1414,6 +1538,7 @@ class IEC61850Adapter(BaseProtocol):
                     continue
             
             if value_read:
+                self._last_ok = time.monotonic()
                 # Success! Now try to get sibling timestamp (.t) if possible
                 if ".stVal" in address or ".mag" in address or ".cVal" in address:
                     try:
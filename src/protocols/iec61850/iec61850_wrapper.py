@@ -323,6 +323,34 @@ def IedConnection_getState(connection):
     func.argtypes = [IedConnection]
     return func(connection)
 
+def IedConnection_setConnectTimeout(connection, timeout_ms):
+    """
+    Set the timeout for establishing the connection (TCP + MMS initiate).
+
+    Args:
+        connection: IedConnection handle
+        timeout_ms: Timeout in milliseconds (int)
+    """
+    _check_lib()
+    func = _lib.IedConnection_setConnectTimeout
+    func.restype = None
+    func.argtypes = [IedConnection, c_uint32]
+    func(connection, timeout_ms)
+
+def IedConnection_setRequestTimeout(connection, timeout_ms):
+    """
+    Set the timeout for confirmed service requests (reads, writes, ...).
+
+    Args:
+        connection: IedConnection handle
+        timeout_ms: Timeout in milliseconds (int)
+    """
+    _check_lib()
+    func = _lib.IedConnection_setRequestTimeout
+    func.restype = None
+    func.argtypes = [IedConnection, c_uint32]
+    func(connection, timeout_ms)
+
 # ============================================================================
 # Device Browsing
 # ============================================================================
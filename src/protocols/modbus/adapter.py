@@ -2,6 +2,7 @@
 Modbus TCP Protocol Adapter
 Supports reading and writing Modbus TCP devices
 """
+import importlib.util
 import logging
 import struct
 from datetime import datetime
@@ -15,19 +16,34 @@ from src.models.device_models import (
 )
 from src.protocols.modbus.register_mapping import encode_mapped_value, decode_mapped_value, get_register_count
 
-# Try to import pymodbus 3.x
-try:
-    from pymodbus.client import ModbusTcpClient
-    from pymodbus.exceptions import ModbusException, ConnectionException
-    HAS_PYMODBUS = True
-except ImportError:
-    HAS_PYMODBUS = False
-    ModbusTcpClient = None
-    ModbusException = Exception
-    ConnectionException = Exception
+# pymodbus 3.x is imported on first connect (see _load_pymodbus); at import
+# time we only check that it is installed, which keeps start-up fast.
+HAS_PYMODBUS = importlib.util.find_spec("pymodbus") is not None
+ModbusTcpClient = None
+ModbusException = Exception
+ConnectionException = Exception
 
 logger = logging.getLogger(__name__)
 
+
+def _load_pymodbus() -> bool:
+    """Import the pymodbus client classes on first use; False if unavailable."""
+    global HAS_PYMODBUS, ModbusTcpClient, ModbusException, ConnectionException
+    if ModbusTcpClient is not None:
+        return True
+    if not HAS_PYMODBUS:
+        return False
+    try:
+        from pymodbus.client import ModbusTcpClient as _client
+        from pymodbus.exceptions import ModbusException as _modbus_exc, ConnectionException as _conn_exc
+    except ImportError as e:
+        logger.error(f"pymodbus import failed: {e}")
+        HAS_PYMODBUS = False
+        return False
+    ModbusException, ConnectionException = _modbus_exc, _conn_exc
+    ModbusTcpClient = _client
+    return True
+
 MODBUS_EXCEPTIONS = {
     1: "Illegal Function",
     2: "Illegal Data Address",
@@ -40,6 +56,18 @@ MODBUS_EXCEPTIONS = {
     11: "Gateway Target Device Failed to Respond"
 }
 
+# Read function per function code, and the per-request limits of the spec
+_READ_FUNCS = {
+    1: 'read_coils',
+    2: 'read_discrete_inputs',
+    3: 'read_holding_registers',
+    4: 'read_input_registers',
+}
+MAX_READ_REGISTERS = 125
+MAX_READ_BITS = 2000
+MAX_WRITE_REGISTERS = 123
+MAX_WRITE_COILS = 1968
+
 
 
 class ModbusTCPAdapter(BaseProtocol):
@@ -63,7 +91,7 @@ class ModbusTCPAdapter(BaseProtocol):
     
     def connect(self) -> bool:
         """Establish connection to Modbus TCP device"""
-        if not HAS_PYMODBUS:
+        if not _load_pymodbus():
             logger.error("Cannot connect: pymodbus not available")
             return False
         
@@ -336,15 +364,7 @@ class ModbusTCPAdapter(BaseProtocol):
                     signal.modbus_offset
                 )
             
-            # Update last_changed if value changed
-            now = datetime.now()
-            if signal.value != new_value:
-                signal.value = new_value
-                signal.last_changed = now
-            
-            signal.quality = SignalQuality.GOOD
-            signal.timestamp = now
-            signal.error = ""
+            self._set_read_value(signal, new_value, datetime.now())
             
             if self.event_logger:
                 self.event_logger.transaction(self.config.name, f"← READ OK: {signal.value}")
@@ -371,6 +391,223 @@ class ModbusTCPAdapter(BaseProtocol):
         
         return signal
     
+    def _set_read_value(self, signal: Signal, new_value: Any, now: datetime):
+        # Update last_changed if value changed
+        if signal.value != new_value:
+            signal.value = new_value
+            signal.last_changed = now
+        signal.quality = SignalQuality.GOOD
+        signal.timestamp = now
+        signal.error = ""
+
+    @staticmethod
+    def _parse_address(address: str) -> Optional[Tuple[int, int, int]]:
+        """"unit:function:address" -> (unit, function, address), or None if malformed"""
+        parts = address.split(':')
+        if len(parts) != 3:
+            return None
+        try:
+            return int(parts[0]), int(parts[1]), int(parts[2])
+        except ValueError:
+            return None
+
+    @staticmethod
+    def _spans(items, max_len: int):
+        """
+        Merge (address, count, payload) items whose ranges touch or overlap
+        into spans of at most `max_len`; yields (start, length, items).
+        """
+        start = end = None
+        members = []
+        for item in sorted(items, key=lambda item: item[0]):
+            address, count = item[0], item[1]
+            if members and address <= end and max(end, address + count) - start <= max_len:
+                end = max(end, address + count)
+                members.append(item)
+                continue
+            if members:
+                yield start, end - start, members
+            start, end, members = address, address + count, [item]
+        if members:
+            yield start, end - start, members
+
+    def read_signals(self, signals: List[Signal]) -> List[Signal]:
+        """
+        Read several signals with as few requests as possible.
+
+        Signals are grouped by unit and function code, and addresses that
+        touch or overlap are read as one span (up to 125 registers / 2000
+        bits per request). A span the device rejects is read again signal by
+        signal, so one bad address only fails itself. Every signal is
+        reported through the data callback as with `read_signal`.
+        """
+        signals = list(signals)
+        if not self.connected or not self.client:
+            return [self.read_signal(signal) for signal in signals]
+
+        groups = {}
+        singles = []
+        for signal in signals:
+            parsed = self._parse_address(signal.address)
+            if parsed is None or parsed[1] not in _READ_FUNCS:
+                singles.append(signal)
+                continue
+            unit_id, func_code, address = parsed
+            if func_code in (1, 2):
+                count = 1
+            else:
+                count = self._get_register_size(signal.modbus_data_type or ModbusDataType.UINT16)
+            groups.setdefault((unit_id, func_code), []).append((address, count, signal))
+
+        for (unit_id, func_code), items in groups.items():
+            max_len = MAX_READ_BITS if func_code in (1, 2) else MAX_READ_REGISTERS
+            for start, length, members in self._spans(items, max_len):
+                if len(members) == 1 or not self.connected:
+                    singles.extend(signal for _, _, signal in members)
+                else:
+                    self._read_span(unit_id, func_code, start, length, members)
+
+        for signal in singles:
+            self.read_signal(signal)
+        return signals
+
+    def _read_span(self, unit_id: int, func_code: int, start: int, length: int, members):
+        if self.event_logger:
+            self.event_logger.transaction(
+                self.config.name,
+                f"→ READ FC{func_code} Unit={unit_id} Addr={start} Count={length} ({len(members)} signals)")
+        try:
+            result = getattr(self.client, _READ_FUNCS[func_code])(start, count=length, device_id=unit_id)
+        except ConnectionException:
+            self.connected = False
+            if self.event_logger:
+                self.event_logger.error(self.config.name, "← Connection lost during read")
+            for _, _, signal in members:
+                signal.quality = SignalQuality.NOT_CONNECTED
+                signal.error = "Connection lost"
+                self._emit_update(signal)
+            return
+        except Exception as e:
+            logger.debug(f"Span read FC{func_code} {start}+{length} failed: {e}")
+            result = None
+
+        if result is None or result.isError():
+            # Find out which address the device objects to
+            for _, _, signal in members:
+                self.read_signal(signal)
+            return
+
+        now = datetime.now()
+        for address, count, signal in members:
+            offset = address - start
+            try:
+                if func_code in (1, 2):
+                    new_value = bool(result.bits[offset])
+                else:
+                    new_value = self._decode_registers(
+                        result.registers[offset:offset + count],
+                        signal.modbus_data_type or ModbusDataType.UINT16,
+                        signal.modbus_endianness,
+                        signal.modbus_scale,
+                        signal.modbus_offset
+                    )
+                self._set_read_value(signal, new_value, now)
+            except Exception as e:
+                signal.quality = SignalQuality.INVALID
+                signal.error = str(e)
+            self._emit_update(signal)
+        if self.event_logger:
+            self.event_logger.transaction(self.config.name, f"← READ OK: {len(members)} signals")
+
+    def write_signals(self, writes: List[tuple]) -> List[bool]:
+        """
+        Write several (signal, value) pairs with as few requests as possible.
+
+        Holding registers and coils of one unit whose addresses touch or
+        overlap are written as one FC16/FC15 request (the pair given last
+        wins where they overlap). A rejected span is written again pair by
+        pair; anything else goes through `write_signal`. Returns a success
+        flag per pair.
+        """
+        writes = list(writes)
+        results = [False] * len(writes)
+        if not self.connected or not self.client:
+            if self.event_logger:
+                self.event_logger.error(self.config.name, "Cannot write: not connected")
+            return results
+
+        groups = {}
+        singles = []
+        for index, (signal, value) in enumerate(writes):
+            parsed = self._parse_address(signal.address)
+            if parsed is None or parsed[1] not in (1, 3):
+                singles.append(index)
+                continue
+            unit_id, func_code, address = parsed
+            try:
+                if func_code == 1:
+                    words = [bool(value)]
+                else:
+                    words = self._encode_value(
+                        value,
+                        signal.modbus_data_type or ModbusDataType.UINT16,
+                        signal.modbus_endianness,
+                        signal.modbus_scale,
+                        signal.modbus_offset
+                    )
+            except Exception:
+                singles.append(index)  # write_signal reports the encoding error
+                continue
+            groups.setdefault((unit_id, func_code), []).append((address, len(words), (index, words)))
+
+        for (unit_id, func_code), items in groups.items():
+            max_len = MAX_WRITE_COILS if func_code == 1 else MAX_WRITE_REGISTERS
+            for start, length, members in self._spans(items, max_len):
+                indexes = [index for _, _, (index, _) in members]
+                if len(members) == 1 or not self.connected:
+                    singles.extend(indexes)
+                    continue
+                buffer = [0] * length
+                for address, _, (index, words) in sorted(members, key=lambda m: m[2][0]):
+                    buffer[address - start:address - start + len(words)] = words
+                if self._write_span(unit_id, func_code, start, buffer, len(members)):
+                    for index in indexes:
+                        signal = writes[index][0]
+                        signal.error = ""
+                        signal.quality = SignalQuality.GOOD
+                        results[index] = True
+                elif self.connected:
+                    singles.extend(indexes)
+
+        for index in sorted(singles):
+            signal, value = writes[index]
+            results[index] = self.write_signal(signal, value)
+        return results
+
+    def _write_span(self, unit_id: int, func_code: int, start: int, buffer: list, count: int) -> bool:
+        if self.event_logger:
+            self.event_logger.transaction(
+                self.config.name,
+                f"→ WRITE FC{15 if func_code == 1 else 16} Unit={unit_id} Addr={start} Count={len(buffer)} ({count} signals)")
+        try:
+            if func_code == 1:
+                result = self.client.write_coils(start, buffer, device_id=unit_id)
+            else:
+                result = self.client.write_registers(start, buffer, device_id=unit_id)
+        except ConnectionException:
+            self.connected = False
+            if self.event_logger:
+                self.event_logger.error(self.config.name, "← Connection lost during write")
+            return False
+        except Exception as e:
+            logger.debug(f"Span write FC{func_code} {start}+{len(buffer)} failed: {e}")
+            return False
+        if result is None or result.isError():
+            return False
+        if self.event_logger:
+            self.event_logger.transaction(self.config.name, f"← WRITE SUCCESS ({count} signals)")
+        return True
+
     def write_signal(self, signal: Signal, value: Any) -> bool:
         """Write value to a Modbus signal"""
         if not self.connected or not self.client:
@@ -0,0 +1,206 @@
+"""
+Shared-memory image of a Modbus slave's registers.
+
+The slave's data blocks can be placed in a `multiprocessing.shared_memory`
+segment so that another process (a simulation, a test driver) can change
+register values directly, with no copies and no RPC, while the server
+keeps answering masters from the same memory.
+
+Layout (all little-endian, offsets in bytes from the start of the segment):
+
+    0   4s       magic b"SSRI"
+    4   uint32   layout version (1)
+    8   uint64   change sequence, coils
+    16  uint64   change sequence, discrete inputs
+    24  uint64   change sequence, holding registers
+    32  uint64   change sequence, input registers
+    40  uint32   number of segments N
+    44  uint32   process id of the owning server (0 = unknown)
+    48  N x 24   segment table: uint32 register type (TYPE_CODES),
+                 uint32 start address, uint32 count, uint32 reserved,
+                 uint64 data offset
+    ..  uint16   register values of every segment, each 8-byte aligned
+
+Every segment is a contiguous address range of one register type (coils
+and discrete inputs hold 0/1 per address). A writer updates values in
+place and then increments the sequence of that register type; readers
+compare sequences to find out whether anything changed. The sequence is
+a change indicator, not a lock: a master may observe a multi-register
+value half-written.
+
+The owner PID lets a server restarted after a crash replace the segment
+its predecessor left behind (`remove_if_stale`) without ever unlinking a
+segment that a running server still owns.
+
+Example (driver process):
+
+    image = RegisterImage.attach("scada-scout-slave-5020")
+    regs = image.view("holding", 0, 1000)
+    regs[:] = new_values          # numpy, zero copy
+    image.bump("holding")
+"""
+import os
+import struct
+import sys
+from multiprocessing import shared_memory
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+MAGIC = b"SSRI"
+VERSION = 1
+HEADER = struct.Struct("<4sI4QII")
+SEGMENT = struct.Struct("<IIIIQ")
+TYPE_CODES = {"coils": 0, "discrete": 1, "holding": 2, "input": 3}
+_SEQ_OFFSET = 8
+_OWNER_PID_OFFSET = 44
+
+
+class RegisterImage:
+    """
+    A shared-memory register image; see the module docstring for the layout.
+
+    Use `create` in the owning (server) process and `attach` elsewhere.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        self._shm = shm
+        self.owner = owner
+        magic, version, *_seqs, n, _ = HEADER.unpack_from(shm.buf, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{shm.name} is not a register image (version {VERSION})")
+        self._seq = np.ndarray((4,), dtype='<u8', buffer=shm.buf, offset=_SEQ_OFFSET)
+        self._segments: Dict[str, List[Tuple[int, np.ndarray]]] = {name: [] for name in TYPE_CODES}
+        names = {code: name for name, code in TYPE_CODES.items()}
+        for i in range(n):
+            code, start, count, _, offset = SEGMENT.unpack_from(shm.buf, HEADER.size + i * SEGMENT.size)
+            data = np.ndarray((count,), dtype='<u2', buffer=shm.buf, offset=offset)
+            self._segments[names[code]].append((start, data))
+
+    @classmethod
+    def create(cls, ranges: Dict[str, Iterable[Tuple[int, int]]],
+               name: Optional[str] = None) -> 'RegisterImage':
+        """Create an image holding {register_type: [(start, count), ...]}."""
+        table = [(TYPE_CODES[rtype], int(start), int(count))
+                 for rtype, spans in ranges.items() for start, count in spans if count > 0]
+        offset = _align(HEADER.size + SEGMENT.size * len(table))
+        layout = []
+        for code, start, count in table:
+            layout.append((code, start, count, offset))
+            offset = _align(offset + 2 * count)
+
+        shm = shared_memory.SharedMemory(name=name, create=True, size=max(offset, 1))
+        HEADER.pack_into(shm.buf, 0, MAGIC, VERSION, 0, 0, 0, 0, len(layout), os.getpid())
+        for i, (code, start, count, data_offset) in enumerate(layout):
+            SEGMENT.pack_into(shm.buf, HEADER.size + i * SEGMENT.size, code, start, count, 0, data_offset)
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> 'RegisterImage':
+        """Attach to an existing image (e.g. from a simulation process)."""
+        if sys.version_info >= (3, 13):
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            shm = shared_memory.SharedMemory(name=name)
+            # Before 3.13 the resource tracker would unlink the segment when
+            # this (non-owning) process exits
+            try:
+                from multiprocessing import resource_tracker
+                resource_tracker.unregister(shm._name, "shared_memory")
+            except Exception:
+                pass
+        return cls(shm, owner=False)
+
+    @classmethod
+    def remove_if_stale(cls, name: str) -> bool:
+        """
+        Unlink image `name` if the server process that created it is gone.
+        Returns False (and leaves the segment alone) when the owner is alive,
+        unknown, or the segment is not a register image.
+        """
+        try:
+            image = cls.attach(name)
+        except FileNotFoundError:
+            return True
+        except ValueError:
+            return False
+        pid = image.owner_pid
+        image.close()
+        if not pid or _pid_alive(pid):
+            return False
+        stale = shared_memory.SharedMemory(name=name)
+        stale.close()
+        try:
+            stale.unlink()
+        except FileNotFoundError:
+            pass
+        return True
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @property
+    def owner_pid(self) -> int:
+        return struct.unpack_from("<I", self._shm.buf, _OWNER_PID_OFFSET)[0]
+
+    def segments(self, register_type: str) -> List[Tuple[int, np.ndarray]]:
+        """[(start address, uint16 array view)] of one register type."""
+        return self._segments[register_type]
+
+    def view(self, register_type: str, address: int, count: int = 1) -> np.ndarray:
+        """Writable zero-copy view of [address, address + count)."""
+        for start, data in self._segments[register_type]:
+            if start <= address and address + count <= start + len(data):
+                return data[address - start:address - start + count]
+        raise IndexError(f"{register_type} {address}..{address + count - 1} is not in the image")
+
+    def write(self, register_type: str, address: int, values) -> None:
+        """Copy `values` into the image and bump the sequence."""
+        self.view(register_type, address, len(values))[:] = np.asarray(values, dtype=np.int64) & 0xFFFF
+        self.bump(register_type)
+
+    def seq(self, register_type: str) -> int:
+        return int(self._seq[TYPE_CODES[register_type]])
+
+    def seq_cell(self, register_type: str) -> np.ndarray:
+        """One-element view of a sequence counter (shared with data blocks)."""
+        code = TYPE_CODES[register_type]
+        return self._seq[code:code + 1]
+
+    def bump(self, register_type: str) -> None:
+        self._seq[TYPE_CODES[register_type]] += 1
+
+    def close(self):
+        """Release this process' mapping (and remove the segment if owner)."""
+        self._seq = None
+        self._segments = {name: [] for name in TYPE_CODES}
+        try:
+            self._shm.close()
+        except BufferError:
+            # Views handed out to data blocks are still alive; the mapping
+            # goes away with them
+            pass
+        if self.owner:
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def _pid_alive(pid: int) -> bool:
+    if pid == os.getpid() or os.name == 'nt':
+        # Windows frees a segment with its last handle, so one that still
+        # exists has a live owner
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
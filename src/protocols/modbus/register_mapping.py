@@ -1,7 +1,19 @@
 import struct
-from typing import List, Any, Optional
+from typing import List, Any, Optional, Sequence
+import numpy as np
 from src.models.device_models import ModbusDataType, ModbusEndianness
 
+# Big-endian numpy dtypes for types that can be encoded as whole arrays
+_NUMPY_TYPES = {
+    ModbusDataType.INT16: '>i2', ModbusDataType.UINT16: '>u2',
+    ModbusDataType.HEX16: '>u2', ModbusDataType.BINARY16: '>u2',
+    ModbusDataType.INT32: '>i4', ModbusDataType.UINT32: '>u4',
+    ModbusDataType.FLOAT32: '>f4',
+    ModbusDataType.INT64: '>i8', ModbusDataType.UINT64: '>u8',
+    ModbusDataType.FLOAT64: '>f8',
+    ModbusDataType.BOOL: '>u2', ModbusDataType.BIT: '>u2',
+}
+
 def encode_mapped_value(value: Any, 
                        data_type: ModbusDataType, 
                        endianness: ModbusEndianness = ModbusEndianness.BIG_ENDIAN,
@@ -54,6 +66,37 @@ def encode_mapped_value(value: Any,
     # 3. Apply endianness/swapping
     return _apply_swapping(raw_bytes, endianness)
 
+def encode_mapped_values(values: Sequence[float],
+                         data_type: ModbusDataType,
+                         endianness: ModbusEndianness = ModbusEndianness.BIG_ENDIAN) -> Optional[np.ndarray]:
+    """
+    Array version of encode_mapped_value() for already-scaled numeric values.
+
+    Returns a (len(values), register_count) uint16 array with the same word
+    layout encode_mapped_value() produces, or None for types that have no
+    fixed-width numeric encoding (STRING, BCD) so callers can fall back to
+    the scalar encoder. Integer types are clipped to their range instead of
+    raising.
+    """
+    dtype = _NUMPY_TYPES.get(data_type)
+    if dtype is None:
+        return None
+    arr = np.asarray(values, dtype=np.float64)
+    if data_type in (ModbusDataType.BOOL, ModbusDataType.BIT):
+        arr = (arr != 0)
+    elif np.dtype(dtype).kind in 'iu':
+        info = np.iinfo(np.dtype(dtype))
+        arr = np.clip(np.trunc(arr), info.min, info.max)
+    words = arr.astype(dtype).view('>u2').reshape(len(arr), -1).astype(np.uint16)
+
+    if endianness in (ModbusEndianness.LITTLE_ENDIAN, ModbusEndianness.CDAB):
+        words = words[:, ::-1]
+    elif endianness in (ModbusEndianness.BIG_ENDIAN_BYTE_SWAP, ModbusEndianness.BADC):
+        words = (words >> 8) | (words << 8)
+    elif endianness in (ModbusEndianness.LITTLE_ENDIAN_BYTE_SWAP, ModbusEndianness.LITTLE_LITTLE):
+        words = ((words >> 8) | (words << 8))[:, ::-1]
+    return np.ascontiguousarray(words)
+
 def decode_mapped_value(registers: List[int], 
                        data_type: ModbusDataType, 
                        endianness: ModbusEndianness = ModbusEndianness.BIG_ENDIAN,
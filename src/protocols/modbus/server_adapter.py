@@ -22,7 +22,8 @@ class ModbusServerAdapter(BaseProtocol):
             listen_address=config.ip_address,
             port=config.port,
             unit_id=config.modbus_unit_id,
-            register_blocks=getattr(config, 'modbus_slave_blocks', [])
+            register_blocks=getattr(config, 'modbus_slave_blocks', []),
+            shared_memory_name=(config.protocol_params or {}).get('shared_memory_name') or None
         )
         self.server = ModbusSlaveServer(slave_config, event_logger)
         
@@ -59,11 +60,14 @@ class ModbusServerAdapter(BaseProtocol):
                     listen_address=self.config.ip_address,
                     port=self.config.port,
                     unit_id=self.config.modbus_unit_id,
-                    register_blocks=getattr(self.config, 'modbus_slave_blocks', [])
+                    register_blocks=getattr(self.config, 'modbus_slave_blocks', []),
+                    shared_memory_name=(self.config.protocol_params or {}).get('shared_memory_name') or None
                  )
                  # Preserve stats or events? Maybe not critical.
                  # But we must preserve mappings.
                  mappings = self.server.mappings
+                 # The new instance recreates the shared image under the same name
+                 self.server.release_shared_registers()
                  self.server = ModbusSlaveServer(slave_config, self.event_logger)
                  self.server.mappings = mappings
 
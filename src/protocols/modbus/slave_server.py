@@ -4,10 +4,14 @@ Allows application to act as a Modbus device for testing and simulation
 """
 import logging
 import threading
+from bisect import bisect_right
 from typing import Dict, Callable, Optional, Any, List
 from datetime import datetime
 from dataclasses import dataclass, field
 
+import numpy as np
+
+from src.protocols.modbus.register_image import RegisterImage
 
 logger = logging.getLogger(__name__)
 
@@ -70,71 +74,179 @@ class ModbusSlaveConfig:
     allow_reuse_address: bool = True
     ignore_missing_slaves: bool = False
 
+    # Per-request transaction logging (reads are off: polling masters flood the log)
+    log_reads: bool = False
+    log_writes: bool = True
+
+    # Name of a shared memory register image to create (see register_image.py)
+    shared_memory_name: Optional[str] = None
+
+
+class RegisterSegment:
+    """Contiguous address range of one register type backed by a uint16 array."""
+    __slots__ = ("start", "end", "data")
+
+    def __init__(self, start: int, count: int, data: Optional[np.ndarray] = None):
+        self.start = start
+        self.end = start + count
+        self.data = np.zeros(count, dtype=np.uint16) if data is None else data
+
+    @property
+    def count(self) -> int:
+        return self.end - self.start
+
+
+def merge_ranges(ranges) -> List[tuple]:
+    """Merge (start, count) ranges that overlap or touch into sorted ranges."""
+    merged: List[list] = []
+    for start, count in sorted((int(s), int(c)) for s, c in ranges if c > 0):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], start + count)
+        else:
+            merged.append([start, start + count])
+    return [(start, end - start) for start, end in merged]
+
 
 class CallbackDataBlock(BaseModbusDataBlock):
     """
-    Custom data block that triggers callbacks on read/write
-    Allows external code to respond to Modbus operations
+    Dense data block for one register type.
+
+    Values live in one uint16 array per contiguous address range (blocks
+    that overlap or touch are merged), so validating a request is a range
+    check and reads/writes are slice copies. Addresses outside every range
+    read as `default_value` and cannot be written.
+
+    Callbacks are optional (None disables them); per-request transaction
+    logging is controlled by `log_reads`/`log_writes`. `change_seq`
+    increases on every write, including writes made by other processes
+    through a shared `RegisterImage`.
     """
-    def __init__(self, values, event_logger=None):
+    def __init__(self, ranges, event_logger=None, log_reads: bool = False, log_writes: bool = True):
         super().__init__()
-        # In pymodbus 3, values can be a dictionary mapping address -> value
-        # This supports sparse data blocks efficiently
-        self.values = values if isinstance(values, dict) else {i: v for i, v in enumerate(values)}
+        self.segments = [RegisterSegment(start, count) for start, count in merge_ranges(ranges)]
+        self._starts = [seg.start for seg in self.segments]
         self.default_value = 0
         self.event_logger = event_logger
-        
+        self.log_reads = log_reads
+        self.log_writes = log_writes
+        self._seq = np.zeros(1, dtype=np.uint64)
+
         # Callbacks
         self.read_callback: Optional[Callable] = None
         self.write_callback: Optional[Callable] = None
-    
+
+    @property
+    def size(self) -> int:
+        return sum(seg.count for seg in self.segments)
+
+    @property
+    def change_seq(self) -> int:
+        return int(self._seq[0])
+
+    def attach_image(self, image, register_type: str):
+        """Move the values into `image` (which must hold the same ranges)."""
+        views = dict(image.segments(register_type))
+        for seg in self.segments:
+            data = views[seg.start]
+            data[:] = seg.data
+            seg.data = data
+        image.seq_cell(register_type)[0] = self._seq[0]
+        self._seq = image.seq_cell(register_type)
+
+    def detach_image(self):
+        """Copy the values back into private memory."""
+        for seg in self.segments:
+            seg.data = seg.data.copy()
+        self._seq = self._seq.copy()
+
+    def segment_for(self, address: int, count: int = 1) -> Optional[RegisterSegment]:
+        """Segment holding all of [address, address + count), if any."""
+        i = bisect_right(self._starts, address) - 1
+        if i >= 0:
+            seg = self.segments[i]
+            if address + count <= seg.end:
+                return seg
+        return None
+
     def validate(self, address, count=1):
         """Validate address range"""
-        # With sparse block, we validate if ALL requested addresses exist
-        for i in range(address, address + count):
-            if i not in self.values:
-                return False
-        return True
-    
+        return count > 0 and self.segment_for(address, count) is not None
+
     def getValues(self, address, count=1):
         """Read values with callback"""
-        if not self.validate(address, count):
-             # Return empty/default if invalid, though validate should catch it
-             pass
-
         if self.read_callback:
             try:
                 self.read_callback(address, count)
             except Exception as e:
                 logger.error(f"Read callback error: {e}")
-        
-        result = []
-        for i in range(address, address + count):
-            result.append(self.values.get(i, self.default_value))
-        
-        if self.event_logger:
+
+        seg = self.segment_for(address, count)
+        if seg is not None:
+            offset = address - seg.start
+            result = seg.data[offset:offset + count].tolist()
+        else:
+            result = [self._get(i) for i in range(address, address + count)]
+
+        if self.log_reads and self.event_logger:
             self.event_logger.transaction("ModbusSlave", f"← READ Addr={address} Count={count} Values={result[:5]}...")
-        
+
         return result
-    
+
+    def _get(self, address: int) -> int:
+        seg = self.segment_for(address)
+        return int(seg.data[address - seg.start]) if seg is not None else self.default_value
+
     def setValues(self, address, values):
         """Write values with callback"""
-        # Validate existence
-        if not self.validate(address, len(values)):
-             return # Or raise error? pymodbus handles validation failure
+        count = len(values)
+        seg = self.segment_for(address, count)
+        if seg is None or count == 0:
+            return  # pymodbus reports the failed validation
+
+        if self.log_writes and self.event_logger:
+            self.event_logger.transaction("ModbusSlave", f"→ WRITE Addr={address} Count={count} Values={list(values[:5])}...")
+
+        offset = address - seg.start
+        # Registers are 16 bit; wrap signed/oversized input the way the wire would
+        seg.data[offset:offset + count] = np.asarray(values, dtype=np.int64) & 0xFFFF
+        self._seq[0] += 1
 
-        if self.event_logger:
-            self.event_logger.transaction("ModbusSlave", f"→ WRITE Addr={address} Count={len(values)} Values={values[:5]}...")
-        
-        for i, value in enumerate(values):
-            self.values[address + i] = value
-        
         if self.write_callback:
             try:
                 self.write_callback(address, values)
             except Exception as e:
                 logger.error(f"Write callback error: {e}")
 
+    def write(self, address: int, values) -> bool:
+        """
+        setValues for local callers (gateway, simulation, scripts): returns
+        False, and writes nothing, when the range is not inside the block.
+        """
+        if not self.validate(address, len(values)):
+            logger.debug(f"Write to {address}..{address + len(values) - 1} is outside the configured registers")
+            return False
+        self.setValues(address, values)
+        return True
+
+    def snapshot(self) -> Dict[int, int]:
+        """All values as {address: value} (for export/inspection)."""
+        result = {}
+        for seg in self.segments:
+            result.update(zip(range(seg.start, seg.end), seg.data.tolist()))
+        return result
+
+    def update(self, data: Dict[int, int]) -> int:
+        """Set values from {address: value}; addresses outside the block are skipped."""
+        written = 0
+        for address, value in data.items():
+            seg = self.segment_for(int(address))
+            if seg is not None:
+                seg.data[int(address) - seg.start] = int(value) & 0xFFFF
+                written += 1
+        if written:
+            self._seq[0] += 1
+        return written
+
 
 class ModbusSlaveServer:
     """
@@ -149,45 +261,41 @@ class ModbusSlaveServer:
         self.server_thread = None
         self.context = None
         
-        # Initialize Memory dictionaries
-        coils_map = {}
-        discrete_map = {}
-        holding_map = {}
-        input_map = {}
+        # Address ranges per register type
+        ranges = {"coils": [], "discrete": [], "holding": [], "input": []}
         
         # Populate from blocks if defined
         if self.config.register_blocks:
             for block in self.config.register_blocks:
-                # Determine target map
-                target_map = None
-                if block.register_type == "coils":
-                    target_map = coils_map
-                elif block.register_type == "discrete":
-                    target_map = discrete_map
-                elif block.register_type == "holding":
-                    target_map = holding_map
-                elif block.register_type == "input":
-                    target_map = input_map
-                
-                if target_map is not None:
-                     for i in range(block.start_address, block.start_address + block.count):
-                         target_map[i] = 0
+                if block.register_type in ranges:
+                    ranges[block.register_type].append((block.start_address, block.count))
             
             # If a type has NO blocks, it stays empty (access will fail)
-            logger.info(f"Initialized sparse memory: HR={len(holding_map)} IR={len(input_map)}")
+            logger.info(f"Initialized sparse memory: HR={sum(c for _, c in ranges['holding'])} "
+                        f"IR={sum(c for _, c in ranges['input'])}")
             
         else:
             # Legacy/Default mode
-            coils_map = {i: 0 for i in range(self.config.coils_count)}
-            discrete_map = {i: 0 for i in range(self.config.discrete_inputs_count)}
-            holding_map = {i: 0 for i in range(self.config.holding_registers_count)}
-            input_map = {i: 0 for i in range(self.config.input_registers_count)}
+            ranges["coils"].append((0, self.config.coils_count))
+            ranges["discrete"].append((0, self.config.discrete_inputs_count))
+            ranges["holding"].append((0, self.config.holding_registers_count))
+            ranges["input"].append((0, self.config.input_registers_count))
 
         # Data blocks with callbacks
-        self.coils_block = CallbackDataBlock(coils_map, self.event_logger)
-        self.discrete_inputs_block = CallbackDataBlock(discrete_map, self.event_logger)
-        self.holding_registers_block = CallbackDataBlock(holding_map, self.event_logger)
-        self.input_registers_block = CallbackDataBlock(input_map, self.event_logger)
+        def _block(register_type):
+            return CallbackDataBlock(ranges[register_type], self.event_logger,
+                                     log_reads=self.config.log_reads, log_writes=self.config.log_writes)
+        self.coils_block = _block("coils")
+        self.discrete_inputs_block = _block("discrete")
+        self.holding_registers_block = _block("holding")
+        self.input_registers_block = _block("input")
+
+        self.register_image: Optional[RegisterImage] = None
+        if self.config.shared_memory_name:
+            try:
+                self.share_registers(self.config.shared_memory_name)
+            except Exception as e:
+                logger.error(f"Could not create shared register image '{self.config.shared_memory_name}': {e}")
         
         # Signal mappings for structured data
         self.mappings: Dict[int, ModbusSignalMapping] = {}
@@ -207,14 +315,56 @@ class ModbusSlaveServer:
     def set_callbacks(self, 
                      on_read: Optional[Callable] = None,
                      on_write: Optional[Callable] = None):
-        """Set callbacks for read/write operations"""
-        if self.coils_block:
-            self.coils_block.read_callback = on_read
-            self.coils_block.write_callback = on_write
-        
-        if self.holding_registers_block:
-            self.holding_registers_block.read_callback = on_read
-            self.holding_registers_block.write_callback = on_write
+        """Set callbacks for read/write operations (None disables them)"""
+        for block in self._blocks().values():
+            block.read_callback = on_read
+            block.write_callback = on_write
+
+    def share_registers(self, name: Optional[str] = None) -> RegisterImage:
+        """
+        Move all register values into a shared memory image so other
+        processes can read and write them (see register_image.py).
+        """
+        if self.register_image is not None:
+            return self.register_image
+        blocks = self._blocks()
+        ranges = {rtype: [(seg.start, seg.count) for seg in block.segments] for rtype, block in blocks.items()}
+        try:
+            image = RegisterImage.create(ranges, name)
+        except FileExistsError:
+            # Only replace an image left behind by a server that is gone
+            if not RegisterImage.remove_if_stale(name):
+                raise FileExistsError(f"Shared register image '{name}' is in use by another server")
+            logger.warning(f"Replaced stale shared register image '{name}'")
+            image = RegisterImage.create(ranges, name)
+        for rtype, block in blocks.items():
+            block.attach_image(image, rtype)
+        self.register_image = image
+        if self.event_logger:
+            self.event_logger.info("ModbusSlave", f"Registers shared as '{image.name}'")
+        return image
+
+    def release_shared_registers(self):
+        """Take the values back into private memory and remove the image."""
+        image = self.register_image
+        if image is None:
+            return
+        for block in self._blocks().values():
+            block.detach_image()
+        self.register_image = None
+        image.close()
+
+    def get_block(self, register_type: str) -> Optional[CallbackDataBlock]:
+        """Data block of a register type ("holding", "input", "coils", "discrete")."""
+        return self._blocks().get(register_type)
+
+    def _blocks(self) -> Dict[str, CallbackDataBlock]:
+        return {
+            "holding": self.holding_registers_block,
+            "input": self.input_registers_block,
+            "coils": self.coils_block,
+            "discrete": self.discrete_inputs_block,
+        }
     
     def start(self) -> bool:
         """Start the Modbus server"""
@@ -336,8 +486,7 @@ class ModbusSlaveServer:
     def write_coil(self, address: int, value: bool) -> bool:
         """Programmatically write to coil"""
         try:
-            self.coils_block.setValues(address, [1 if value else 0])
-            return True
+            return self.coils_block.write(address, [1 if value else 0])
         except Exception as e:
             logger.error(f"Error writing coil: {e}")
             return False
@@ -345,8 +494,7 @@ class ModbusSlaveServer:
     def write_register(self, address: int, value: int) -> bool:
         """Programmatically write to holding register"""
         try:
-            self.holding_registers_block.setValues(address, [value])
-            return True
+            return self.holding_registers_block.write(address, [value])
         except Exception as e:
             logger.error(f"Error writing register: {e}")
             return False
@@ -354,8 +502,7 @@ class ModbusSlaveServer:
     def write_input_register(self, address: int, value: int) -> bool:
         """Programmatically write to input register"""
         try:
-            self.input_registers_block.setValues(address, [value])
-            return True
+            return self.input_registers_block.write(address, [value])
         except Exception as e:
             logger.error(f"Error writing input register: {e}")
             return False
@@ -378,11 +525,8 @@ class ModbusSlaveServer:
                 mapping.offset
             )
             
-            if register_type == "holding":
-                self.holding_registers_block.setValues(address, registers)
-            else:
-                self.input_registers_block.setValues(address, registers)
-            return True
+            block = self.holding_registers_block if register_type == "holding" else self.input_registers_block
+            return block.write(address, registers)
         except Exception as e:
             logger.error(f"Error writing mapped value at {address}: {e}")
             return False
@@ -413,8 +557,7 @@ class ModbusSlaveServer:
     def write_discrete_input(self, address: int, value: bool) -> bool:
         """Programmatically write to discrete input"""
         try:
-            self.discrete_inputs_block.setValues(address, [1 if value else 0])
-            return True
+            return self.discrete_inputs_block.write(address, [1 if value else 0])
         except Exception as e:
             logger.error(f"Error writing discrete input: {e}")
             return False
@@ -440,54 +583,66 @@ class ModbusSlaveServer:
     def bulk_write_registers(self, start_address: int, values: list) -> bool:
         """Write multiple registers at once"""
         try:
-            self.holding_registers_block.setValues(start_address, values)
-            return True
+            return self.holding_registers_block.write(start_address, values)
         except Exception as e:
             logger.error(f"Error bulk writing registers: {e}")
             return False
     
+    def bulk_write_input_registers(self, start_address: int, values: list) -> bool:
+        """Write multiple input registers at once"""
+        try:
+            return self.input_registers_block.write(start_address, values)
+        except Exception as e:
+            logger.error(f"Error bulk writing input registers: {e}")
+            return False
+
     def bulk_write_coils(self, start_address: int, values: list) -> bool:
         """Write multiple coils at once"""
         try:
             int_values = [1 if v else 0 for v in values]
-            self.coils_block.setValues(start_address, int_values)
-            return True
+            return self.coils_block.write(start_address, int_values)
         except Exception as e:
             logger.error(f"Error bulk writing coils: {e}")
             return False
+
+    def bulk_write_discrete_inputs(self, start_address: int, values: list) -> bool:
+        """Write multiple discrete inputs at once"""
+        try:
+            int_values = [1 if v else 0 for v in values]
+            return self.discrete_inputs_block.write(start_address, int_values)
+        except Exception as e:
+            logger.error(f"Error bulk writing discrete inputs: {e}")
+            return False
     
     def get_all_registers(self, register_type: str = "holding") -> Dict[int, int]:
         """Get all register values for export/inspection"""
-        if register_type == "holding":
-            return self.holding_registers_block.values.copy()
-        elif register_type == "input":
-            return self.input_registers_block.values.copy()
-        elif register_type == "coils":
-            return self.coils_block.values.copy()
-        elif register_type == "discrete":
-            return self.discrete_inputs_block.values.copy()
-        return {}
+        block = self._blocks().get(register_type)
+        return block.snapshot() if block is not None else {}
     
-    def import_register_data(self, data: Dict[int, int], register_type: str = "holding"):
-        """Import register data from dictionary"""
+    def import_register_data(self, data: Dict[int, int], register_type: str = "holding") -> Optional[int]:
+        """
+        Import register data from dictionary.
+
+        Only addresses inside the configured register blocks can hold a
+        value; the others are skipped and logged. Returns the number of
+        skipped addresses, or None if the import failed.
+        """
         try:
-            if register_type == "holding":
-                self.holding_registers_block.values.update(data)
-            elif register_type == "input":
-                self.input_registers_block.values.update(data)
-            elif register_type == "coils":
-                self.coils_block.values.update(data)
-            elif register_type == "discrete":
-                self.discrete_inputs_block.values.update(data)
-            
+            block = self._blocks().get(register_type)
+            written = block.update(data) if block is not None else 0
+            skipped = len(data) - written
+            if skipped:
+                logger.warning(f"Import skipped {skipped} {register_type} addresses outside the configured blocks")
+
             if self.event_logger:
                 self.event_logger.info("ModbusSlave", 
-                    f"Imported {len(data)} values to {register_type}")
-            
-            return True
+                    f"Imported {written} values to {register_type}"
+                    + (f" ({skipped} outside the configured blocks skipped)" if skipped else ""))
+
+            return skipped
         except Exception as e:
             logger.error(f"Error importing data: {e}")
-            return False
+            return None
     
     def simulate_sensor_updates(self, enable: bool = True):
         """Start/stop automatic sensor simulation"""
@@ -65,3 +65,37 @@ def test_load_offline_scd_is_non_blocking_and_populates(tmp_path, monkeypatch):
 
     assert dev.root_node is not None
     assert any(c.name and 'LD1' in c.name for c in dev.root_node.children)
+
+
+def test_devices_sharing_an_scd_share_one_parse(tmp_path, monkeypatch):
+    scd = tmp_path / "station.scd"
+    _make_minimal_scd(scd)
+    # Same station file referenced by several IEDs
+    text = scd.read_text()
+    ied = text[text.index('<IED'):text.index('</IED>') + len('</IED>')]
+    scd.write_text(text.replace(ied, ''.join(ied.replace('IED1', f'IED{i}') for i in range(1, 7))))
+
+    from src.core import workers as _workers
+    _orig = _workers._parse_scd_file
+    calls = []
+
+    def counting_parse(p):
+        calls.append(p)
+        time.sleep(0.1)
+        return _orig(p)
+
+    monkeypatch.setattr(_workers, '_parse_scd_file', counting_parse)
+
+    dm = DeviceManagerCore(config_path=str(tmp_path / 'devices.json'))
+    devices = [dm.add_device(DeviceConfig(name=f'IED{i}', ip_address='127.0.0.1', port=102, scd_file_path=str(scd)),
+                             save=False)
+               for i in range(1, 7)]
+
+    deadline = time.time() + 5.0
+    while time.time() < deadline and any(d.root_node is None for d in devices):
+        time.sleep(0.02)
+
+    assert len(calls) == 1
+    for d in devices:
+        assert d.root_node is not None
+        assert any(c.name and 'LD1' in c.name for c in d.root_node.children)
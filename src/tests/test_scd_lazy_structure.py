@@ -0,0 +1,115 @@
+from src.core.device_manager_core import DeviceManagerCore
+from src.core.scd_parser import SCDParser
+from src.models.device_models import DeviceConfig, DeviceType, LazyNode
+
+SCD = '''<?xml version="1.0"?>
+<SCL xmlns="http://www.iec.ch/61850/2003/SCL">
+  <DataTypeTemplates>
+    <LNodeType id="LN1" lnClass="XCBR">
+      <DO name="Beh" type="DO1"/>
+      <DO name="Pos" type="DO1"/>
+    </LNodeType>
+    <DOType id="DO1">
+      <DA name="stVal" bType="Enum" fc="ST" type="E1"/>
+      <DA name="q" bType="Quality" fc="ST"/>
+    </DOType>
+    <EnumType id="E1"><EnumVal ord="1">ON</EnumVal></EnumType>
+  </DataTypeTemplates>
+  <IED name="IED1"><AccessPoint><Server><LDevice inst="LD1">
+    <LN0 lnClass="LLN0" lnType="LN1" inst=""><DataSet name="DS1"><FCDA ldInst="LD1" lnClass="XCBR" lnInst="1" doName="Pos" fc="ST"/></DataSet></LN0>
+    <LN lnClass="XCBR" lnType="LN1" inst="1"/>
+    <LN lnClass="XCBR" lnType="LN1" inst="2"/>
+  </LDevice></Server></AccessPoint></IED>
+</SCL>'''
+
+
+def _flatten(node, prefix=""):
+    out = [f"{prefix}{node.name}"]
+    out += [f"{prefix}{node.name}:{s.address}" for s in node.signals]
+    for child in node.children:
+        out += _flatten(child, f"{prefix}{node.name}/")
+    return out
+
+
+def test_lazy_structure_matches_eager_once_opened(tmp_path):
+    path = tmp_path / "station.scd"
+    path.write_text(SCD)
+    parser = SCDParser(str(path))
+
+    lazy = parser.get_structure("IED1", lazy=True)
+    lns = lazy.children[0].children
+    assert [ln.name for ln in lns] == ["XCBR1", "XCBR2", "LLN0"]
+    assert all(isinstance(ln, LazyNode) and not ln.is_loaded for ln in lns)
+    assert lns[0].path == "IED1LD1/XCBR1"
+
+    assert _flatten(lazy) == _flatten(parser.get_structure("IED1"))
+    assert all(ln.is_loaded for ln in lns)
+
+
+def test_lookups_open_only_the_ln_they_address(tmp_path):
+    path = tmp_path / "station.scd"
+    path.write_text(SCD)
+    dm = DeviceManagerCore(str(tmp_path / "devices.json"))
+    dm.add_device(DeviceConfig(name="IED1", ip_address="127.0.0.1", port=0, device_type=DeviceType.UNKNOWN),
+                  save=False, run_offline_discovery=False)
+    root = SCDParser(str(path)).get_structure("IED1", lazy=True)
+    dm._devices["IED1"].root_node = root
+    dm._assign_unique_addresses("IED1", root)
+    xcbr1, xcbr2, lln0 = root.children[0].children
+
+    assert not any(ln.is_loaded for ln in (xcbr1, xcbr2, lln0))
+
+    sig = dm.get_signal_by_unique_address("IED1::IED1LD1/XCBR2.Pos.stVal")
+    assert sig is not None and sig.unique_address == "IED1::IED1LD1/XCBR2.Pos.stVal"
+    assert xcbr2.is_loaded and not xcbr1.is_loaded and not lln0.is_loaded
+
+    # Token resolution reaches unopened LNs through the index, on any device
+    code = "v = ctx.get({{TAG:Other::IED1LD1/XCBR1.Beh.q}})"
+    assert dm._script_tag_manager.resolve_code(code) == "v = ctx.get('IED1::IED1LD1/XCBR1.Beh.q')"
+    assert xcbr1.is_loaded and not lln0.is_loaded
+
+    assert dm.resolve_unique_addresses(["IED1::IED1LD1/LLN0.Beh.stVal"])
+    assert lln0.is_loaded
+
+
+def test_tree_search_finds_signals_under_unexpanded_lns(tmp_path):
+    import os
+
+    import pytest
+    pytest.importorskip("PySide6")
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtCore import Qt
+    from PySide6.QtWidgets import QApplication
+    from src.core.device_manager import DeviceManager
+    from src.ui.widgets.device_tree import DeviceTreeWidget
+
+    app = QApplication.instance() or QApplication([])
+    path = tmp_path / "station.scd"
+    path.write_text(SCD)
+    dm = DeviceManager(str(tmp_path / "devices.json"))
+    tree = DeviceTreeWidget(dm)
+    dm.add_device(DeviceConfig(name="IED1", ip_address="127.0.0.1", port=0, device_type=DeviceType.UNKNOWN),
+                  run_offline_discovery=False)
+    root = SCDParser(str(path)).get_structure("IED1", lazy=True)
+    dm.get_device("IED1").root_node = root
+    tree._refresh_device_node("IED1")
+
+    def _unexpanded(tree, parent=None):
+        parent = parent or tree.model.invisibleRootItem()
+        for row in range(parent.rowCount()):
+            item = parent.child(row, 0)
+            if tree._is_unexpanded_lazy(item):
+                yield item
+            else:
+                yield from _unexpanded(tree, item)
+
+    tree.txt_filter.setText("loading")
+    assert tree._filter_matches == []             # placeholder rows are not results
+    assert sorted(tree._item_path(i) for i in _unexpanded(tree)) == ["IED1.IED1LD1.LLN0", "IED1.IED1LD1.XCBR1", "IED1.IED1LD1.XCBR2"]
+
+    tree.txt_filter.setText("xcbr2.pos.stval")
+    assert [tree._item_path(m) for m in tree._filter_matches] == ["IED1.IED1LD1.XCBR2.Pos.stVal"]
+    assert tree._filter_matches[0].data(Qt.UserRole).address == "IED1LD1/XCBR2.Pos.stVal"
+    # Only the LN holding the match got rows
+    assert sorted(tree._item_path(i) for i in _unexpanded(tree)) == ["IED1.IED1LD1.LLN0", "IED1.IED1LD1.XCBR1"]
+    app.processEvents()
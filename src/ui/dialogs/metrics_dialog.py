@@ -0,0 +1,135 @@
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton,
+    QTableWidget, QTableWidgetItem, QHeaderView, QApplication, QCheckBox
+)
+from PySide6.QtCore import Qt, QTimer
+import time
+
+from src.core import metrics
+
+
+def _ms(seconds: float) -> str:
+    return f"{seconds * 1000:.2f}"
+
+
+class MetricsDialog(QDialog):
+    """
+    Live view of the runtime metrics registry.
+
+    One row per metric and label set: counters and gauges show their value,
+    histograms show sample count and p50/p90/p99/max in milliseconds. The
+    rate column is the change since the previous refresh, so a busy queue or
+    a device whose error count is climbing stands out immediately.
+    """
+    COLUMNS = ["Metric", "Labels", "Value / Count", "Rate /s", "p50 ms", "p90 ms", "p99 ms", "Max ms"]
+    REFRESH_MS = 1000
+
+    def __init__(self, parent=None, registry=metrics.REGISTRY):
+        super().__init__(parent)
+        self.setWindowTitle("Runtime Metrics")
+        self.resize(1000, 560)
+        self._registry = registry
+        self._previous = {}
+        self._previous_ts = None
+
+        layout = QVBoxLayout(self)
+
+        top = QHBoxLayout()
+        self.txt_filter = QLineEdit()
+        self.txt_filter.setPlaceholderText("Filter by metric or label (e.g. worker, PROT_IED)")
+        self.txt_filter.textChanged.connect(self.refresh)
+        top.addWidget(self.txt_filter, 1)
+        self.chk_hide_idle = QCheckBox("Hide empty")
+        self.chk_hide_idle.setChecked(True)
+        self.chk_hide_idle.toggled.connect(self.refresh)
+        top.addWidget(self.chk_hide_idle)
+        layout.addLayout(top)
+
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.table.verticalHeader().setVisible(False)
+        header = self.table.horizontalHeader()
+        header.setSectionResizeMode(0, QHeaderView.ResizeToContents)
+        header.setSectionResizeMode(1, QHeaderView.Stretch)
+        layout.addWidget(self.table)
+
+        bottom = QHBoxLayout()
+        self.lbl_status = QLabel()
+        bottom.addWidget(self.lbl_status, 1)
+        btn_copy = QPushButton("Copy as Text")
+        btn_copy.setToolTip("Copy all metrics in Prometheus text format")
+        btn_copy.clicked.connect(self._copy_text)
+        bottom.addWidget(btn_copy)
+        btn_close = QPushButton("Close")
+        btn_close.clicked.connect(self.close)
+        bottom.addWidget(btn_close)
+        layout.addLayout(bottom)
+
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self.refresh)
+        self._timer.start(self.REFRESH_MS)
+        self.refresh()
+
+    def refresh(self):
+        now = time.monotonic()
+        elapsed = (now - self._previous_ts) if self._previous_ts else None
+        # Filter edits refresh immediately; rates are only resampled on timer ticks
+        resample = elapsed is None or elapsed >= self.REFRESH_MS / 2000
+        needle = self.txt_filter.text().strip().lower()
+        hide_idle = self.chk_hide_idle.isChecked()
+
+        rows = []
+        current = {}
+        for row in self._registry.snapshot():
+            labels = ", ".join(f"{k}={v}" for k, v in row['labels'].items())
+            key = (row['name'], labels)
+            total = row['count'] if row['kind'] == 'histogram' else row['value']
+            current[key] = total
+            if hide_idle and not total:
+                continue
+            if needle and needle not in row['name'].lower() and needle not in labels.lower():
+                continue
+            rate = ""
+            if row['kind'] != 'gauge' and resample and elapsed and key in self._previous:
+                rate = f"{(total - self._previous[key]) / elapsed:.1f}"
+            if row['kind'] == 'histogram':
+                cells = [row['name'], labels, str(row['count']), rate,
+                         _ms(row['p50']), _ms(row['p90']), _ms(row['p99']), _ms(row['max'])]
+            else:
+                value = row['value']
+                cells = [row['name'], labels, f"{value:g}", rate, "", "", "", ""]
+            rows.append(cells)
+        if resample:
+            self._previous = current
+            self._previous_ts = now
+
+        self.table.setUpdatesEnabled(False)
+        self.table.setRowCount(len(rows))
+        for r, cells in enumerate(rows):
+            for c, text in enumerate(cells):
+                item = self.table.item(r, c)
+                if item is None:
+                    item = QTableWidgetItem()
+                    if c >= 2:
+                        item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                    self.table.setItem(r, c, item)
+                item.setText(text)
+        self.table.setUpdatesEnabled(True)
+
+        state = "on" if metrics.is_enabled() else "off (SCADASCOUT_METRICS=0)"
+        self.lbl_status.setText(f"{len(rows)} series shown, recording {state}")
+
+    def _copy_text(self):
+        QApplication.clipboard().setText(self._registry.render_text())
+
+    def showEvent(self, event):
+        if not self._timer.isActive():
+            self._timer.start(self.REFRESH_MS)
+            self.refresh()
+        super().showEvent(event)
+
+    def closeEvent(self, event):
+        self._timer.stop()
+        super().closeEvent(event)
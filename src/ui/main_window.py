@@ -40,10 +40,11 @@ class MainWindow(QMainWindow):
     Main Application Window.
     Includes Menu Bar, Toolbar, Status Bar, and Docking areas for Panels.
     """
-    def __init__(self, device_manager, event_logger=None):
+    def __init__(self, device_manager, event_logger=None, historian=None):
         super().__init__()
         self.device_manager = device_manager
         self.event_logger = event_logger
+        self.historian = historian
         self.setWindowTitle("Scada Scout")
         
         # Scale initial size for Windows DPI and screen size
@@ -268,6 +269,19 @@ class MainWindow(QMainWindow):
         system_properties_action.setStatusTip("View system and network adapter details")
         system_properties_action.triggered.connect(self._show_system_properties)
         self.view_menu.addAction(system_properties_action)
+
+        metrics_action = QAction("Runtime &Metrics...", self)
+        metrics_action.setStatusTip("Queue depths, read latency percentiles and error counts per device")
+        metrics_action.triggered.connect(self._show_metrics_dialog)
+        self.view_menu.addAction(metrics_action)
+
+        from src.core.profiler import PROFILER
+        self.profiling_action = QAction("Stop &Profiling" if PROFILER.running else "Start &Profiling", self)
+        self.profiling_action.setCheckable(True)
+        self.profiling_action.setChecked(PROFILER.running)
+        self.profiling_action.setStatusTip("Sample all thread stacks; stopping writes a flamegraph-ready profile")
+        self.profiling_action.toggled.connect(self._toggle_profiling)
+        self.view_menu.addAction(self.profiling_action)
         self.view_menu.addSeparator()
         
         # Help Menu
@@ -397,7 +411,7 @@ class MainWindow(QMainWindow):
         self.dock_right.setAllowedAreas(Qt.AllDockWidgetAreas)
         self.dock_right.setFeatures(QDockWidget.DockWidgetMovable | QDockWidget.DockWidgetFloatable | QDockWidget.DockWidgetClosable)
         
-        self.signals_view = SignalsViewWidget(self.device_manager, self.watch_list_manager)
+        self.signals_view = SignalsViewWidget(self.device_manager, self.watch_list_manager, historian=self.historian)
         self.signals_view.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         self.dock_right.setWidget(self.signals_view)
         self.addDockWidget(Qt.BottomDockWidgetArea, self.dock_right)
@@ -581,6 +595,32 @@ class MainWindow(QMainWindow):
             dlg.setAttribute(Qt.WA_DeleteOnClose, True)
             dlg.show()
 
+    def _show_metrics_dialog(self):
+        from src.ui.dialogs.metrics_dialog import MetricsDialog
+        # Kept on the main window; closing only stops its refresh timer
+        if getattr(self, '_metrics_dialog', None) is None:
+            self._metrics_dialog = MetricsDialog(self)
+        self._metrics_dialog.show()
+        self._metrics_dialog.raise_()
+        self._metrics_dialog.activateWindow()
+
+    def _toggle_profiling(self, checked: bool):
+        from src.core import profiler
+        self.profiling_action.setText("Stop &Profiling" if checked else "Start &Profiling")
+        if checked:
+            if not profiler.PROFILER.running:
+                profiler.PROFILER.start()
+            self.status_bar.showMessage("Profiling: sampling all threads", 3000)
+            return
+        paths = profiler.stop_and_save()
+        if paths is None:
+            # Stopped on its own (SCADASCOUT_PROFILE_SECONDS); files are already written
+            self.status_bar.showMessage(f"Profiles are in {profiler.PROFILE_DIR}", 5000)
+            return
+        QMessageBox.information(
+            self, "Profile Saved",
+            f"Flamegraph input (collapsed stacks):\n{paths[0]}\n\nPer-function report:\n{paths[1]}")
+
     def _run_script_once_from_file(self):
         script_path, _ = QFileDialog.getOpenFileName(self, "Run Python Script (Once)", "", "Python Files (*.py)")
         if not script_path:
@@ -0,0 +1,311 @@
+from PySide6.QtCore import Qt, QAbstractTableModel, QAbstractProxyModel, QModelIndex, QTimer
+from PySide6.QtGui import QColor, QBrush, QFont
+from typing import List, Tuple, Optional, Any
+from bisect import bisect_left
+import re
+
+# (timestamp, level, source, message)
+EventRow = Tuple[str, str, str, str]
+
+LEVEL_COLORS = {
+    "ERROR": "#f48771",        # Red
+    "WARNING": "#dcdcaa",      # Yellow
+    "INFO": "#4fc1ff",         # Bright Cyan - More visible for success messages
+    "DEBUG": "#9cdcfe",        # Light Blue
+    "TRANSACTION": "#c586c0",  # Purple
+    "PACKET": "#569cd6",       # Blue for packets
+}
+DEFAULT_COLOR = "#d4d4d4"      # Gray
+TIMESTAMP_COLOR = "#808080"
+SOURCE_COLOR = "#569cd6"
+
+# Sources shown under the "Application" filter entry
+APP_SOURCES = frozenset(["Main", "AppController", "DeviceManager", "IEC61850Adapter", "EventLog", "SCDImport"])
+
+_WS_RE = re.compile(r"\s+")
+
+
+class EventLogModel(QAbstractTableModel):
+    """
+    Table model over a bounded ring of event log rows.
+
+    Events are queued by `append_event` and inserted in one
+    beginInsertRows/endInsertRows batch per flush (one frame), so a burst
+    of thousands of log lines costs a single view update. Display text,
+    colours and tooltips are produced lazily in `data()` for visible rows only.
+    """
+    COLUMNS = ["Time", "Level", "Source", "Message"]
+    COL_TIME, COL_LEVEL, COL_SOURCE, COL_MESSAGE = range(4)
+
+    MAX_DISPLAY_LEN = 300
+
+    def __init__(self, max_rows: int = 100000, flush_interval_ms: int = 16, parent=None):
+        super().__init__(parent)
+        self._rows: List[EventRow] = []
+        # Absolute id of row 0; grows as the ring drops its oldest rows
+        self.base = 0
+        self._pending: List[EventRow] = []
+        self._max_rows = max(1, int(max_rows))
+
+        self._brushes = {lvl: QBrush(QColor(c)) for lvl, c in LEVEL_COLORS.items()}
+        self._default_brush = QBrush(QColor(DEFAULT_COLOR))
+        self._time_brush = QBrush(QColor(TIMESTAMP_COLOR))
+        self._source_brush = QBrush(QColor(SOURCE_COLOR))
+        self._bold_font = QFont()
+        self._bold_font.setBold(True)
+
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(flush_interval_ms)
+        self._flush_timer.timeout.connect(self.flush)
+
+    # ---- Ring buffer management ----
+
+    def append_event(self, timestamp: str, level: str, source: str, message: Any):
+        """Queue an event; rows are inserted on the next flush."""
+        if not isinstance(message, str):
+            message = str(message)
+        self._pending.append((timestamp, level, str(source), message))
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def flush(self):
+        """Insert all queued events as one batch, trimming the oldest rows beyond capacity."""
+        if not self._pending:
+            return
+        pending = self._pending
+        self._pending = []
+        if len(pending) > self._max_rows:
+            pending = pending[-self._max_rows:]
+
+        overflow = len(self._rows) + len(pending) - self._max_rows
+        if overflow > 0:
+            self.beginRemoveRows(QModelIndex(), 0, overflow - 1)
+            del self._rows[:overflow]
+            self.base += overflow
+            self.endRemoveRows()
+
+        start = len(self._rows)
+        self.beginInsertRows(QModelIndex(), start, start + len(pending) - 1)
+        self._rows.extend(pending)
+        self.endInsertRows()
+
+    def set_events(self, events):
+        """Replace the contents with a list of event dicts (e.g. EventLogger history)."""
+        self._flush_timer.stop()
+        self._pending = []
+        rows = []
+        for event in events:
+            get = event.get if isinstance(event, dict) else (lambda k, e=event: getattr(e, k, None))
+            msg = get('message')
+            rows.append((get('timestamp') or "", get('level') or "", str(get('source')), msg if isinstance(msg, str) else str(msg)))
+        self.beginResetModel()
+        self._rows = rows[-self._max_rows:]
+        self.base = 0
+        self.endResetModel()
+
+    def clear(self):
+        self._flush_timer.stop()
+        self._pending = []
+        self.beginResetModel()
+        self._rows = []
+        self.base = 0
+        self.endResetModel()
+
+    def event_at(self, row: int) -> Optional[EventRow]:
+        if 0 <= row < len(self._rows):
+            return self._rows[row]
+        return None
+
+    def events(self) -> List[EventRow]:
+        return self._rows
+
+    # ---- Qt model interface ----
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return len(self.COLUMNS)
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.COLUMNS[section]
+        return None
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        timestamp, level, source, message = self._rows[index.row()]
+        col = index.column()
+
+        if role == Qt.DisplayRole:
+            if col == self.COL_TIME:
+                return timestamp
+            if col == self.COL_LEVEL:
+                return level
+            if col == self.COL_SOURCE:
+                return source
+            if col == self.COL_MESSAGE:
+                compact = _WS_RE.sub(" ", message.strip())
+                if len(compact) > self.MAX_DISPLAY_LEN:
+                    return compact[:self.MAX_DISPLAY_LEN] + "..."
+                return compact
+            return None
+
+        if role == Qt.ForegroundRole:
+            if col == self.COL_TIME:
+                return self._time_brush
+            if col == self.COL_SOURCE:
+                return self._source_brush
+            return self._brushes.get(level, self._default_brush)
+
+        if role == Qt.FontRole and col == self.COL_MESSAGE and '✅' in message:
+            return self._bold_font
+
+        if role == Qt.ToolTipRole and col == self.COL_MESSAGE:
+            return message.strip() or None
+
+        return None
+
+
+class EventLogFilterProxy(QAbstractProxyModel):
+    """
+    Filters event rows by verbosity and source.
+
+    Keeps a sorted list of accepted absolute row ids (see `EventLogModel.base`)
+    so filter changes are a single list comprehension over the raw row tuples,
+    appends only examine the new rows and ring trimming only drops the head.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._verbose = True
+        self._source_filter = "All Sources"
+        self._accepted: List[int] = []
+
+    def set_verbose(self, verbose: bool):
+        if verbose != self._verbose:
+            self._verbose = verbose
+            self._rebuild()
+
+    def set_source_filter(self, source_filter: str):
+        if source_filter != self._source_filter:
+            self._source_filter = source_filter
+            self._rebuild()
+
+    def setSourceModel(self, model):
+        old = self.sourceModel()
+        if old is not None:
+            old.modelAboutToBeReset.disconnect(self.beginResetModel)
+            old.modelReset.disconnect(self._on_source_reset)
+            old.rowsInserted.disconnect(self._on_rows_inserted)
+            old.rowsAboutToBeRemoved.disconnect(self._on_rows_about_to_be_removed)
+        self.beginResetModel()
+        super().setSourceModel(model)
+        model.modelAboutToBeReset.connect(self.beginResetModel)
+        model.modelReset.connect(self._on_source_reset)
+        model.rowsInserted.connect(self._on_rows_inserted)
+        model.rowsAboutToBeRemoved.connect(self._on_rows_about_to_be_removed)
+        self._accepted = self._filter_range(0, model.rowCount())
+        self.endResetModel()
+
+    # ---- Filtering ----
+
+    def _is_accepted(self, event: EventRow) -> bool:
+        _, level, source, message = event
+
+        # If "Verbose" is OFF, hide TRANSACTION and detailed READ events unless it's a change or error
+        if not self._verbose:
+            if level == 'TRANSACTION':
+                return False
+            if source == 'WatchList' and level == 'INFO' and 'Read' in message:
+                return False
+
+        if self._source_filter == "All Sources":
+            return True
+        if self._source_filter == "Application":
+            return source in APP_SOURCES or "Manager" in source or "Main" in source
+        return source == self._source_filter
+
+    def _filter_range(self, first: int, last_exclusive: int) -> List[int]:
+        model = self.sourceModel()
+        base = model.base
+        if self._verbose and self._source_filter == "All Sources":
+            return list(range(base + first, base + last_exclusive))
+        rows = model.events()
+        accept = self._is_accepted
+        return [base + i for i in range(first, last_exclusive) if accept(rows[i])]
+
+    def _rebuild(self):
+        if self.sourceModel() is None:
+            return
+        self.beginResetModel()
+        self._accepted = self._filter_range(0, self.sourceModel().rowCount())
+        self.endResetModel()
+
+    def _on_source_reset(self):
+        self._accepted = self._filter_range(0, self.sourceModel().rowCount())
+        self.endResetModel()
+
+    def _on_rows_inserted(self, parent, first, last):
+        new_ids = self._filter_range(first, last + 1)
+        if not new_ids:
+            return
+        start = len(self._accepted)
+        self.beginInsertRows(QModelIndex(), start, start + len(new_ids) - 1)
+        self._accepted.extend(new_ids)
+        self.endInsertRows()
+
+    def _on_rows_about_to_be_removed(self, parent, first, last):
+        base = self.sourceModel().base
+        lo = bisect_left(self._accepted, base + first)
+        hi = bisect_left(self._accepted, base + last + 1)
+        if hi > lo:
+            self.beginRemoveRows(QModelIndex(), lo, hi - 1)
+            del self._accepted[lo:hi]
+            self.endRemoveRows()
+
+    # ---- Qt proxy interface ----
+
+    def mapToSource(self, proxy_index: QModelIndex) -> QModelIndex:
+        if not proxy_index.isValid() or self.sourceModel() is None:
+            return QModelIndex()
+        model = self.sourceModel()
+        return model.index(self._accepted[proxy_index.row()] - model.base, proxy_index.column())
+
+    def mapFromSource(self, source_index: QModelIndex) -> QModelIndex:
+        if not source_index.isValid():
+            return QModelIndex()
+        abs_id = self.sourceModel().base + source_index.row()
+        pos = bisect_left(self._accepted, abs_id)
+        if pos < len(self._accepted) and self._accepted[pos] == abs_id:
+            return self.createIndex(pos, source_index.column())
+        return QModelIndex()
+
+    def index(self, row: int, column: int, parent=QModelIndex()) -> QModelIndex:
+        if parent.isValid() or not (0 <= row < len(self._accepted)) or not (0 <= column < self.columnCount()):
+            return QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, index=QModelIndex()) -> QModelIndex:
+        return QModelIndex()
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._accepted)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        model = self.sourceModel()
+        return model.columnCount() if model is not None else 0
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.DisplayRole):
+        model = self.sourceModel()
+        if model is None or orientation != Qt.Horizontal:
+            return None
+        return model.headerData(section, orientation, role)
+
+    def event_at(self, row: int) -> Optional[EventRow]:
+        """Raw event tuple for a proxy row."""
+        if 0 <= row < len(self._accepted):
+            model = self.sourceModel()
+            return model.event_at(self._accepted[row] - model.base)
+        return None
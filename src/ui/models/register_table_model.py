@@ -0,0 +1,148 @@
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, Signal as QtSignal
+from typing import Callable, List, Optional
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class RegisterTableModel(QAbstractTableModel):
+    """
+    Table model over a Modbus slave data block (`CallbackDataBlock`).
+
+    Rows are the addresses of the block's segments in order; cell values
+    are read straight from the block's arrays when the view asks for them,
+    so only visible rows are ever formatted. `refresh()` checks the
+    block's change sequence and, if it moved, diffs the arrays against a
+    shadow copy and announces only the rows that changed.
+
+    Rejected edits (not a 16-bit integer, or refused by the server) are
+    reported through `edit_rejected` so the view can tell the user.
+    """
+    edit_rejected = QtSignal(str)
+
+    COLUMNS = ["Address", "Value", "Hex"]
+    COL_ADDRESS, COL_VALUE, COL_HEX = range(3)
+
+    # Above this many changed runs a single spanning dataChanged is cheaper
+    MAX_CHANGED_RANGES = 64
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._block = None
+        self._write: Optional[Callable[[int, int], object]] = None
+        self._row_starts = np.zeros(1, dtype=np.int64)  # first row of each segment, plus total
+        self._shadow: List[np.ndarray] = []
+        self._seen_seq = None
+
+    def set_block(self, block, write: Optional[Callable[[int, int], object]] = None):
+        """Show `block`; edits in the Value column are passed to `write(address, value)`."""
+        self.beginResetModel()
+        self._block = block
+        self._write = write
+        segments = block.segments if block is not None else []
+        self._row_starts = np.cumsum([0] + [seg.count for seg in segments]).astype(np.int64)
+        self._shadow = [seg.data.copy() for seg in segments]
+        self._seen_seq = block.change_seq if block is not None else None
+        self.endResetModel()
+
+    def _locate(self, row: int):
+        i = int(np.searchsorted(self._row_starts, row, side='right')) - 1
+        seg = self._block.segments[i]
+        return seg, row - int(self._row_starts[i])
+
+    def address_at(self, row: int) -> Optional[int]:
+        if self._block is None or not 0 <= row < self.rowCount():
+            return None
+        seg, offset = self._locate(row)
+        return seg.start + offset
+
+    def row_of(self, address: int) -> Optional[int]:
+        if self._block is None:
+            return None
+        for i, seg in enumerate(self._block.segments):
+            if seg.start <= address < seg.end:
+                return int(self._row_starts[i]) + address - seg.start
+        return None
+
+    def refresh(self) -> int:
+        """Announce rows whose value changed since the last refresh; returns their count."""
+        block = self._block
+        if block is None or block.change_seq == self._seen_seq:
+            return 0
+        self._seen_seq = block.change_seq
+
+        changed = []
+        for i, (seg, shadow) in enumerate(zip(block.segments, self._shadow)):
+            diff = np.flatnonzero(shadow != seg.data)
+            if len(diff):
+                shadow[diff] = seg.data[diff]
+                changed.append(diff + self._row_starts[i])
+        if not changed:
+            return 0
+        rows = np.concatenate(changed)
+
+        # Contiguous runs of changed rows
+        breaks = np.flatnonzero(np.diff(rows) != 1)
+        starts = np.concatenate(([rows[0]], rows[breaks + 1]))
+        ends = np.concatenate((rows[breaks], [rows[-1]]))
+        if len(starts) > self.MAX_CHANGED_RANGES:
+            starts, ends = starts[:1], ends[-1:]
+        for first, last in zip(starts.tolist(), ends.tolist()):
+            self.dataChanged.emit(self.index(first, self.COL_VALUE), self.index(last, self.COL_HEX))
+        return len(rows)
+
+    # ---- Qt model interface ----
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else int(self._row_starts[-1])
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return len(self.COLUMNS)
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.COLUMNS[section]
+        return None
+
+    def flags(self, index: QModelIndex):
+        flags = super().flags(index)
+        if index.isValid() and index.column() == self.COL_VALUE and self._write is not None:
+            flags |= Qt.ItemIsEditable
+        return flags
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        if not index.isValid() or role not in (Qt.DisplayRole, Qt.EditRole):
+            return None
+        seg, offset = self._locate(index.row())
+        col = index.column()
+        if col == self.COL_ADDRESS:
+            return str(seg.start + offset)
+        value = int(seg.data[offset])
+        if col == self.COL_VALUE:
+            return value if role == Qt.EditRole else str(value)
+        return f"0x{value:04X}"
+
+    def setData(self, index: QModelIndex, value, role: int = Qt.EditRole) -> bool:
+        if role != Qt.EditRole or not index.isValid() or index.column() != self.COL_VALUE or self._write is None:
+            return False
+        try:
+            value = int(str(value).strip(), 0)
+        except ValueError:
+            self.edit_rejected.emit("Please enter a valid integer (decimal or 0x hex)")
+            return False
+        if not 0 <= value <= 0xFFFF:
+            self.edit_rejected.emit("Please enter a value between 0 and 65535 (0xFFFF)")
+            return False
+        address = self.address_at(index.row())
+        try:
+            ok = self._write(address, value)
+        except Exception as e:
+            logger.error(f"Register write failed at {address}: {e}")
+            ok = False
+        if ok is False:
+            self.edit_rejected.emit(f"Writing address {address} failed")
+            return False
+        self.refresh()
+        return True
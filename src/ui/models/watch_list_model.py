@@ -0,0 +1,347 @@
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, QTimer
+from PySide6.QtGui import QColor, QBrush
+from typing import List, Dict, Optional, Any, Iterable
+from src.models.device_models import Signal, SignalQuality
+from src.core import metrics
+import datetime
+import logging
+import re
+import time
+
+logger = logging.getLogger(__name__)
+
+_ui_update_seconds = metrics.histogram(
+    'scadascout_ui_update_seconds', 'Time spent applying live updates in a view', ('view',))
+_ui_rows_updated = metrics.counter(
+    'scadascout_ui_rows_updated_total', 'Rows refreshed by live updates', ('view',))
+
+POS_STVAL_ENUM = {0: "intermediate", 1: "open", 2: "closed", 3: "bad"}
+
+
+def is_pos_stval(signal: Signal) -> bool:
+    addr = (signal.address or "").lower()
+    name = (signal.name or "").lower()
+    return "pos.stval" in addr or "pos$stval" in addr or ("pos" in addr and name == "stval")
+
+
+def extract_numeric_and_enum(signal: Signal) -> tuple[int | None, str | None]:
+    num = None
+    enum_label = None
+
+    mapping = getattr(signal, "enum_map", None)
+    if not mapping and is_pos_stval(signal):
+        mapping = POS_STVAL_ENUM
+
+    val = signal.value
+    if isinstance(val, bool):
+        num = int(val)
+    elif isinstance(val, int):
+        num = val
+    elif isinstance(val, float) and val.is_integer():
+        num = int(val)
+    elif isinstance(val, str):
+        text = val.strip()
+        try:
+            if text.lower().startswith("0x"):
+                num = int(text.split()[0], 16)
+            else:
+                m = re.search(r"\(([-]?\d+)\)", text)
+                if m:
+                    num = int(m.group(1))
+                elif re.fullmatch(r"-?\d+", text):
+                    num = int(text)
+        except Exception:
+            num = None
+
+        if num is None:
+            if mapping:
+                for k, v in mapping.items():
+                    if str(v).lower() == text.lower():
+                        num = int(k)
+                        break
+
+        if num is not None and not enum_label:
+            m = re.match(r"(.+?)\s*\(\s*[-]?\d+\s*\)", text)
+            if m:
+                enum_label = m.group(1).strip()
+
+    if num is not None and mapping and num in mapping:
+        enum_label = mapping[num]
+
+    return num, enum_label
+
+
+def format_signal_value(signal: Signal) -> str:
+    if signal.value is None:
+        return "--"
+
+    # Try to format as Hex/Decimal/Enum
+    num, enum_label = extract_numeric_and_enum(signal)
+    if num is not None:
+        hex_str = f"0x{num:X}"
+        if enum_label:
+            return f"{hex_str} ({num}) {enum_label}"
+        return f"{hex_str} ({num})"
+
+    return str(signal.value)
+
+
+def _format_time(ts) -> str:
+    if not ts:
+        return "--"
+    try:
+        text = ts.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]
+        if getattr(ts, 'tzinfo', None) is not None and ts.tzinfo == datetime.timezone.utc:
+            text += ' UTC'
+        return text
+    except Exception:
+        return str(ts)
+
+
+class WatchRow:
+    """One watch list row: a watched signal or a (visual-only) variable."""
+    __slots__ = ("ident", "watched", "response_ms", "unique_address", "name", "value", "ts")
+
+    def __init__(self, ident: str, watched=None, name: str = "", unique_address: str = "",
+                 value: Any = None, ts: Any = None):
+        self.ident = ident
+        self.watched = watched
+        self.response_ms = None
+        self.name = name
+        self.unique_address = unique_address
+        self.value = value
+        self.ts = ts
+
+    @property
+    def is_variable(self) -> bool:
+        return self.watched is None
+
+
+class WatchListModel(QAbstractTableModel):
+    """
+    Table model for the watch list, keyed by watch_id.
+
+    Updates are O(1): the row is looked up in a dict, marked dirty and the
+    dirty rows are announced as contiguous dataChanged ranges once per flush
+    interval. Cell text and colours are produced lazily in `data()`, so only
+    visible rows are ever formatted.
+    """
+    COLUMNS = [
+        "Name", "Address", "Access", "Type",
+        "Modbus Type", "Endianness", "Scale", "Offset",
+        "Value", "RTT (ms)", "Max RTT (ms)", "Quality", "Timestamp", "Last Changed", "Error"
+    ]
+    (COL_NAME, COL_ADDRESS, COL_ACCESS, COL_TYPE, COL_MODBUS_TYPE, COL_ENDIANNESS,
+     COL_SCALE, COL_OFFSET, COL_VALUE, COL_RTT, COL_MAX_RTT, COL_QUALITY,
+     COL_TIMESTAMP, COL_LAST_CHANGED, COL_ERROR) = range(15)
+
+    # Columns that change with a value update
+    FIRST_DYNAMIC_COL = COL_VALUE
+
+    def __init__(self, flush_interval_ms: int = 50, parent=None):
+        super().__init__(parent)
+        self._rows: List[WatchRow] = []
+        self._row_of: Dict[str, int] = {}
+        self._dirty: set = set()  # idents of rows changed since the last flush
+
+        self._quality_brushes = {
+            SignalQuality.GOOD: QBrush(QColor('darkgreen')),
+            SignalQuality.INVALID: QBrush(QColor('red')),
+        }
+        self._default_quality_brush = QBrush(QColor('gray'))
+        self._variable_brush = QBrush(QColor('#DDEEFF'))
+
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(flush_interval_ms)
+        self._flush_timer.timeout.connect(self.flush)
+
+    # ---- Row management ----
+
+    def set_watched(self, watched_signals: Iterable):
+        """Replace the watched-signal rows; variable rows are kept at the end."""
+        variables = [r for r in self._rows if r.is_variable]
+        old_rtt = {r.ident: r.response_ms for r in self._rows if not r.is_variable}
+        self.beginResetModel()
+        self._rows = []
+        for watched in watched_signals:
+            row = WatchRow(watched.watch_id, watched=watched)
+            row.response_ms = old_rtt.get(watched.watch_id)
+            self._rows.append(row)
+        self._rows.extend(variables)
+        self._reindex()
+        self._dirty.clear()
+        self.endResetModel()
+
+    def add_variable(self, owner, name: str, unique_address: str, value=None, ts=None):
+        ident = f"var:{owner or ''}:{name}"
+        if ident in self._row_of:
+            return
+        row = len(self._rows)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._rows.append(WatchRow(ident, name=name, unique_address=unique_address, value=value, ts=ts))
+        self._row_of[ident] = row
+        self.endInsertRows()
+
+    def remove_ident(self, ident: str):
+        row = self._row_of.get(ident)
+        if row is None:
+            return
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._rows[row]
+        self._reindex()
+        self._dirty.discard(ident)
+        self.endRemoveRows()
+
+    def _reindex(self):
+        self._row_of = {r.ident: i for i, r in enumerate(self._rows)}
+
+    def update_signal(self, watch_id: str, signal: Signal, response_ms: Optional[int] = None):
+        row = self._row_of.get(watch_id)
+        if row is None:
+            return
+        entry = self._rows[row]
+        if entry.watched is not None:
+            entry.watched.signal = signal
+        if response_ms is not None:
+            entry.response_ms = response_ms
+        self._mark_dirty(watch_id)
+
+    def update_variable(self, owner, name: str, value, ts):
+        ident = f"var:{owner or ''}:{name}"
+        row = self._row_of.get(ident)
+        if row is None:
+            return
+        entry = self._rows[row]
+        entry.value = value
+        entry.ts = ts
+        self._mark_dirty(ident)
+
+    def _mark_dirty(self, ident: str):
+        self._dirty.add(ident)
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def flush(self):
+        """Emit dataChanged for all dirty rows, merged into contiguous ranges."""
+        if not self._dirty:
+            return
+        t0 = time.perf_counter()
+        row_of = self._row_of
+        rows = sorted(row_of[i] for i in self._dirty if i in row_of)
+        self._dirty.clear()
+        if not rows:
+            return
+        _ui_rows_updated.labels('watch_list').inc(len(rows))
+        last_col = len(self.COLUMNS) - 1
+        start = prev = rows[0]
+        for r in rows[1:]:
+            if r != prev + 1:
+                self.dataChanged.emit(self.index(start, self.FIRST_DYNAMIC_COL), self.index(prev, last_col))
+                start = r
+            prev = r
+        self.dataChanged.emit(self.index(start, self.FIRST_DYNAMIC_COL), self.index(prev, last_col))
+        _ui_update_seconds.labels('watch_list').observe(time.perf_counter() - t0)
+
+    def row_at(self, row: int) -> Optional[WatchRow]:
+        if 0 <= row < len(self._rows):
+            return self._rows[row]
+        return None
+
+    def row_of(self, ident: str) -> Optional[int]:
+        return self._row_of.get(ident)
+
+    # ---- Qt model interface ----
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return len(self.COLUMNS)
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.COLUMNS[section]
+        return None
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        entry = self._rows[index.row()]
+        col = index.column()
+
+        if role == Qt.UserRole:
+            return entry.ident
+
+        if role == Qt.BackgroundRole and col == self.COL_QUALITY:
+            if entry.is_variable:
+                return self._variable_brush
+            quality = getattr(entry.watched.signal, 'quality', None)
+            return self._quality_brushes.get(quality, self._default_quality_brush)
+
+        if role != Qt.DisplayRole:
+            return None
+
+        if entry.is_variable:
+            return self._variable_text(entry, col)
+        try:
+            return self._signal_text(entry, col)
+        except Exception as e:
+            logger.debug(f"Watch list format error for {entry.ident}: {e}")
+            return "--"
+
+    def _variable_text(self, entry: WatchRow, col: int) -> str:
+        if col == self.COL_NAME:
+            return entry.name
+        if col == self.COL_ADDRESS:
+            return entry.unique_address
+        if col == self.COL_VALUE:
+            return str(entry.value) if entry.value is not None else "--"
+        if col == self.COL_QUALITY:
+            return "VAR"
+        if col == self.COL_TIMESTAMP:
+            return str(entry.ts) if entry.ts else "--"
+        return "--"
+
+    def _signal_text(self, entry: WatchRow, col: int) -> str:
+        watched = entry.watched
+        signal = watched.signal
+        if col == self.COL_NAME:
+            return signal.name
+        if col == self.COL_ADDRESS:
+            return signal.address
+        if col == self.COL_ACCESS:
+            return getattr(signal, 'access', 'RO')
+        if col == self.COL_TYPE:
+            if getattr(signal, 'signal_type', None):
+                return signal.signal_type.value if hasattr(signal.signal_type, 'value') else str(signal.signal_type)
+            return "Unknown"
+        if col == self.COL_MODBUS_TYPE:
+            return signal.modbus_data_type.value if signal.modbus_data_type else "-"
+        if col == self.COL_ENDIANNESS:
+            return signal.modbus_endianness.value if signal.modbus_endianness else "-"
+        if col == self.COL_SCALE:
+            return str(signal.modbus_scale)
+        if col == self.COL_OFFSET:
+            return str(signal.modbus_offset)
+        if col == self.COL_VALUE:
+            return format_signal_value(signal)
+        if col == self.COL_RTT:
+            rtt = entry.response_ms
+            if rtt is None:
+                rtt = watched.last_response_ms
+            if rtt is None and getattr(signal, 'last_rtt', 0) and signal.last_rtt > 0:
+                rtt = int(round(signal.last_rtt))
+            return str(rtt) if rtt is not None else "--"
+        if col == self.COL_MAX_RTT:
+            return str(watched.max_response_ms) if watched.max_response_ms is not None else "--"
+        if col == self.COL_QUALITY:
+            quality = getattr(signal, 'quality', None)
+            return quality.value if quality is not None else "--"
+        if col == self.COL_TIMESTAMP:
+            return _format_time(signal.timestamp)
+        if col == self.COL_LAST_CHANGED:
+            return _format_time(signal.last_changed)
+        if col == self.COL_ERROR:
+            return signal.error or "-"
+        return None
@@ -2048,8 +2048,9 @@ QTextEdit:focus, QPlainTextEdit:focus {{
 
 /* ==================== Special Widget Classes ==================== */
 /* Event Log Console Style */
-QTextEdit#eventLog {{
+QTableView#eventLog {{
     background-color: #1e1e1e;
+    alternate-background-color: #1e1e1e;
     color: #d4d4d4;
     font-family: "Consolas", "Monaco", "Courier New", monospace;
     border: none;
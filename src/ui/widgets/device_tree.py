@@ -6,7 +6,7 @@ import json
 from typing import Optional, List
 from src.ui.widgets.connection_dialog import ConnectionDialog
 from src.ui.widgets.modbus_inspector_dialog import ModbusInspectorDialog
-from src.models.device_models import DeviceType
+from src.models.device_models import DeviceType, LazyNode
 import logging
 
 logger = logging.getLogger(__name__)
@@ -23,6 +23,9 @@ class DeviceTreeWidget(QWidget):
     add_to_live_data_requested = QtSignal(object) # Emits signal definition payload (allow node objects)
     show_event_log_requested = QtSignal() # Requests bringing Event Log to focus
 
+    # Qt.UserRole + 1 marker of the stand-in row under an unexpanded lazy LN
+    LAZY_PLACEHOLDER = "LAZY_PLACEHOLDER"
+
     def __init__(self, device_manager, watch_list_manager=None, parent=None):
         super().__init__(parent)
         self.device_manager = device_manager
@@ -171,21 +174,42 @@ class DeviceTreeWidget(QWidget):
     def _collect_filter_matches(self, parent, search, matches):
         for row in range(parent.rowCount()):
             item = parent.child(row, 0)
-            if not item:
+            if not item or item.data(Qt.UserRole + 1) == self.LAZY_PLACEHOLDER:
                 continue
 
-            txt = item.text().lower() if item.text() else ""
-            path_txt = self._item_path(item).lower()
             desc_item = parent.child(row, 2)
-            if desc_item and desc_item.text():
-                txt += " " + desc_item.text().lower()
-
-            if self._matches_filter(txt, search) or self._matches_filter(path_txt, search):
+            path = self._item_path(item)
+            if self._entry_matches(item.text(), desc_item.text() if desc_item else "", path, search):
                 matches.append(item)
 
+            if self._is_unexpanded_lazy(item):
+                # Search the node model; build rows only where something matches
+                if not self._lazy_subtree_matches(item.data(Qt.UserRole), path, search):
+                    continue
+                self._materialize_lazy_item(item)
+
             if item.rowCount() > 0:
                 self._collect_filter_matches(item, search, matches)
 
+    def _entry_matches(self, name, description, path, search):
+        txt = name.lower() if name else ""
+        if description:
+            txt += " " + description.lower()
+        return self._matches_filter(txt, search) or self._matches_filter(path.lower(), search)
+
+    def _lazy_subtree_matches(self, node, path, search):
+        """True if anything below `node` (loading it if needed) matches the search."""
+        for child in node.children:
+            child_path = f"{path}.{child.name}"
+            if self._entry_matches(child.name, child.description, child_path, search):
+                return True
+            if self._lazy_subtree_matches(child, child_path, search):
+                return True
+        for sig in node.signals or []:
+            if self._entry_matches(sig.name, sig.description, f"{path}.{sig.name}", search):
+                return True
+        return False
+
     def _matches_filter(self, text, search):
         if not search:
             return False
@@ -340,6 +364,8 @@ class DeviceTreeWidget(QWidget):
         
         # Double-click handler for status column
         self.tree_view.doubleClicked.connect(self._on_double_click)
+        # Lazily built LNs get their rows when first expanded
+        self.tree_view.expanded.connect(self._on_item_expanded)
         
         header = self.tree_view.header()
         header.setSectionsMovable(True)
@@ -451,7 +477,10 @@ class DeviceTreeWidget(QWidget):
         self.device_manager.device_status_changed.connect(self._update_status_indicator)
         # Live signal updates (device_name, Signal)
         try:
-            self.device_manager.signal_updated.connect(self._on_signal_updated)
+            if hasattr(self.device_manager, 'signal_updates'):
+                self.device_manager.signal_updates.connect(self._on_signal_updates)
+            else:
+                self.device_manager.signal_updated.connect(self._on_signal_updated)
         except Exception:
             # Older versions may not have the signal; ignore
             pass
@@ -601,7 +630,15 @@ class DeviceTreeWidget(QWidget):
         item_type.setEditable(False)
 
         parent_item.appendRow([item_name, status_item, item_desc, item_fc, item_type])
-        
+
+        if isinstance(node, LazyNode) and not node.is_loaded:
+            # Placeholder keeps the expand arrow; rows are built on expansion
+            placeholder = QStandardItem("Loading...")
+            placeholder.setEditable(False)
+            placeholder.setData(self.LAZY_PLACEHOLDER, Qt.UserRole + 1)
+            item_name.appendRow(placeholder)
+            return
+
         # Add Children Nodes
         for child in node.children:
             self._add_node_recursive(item_name, child)
@@ -611,6 +648,27 @@ class DeviceTreeWidget(QWidget):
             for sig in node.signals:
                 self._add_signal_node(item_name, sig)
     
+    def _on_item_expanded(self, index):
+        """Replace a lazy LN's placeholder row with its real children."""
+        item = self.model.itemFromIndex(index.siblingAtColumn(0))
+        if item is not None and self._is_unexpanded_lazy(item):
+            self._materialize_lazy_item(item)
+
+    def _is_unexpanded_lazy(self, item):
+        first = item.child(0, 0) if item.rowCount() else None
+        return first is not None and first.data(Qt.UserRole + 1) == self.LAZY_PLACEHOLDER
+
+    def _materialize_lazy_item(self, item):
+        node = item.data(Qt.UserRole)
+        item.removeRow(0)
+        try:
+            for child in node.children:
+                self._add_node_recursive(item, child)
+            for sig in node.signals or []:
+                self._add_signal_node(item, sig)
+        except Exception:
+            logger.exception(f"Failed to expand {getattr(node, 'name', '?')}")
+
     def _add_signal_node(self, parent_item: QStandardItem, sig):
         """Adds a signal as a child row."""
         # Col 0: Name
@@ -699,6 +757,11 @@ class DeviceTreeWidget(QWidget):
             # Bring Event Log to focus to show connection progress
             self.show_event_log_requested.emit()
 
+    def _on_signal_updates(self, items):
+        """Batched live updates: [(device_name, signal), ...]."""
+        for device_name, signal in items:
+            self._on_signal_updated(device_name, signal)
+
     def _on_signal_updated(self, device_name: str, signal):
         """Update the tree row for a signal when live data arrives.
 
@@ -1,15 +1,15 @@
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QTextEdit, QPushButton, QHBoxLayout, QCheckBox, QComboBox, QLineEdit, QLabel, QFileDialog, QMessageBox, QGridLayout
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QTableView, QAbstractItemView, QHeaderView, QPushButton, QHBoxLayout, QCheckBox, QComboBox, QLineEdit, QLabel, QFileDialog, QMessageBox, QGridLayout
 import subprocess
 import os
-from PySide6.QtCore import Qt, Signal as QtSignal, QObject
-from PySide6.QtGui import QTextCursor, QColor
-import html
+from PySide6.QtCore import Qt, Signal as QtSignal, QObject, QTimer
 import logging
+import re
 from datetime import datetime
 from src.core.packet_capture import PacketCaptureWorker
 import psutil
 
 from src.core.event_logger import EventLogger
+from src.ui.models.event_log_model import EventLogModel, EventLogFilterProxy
 
 class EventLogWidget(QWidget):
     """
@@ -22,12 +22,38 @@ class EventLogWidget(QWidget):
     def _setup_ui(self):
         layout = QVBoxLayout(self)
         
-        # Text display
-        self.text_edit = QTextEdit()
-        self.text_edit.setReadOnly(True)
-        # Use themed event log style from QSS (QTextEdit#eventLog)
-        self.text_edit.setObjectName("eventLog")
-        layout.addWidget(self.text_edit)
+        # Event table backed by a ring-buffer model; filtering happens in the proxy
+        self.log_model = EventLogModel(parent=self)
+        self.log_proxy = EventLogFilterProxy(self)
+        self.log_proxy.setSourceModel(self.log_model)
+
+        self.log_view = QTableView()
+        self.log_view.setModel(self.log_proxy)
+        # Use themed event log style from QSS (QTableView#eventLog)
+        self.log_view.setObjectName("eventLog")
+        self.log_view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.log_view.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.log_view.setShowGrid(False)
+        self.log_view.setWordWrap(False)
+        self.log_view.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.log_view.verticalHeader().setVisible(False)
+        # Fixed row height keeps scrolling O(1) regardless of row count
+        self.log_view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.log_view.verticalHeader().setDefaultSectionSize(self.log_view.fontMetrics().height() + 4)
+        header = self.log_view.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.Interactive)
+        header.setStretchLastSection(True)
+        header.resizeSection(EventLogModel.COL_TIME, 90)
+        header.resizeSection(EventLogModel.COL_LEVEL, 100)
+        header.resizeSection(EventLogModel.COL_SOURCE, 140)
+        layout.addWidget(self.log_view)
+
+        # Follow the tail only when the user is already scrolled to the bottom
+        self._follow_tail = True
+        self.log_proxy.rowsInserted.connect(self._on_rows_inserted)
+        self.log_view.verticalScrollBar().valueChanged.connect(self._on_scroll_changed)
+        # Double-clicking a captured packet row dissects that frame on demand
+        self.log_view.doubleClicked.connect(self._on_log_row_activated)
         
         # Control buttons in two rows for better flexibility
         # Row 1: Basic controls
@@ -35,7 +61,7 @@ class EventLogWidget(QWidget):
         
         self.chk_verbose = QCheckBox("Show All Events")
         self.chk_verbose.setChecked(True)
-        self.chk_verbose.stateChanged.connect(self._refresh_log_view)
+        self.chk_verbose.stateChanged.connect(self._apply_verbose_filter)
         row1_layout.addWidget(self.chk_verbose)
         
         self.btn_pause = QPushButton("⏸️ Pause")
@@ -133,6 +159,16 @@ class EventLogWidget(QWidget):
         self.btn_apply_rotation.clicked.connect(self._apply_rotation_settings)
         row2_layout.addWidget(self.btn_apply_rotation)
 
+        self.btn_proto_stats = QPushButton("📊 Stats")
+        self.btn_proto_stats.setToolTip("MMS/Modbus/GOOSE latency and throughput of the live capture")
+        self.btn_proto_stats.clicked.connect(self._show_protocol_stats)
+        row2_layout.addWidget(self.btn_proto_stats)
+
+        self.btn_analyze_file = QPushButton("🔍 Analyze pcap...")
+        self.btn_analyze_file.setToolTip("Decode a pcap/pcapng file offline and show per-device statistics")
+        self.btn_analyze_file.clicked.connect(self._analyze_capture_file)
+        row2_layout.addWidget(self.btn_analyze_file)
+
         row2_layout.addStretch()
         layout.addLayout(row2_layout)
 
@@ -145,6 +181,12 @@ class EventLogWidget(QWidget):
         self.capture_worker = PacketCaptureWorker()
         self.capture_worker.packet_captured.connect(self._on_packet_captured)
         self.capture_worker.error_occurred.connect(self._on_capture_error)
+
+        # Captured frames are pulled from the capture ring in batches instead of one signal per packet
+        self._capture_drain_timer = QTimer(self)
+        self._capture_drain_timer.setInterval(100)
+        self._capture_drain_timer.timeout.connect(self._drain_captured_packets)
+        self._capture_dropped_reported = 0
         
         # New: If logger is provided, connect to it
         self.event_logger = None
@@ -247,6 +289,7 @@ class EventLogWidget(QWidget):
 
             try:
                 self.capture_worker.start_capture(filter_str)
+                self._capture_drain_timer.start()
                 self.log_event("INFO", "Network", f"Started capture with filter: {filter_str}")
                 self._update_capture_button_style(running=True)
             except Exception as e:
@@ -256,12 +299,73 @@ class EventLogWidget(QWidget):
                 self._update_capture_button_style(running=False, error=True)
         else:
             self.capture_worker.stop_capture()
+            self._capture_drain_timer.stop()
+            self._drain_captured_packets()
             self.log_event("INFO", "Network", "Stopped capture")
             self._update_capture_button_style(running=False)
 
     def _on_packet_captured(self, summary: str):
         self.log_event("PACKET", "Network", summary)
 
+    # Max packet rows listed per drain tick; the rest stay in the capture ring / log file
+    MAX_PACKET_ROWS_PER_TICK = 200
+
+    def _drain_captured_packets(self):
+        pipeline = self.capture_worker.pipeline
+        for seq in pipeline.drain(max_items=self.MAX_PACKET_ROWS_PER_TICK):
+            summary = pipeline.summary(seq)
+            if summary is not None:
+                self.log_event("PACKET", "Network", f"#{seq} {summary}")
+        dropped = pipeline.frames_dropped_ui
+        if dropped > self._capture_dropped_reported:
+            self.log_event("INFO", "Network",
+                           f"{dropped - self._capture_dropped_reported} packets not listed "
+                           f"(kept in capture buffer/file; {pipeline.frames_captured} captured)")
+            self._capture_dropped_reported = dropped
+
+    def _show_protocol_stats(self):
+        from src.ui.widgets.scrollable_message_box import ScrollableMessageBox
+        analyzer = self.capture_worker.pipeline.analyzer
+        if analyzer is None:
+            return
+        dlg = ScrollableMessageBox("Protocol Statistics", "Live capture: request/response latency per device",
+                                   analyzer.format_report(), self)
+        dlg.exec()
+
+    def _analyze_capture_file(self):
+        filename, _ = QFileDialog.getOpenFileName(self, "Analyze capture file", "",
+                                                  "Packet Capture (*.pcapng *.pcap);;All Files (*)")
+        if not filename:
+            return
+        from PySide6.QtWidgets import QApplication
+        from src.core.protocol_decoder import analyze_capture_file
+        from src.ui.widgets.scrollable_message_box import ScrollableMessageBox
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        try:
+            report = analyze_capture_file(filename).format_report()
+        except Exception as e:
+            QApplication.restoreOverrideCursor()
+            self.log_event("ERROR", "Network", f"Failed to analyze {filename}: {e}")
+            return
+        QApplication.restoreOverrideCursor()
+        dlg = ScrollableMessageBox("Protocol Statistics", os.path.basename(filename), report, self)
+        dlg.exec()
+
+    def _on_log_row_activated(self, index):
+        event = self.log_proxy.event_at(index.row())
+        if not event or event[1] != "PACKET":
+            return
+        m = re.match(r"#(\d+)\s", event[3])
+        if not m:
+            return
+        text = self.capture_worker.pipeline.dissect(int(m.group(1)))
+        from src.ui.widgets.scrollable_message_box import ScrollableMessageBox
+        if text is None:
+            QMessageBox.information(self, "Packet", "This packet is no longer in the capture buffer.")
+            return
+        dlg = ScrollableMessageBox(f"Packet #{m.group(1)}", event[3], text, self)
+        dlg.exec()
+
     def _update_capture_button_style(self, running: bool, error: bool = False):
         """Visually update the capture button to indicate running/stopped/error."""
         # Use themed button classes instead of inline styles
@@ -299,7 +403,7 @@ class EventLogWidget(QWidget):
             return False
 
     def _browse_log_file(self):
-        filename, _ = QFileDialog.getSaveFileName(self, "Select packet log file", "packets.log", "Log Files (*.log *.txt);;All Files (*)")
+        filename, _ = QFileDialog.getSaveFileName(self, "Select packet log file", "packets.log", "Log Files (*.log *.txt);;Packet Capture (*.pcapng);;All Files (*)")
         if filename:
             self.le_log_file.setText(filename)
 
@@ -392,7 +496,8 @@ class EventLogWidget(QWidget):
         """Update the console font for the event log."""
         from PySide6.QtGui import QFont
         font = QFont(font_family, font_size)
-        self.text_edit.setFont(font)
+        self.log_view.setFont(font)
+        self.log_view.verticalHeader().setDefaultSectionSize(self.log_view.fontMetrics().height() + 4)
 
     def _toggle_pause(self):
         self.is_paused = self.btn_pause.isChecked()
@@ -400,7 +505,18 @@ class EventLogWidget(QWidget):
 
     def _apply_source_filter(self, text):
         self.source_filter = text
-        self._refresh_log_view()
+        self.log_proxy.set_source_filter(text)
+
+    def _apply_verbose_filter(self, *_):
+        self.log_proxy.set_verbose(self.chk_verbose.isChecked())
+
+    def _on_scroll_changed(self, value):
+        bar = self.log_view.verticalScrollBar()
+        self._follow_tail = value >= bar.maximum()
+
+    def _on_rows_inserted(self, *_):
+        if self._follow_tail:
+            self.log_view.scrollToBottom()
 
     def set_event_logger(self, logger: EventLogger):
         """Connects the widget to a core event logger."""
@@ -414,122 +530,27 @@ class EventLogWidget(QWidget):
         self._refresh_log_view()
 
     def _refresh_log_view(self):
-        """Re-populates the text area based on current filter."""
-        self.text_edit.clear()
+        """Reloads the model from the logger history (filters are applied by the proxy)."""
         if not self.event_logger:
+            self.log_model.clear()
             return
-            
-        for event in self.event_logger.get_history():
-            self._display_event(event)
+        self.log_model.set_events(self.event_logger.get_history())
+        self.log_view.scrollToBottom()
 
     def log_event(self, level: str, source: str, message: str):
         """Processes an event from the logger or direct call."""
         if self.is_paused:
             return
 
-        # Create a display-only event dict if it wasn't already in history
-        # (Though usually this will be called via Signal)
         timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
-        
-        event = {
-            'timestamp': timestamp,
-            'level': level,
-            'source': source,
-            'message': message
-        }
-        
-        self._display_event(event)
-        
-    def _display_event(self, event):
-        """Displays a singe event if it matches criteria."""
-        # Normalize event fields early to avoid UnboundLocalError
-        level = event.get('level') if isinstance(event, dict) else getattr(event, 'level', None)
-        source = event.get('source') if isinstance(event, dict) else getattr(event, 'source', None)
-        message = event.get('message') if isinstance(event, dict) else getattr(event, 'message', None)
-
-        # Filter logic:
-        # If "Verbose" is OFF, hide TRANSACTION and detailed READ events unless it's a change or error
-        if not self.chk_verbose.isChecked():
-            # Hide transactions (IEC61850 calls)
-            if level == 'TRANSACTION':
-                return
-            # Hide generic cyclic reads if not error
-            if source == 'WatchList' and isinstance(message, str) and 'Read' in message and level == 'INFO':
-                # Keep it only if it looks like a value update or error? Currently skip
-                return
+        self.log_model.append_event(timestamp, level, source, message)
 
-        # Source Filtering
-        if self.source_filter == "All Sources":
-            pass # Show all
-        elif self.source_filter == "Application":
-            # Show specific sources
-            app_sources = ["Main", "AppController", "DeviceManager", "IEC61850Adapter", "EventLog", "SCDImport"]
-            if source not in app_sources:
-                # If source is likely a device name (not in this list), skip
-                if not any(k in str(source) for k in ("Manager", "Main")):
-                    return
-        else:
-            # Specific Device selected
-            if source != self.source_filter:
-                return
-        if level == "ERROR":
-            color = "#f48771"  # Red
-        elif level == "WARNING":
-            color = "#dcdcaa"  # Yellow
-        elif level == "INFO":
-            color = "#4fc1ff"  # Bright Cyan - More visible for success messages
-        elif level == "DEBUG":
-            color = "#9cdcfe"  # Light Blue
-        elif level == "TRANSACTION":
-            color = "#c586c0"  # Purple
-        elif level == "PACKET":
-            color = "#569cd6"  # Blue for packets
-        else:
-            color = "#d4d4d4"  # Gray
-        
-        # Format the log entry
-        # Normalize message: trim, collapse whitespace/newlines, and truncate for tidy display
-        import re
-        full_msg = message if isinstance(message, str) else str(message)
-        full_msg = full_msg.strip()
-        # Collapse any sequence of whitespace/newlines into single space for compact display
-        compact = re.sub(r"\s+", " ", full_msg)
-        # Truncate long messages for the log view, keep full in tooltip
-        max_len = 300
-        display_msg = compact if len(compact) <= max_len else compact[:max_len] + "..."
-        escaped_display = html.escape(display_msg)
-        escaped_full = html.escape(full_msg)
-
-        # Make success messages stand out with bold text for ✅ indicators
-        title_attr = f' title="{escaped_full}"' if escaped_full else ''
-        if '✅' in full_msg:
-            entry_html = (
-                f'<span style="color: #808080;">[{event["timestamp"]}]</span> '
-                f'<span style="color: {color}; font-weight: bold;">[{level}]</span> '
-                f'<span style="color: #569cd6; font-weight: bold;">{event["source"]}:</span> '
-                f'<pre style="white-space:pre-wrap;margin:0; color: {color}; font-weight: bold;"{title_attr}>{escaped_display}</pre>'
-            )
-        else:
-            entry_html = (
-                f'<span style="color: #808080;">[{event["timestamp"]}]</span> '
-                f'<span style="color: {color};">[{level}]</span> '
-                f'<span style="color: #569cd6;">{event["source"]}:</span> '
-                f'<pre style="white-space:pre-wrap;margin:0"{title_attr}>{escaped_display}</pre>'
-            )
-
-        self.text_edit.append(entry_html)
-        
-        # Auto-scroll to bottom
-        cursor = self.text_edit.textCursor()
-        cursor.movePosition(QTextCursor.End)
-        self.text_edit.setTextCursor(cursor)
-    
     def clear_log(self):
         """Clear all log entries."""
         if self.event_logger:
             self.event_logger.clear_history()
         else:
-            self.text_edit.clear()
+            self.log_model.clear()
             self.log_event("INFO", "EventLog", "Log cleared")
     
     def _export_log(self):
@@ -545,7 +566,10 @@ class EventLogWidget(QWidget):
         
         if filename:
             try:
+                self.log_model.flush()
                 with open(filename, 'w') as f:
-                    f.write(self.text_edit.toPlainText())
+                    for row in range(self.log_proxy.rowCount()):
+                        timestamp, level, source, message = self.log_proxy.event_at(row)
+                        f.write(f"[{timestamp}] [{level}] {source}: {message}\n")
             except Exception as e:
                 pass
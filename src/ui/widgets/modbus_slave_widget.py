@@ -4,13 +4,14 @@ Allows starting/stopping server and managing virtual registers
 """
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QGroupBox,
                                 QPushButton, QLabel, QSpinBox, QLineEdit,
-                                QTableWidget, QTableWidgetItem, QHeaderView,
+                                QTableWidget, QTableWidgetItem, QTableView, QHeaderView,
                                 QComboBox, QCheckBox, QFormLayout, QTabWidget,
                                 QFileDialog, QMessageBox, QTextEdit)
 from PySide6.QtCore import Qt, QTimer, Signal as QtSignal
 from PySide6.QtGui import QColor
 import logging
 from src.models.device_models import ModbusDataType, ModbusEndianness, ModbusSignalMapping
+from src.ui.models.register_table_model import RegisterTableModel
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +24,9 @@ class ModbusSlaveWidget(QWidget):
     server_stopped = QtSignal()
     server_started = QtSignal() # New signal
     config_updated = QtSignal()  # Emitted when mappings or config change
+
+    # Register view refresh; only changed rows are repainted, so this can be fast
+    REFRESH_INTERVAL_MS = 200
     
     def __init__(self, event_logger=None, parent=None, device_config=None, server_adapter=None):
         super().__init__(parent)
@@ -55,7 +59,7 @@ class ModbusSlaveWidget(QWidget):
                 self.lbl_status.style().polish(self.lbl_status)
             except Exception:
                 pass
-            self.update_timer.start(1000)
+            self.update_timer.start(self.REFRESH_INTERVAL_MS)
     
     def _setup_ui(self):
         """Initialize UI components"""
@@ -336,12 +340,17 @@ class ModbusSlaveWidget(QWidget):
         layout.addLayout(toolbar)
         
         # Table
-        self.table_registers = QTableWidget()
-        self.table_registers.setColumnCount(3)
-        self.table_registers.setHorizontalHeaderLabels(["Address", "Value", "Hex"])
+        self.register_model = RegisterTableModel(self)
+        # Queued: the message box must not open while the editor is committing
+        self.register_model.edit_rejected.connect(self._on_register_edit_rejected, Qt.QueuedConnection)
+        self.table_registers = QTableView()
+        self.table_registers.setModel(self.register_model)
         self.table_registers.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.table_registers.verticalHeader().setVisible(False)
+        # Fixed row height lets the view skip measuring 65k rows
+        self.table_registers.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table_registers.verticalHeader().setDefaultSectionSize(22)
         self.table_registers.setAlternatingRowColors(True)
-        self.table_registers.itemChanged.connect(self._on_register_changed)
         
         layout.addWidget(self.table_registers)
         
@@ -537,7 +546,7 @@ class ModbusSlaveWidget(QWidget):
                     self.server.write_mapped_value(addr, val)
                     # Refresh because scale might affect it or multi-registers might change
                     QTimer.singleShot(100, self._load_mappings)
-                    QTimer.singleShot(100, self._load_registers) # Raw sync
+                    QTimer.singleShot(100, self.register_model.refresh) # Raw sync
                 except Exception as e:
                     logger.error(f"Value update error: {e}")
                     
@@ -664,7 +673,7 @@ class ModbusSlaveWidget(QWidget):
                 pass
             
             # Start update timer
-            self.update_timer.start(1000)
+            self.update_timer.start(self.REFRESH_INTERVAL_MS)
             
             # Load initial registers
             self._load_registers()
@@ -704,105 +713,33 @@ class ModbusSlaveWidget(QWidget):
         
         self.server_stopped.emit()
     
+    REGISTER_TYPES = {
+        "Holding Registers": "holding",
+        "Input Registers": "input",
+        "Coils": "coils",
+        "Discrete Inputs": "discrete"
+    }
+
+    def _current_register_type(self) -> str:
+        return self.REGISTER_TYPES[self.combo_register_type.currentText()]
+
     def _load_registers(self):
-        """Load current register values into table"""
+        """Show the data block of the selected register type"""
         if not self.server:
             return
         
-        reg_type_map = {
-            "Holding Registers": "holding",
-            "Input Registers": "input",
-            "Coils": "coils",
-            "Discrete Inputs": "discrete"
+        reg_type = self._current_register_type()
+        writers = {
+            "holding": self.server.write_register,
+            "input": self.server.write_input_register,
+            "coils": lambda address, value: self.server.write_coil(address, bool(value)),
+            "discrete": lambda address, value: self.server.write_discrete_input(address, bool(value)),
         }
-        
-        reg_type = reg_type_map[self.combo_register_type.currentText()]
-        data = self.server.get_all_registers(reg_type)
-        
-        # Block signals to avoid triggering itemChanged
-        self.table_registers.blockSignals(True)
-        
-        self.table_registers.setRowCount(0)
-        
-        # Show registers from configured blocks
-        if self.device_config and self.device_config.modbus_slave_blocks:
-            # Filter blocks by type
-            matching_blocks = [b for b in self.device_config.modbus_slave_blocks if b.register_type == reg_type]
-            
-            for block in matching_blocks:
-                # Add a header row or just list them? Listing is simpler for now.
-                for i in range(block.count):
-                    addr = block.start_address + i
-                    value = data.get(addr, 0)
-                    
-                    row = self.table_registers.rowCount()
-                    self.table_registers.insertRow(row)
-                    
-                    # Address
-                    addr_item = QTableWidgetItem(str(addr))
-                    addr_item.setFlags(addr_item.flags() & ~Qt.ItemIsEditable)
-                    self.table_registers.setItem(row, 0, addr_item)
-                    
-                    # Value
-                    value_item = QTableWidgetItem(str(value))
-                    self.table_registers.setItem(row, 1, value_item)
-                    
-                    # Hex
-                    hex_item = QTableWidgetItem(f"0x{value:04X}")
-                    hex_item.setFlags(hex_item.flags() & ~Qt.ItemIsEditable)
-                    self.table_registers.setItem(row, 2, hex_item)
-        else:
-            # Fallback for legacy/default 0-100 if no blocks defined
-            for addr in range(100):
-                value = data.get(addr, 0)
-                
-                row = self.table_registers.rowCount()
-                self.table_registers.insertRow(row)
-                
-                # Address
-                addr_item = QTableWidgetItem(str(addr))
-                addr_item.setFlags(addr_item.flags() & ~Qt.ItemIsEditable)
-                self.table_registers.setItem(row, 0, addr_item)
-                
-                # Value
-                value_item = QTableWidgetItem(str(value))
-                self.table_registers.setItem(row, 1, value_item)
-                
-                # Hex
-                hex_item = QTableWidgetItem(f"0x{value:04X}")
-                hex_item.setFlags(hex_item.flags() & ~Qt.ItemIsEditable)
-                self.table_registers.setItem(row, 2, hex_item)
-        
-        self.table_registers.blockSignals(False)
-    
-    def _on_register_changed(self, item):
-        """Handle register value change in table"""
-        if not self.server or item.column() != 1:
-            return
-        
-        try:
-            row = item.row()
-            address = int(self.table_registers.item(row, 0).text())
-            value = int(item.text())
-            
-            reg_type = self.combo_register_type.currentText()
-            
-            if reg_type == "Holding Registers":
-                self.server.write_register(address, value)
-            elif reg_type == "Input Registers":
-                self.server.write_input_register(address, value)
-            elif reg_type == "Coils":
-                self.server.write_coil(address, bool(value))
-            elif reg_type == "Discrete Inputs":
-                self.server.write_discrete_input(address, bool(value))
-            
-            # Update hex display
-            self.table_registers.item(row, 2).setText(f"0x{value:04X}")
-            
-        except ValueError:
-            QMessageBox.warning(self, "Invalid Value", "Please enter a valid integer")
-            self._load_registers()
+        self.register_model.set_block(self.server.get_block(reg_type), writers[reg_type])
     
+    def _on_register_edit_rejected(self, message: str):
+        QMessageBox.warning(self, "Invalid Value", message)
+
     def _quick_write(self):
         """Quick write to register"""
         if not self.server:
@@ -819,7 +756,10 @@ class ModbusSlaveWidget(QWidget):
         elif reg_type == "Input Registers":
             self.server.write_input_register(address, value)
         
-        self._load_registers()
+        self.register_model.refresh()
+        row = self.register_model.row_of(address)
+        if row is not None:
+            self.table_registers.scrollTo(self.register_model.index(row, RegisterTableModel.COL_VALUE))
     
     def _toggle_simulation(self, state):
         """Enable/disable sensor simulation"""
@@ -844,7 +784,7 @@ class ModbusSlaveWidget(QWidget):
             values = [random.randint(0, 65535) for _ in range(100)]
         
         self.server.bulk_write_registers(0, values)
-        self._load_registers()
+        self.register_model.refresh()
     
     def _import_registers(self):
         """Import register values from CSV"""
@@ -863,18 +803,17 @@ class ModbusSlaveWidget(QWidget):
                     value = int(row['value'])
                     data[addr] = value
             
-            reg_type_map = {
-                "Holding Registers": "holding",
-                "Input Registers": "input",
-                "Coils": "coils",
-                "Discrete Inputs": "discrete"
-            }
+            reg_type = self._current_register_type()
+            skipped = self.server.import_register_data(data, reg_type)
+            self.register_model.refresh()
             
-            reg_type = reg_type_map[self.combo_register_type.currentText()]
-            self.server.import_register_data(data, reg_type)
-            self._load_registers()
-            
-            QMessageBox.information(self, "Success", f"Imported {len(data)} registers")
+            if skipped is None:
+                QMessageBox.critical(self, "Import Error", "Failed to import registers (see log)")
+            elif skipped:
+                QMessageBox.warning(self, "Import", f"Imported {len(data) - skipped} registers.\n"
+                                    f"{skipped} addresses are outside the configured register blocks and were skipped.")
+            else:
+                QMessageBox.information(self, "Success", f"Imported {len(data)} registers")
             
         except Exception as e:
             QMessageBox.critical(self, "Import Error", f"Failed to import:\n{e}")
@@ -888,14 +827,7 @@ class ModbusSlaveWidget(QWidget):
         try:
             import csv
             
-            reg_type_map = {
-                "Holding Registers": "holding",
-                "Input Registers": "input",
-                "Coils": "coils",
-                "Discrete Inputs": "discrete"
-            }
-            
-            reg_type = reg_type_map[self.combo_register_type.currentText()]
+            reg_type = self._current_register_type()
             data = self.server.get_all_registers(reg_type)
             
             with open(fname, 'w', newline='') as f:
@@ -923,28 +855,17 @@ class ModbusSlaveWidget(QWidget):
         )
         
         if reply == QMessageBox.Yes:
-            zeros = {i: 0 for i in range(1000)}
-            
-            reg_type_map = {
-                "Holding Registers": "holding",
-                "Input Registers": "input",
-                "Coils": "coils",
-                "Discrete Inputs": "discrete"
-            }
-            
-            reg_type = reg_type_map[self.combo_register_type.currentText()]
+            reg_type = self._current_register_type()
+            zeros = dict.fromkeys(self.server.get_all_registers(reg_type), 0)
             self.server.import_register_data(zeros, reg_type)
-            self._load_registers()
+            self.register_model.refresh()
     
     def _update_display(self):
         """Periodic update of display (when server running)"""
         if self.server and self.server.running:
-            # Reload current view if visible
+            # Repaint changed registers if visible
             if self.tabs.currentIndex() == 0:  # Register editor
-                current_row = self.table_registers.currentRow()
-                self._load_registers()
-                if current_row >= 0:
-                    self.table_registers.setCurrentCell(current_row, 1)
+                self.register_model.refresh()
     
     def _update_statistics(self):
         """Update statistics display"""
@@ -1,21 +1,29 @@
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QTableView, QHeaderView, QTabWidget, QPushButton, QSizePolicy
-from PySide6.QtGui import QStandardItemModel, QStandardItem, QPainter
-from PySide6.QtCharts import QChart, QChartView, QLineSeries
+from PySide6.QtGui import QStandardItemModel, QStandardItem
 from PySide6.QtCore import Qt
 from src.ui.models.signal_table_model import SignalTableModel
 from PySide6.QtCore import QRegularExpression
 from PySide6.QtCore import QSortFilterProxyModel
+from src.core import metrics
 import json
+import time
+
+_ui_update_seconds = metrics.histogram(
+    'scadascout_ui_update_seconds', 'Time spent applying live updates in a view', ('view',))
 
 class SignalsViewWidget(QWidget):
     """
     Widget containing the Data Grid and Live Chart.
     Uses tabs to switch between Table View and Chart View.
     """
-    def __init__(self, device_manager, watch_list_manager=None, parent=None):
+    # Plotting more signals than this at once asks for confirmation
+    TREND_CONFIRM_COUNT = 32
+
+    def __init__(self, device_manager, watch_list_manager=None, parent=None, historian=None):
         super().__init__(parent)
         self.device_manager = device_manager
         self.watch_list_manager = watch_list_manager
+        self.historian = historian
         self.current_device_name = None  # Track which device's signals we're showing
         self.current_node = None        # Track current node for manual refresh
         # Queue for chunked background reads to keep UI responsive on large selections
@@ -172,6 +180,12 @@ class SignalsViewWidget(QWidget):
         toolbar.addWidget(self.txt_filter)
         
         toolbar.addStretch()
+
+        # Switch between table and trend (the tab bar itself is hidden)
+        self.btn_trend = QPushButton("Trend Chart")
+        self.btn_trend.setCheckable(True)
+        self.btn_trend.toggled.connect(self._on_trend_toggled)
+        toolbar.addWidget(self.btn_trend)
         layout.addLayout(toolbar)
         
         self.table_view = QTableView()
@@ -664,6 +678,10 @@ class SignalsViewWidget(QWidget):
              
         remove_action.triggered.connect(remove_signal)
         menu.addAction(remove_action)
+
+        trend_action = QAction("Add to Trend", self)
+        trend_action.triggered.connect(lambda: self.add_signal_to_trend(device_name, signal))
+        menu.addAction(trend_action)
         
         # Control option
         menu.addSeparator()
@@ -699,26 +717,70 @@ class SignalsViewWidget(QWidget):
 
 
     def _setup_chart_tab(self):
-        """Create the Chart tab."""
+        """Create the Trend Chart tab."""
         self.chart_tab = QWidget()
         layout = QVBoxLayout(self.chart_tab)
-        
-        self.chart = QChart()
-        self.chart.setTitle("Live Telemetry")
-        
-        # We will dynamically add series later
-        self.chart.createDefaultAxes()
-        
-        self.chart_view = QChartView(self.chart)
-        self.chart_view.setRenderHint(QPainter.Antialiasing)
-        
-        layout.addWidget(self.chart_view)
-        # self.tabs.addTab(self.chart_tab, "Trend Chart") # Hide Chart for now until implemented
+
+        toolbar = QHBoxLayout()
+        btn_back = QPushButton("Back to Table")
+        btn_back.clicked.connect(lambda: self.btn_trend.setChecked(False))
+        toolbar.addWidget(btn_back)
+        btn_add = QPushButton("Plot Selected")
+        btn_add.setToolTip("Add the signals selected in the table to the trend")
+        btn_add.clicked.connect(self._on_plot_selected_clicked)
+        toolbar.addWidget(btn_add)
+        toolbar.addStretch()
+        layout.addLayout(toolbar)
+
+        # The chart (and QtCharts) is created the first time it is shown
+        self.trend_chart = None
+        self.tabs.addTab(self.chart_tab, "Trend Chart")
+
+    def _ensure_trend_chart(self):
+        if self.trend_chart is None:
+            from src.ui.widgets.trend_chart import TrendChartWidget
+            self.trend_chart = TrendChartWidget(historian=self.historian)
+            self.chart_tab.layout().addWidget(self.trend_chart)
+        return self.trend_chart
+
+    def _on_trend_toggled(self, checked: bool):
+        if checked:
+            self._ensure_trend_chart()
+        self.tabs.setCurrentWidget(self.chart_tab if checked else self.table_tab)
+
+    def _on_plot_selected_clicked(self):
+        """Plot the signals selected in the table."""
+        from PySide6.QtWidgets import QMessageBox
+        rows = {self._proxy_model.mapToSource(idx).row()
+                for idx in self.table_view.selectionModel().selectedRows()}
+        if not rows:
+            QMessageBox.information(self, "Trend Chart", "Select the signals to plot in the table first.")
+            return
+        if len(rows) > self.TREND_CONFIRM_COUNT:
+            reply = QMessageBox.question(
+                self, "Trend Chart",
+                f"Plot {len(rows)} signals? Many curves make the chart slow to draw.",
+                QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+            if reply != QMessageBox.Yes:
+                return
+        device_name = self._get_current_device_name()
+        for row in sorted(rows):
+            signal = self.table_model.get_signal_at_row(row)
+            if signal is not None:
+                self.add_signal_to_trend(device_name, signal)
+
+    def add_signal_to_trend(self, device_name, signal):
+        """Plot `signal` in the trend chart and switch to it."""
+        self._ensure_trend_chart().add_signal(device_name, signal)
+        self.btn_trend.setChecked(True)
 
     def _connect_signals(self):
         """Connect to DeviceManager."""
         self.device_manager.device_added.connect(self._on_device_added)
-        self.device_manager.signal_updated.connect(self._on_signal_update)
+        if hasattr(self.device_manager, 'signal_updates'):
+            self.device_manager.signal_updates.connect(self._on_signal_updates)
+        else:
+            self.device_manager.signal_updated.connect(self._on_signal_update)
 
     def _on_device_added(self, device):
         """When a device is added, we don't necessarily update view until selected."""
@@ -729,8 +791,23 @@ class SignalsViewWidget(QWidget):
         # import logging
         # logger = logging.getLogger("SignalsView")
         # logger.debug(f"Signal Update received: {signal.address} = {signal.value}")
+        start = time.perf_counter()
         self.table_model.update_signal(signal)
-        
+        if self.trend_chart is not None:
+            self.trend_chart.on_signal_updated(device_name, signal)
+        _ui_update_seconds.labels('signals').observe(time.perf_counter() - start)
+        
+    def _on_signal_updates(self, items):
+        """Batched live updates: [(device_name, signal), ...]."""
+        start = time.perf_counter()
+        update = self.table_model.update_signal
+        trend = self.trend_chart
+        for device_name, signal in items:
+            update(signal)
+            if trend is not None:
+                trend.on_signal_updated(device_name, signal)
+        _ui_update_seconds.labels('signals').observe(time.perf_counter() - start)
+
     def _collect_signals(self, node) -> list:
         """Recursively collect all signals from a node tree (supports Node, Signal, or Device)."""
         if node is None:
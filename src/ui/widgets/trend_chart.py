@@ -0,0 +1,260 @@
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QComboBox, QCheckBox, QPushButton, QLabel
+from PySide6.QtCharts import QChart, QChartView, QLineSeries, QDateTimeAxis, QValueAxis
+from PySide6.QtCore import Qt, QTimer, QPointF, QDateTime
+from PySide6.QtGui import QPainter
+from typing import Dict, Optional
+import logging
+import time
+
+import numpy as np
+
+from src.core.historian import signal_key, to_float
+from src.core.trend_buffer import TrendBuffer, MinMaxCache, lttb
+
+logger = logging.getLogger(__name__)
+
+
+class _Trace:
+    """State of one plotted signal."""
+    __slots__ = ("key", "label", "series", "buffer", "cache")
+
+    def __init__(self, key: str, label: str, series: QLineSeries, capacity: int):
+        self.key = key
+        self.label = label
+        self.series = series
+        self.buffer = TrendBuffer(capacity)
+        self.cache = MinMaxCache()
+
+
+class TrendChartWidget(QWidget):
+    """
+    Trend chart for live signals.
+
+    Samples are appended to a per-signal ring buffer; nothing is handed to
+    QtCharts on arrival. A timer redraws at most `fps` times per second
+    (less if drawing is slow), and only when something changed, replacing each series with the
+    visible window decimated to `max_points` points (min/max buckets by
+    default, LTTB on request). Older history is backfilled from the
+    historian when a signal is added or the time span grows.
+    """
+    SPANS = [
+        ("1 min", 60), ("10 min", 600), ("1 h", 3600),
+        ("8 h", 8 * 3600), ("24 h", 24 * 3600),
+    ]
+    METHODS = [("Min/Max", "minmax"), ("LTTB", "lttb")]
+
+    def __init__(self, historian=None, parent=None, max_points: int = 2000,
+                 fps: int = 10, capacity: int = 200_000):
+        super().__init__(parent)
+        self.historian = historian
+        self.max_points = max_points
+        self.capacity = capacity
+        self._traces: Dict[str, _Trace] = {}
+        self._dirty = False
+        self._last_draw = 0.0
+        self._span = self.SPANS[1][1]
+        self._method = "minmax"
+        self._frozen_end: Optional[float] = None  # end of the window while paused
+        self._use_np = hasattr(QLineSeries, 'replaceNp')
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        toolbar = QHBoxLayout()
+        toolbar.addWidget(QLabel("Span:"))
+        self.cmb_span = QComboBox()
+        for label, _ in self.SPANS:
+            self.cmb_span.addItem(label)
+        self.cmb_span.setCurrentIndex(1)
+        self.cmb_span.currentIndexChanged.connect(self._on_span_changed)
+        toolbar.addWidget(self.cmb_span)
+
+        toolbar.addWidget(QLabel("Decimation:"))
+        self.cmb_method = QComboBox()
+        for label, _ in self.METHODS:
+            self.cmb_method.addItem(label)
+        self.cmb_method.currentIndexChanged.connect(self._on_method_changed)
+        toolbar.addWidget(self.cmb_method)
+
+        self.chk_follow = QCheckBox("Follow Live")
+        self.chk_follow.setChecked(True)
+        self.chk_follow.toggled.connect(self._on_follow_toggled)
+        toolbar.addWidget(self.chk_follow)
+
+        self.btn_clear = QPushButton("Clear Trend")
+        self.btn_clear.clicked.connect(self.clear)
+        toolbar.addWidget(self.btn_clear)
+
+        self.lbl_points = QLabel("")
+        toolbar.addStretch()
+        toolbar.addWidget(self.lbl_points)
+        layout.addLayout(toolbar)
+
+        self.chart = QChart()
+        self.chart.setTitle("Live Telemetry")
+        self.axis_x = QDateTimeAxis()
+        self.axis_x.setFormat("HH:mm:ss")
+        self.axis_x.setTitleText("Time")
+        self.axis_y = QValueAxis()
+        self.chart.addAxis(self.axis_x, Qt.AlignBottom)
+        self.chart.addAxis(self.axis_y, Qt.AlignLeft)
+
+        self.chart_view = QChartView(self.chart)
+        self.chart_view.setRenderHint(QPainter.Antialiasing)
+        layout.addWidget(self.chart_view)
+
+        self._redraw_timer = QTimer(self)
+        self._frame_ms = max(1, int(1000 / max(1, fps)))
+        self._redraw_timer.setInterval(self._frame_ms)
+        self._redraw_timer.timeout.connect(self.redraw)
+
+    # ---- Series management ----
+
+    def add_signal(self, device_name: str, signal) -> bool:
+        key = signal_key(device_name, signal)
+        return self.add_series(key, signal.name or signal.address)
+
+    def add_series(self, key: str, label: str) -> bool:
+        if key in self._traces:
+            return False
+        series = QLineSeries()
+        series.setName(label)
+        self.chart.addSeries(series)
+        series.attachAxis(self.axis_x)
+        series.attachAxis(self.axis_y)
+        trace = _Trace(key, label, series, self.capacity)
+        self._traces[key] = trace
+        self._backfill(trace, time.time() - self._span)
+        self._dirty = True
+        return True
+
+    def remove_series(self, key: str):
+        trace = self._traces.pop(key, None)
+        if trace is not None:
+            self.chart.removeSeries(trace.series)
+            self._dirty = True
+
+    def has_series(self, key: str) -> bool:
+        return key in self._traces
+
+    def series_keys(self):
+        return list(self._traces)
+
+    def clear(self):
+        for trace in self._traces.values():
+            self.chart.removeSeries(trace.series)
+        self._traces.clear()
+        self.lbl_points.setText("")
+        self._dirty = True
+
+    def _backfill(self, trace: _Trace, start: float):
+        """Load history older than the buffered samples from the historian."""
+        if self.historian is None:
+            return
+        first = trace.buffer.first_time
+        end = first if first is not None else time.time()
+        if start >= end:
+            return
+        try:
+            result = self.historian.query(trace.key, start, end, max_points=self.capacity // 4)
+        except Exception as e:
+            logger.debug(f"Trend backfill failed for {trace.key}: {e}")
+            return
+        if 'value' in result:
+            t, v = result['t'], result['value']
+        else:
+            # Downsampled: keep both extremes of every bucket
+            t = np.repeat(result['t'], 2)
+            v = np.column_stack((result['min'], result['max'])).ravel()
+        if len(t):
+            trace.buffer.prepend(t, v)
+
+    # ---- Data ----
+
+    def on_signal_updated(self, device_name: str, signal):
+        """Slot for DeviceManager.signal_updated (only plotted signals are kept)."""
+        if not self._traces:
+            return
+        trace = self._traces.get(signal_key(device_name, signal))
+        if trace is None:
+            return
+        value = to_float(signal.value)
+        if value is None or value != value:
+            return
+        if trace.buffer.append(time.time(), value):
+            self._dirty = True
+
+    # ---- Drawing ----
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._dirty = True
+        self._redraw_timer.start()
+
+    def hideEvent(self, event):
+        self._redraw_timer.stop()
+        super().hideEvent(event)
+
+    def _on_span_changed(self, index: int):
+        self._span = self.SPANS[index][1]
+        end = self._window_end()
+        for trace in self._traces.values():
+            self._backfill(trace, end - self._span)
+        self._dirty = True
+
+    def _on_method_changed(self, index: int):
+        self._method = self.METHODS[index][1]
+        self._dirty = True
+
+    def _on_follow_toggled(self, follow: bool):
+        self._frozen_end = None if follow else time.time()
+        self._dirty = True
+
+    def _window_end(self) -> float:
+        return self._frozen_end if self._frozen_end is not None else time.time()
+
+    def redraw(self):
+        """Push the decimated visible window of every series to the chart."""
+        now = time.time()
+        # While following live data the window also slides without updates
+        idle_slide = self._frozen_end is None and self._traces and now - self._last_draw >= 1.0
+        if not self._dirty and not idle_slide:
+            return
+        self._dirty = False
+        self._last_draw = now
+        end = self._window_end()
+        start = end - self._span
+        total = 0
+        y_lo, y_hi = np.inf, -np.inf
+        for trace in self._traces.values():
+            if self._method == "minmax":
+                x, y = trace.cache.get(trace.buffer, start, end, self.max_points // 2)
+            else:
+                # MinMaxLTTB: LTTB over a min/max pre-selection of ~4x the points
+                x, y = lttb(*trace.cache.get(trace.buffer, start, end, 2 * self.max_points), self.max_points)
+            total += len(x)
+            if len(y):
+                y_lo = min(y_lo, float(y.min()))
+                y_hi = max(y_hi, float(y.max()))
+            self._set_points(trace.series, x * 1000.0, y)
+
+        self.axis_x.setRange(_to_qdatetime(start), _to_qdatetime(end))
+        if y_lo <= y_hi:
+            pad = (y_hi - y_lo) * 0.05 or max(1.0, abs(y_hi) * 0.05)
+            self.axis_y.setRange(y_lo - pad, y_hi + pad)
+        if self._traces:
+            self.lbl_points.setText(f"{len(self._traces)} series, {total} points drawn")
+
+        # Never spend more than about half the time redrawing
+        elapsed_ms = (time.time() - now) * 1000.0
+        self._redraw_timer.setInterval(max(self._frame_ms, int(2 * elapsed_ms)))
+
+    def _set_points(self, series: QLineSeries, x: np.ndarray, y: np.ndarray):
+        if self._use_np:
+            series.replaceNp(np.ascontiguousarray(x), np.ascontiguousarray(y))
+        else:
+            series.replace([QPointF(a, b) for a, b in zip(x.tolist(), y.tolist())])
+
+
+def _to_qdatetime(ts: float) -> QDateTime:
+    return QDateTime.fromMSecsSinceEpoch(int(ts * 1000))
@@ -1,13 +1,13 @@
-from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTableWidget, 
-                                QTableWidgetItem, QPushButton, QSpinBox, QLabel,
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTableView,
+                                QAbstractItemView, QPushButton, QSpinBox, QLabel,
                                 QHeaderView, QFileDialog, QMessageBox)
-from PySide6.QtCore import Qt, Signal as QtSignal
-from PySide6.QtGui import QBrush, QColor
+from PySide6.QtCore import Qt, QTimer, Signal as QtSignal
 from src.core.watch_list_manager import WatchListManager, WatchedSignal
-import datetime
-from src.models.device_models import Signal, SignalQuality
+from src.models.device_models import Signal
+from src.ui.models.watch_list_model import (WatchListModel, format_signal_value,
+                                            is_pos_stval, extract_numeric_and_enum)
+import json
 import logging
-import re
 
 logger = logging.getLogger(__name__)
 
@@ -22,9 +22,19 @@ class WatchListWidget(QWidget):
         super().__init__(parent)
         self.watch_manager = watch_list_manager
         self.device_manager = device_manager
+
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.setInterval(0)
+        self._refresh_timer.timeout.connect(self._refresh_table)
+
+        self._stats_timer = QTimer(self)
+        self._stats_timer.setInterval(1000)
+        self._stats_timer.timeout.connect(self._update_poll_status)
         
         self._setup_ui()
         self._connect_signals()
+        self._stats_timer.start()
         
     def _setup_ui(self):
         """Initialize UI components."""
@@ -41,6 +51,10 @@ class WatchListWidget(QWidget):
         self.interval_spinbox.setSingleStep(100)
         self.interval_spinbox.valueChanged.connect(self._on_interval_changed)
         controls_layout.addWidget(self.interval_spinbox)
+
+        # Poll health (outstanding reads / overruns), details per device in the tooltip
+        self.poll_status_label = QLabel("")
+        controls_layout.addWidget(self.poll_status_label)
         
         controls_layout.addStretch()
         
@@ -56,22 +70,20 @@ class WatchListWidget(QWidget):
         
         layout.addLayout(controls_layout)
         
-        # Table
-        self.table = QTableWidget()
-        # Add columns for RTT and Max RTT after Value
-        self.table.setColumnCount(15)
-        self.table.setHorizontalHeaderLabels([
-            "Name", "Address", "Access", "Type",
-            "Modbus Type", "Endianness", "Scale", "Offset",
-            "Value", "RTT (ms)", "Max RTT (ms)", "Quality", "Timestamp", "Last Changed", "Error"
-        ])
+        # Table (model/view: rows are keyed by watch_id, cells formatted lazily)
+        self.model = WatchListModel(parent=self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
         
         header = self.table.horizontalHeader()
         header.setSectionResizeMode(QHeaderView.Interactive)
         header.setStretchLastSection(True)
-        self.table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.table.setSelectionMode(QTableWidget.ExtendedSelection)  # Enable Ctrl/Shift multi-selection
-        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        # Only sample the first rows when sizing columns; large lists stay cheap
+        header.setResizeContentsPrecision(200)
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.ExtendedSelection)  # Enable Ctrl/Shift multi-selection
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
         
         # Context menu for table
         self.table.setContextMenuPolicy(Qt.CustomContextMenu)
@@ -171,7 +183,7 @@ class WatchListWidget(QWidget):
     def _connect_signals(self):
         """Connect watch manager signals."""
         self.watch_manager.signal_updated.connect(self._on_signal_updated)
-        self.watch_manager.watch_list_changed.connect(self._refresh_table)
+        self.watch_manager.watch_list_changed.connect(self._schedule_refresh)
         # Listen for variables (DeviceManager bridges core variable events to Qt signals)
         try:
             if hasattr(self, 'device_manager') and getattr(self.device_manager, 'variable_added', None):
@@ -184,202 +196,45 @@ class WatchListWidget(QWidget):
             # Non-fatal if DeviceManager doesn't expose variable signals
             pass
         
+    def _schedule_refresh(self):
+        """Coalesce bursts of watch list changes (e.g. adding a whole LN) into one rebuild."""
+        if not self._refresh_timer.isActive():
+            self._refresh_timer.start()
+
     def _refresh_table(self):
         """Rebuild the table from watch list."""
-        self.table.setRowCount(0)
-        
-        for watched in self.watch_manager.get_all_watched():
-            self._add_signal_row(watched)
-        
+        self._refresh_timer.stop()
+        self.model.set_watched(self.watch_manager.get_all_watched())
         self.table.resizeColumnsToContents()
 
-    def _ensure_item(self, row: int, col: int) -> QTableWidgetItem:
-        """Ensure a QTableWidgetItem exists at (row, col) and return it."""
-        item = self.table.item(row, col)
-        if item is None:
-            item = QTableWidgetItem()
-            self.table.setItem(row, col, item)
-        return item
-    
-    def _add_signal_row(self, watched: WatchedSignal):
-        """Add a row for a watched signal."""
-        row = self.table.rowCount()
-        self.table.insertRow(row)
-        
-        signal = watched.signal
-        
-        # Column 0: Name
-        self.table.setItem(row, 0, QTableWidgetItem(signal.name))
-        
-        # Column 1: Address
-        self.table.setItem(row, 1, QTableWidgetItem(signal.address))
-        
-        # Column 2: Access
-        access = getattr(signal, 'access', 'RO')
-        self.table.setItem(row, 2, QTableWidgetItem(access))
-        
-        # Column 3: Type
-        if hasattr(signal, 'signal_type') and signal.signal_type:
-            type_str = signal.signal_type.value if hasattr(signal.signal_type, 'value') else str(signal.signal_type)
-        else:
-            type_str = "Unknown"
-        self.table.setItem(row, 3, QTableWidgetItem(type_str))
-        
-        # Column 4: Modbus Type
-        modbus_type = signal.modbus_data_type.value if signal.modbus_data_type else "-"
-        self.table.setItem(row, 4, QTableWidgetItem(modbus_type))
-        
-        # Column 5: Endianness
-        endianness = signal.modbus_endianness.value if signal.modbus_endianness else "-"
-        self.table.setItem(row, 5, QTableWidgetItem(endianness))
-        
-        # Column 6: Scale
-        self.table.setItem(row, 6, QTableWidgetItem(str(signal.modbus_scale)))
-        
-        # Column 7: Offset
-        self.table.setItem(row, 7, QTableWidgetItem(str(signal.modbus_offset)))
-        
-        # Column 8: Value
-        value_str = self._format_value(signal)
-        self.table.setItem(row, 8, QTableWidgetItem(value_str))
-
-        # Column 9: RTT (ms)
-        rtt_value = watched.last_response_ms
-        if rtt_value is None and hasattr(signal, 'last_rtt') and signal.last_rtt > 0:
-            rtt_value = int(round(signal.last_rtt))
-        rtt_display = str(rtt_value) if rtt_value is not None else "--"
-        self.table.setItem(row, 9, QTableWidgetItem(rtt_display))
-
-        # Column 10: Max RTT (ms)
-        max_rtt_display = str(watched.max_response_ms) if watched.max_response_ms is not None else "--"
-        self.table.setItem(row, 10, QTableWidgetItem(max_rtt_display))
-
-        # Column 11: Quality
-        try:
-            qual_text = signal.quality.value if getattr(signal, 'quality', None) is not None else "--"
-        except Exception:
-            qual_text = "--"
-
-        quality_item = QTableWidgetItem(qual_text)
-        # Color code by quality (use QBrush/QColor to avoid conversion surprises)
-        if getattr(signal, 'quality', None) == SignalQuality.GOOD:
-            quality_item.setBackground(QBrush(QColor('darkgreen')))
-        elif getattr(signal, 'quality', None) == SignalQuality.INVALID:
-            quality_item.setBackground(QBrush(QColor('red')))
-        else:
-            quality_item.setBackground(QBrush(QColor('gray')))
-        self.table.setItem(row, 11, quality_item)
-        
-        # Column 12: Timestamp
-        if signal.timestamp:
-            try:
-                ts_str = signal.timestamp.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]
-                if getattr(signal.timestamp, 'tzinfo', None) is not None and signal.timestamp.tzinfo == datetime.timezone.utc:
-                    ts_str += ' UTC'
-            except Exception:
-                ts_str = str(signal.timestamp)
-        else:
-            ts_str = "--"
-        self.table.setItem(row, 12, QTableWidgetItem(ts_str))
-
-        # Column 13: Last Changed
-        if signal.last_changed:
-            try:
-                lc_str = signal.last_changed.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]
-                if getattr(signal.last_changed, 'tzinfo', None) is not None and signal.last_changed.tzinfo == datetime.timezone.utc:
-                    lc_str += ' UTC'
-            except Exception:
-                lc_str = str(signal.last_changed)
-        else:
-            lc_str = "--"
-        self.table.setItem(row, 13, QTableWidgetItem(lc_str))
-
-        # Column 14: Error
-        error_str = signal.error or "-"
-        self.table.setItem(row, 14, QTableWidgetItem(error_str))
-        
-        # Store watch_id in row data (column 0)
-        self.table.item(row, 0).setData(Qt.UserRole, watched.watch_id)
+    def _update_poll_status(self):
+        """Show outstanding reads and overruns from the poll planner."""
+        get_stats = getattr(self.watch_manager, 'get_poll_statistics', None)
+        stats = get_stats() if get_stats else {}
+        if not stats:
+            self.poll_status_label.setText("")
+            self.poll_status_label.setToolTip("")
+            return
+        outstanding = sum(s['outstanding'] for s in stats.values())
+        overruns = sum(s['overruns'] for s in stats.values())
+        self.poll_status_label.setText(f"Pending: {outstanding}  Overruns: {overruns}")
+        lines = []
+        for device_name, s in sorted(stats.items()):
+            latency = f"{s['last_latency_ms']:.0f} ms" if s['last_latency_ms'] is not None else "--"
+            lines.append(f"{device_name}: batch {s['last_batch']}, pending {s['outstanding']}, "
+                         f"skipped {s['skipped']}, overruns {s['overruns']}, timeouts {s['timeouts']}, "
+                         f"latency {latency}")
+        self.poll_status_label.setToolTip("\n".join(lines))
+
+    def _selected_rows(self) -> list:
+        selection = self.table.selectionModel()
+        if selection is None:
+            return []
+        return sorted(set(idx.row() for idx in selection.selectedIndexes()))
     
     def _on_signal_updated(self, watch_id: str, signal: Signal, response_ms: int | None):
         """Update a signal's display when its value changes."""
-        # Find the row
-        for row in range(self.table.rowCount()):
-            item = self.table.item(row, 0)
-            if item and item.data(Qt.UserRole) == watch_id:
-                # Update all columns
-                # Column 0: Name (usually doesn't change)
-                # Column 1: Address (usually doesn't change)
-                # Column 2: Access (usually doesn't change)
-                # Column 3: Type (usually doesn't change)
-                # Column 4: Modbus Type (usually doesn't change)
-                # Column 5: Endianness (usually doesn't change)
-                # Column 6: Scale (usually doesn't change)
-                # Column 7: Offset (usually doesn't change)
-                
-                try:
-                    # Column 8: Value
-                    value_str = self._format_value(signal)
-                    self._ensure_item(row, 8).setText(value_str)
-
-                    # Column 9: RTT (ms)
-                    rtt_value = response_ms
-                    if rtt_value is None:
-                        watched = self.watch_manager.get_watched(watch_id)
-                        if watched and watched.last_response_ms is not None:
-                            rtt_value = watched.last_response_ms
-                        elif hasattr(signal, 'last_rtt') and signal.last_rtt > 0:
-                            rtt_value = int(round(signal.last_rtt))
-                    rtt_text = str(rtt_value) if rtt_value is not None else "--"
-                    self._ensure_item(row, 9).setText(rtt_text)
-
-                    # Column 10: Max RTT (ms)
-                    watched = self.watch_manager.get_watched(watch_id)
-                    max_rtt = watched.max_response_ms if watched else None
-                    max_rtt_text = str(max_rtt) if max_rtt is not None else "--"
-                    self._ensure_item(row, 10).setText(max_rtt_text)
-
-                    # Column 11: Quality
-                    quality_item = self._ensure_item(row, 11)
-                    qual_text = signal.quality.value if getattr(signal, 'quality', None) is not None else "--"
-                    quality_item.setText(qual_text)
-                    if getattr(signal, 'quality', None) == SignalQuality.GOOD:
-                        quality_item.setBackground(QBrush(QColor('darkgreen')))
-                    elif getattr(signal, 'quality', None) == SignalQuality.INVALID:
-                        quality_item.setBackground(QBrush(QColor('red')))
-                    else:
-                        quality_item.setBackground(QBrush(QColor('gray')))
-
-                    # Column 12: Timestamp
-                    if signal.timestamp:
-                        try:
-                            ts_str = signal.timestamp.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]
-                            if getattr(signal.timestamp, 'tzinfo', None) is not None and signal.timestamp.tzinfo == datetime.timezone.utc:
-                                ts_str += ' UTC'
-                        except Exception:
-                            ts_str = str(signal.timestamp)
-                    else:
-                        ts_str = "--"
-                    self._ensure_item(row, 12).setText(ts_str)
-
-                    # Column 13: Last Changed
-                    if signal.last_changed:
-                        try:
-                            lc_str = signal.last_changed.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]
-                            if getattr(signal.last_changed, 'tzinfo', None) is not None and signal.last_changed.tzinfo == datetime.timezone.utc:
-                                lc_str += ' UTC'
-                        except Exception:
-                            lc_str = str(signal.last_changed)
-                    else:
-                        lc_str = "--"
-                    self._ensure_item(row, 13).setText(lc_str)
-
-                    # Column 14: Error
-                    error_str = signal.error or "-"
-                    self._ensure_item(row, 14).setText(error_str)
-                except Exception as e:
-                    logger.exception(f"Error updating watch list row {row} for {watch_id}: {e}")
-                break
+        self.model.update_signal(watch_id, signal, response_ms)
     
     def _on_interval_changed(self, value: int):
         """Handle poll interval change."""
@@ -412,7 +267,7 @@ class WatchListWidget(QWidget):
             return
         
         # Get all selected rows
-        selected_rows = list(set(idx.row() for idx in self.table.selectedIndexes()))
+        selected_rows = self._selected_rows()
         
         if not selected_rows:
             return
@@ -438,14 +293,11 @@ class WatchListWidget(QWidget):
                     menu.addSeparator()
 
             # Get watch_id and signal info
-            watch_id = self.table.item(row, 0).data(Qt.UserRole)
+            entry = self.model.row_at(row)
+            watch_id = entry.ident if entry else None
             
             # Get the watched signal object
-            watched = None
-            for w in self.watch_manager.get_all_watched():
-                if w.watch_id == watch_id:
-                    watched = w
-                    break
+            watched = self.watch_manager.get_watched(watch_id) if watch_id else None
             
             if not watched:
                 return
@@ -544,7 +396,7 @@ class WatchListWidget(QWidget):
     
     def _remove_selected_signals(self):
         """Remove all selected signals or variables from watch list/UI."""
-        selected_rows = list(set(idx.row() for idx in self.table.selectedIndexes()))
+        selected_rows = self._selected_rows()
         
         if not selected_rows:
             return
@@ -552,11 +404,9 @@ class WatchListWidget(QWidget):
         # Collect identifiers from selected rows
         ids = []
         for row in selected_rows:
-            item = self.table.item(row, 0)
-            if item:
-                ident = item.data(Qt.UserRole)
-                if ident:
-                    ids.append(ident)
+            entry = self.model.row_at(row)
+            if entry and entry.ident:
+                ids.append(entry.ident)
         
         # Remove items — support both watched-signals and variables
         for ident in ids:
@@ -582,14 +432,10 @@ class WatchListWidget(QWidget):
     def _create_variable_from_row(self, row: int):
         """Prompt user and create a global variable bound to the selected signal."""
         try:
-            item = self.table.item(row, 0)
-            if not item:
+            if self.model.row_at(row) is None:
                 return
             # Extract address from Address column
-            addr_item = self.table.item(row, 1)
-            if not addr_item:
-                return
-            unique_address = addr_item.text().strip()
+            unique_address = str(self.model.index(row, WatchListModel.COL_ADDRESS).data() or "").strip()
             if not unique_address:
                 return
 
@@ -626,62 +472,23 @@ class WatchListWidget(QWidget):
 
     def _add_variable_row(self, owner, name, unique_address, value=None, ts=None):
         """Add a variable row to the watch table (visual-only)."""
-        row = self.table.rowCount()
-        self.table.insertRow(row)
-        # Column 0: Name
-        it = QTableWidgetItem(name)
-        it.setData(Qt.UserRole, f"var:{owner or ''}:{name}")
-        self.table.setItem(row, 0, it)
-        # Column 1: Address
-        self.table.setItem(row, 1, QTableWidgetItem(unique_address))
-        # Columns 2-7: metadata not applicable
-        for c in range(2, 8):
-            self.table.setItem(row, c, QTableWidgetItem("--"))
-        # Column 8: Value
-        val_text = str(value) if value is not None else "--"
-        self.table.setItem(row, 8, QTableWidgetItem(val_text))
-        # RTT/Max RTT
-        self.table.setItem(row, 9, QTableWidgetItem("--"))
-        self.table.setItem(row, 10, QTableWidgetItem("--"))
-        # Quality
-        qit = QTableWidgetItem("VAR")
-        qit.setBackground(QBrush(QColor('#DDEEFF')))
-        self.table.setItem(row, 11, qit)
-        # Timestamp
-        ts_text = str(ts) if ts else "--"
-        self.table.setItem(row, 12, QTableWidgetItem(ts_text))
-        # Last changed / Error
-        self.table.setItem(row, 13, QTableWidgetItem("--"))
-        self.table.setItem(row, 14, QTableWidgetItem("--"))
+        self.model.add_variable(owner, name, unique_address, value, ts)
 
     def _on_variable_added(self, owner, name, unique_address):
         try:
             # Add a lightweight row for the variable
             self._add_variable_row(owner, name, unique_address)
-            self.table.resizeColumnsToContents()
         except Exception:
             logger.exception('Failed to add variable row')
 
     def _on_variable_removed(self, owner, name):
-        # Find and remove matching variable row
-        ident = f"var:{owner or ''}:{name}"
-        for row in range(self.table.rowCount() - 1, -1, -1):
-            item = self.table.item(row, 0)
-            if item and item.data(Qt.UserRole) == ident:
-                self.table.removeRow(row)
-                break
+        self.model.remove_ident(f"var:{owner or ''}:{name}")
 
     def _on_variable_updated(self, owner, name, value, ts):
-        ident = f"var:{owner or ''}:{name}"
-        for row in range(self.table.rowCount()):
-            item = self.table.item(row, 0)
-            if item and item.data(Qt.UserRole) == ident:
-                try:
-                    self._ensure_item(row, 8).setText(str(value) if value is not None else "--")
-                    self._ensure_item(row, 12).setText(str(ts) if ts else "--")
-                except Exception:
-                    logger.exception('Failed to update variable row')
-                break
+        try:
+            self.model.update_variable(owner, name, value, ts)
+        except Exception:
+            logger.exception('Failed to update variable row')
     
     def _invoke_control_dialog(self, device_name, signal):
         """Open control dialog for a signal."""
@@ -737,67 +544,10 @@ class WatchListWidget(QWidget):
         dlg.exec()
 
     def _format_value(self, signal: Signal) -> str:
-        if signal.value is None:
-            return "--"
-
-        # Try to format as Hex/Decimal/Enum
-        num, enum_label = self._extract_numeric_and_enum(signal)
-        if num is not None:
-            hex_str = f"0x{num:X}"
-            if enum_label:
-                return f"{hex_str} ({num}) {enum_label}"
-            return f"{hex_str} ({num})"
-
-        return str(signal.value)
+        return format_signal_value(signal)
 
     def _is_pos_stval(self, signal: Signal) -> bool:
-        addr = (signal.address or "").lower()
-        name = (signal.name or "").lower()
-        return "pos.stval" in addr or "pos$stval" in addr or ("pos" in addr and name == "stval")
+        return is_pos_stval(signal)
 
     def _extract_numeric_and_enum(self, signal: Signal) -> tuple[int | None, str | None]:
-        num = None
-        enum_label = None
-
-        mapping = getattr(signal, "enum_map", None)
-        if not mapping and self._is_pos_stval(signal):
-            mapping = {0: "intermediate", 1: "open", 2: "closed", 3: "bad"}
-
-        val = signal.value
-        if isinstance(val, bool):
-            num = int(val)
-        elif isinstance(val, int):
-            num = val
-        elif isinstance(val, float) and val.is_integer():
-            num = int(val)
-        elif isinstance(val, str):
-            text = val.strip()
-            try:
-                if text.lower().startswith("0x"):
-                    num = int(text.split()[0], 16)
-                else:
-                    m = re.search(r"\(([-]?\d+)\)", text)
-                    if m:
-                        num = int(m.group(1))
-                    elif re.fullmatch(r"-?\d+", text):
-                        num = int(text)
-            except Exception:
-                num = None
-
-            if num is None:
-                if mapping:
-                    for k, v in mapping.items():
-                        if str(v).lower() == text.lower():
-                            num = int(k)
-                            break
-
-            if num is not None and not enum_label:
-                m = re.match(r"(.+?)\s*\(\s*[-]?\d+\s*\)", text)
-                if m:
-                    enum_label = m.group(1).strip()
-
-        if num is not None and mapping and num in mapping:
-            enum_label = mapping[num]
-
-        return num, enum_label
-
+        return extract_numeric_and_enum(signal)
@@ -0,0 +1,46 @@
+"""
+Lazy import boundaries
+Defer heavy or native-library modules until they are first used
+"""
+import importlib
+import types
+
+
+class LazyModule(types.ModuleType):
+    """
+    Stand-in for a module that is imported on first attribute access.
+
+    After loading, the real module's attributes are copied onto the stand-in,
+    so later lookups cost the same as on the module itself. Attributes set
+    on the stand-in before it loads (e.g. test patches) are kept.
+    """
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__['_lazy_loaded'] = False
+
+    def _lazy_load(self):
+        module = importlib.import_module(self.__name__)
+        for key, value in module.__dict__.items():
+            self.__dict__.setdefault(key, value)
+        self.__dict__['_lazy_loaded'] = True
+        return module
+
+    def __getattr__(self, attr):
+        if self.__dict__['_lazy_loaded']:
+            raise AttributeError(f"module '{self.__name__}' has no attribute '{attr}'")
+        self._lazy_load()
+        try:
+            return self.__dict__[attr]
+        except KeyError:
+            raise AttributeError(f"module '{self.__name__}' has no attribute '{attr}'") from None
+
+    def __dir__(self):
+        if not self.__dict__['_lazy_loaded']:
+            self._lazy_load()
+        return list(self.__dict__)
+
+
+def lazy_import(name: str) -> LazyModule:
+    """Return a module proxy for `name` that imports it on first use."""
+    return LazyModule(name)
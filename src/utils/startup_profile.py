@@ -0,0 +1,113 @@
+"""
+Startup profiling
+Phase timings and per-module import cost of application start-up
+
+Enabled with `python src/main.py --profile-startup`: the application is
+re-launched under `python -X importtime` with the import log captured to a
+file, start-up phases are timed with `mark()`, and once the main window is
+up a report is written to ~/.scada_scout/startup_profile.txt. The last
+report is included in the diagnostics report export.
+"""
+import os
+import re
+import subprocess
+import sys
+import time
+from typing import List, Optional, Tuple
+
+PROFILE_ENV = "SCADASCOUT_PROFILE_STARTUP"
+PROFILE_DIR = os.path.expanduser("~/.scada_scout")
+IMPORT_LOG = os.path.join(PROFILE_DIR, "startup_importtime.log")
+REPORT_PATH = os.path.join(PROFILE_DIR, "startup_profile.txt")
+
+_IMPORT_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+_t0 = time.perf_counter()
+_marks: List[Tuple[str, float]] = []
+
+
+def enabled() -> bool:
+    return os.environ.get(PROFILE_ENV, "") not in ("", "0")
+
+
+def mark(phase: str):
+    """Record the end of a start-up phase (no-op unless profiling)."""
+    if enabled():
+        _marks.append((phase, time.perf_counter()))
+
+
+def phases() -> List[Tuple[str, float]]:
+    """[(phase, duration in seconds)] in the order they were marked."""
+    out = []
+    last = _t0
+    for phase, t in _marks:
+        out.append((phase, t - last))
+        last = t
+    return out
+
+
+def relaunch_with_importtime(argv: List[str], script: str) -> int:
+    """Run `script argv` again under -X importtime with profiling enabled."""
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    env = dict(os.environ, **{PROFILE_ENV: "1"})
+    with open(IMPORT_LOG, "w") as log:
+        return subprocess.call([sys.executable, "-X", "importtime", script] + list(argv),
+                               env=env, stderr=log)
+
+
+def parse_importtime(text: str) -> List[Tuple[str, int, int, int]]:
+    """Parse `-X importtime` output into [(module, self_us, cumulative_us, depth)]."""
+    rows = []
+    for line in text.splitlines():
+        m = _IMPORT_LINE.match(line)
+        if m:
+            depth = (len(m.group(3)) - 1) // 2
+            rows.append((m.group(4), int(m.group(1)), int(m.group(2)), depth))
+    return rows
+
+
+def format_report(import_rows: Optional[List[Tuple[str, int, int, int]]] = None, top: int = 25) -> str:
+    """Text report: phase timings, then the slowest imports."""
+    lines = ["STARTUP PROFILE", "-" * 80]
+    total = 0.0
+    for phase, seconds in phases():
+        total += seconds
+        lines.append(f"{phase:<50} {seconds * 1000:10.1f} ms")
+    if _marks:
+        lines.append(f"{'total (time to first window)':<50} {total * 1000:10.1f} ms")
+    if import_rows:
+        lines.append("")
+        lines.append(f"Imports: {len(import_rows)} modules, "
+                     f"{sum(r[1] for r in import_rows) / 1000:.1f} ms")
+        lines.append("")
+        lines.append(f"Slowest top-level imports (cumulative){'':<13} {'ms':>10}")
+        for name, _, cumulative, _ in sorted((r for r in import_rows if r[3] == 0),
+                                             key=lambda r: r[2], reverse=True)[:top]:
+            lines.append(f"  {name:<60} {cumulative / 1000:10.1f}")
+        lines.append("")
+        lines.append(f"Slowest modules (self){'':<29} {'ms':>10}")
+        for name, self_us, _, _ in sorted(import_rows, key=lambda r: r[1], reverse=True)[:top]:
+            lines.append(f"  {name:<60} {self_us / 1000:10.1f}")
+    return "\n".join(lines) + "\n"
+
+
+def write_report(path: str = REPORT_PATH, import_log: str = IMPORT_LOG) -> str:
+    """Write the report (including the captured import log, if any); returns its text."""
+    rows = None
+    if os.path.exists(import_log):
+        with open(import_log, "r", errors="replace") as f:
+            rows = parse_importtime(f.read())
+    report = format_report(rows)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(report)
+    return report
+
+
+def last_report(path: str = REPORT_PATH) -> Optional[str]:
+    """The most recently written report, if any."""
+    try:
+        with open(path, "r") as f:
+            return f.read()
+    except OSError:
+        return None
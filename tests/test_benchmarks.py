@@ -0,0 +1,40 @@
+import json
+
+import pytest
+
+from benchmarks import harness
+from benchmarks.__main__ import main
+
+
+def test_compare_flags_regressions_by_metric_direction():
+    baseline = {'results': {'modbus.poll': {'read_p50_ms': 1.0, 'poll_signals_per_s': 1000.0, 'signals': 100},
+                            'iec61850.poll': {'skipped': 'no library'}}}
+    current = {'results': {'modbus.poll': {'read_p50_ms': 1.05, 'poll_signals_per_s': 800.0, 'signals': 50},
+                           'iec61850.poll': {'read_p50_ms': 2.0}}}
+    rows = {(r['benchmark'], r['metric']): r for r in harness.compare(baseline, current, threshold=0.10)}
+
+    # Counts are informational and a metric without a baseline is not compared
+    assert set(rows) == {('modbus.poll', 'read_p50_ms'), ('modbus.poll', 'poll_signals_per_s')}
+    assert not rows[('modbus.poll', 'read_p50_ms')]['regression']
+    assert rows[('modbus.poll', 'poll_signals_per_s')]['regression']
+    assert rows[('modbus.poll', 'poll_signals_per_s')]['change'] == pytest.approx(-0.2)
+    assert 'REGRESSION' in harness.format_comparison(list(rows.values()))
+
+
+def test_cli_writes_results_and_compares(tmp_path, capsys):
+    pytest.importorskip("numpy")
+    out = tmp_path / "run.json"
+    assert main(['--quick', '--only', 'gateway', '-o', str(out)]) == 0
+    document = json.loads(out.read_text())
+    assert document['schema'] == harness.SCHEMA_VERSION and document['quick']
+    assert set(document['results']) == {'gateway.batched', 'gateway.immediate'}
+    batched = document['results']['gateway.batched']
+    assert batched['updates_per_s'] > 0 and 0 < batched['written'] <= batched['updates']
+
+    # A baseline ten times faster than anything achievable makes every rate a regression
+    for values in document['results'].values():
+        values['updates_per_s'] *= 10
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps(document))
+    assert main(['--quick', '--only', 'gateway', '--compare', str(baseline)]) == 1
+    assert 'REGRESSION' in capsys.readouterr().out
@@ -0,0 +1,81 @@
+import os
+import struct
+
+import pytest
+
+from src.core.capture_pipeline import CapturePipeline, FrameRing, summarize_frame
+
+
+def _tcp_frame(src_ip=(10, 0, 0, 1), dst_ip=(10, 0, 0, 2), sport=50000, dport=102, payload=b"\x03\x00\x00\x07\x02\xf0\x80"):
+    eth = b"\x00\x11\x22\x33\x44\x55" + b"\x66\x77\x88\x99\xaa\xbb" + b"\x08\x00"
+    tcp = struct.pack("!HHIIBBHHH", sport, dport, 1, 0, 5 << 4, 0x18, 8192, 0, 0)
+    ip = struct.pack("!BBHHHBBH4s4s", 0x45, 0, 20 + len(tcp) + len(payload), 0, 0, 64, 6, 0,
+                     bytes(src_ip), bytes(dst_ip))
+    return eth + ip + tcp + payload
+
+
+def test_ring_invalidates_overwritten_frames():
+    ring = FrameRing(capacity_bytes=1000, max_frames=8)
+    seqs = [ring.append(float(i), bytes([i]) * 300) for i in range(5)]
+    # 3 frames fit; wrapping drops the oldest frames whose bytes get reused
+    assert ring.get(seqs[0]) is None
+    assert ring.get(seqs[4])[1] == bytes([4]) * 300
+    assert ring.get(seqs[3])[1] == bytes([3]) * 300
+    assert len(ring) <= 3
+
+    small = FrameRing(capacity_bytes=10000, max_frames=4)
+    for i in range(10):
+        small.append(float(i), b"x" * 10)
+    assert small.oldest_seq == 6
+    assert small.get(5) is None and small.get(9)[0] == 9.0
+
+
+def test_summary_is_header_only_and_directional():
+    frame = _tcp_frame()
+    text = summarize_frame(frame, local_ips={"10.0.0.1"})
+    assert text.startswith("[TX] TCP 10.0.0.1:50000 → 10.0.0.2:102 len=7")
+    goose = b"\x01\x0c\xcd\x01\x00\x01" + b"\x00\x11\x22\x33\x44\x55" + b"\x88\xb8" + b"\x00" * 20
+    assert summarize_frame(goose).startswith("GOOSE")
+
+
+def test_drain_caps_rows_and_counts_the_rest():
+    pipeline = CapturePipeline(ring_bytes=1 << 20, ring_frames=1024)
+    for i in range(500):
+        pipeline.on_frame(1000.0 + i, _tcp_frame())
+    seqs = pipeline.drain(max_items=100)
+    assert seqs == list(range(400, 500))
+    assert pipeline.frames_dropped_ui == 400
+    assert pipeline.drain() == []
+    assert "Frame #499" in pipeline.dissect(499)
+
+
+def test_pcapng_output_round_trips_and_rotates(tmp_path):
+    scapy_utils = pytest.importorskip("scapy.utils")
+    path = str(tmp_path / "cap.pcapng")
+    pipeline = CapturePipeline()
+    pipeline.set_pcapng_output(path, max_bytes=4096, max_files=3)
+    frames = [_tcp_frame(sport=40000 + i) for i in range(100)]
+    for i, frame in enumerate(frames):
+        pipeline.on_frame(1700000000.0 + i * 0.001, frame)
+    pipeline.close()
+
+    assert os.path.exists(path + ".1")
+    read_back = [bytes(data) for data, _meta in scapy_utils.RawPcapNgReader(path)]
+    assert read_back and read_back == frames[-len(read_back):]
+
+
+def test_bundled_capture_replays_through_pipeline(tmp_path):
+    scapy_utils = pytest.importorskip("scapy.utils")
+    sample = os.path.join(os.path.dirname(__file__), "..", "sbo.pcapng")
+    if not os.path.exists(sample):
+        pytest.skip("sbo.pcapng not present")
+    pipeline = CapturePipeline()
+    out = str(tmp_path / "replay.pcapng")
+    pipeline.set_pcapng_output(out)
+    count = 0
+    for data, meta in scapy_utils.RawPcapNgReader(sample):
+        pipeline.on_frame(None, data)
+        count += 1
+    pipeline.close()
+    assert pipeline.frames_captured == count
+    assert sum(1 for _ in scapy_utils.RawPcapNgReader(out)) == count
@@ -0,0 +1,110 @@
+import math
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.core.change_filter import ChangeFilter
+from src.core.device_manager_core import DeviceManagerCore
+from src.models.device_models import DeviceConfig, DeviceType, Signal, SignalQuality
+
+
+def _sig(value, quality=SignalQuality.GOOD, address="A"):
+    return Signal(name=address, address=address, value=value, quality=quality)
+
+
+def test_deadband_quality_and_integrity_rules(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr('src.core.change_filter.time.monotonic', lambda: now[0])
+    f = ChangeFilter("T", deadband=0.5, deadband_percent=10.0, integrity_period_s=30.0)
+
+    assert f.accept(_sig(10.0))
+    assert not f.accept(_sig(10.0))
+    assert not f.accept(_sig(10.9))       # within 10% of the last reported value
+    assert f.accept(_sig(11.1))           # 1.1 > max(0.5, 1.0)
+    assert not f.accept(_sig(10.2))       # measured against 11.1, not 10.9
+    assert f.accept(_sig(11.1, SignalQuality.INVALID))
+    assert f.accept(_sig(11.1, SignalQuality.GOOD))
+    now[0] += 31
+    assert f.accept(_sig(11.1))           # integrity refresh
+    assert not f.accept(_sig(11.1))
+
+    exact = ChangeFilter("T", integrity_period_s=0)
+    assert exact.accept(_sig(True, address="B")) and not exact.accept(_sig(True, address="B"))
+    assert exact.accept(_sig(False, address="B"))   # bools are compared, not deadbanded
+    assert exact.accept(_sig("Open (1)", address="C")) and exact.accept(_sig("Closed (2)", address="C"))
+    assert exact.accept(_sig(math.nan, address="D")) and not exact.accept(_sig(math.nan, address="D"))
+    assert exact.accept(_sig(1.0, address="D"))
+    now[0] += 10 ** 6
+    assert not exact.accept(_sig(1.0, address="D"))  # no integrity period
+
+    off = DeviceConfig(name="X", ip_address="", port=0, protocol_params={'change_filter': False})
+    assert ChangeFilter.from_config(off) is None
+    monkeypatch.setenv('SCADASCOUT_CHANGE_FILTER', '0')
+    assert ChangeFilter.from_config(DeviceConfig(name="X", ip_address="", port=0)) is None
+
+
+class _Registers:
+    def __init__(self, values):
+        self.values = values
+
+    def read_holding_registers(self, address, count=1, device_id=1):
+        return SimpleNamespace(registers=self.values[address:address + count], isError=lambda: False)
+
+
+def test_steady_state_polling_reaches_no_subscribers(tmp_path):
+    dm = DeviceManagerCore(str(tmp_path / "devices.json"))
+    dm.add_device(DeviceConfig(name="PLC", ip_address="127.0.0.1", port=502, device_type=DeviceType.MODBUS_TCP),
+                  save=False, run_offline_discovery=False)
+    protocol = dm.get_protocol("PLC")
+    registers = _Registers(list(range(100)))
+    protocol.client = registers
+    protocol.connected = True
+
+    updated, unchanged = [], []
+    dm.on('signal_updated', lambda name, sig: updated.append(sig.address))
+    dm.on('signal_unchanged', lambda name, sig: unchanged.append(sig.address))
+    signals = [Signal(name=f"HR{i}", address=f"1:3:{i}", value=None) for i in range(100)]
+
+    for _ in range(20):
+        for signal in signals:
+            dm.read_signal("PLC", signal)
+    assert len(updated) == 100 and len(unchanged) == 1900
+
+    registers.values[7] = 1234
+    for signal in signals:
+        dm.read_signal("PLC", signal)
+    assert updated[100:] == ["1:3:7"] and signals[7].value == 1234
+
+
+def test_unchanged_completions_reach_the_watch_list_in_one_batch(tmp_path):
+    pytest.importorskip("PySide6")
+    from PySide6.QtWidgets import QApplication
+    from src.core.device_manager import DeviceManager
+    from src.core.watch_list_manager import WatchListManager, WatchedSignal
+
+    app = QApplication.instance() or QApplication([])
+    dm = DeviceManager(str(tmp_path / "devices.json"))
+    wlm = WatchListManager(dm)
+    batches = []
+    dm.signals_unchanged.connect(lambda items: batches.append(len(items)))
+    signals = [_sig(1.0, address=f"a{i}") for i in range(50)]
+    for sig in signals:
+        watch_id = f"PLC::{sig.address}"
+        wlm._watched_signals[watch_id] = WatchedSignal("PLC", sig, watch_id, last_request_ts=time.time())
+    wlm._planner.mark_sent("PLC", list(wlm._watched_signals))
+
+    def worker():
+        for _ in range(3):
+            for sig in signals:
+                dm._core.emit('signal_unchanged', 'PLC', sig)
+    t = threading.Thread(target=worker)
+    t.start()
+    t.join()
+    deadline = time.time() + 2
+    while not batches and time.time() < deadline:
+        app.processEvents()
+    assert batches == [50]                      # one queued call, coalesced per signal
+    assert wlm._planner.outstanding_count("PLC") == 0
+    assert all(w.last_response_ms is not None for w in wlm._watched_signals.values())
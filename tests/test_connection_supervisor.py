@@ -0,0 +1,202 @@
+import threading
+import time
+from types import SimpleNamespace
+
+from src.core.connection_supervisor import ConnectionSupervisor
+from src.models.device_models import DeviceConfig, Signal, SignalQuality
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.time() + timeout
+    while not predicate() and time.time() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+class _FlakyLink:
+    """Protocol stand-in: the link drops when told to and refuses reconnects for a while."""
+
+    def __init__(self):
+        self.connected = True
+        self.refuse = 0
+        self.attempts = []
+        self.disconnected = False
+
+    def check_connection(self, keepalive_s):
+        return self.connected
+
+    def reconnect(self):
+        self.attempts.append(time.monotonic())
+        if self.refuse:
+            self.refuse -= 1
+            return False
+        self.connected = True
+        return True
+
+    def disconnect(self):
+        self.disconnected = True
+
+
+def test_supervisor_reconnects_with_backoff_and_reports_status():
+    link = _FlakyLink()
+    statuses = []
+    sup = ConnectionSupervisor("IED1", link, lambda name, up: statuses.append((name, up)),
+                               check_interval_s=0.05, backoff_initial_s=0.02, backoff_max_s=0.08)
+    sup.start()
+    try:
+        link.refuse = 4
+        link.connected = False
+        sup.wake()
+        assert _wait_for(lambda: statuses == [("IED1", False), ("IED1", True)])
+        assert len(link.attempts) == 5 and link.connected
+        gaps = [b - a for a, b in zip(link.attempts, link.attempts[1:])]
+        assert gaps[1] > gaps[0] * 1.2            # backing off...
+        assert max(gaps) < 0.08 * 1.2 + 0.05      # ...up to the cap
+    finally:
+        sup.stop(timeout=2)
+    assert not link.disconnected
+
+    off = DeviceConfig(name="X", ip_address="", port=0, protocol_params={'auto_reconnect': False})
+    assert ConnectionSupervisor.from_config("X", link, off, print) is None
+    assert ConnectionSupervisor.from_config("X", object(), DeviceConfig(name="X", ip_address="", port=0), print) is None
+
+
+def _fake_iec(state):
+    """The slice of iec61850_wrapper the adapter's supervision paths touch."""
+    def read_object(conn, ref, fc):
+        state['reads'].append(ref)
+        return (None, state['read_error'])
+
+    def connect(conn, host, port):
+        state['connects'] += 1
+        return state['connect_error']
+
+    return SimpleNamespace(
+        IED_STATE_CONNECTED=2, IED_ERROR_OK=0, IED_ERROR_NOT_CONNECTED=1,
+        IED_ERROR_CONNECTION_LOST=3, IED_ERROR_TIMEOUT=12,
+        is_library_loaded=lambda: True,
+        IedConnection_getState=lambda conn: state['state'],
+        IedConnection_readObject=read_object,
+        IedConnection_getLogicalDeviceList=lambda conn: (None, state['read_error']),
+        IedConnection_close=lambda conn: None,
+        IedConnection_connect=connect,
+        MmsValue_delete=lambda v: None,
+        LinkedList_destroy=lambda v: None,
+    )
+
+
+def test_adapter_keepalive_detects_silent_loss_and_reconnects_in_place(monkeypatch):
+    from src.protocols.iec61850 import adapter as adapter_mod
+    from src.protocols.iec61850.control_models import ControlObjectRuntime, ControlState
+
+    state = {'state': 2, 'read_error': 0, 'connect_error': 0, 'connects': 0, 'reads': []}
+    monkeypatch.setattr(adapter_mod, 'iec61850', _fake_iec(state))
+    ad = adapter_mod.IEC61850Adapter(DeviceConfig(name="IED1", ip_address="10.0.0.1", port=102))
+    handle = object()
+    ad.connection, ad.connected = handle, True
+    ad._keepalive_ref = ("IED1LD0/LLN0.Mod.stVal", 0)
+    ctx = ControlObjectRuntime(object_reference="IED1LD0/CSWI1.Pos", state=ControlState.SELECTED)
+    ad.controls = {"a": ctx, "b": ctx}
+    lost = threading.Event()
+    ad.set_connection_lost_callback(lost.set)
+
+    ad._last_ok = time.monotonic()
+    assert ad.check_connection(keepalive_s=5) and state['reads'] == []   # recently active: no probe
+    ad._last_ok -= 10
+    assert ad.check_connection(keepalive_s=5) and state['reads'] == ["IED1LD0/LLN0.Mod.stVal"]
+
+    state['read_error'] = 12                                             # peer went silent
+    ad._last_ok -= 10
+    assert not ad.check_connection(keepalive_s=5)
+    assert lost.is_set() and not ad.connected
+
+    sig = ad.read_signal(Signal(name="stVal", address="IED1LD0/LLN0.Mod.stVal"))
+    assert sig.quality == SignalQuality.NOT_CONNECTED
+
+    state['connect_error'] = 20
+    assert not ad.reconnect() and not ad.connected
+    state['connect_error'] = 0
+    assert ad.reconnect() and ad.connected
+    assert ad.connection is handle and state['connects'] == 2           # same handle, no discovery
+    assert ctx.state == ControlState.IDLE
+
+
+class _DeadIed(_FlakyLink):
+    """A supervised adapter whose IED is gone; records overlapping connect/reconnect calls."""
+
+    def __init__(self, name):
+        super().__init__()
+        self.name = name
+        self.refuse = 10 ** 6
+        self.busy = threading.Lock()
+        self.overlaps = 0
+        self.connects = 0
+
+    def reconnect(self):
+        if not self.busy.acquire(blocking=False):
+            self.overlaps += 1
+            return False
+        try:
+            time.sleep(0.05)
+            return super().reconnect()
+        finally:
+            self.busy.release()
+
+    def connect(self):
+        if not self.busy.acquire(blocking=False):
+            self.overlaps += 1
+            return False
+        try:
+            self.connects += 1
+            self.refuse = 0
+            self.connected = True
+            return True
+        finally:
+            self.busy.release()
+
+    def discover(self):
+        from src.models.device_models import Node
+        return Node(name=self.name)
+
+    def set_data_callback(self, cb):
+        pass
+
+    def set_connection_lost_callback(self, cb):
+        pass
+
+
+def test_reconfigure_and_manual_connect_replace_the_supervisor(tmp_path):
+    from src.core.device_manager_core import DeviceManagerCore
+    from src.models.device_models import DeviceType
+
+    dm = DeviceManagerCore(str(tmp_path / "devices.json"))
+    dm.add_device(DeviceConfig(name="IED", ip_address="10.0.0.1", port=102, device_type=DeviceType.IEC61850_IED),
+                  save=False, run_offline_discovery=False)
+
+    # Reconfigured while reconnecting: the discarded adapter is no longer retried
+    old = _DeadIed("IED")
+    dm._protocols["IED"] = old
+    dm._start_supervisor("IED", old)
+    old.connected = False
+    dm._supervisors["IED"].wake()
+    assert _wait_for(lambda: len(old.attempts) >= 2)
+    dm.update_device_config(DeviceConfig(name="IED", ip_address="10.0.0.2", port=102,
+                                         device_type=DeviceType.IEC61850_IED))
+    assert "IED" not in dm._supervisors and "IED" not in dm._protocols
+    time.sleep(0.1)
+    attempts = len(old.attempts)
+    time.sleep(0.3)
+    assert len(old.attempts) == attempts and not dm.get_device("IED").connected
+
+    # Manual connect during backoff: no overlap with reconnect(), and supervision resumes
+    link = _DeadIed("IED")
+    dm._protocols["IED"] = link
+    dm._start_supervisor("IED", link)
+    stale = dm._supervisors["IED"]
+    link.connected = False
+    stale.wake()
+    assert _wait_for(lambda: len(link.attempts) >= 2)
+    dm.connect_device("IED")
+    assert _wait_for(lambda: dm._supervisors.get("IED") not in (None, stale))
+    assert link.connects == 1 and link.overlaps == 0 and dm.get_device("IED").connected
+    dm.disconnect_device("IED")
@@ -0,0 +1,73 @@
+import pytest
+
+pytest.importorskip("PySide6")
+
+from PySide6.QtWidgets import QApplication
+
+from src.ui.models.event_log_model import EventLogModel, EventLogFilterProxy
+
+
+def test_events_are_batched_and_ring_is_bounded():
+    app = QApplication.instance() or QApplication([])
+    model = EventLogModel(max_rows=100)
+
+    inserts = []
+    model.rowsInserted.connect(lambda parent, first, last: inserts.append((first, last)))
+
+    for i in range(250):
+        model.append_event("00:00:00.000", "INFO", "Dev", f"msg {i}")
+    assert model.rowCount() == 0  # nothing inserted until the flush
+
+    model.flush()
+    assert inserts == [(0, 99)]
+    assert model.rowCount() == 100
+    assert model.event_at(0)[3] == "msg 150"
+    assert model.event_at(99)[3] == "msg 249"
+
+    model.append_event("00:00:00.001", "INFO", "Dev", "tail")
+    model.flush()
+    assert model.rowCount() == 100
+    assert model.event_at(99)[3] == "tail"
+
+
+def test_filter_proxy_verbose_and_source():
+    app = QApplication.instance() or QApplication([])
+    model = EventLogModel()
+    proxy = EventLogFilterProxy()
+    proxy.setSourceModel(model)
+
+    model.append_event("t", "TRANSACTION", "IED1", "read")
+    model.append_event("t", "INFO", "IED1", "value changed")
+    model.append_event("t", "ERROR", "IED2", "failed")
+    model.append_event("t", "INFO", "DeviceManager", "loaded")
+    model.flush()
+    assert proxy.rowCount() == 4
+
+    proxy.set_verbose(False)
+    assert proxy.rowCount() == 3
+
+    proxy.set_source_filter("IED1")
+    assert proxy.rowCount() == 1
+
+    proxy.set_source_filter("Application")
+    assert proxy.rowCount() == 1
+
+    proxy.set_verbose(True)
+    proxy.set_source_filter("All Sources")
+    assert proxy.rowCount() == 4
+
+
+def test_message_display_is_compacted_with_full_tooltip():
+    app = QApplication.instance() or QApplication([])
+    from PySide6.QtCore import Qt
+    model = EventLogModel()
+    long_msg = "line1\n   line2 " + "x" * 400
+    model.append_event("t", "INFO", "Dev", long_msg)
+    model.flush()
+
+    idx = model.index(0, EventLogModel.COL_MESSAGE)
+    shown = model.data(idx, Qt.DisplayRole)
+    assert shown.startswith("line1 line2 ")
+    assert shown.endswith("...")
+    assert len(shown) == EventLogModel.MAX_DISPLAY_LEN + 3
+    assert model.data(idx, Qt.ToolTipRole) == long_msg.strip()
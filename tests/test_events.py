@@ -0,0 +1,131 @@
+import threading
+import time
+
+import pytest
+
+from src.core import metrics
+from src.core.events import BatchChannel, EventEmitter
+
+
+def test_emitter_slots_executors_and_listener_errors():
+    em = EventEmitter()
+    slot = em.slot('tick')
+    calls = []
+
+    def first(x):
+        calls.append(('first', x))
+        em.off('tick', first)          # removing itself mid-emit is safe
+        em.on('tick', late)
+
+    def late(x):
+        calls.append(('late', x))
+
+    def broken(x):
+        raise RuntimeError("boom")
+
+    submitted = []
+    em.on('tick', first)
+    em.on('tick', broken)
+    em.on('tick', calls.append, executor=lambda fn, *args: submitted.append((fn, args)))
+    errors = metrics.REGISTRY.counter('scadascout_event_listener_errors_total', '', ('event',)).labels('tick')
+    before = errors.value
+
+    slot.emit(1)
+    assert calls == [('first', 1)]     # `late` was added during the emit: next time
+    assert submitted == [(calls.append, (1,))]
+    assert errors.value == before + 1
+
+    em.emit('tick', 2)
+    assert calls[1:] == [('late', 2)]
+    em.clear()
+    em.emit('tick', 3)
+    assert em.slot('tick') is slot and slot.listeners == ()
+
+
+def test_batch_channel_coalesces_and_wakes_once_per_batch():
+    wakeups, delivered = [], []
+    channel = BatchChannel('test_coalesce', delivered.append, lambda: wakeups.append(1),
+                           key=lambda device, address, value: (device, address))
+
+    def producer(n):
+        for i in range(1000):
+            channel.post('IED', f'a{i % 50}', (n, i))
+
+    threads = [threading.Thread(target=producer, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(wakeups) == 1 and channel.pending() == 50
+    assert channel.drain() == 50
+    batch = delivered[0]
+    assert sorted(item[1] for item in batch) == sorted(f'a{i}' for i in range(50))
+    assert all(item[2][1] >= 950 for item in batch)   # latest value per key
+
+    channel.post('IED', 'a0', 1)
+    assert len(wakeups) == 2
+    channel.close()
+
+    bounded = BatchChannel('test_bounded', delivered.append, lambda: None, max_pending=10)
+    for i in range(25):
+        bounded.post(i)
+    bounded.drain()
+    assert delivered[-1] == [(i,) for i in range(15, 25)]
+    assert metrics.REGISTRY.counter('scadascout_channel_dropped_total', '', ('channel',)) \
+        .labels('test_bounded').value == 15
+    bounded.close()
+
+
+def test_device_manager_delivers_worker_updates_as_one_batch(tmp_path):
+    pytest.importorskip("PySide6")
+    from PySide6.QtWidgets import QApplication
+    from src.core.device_manager import DeviceManager
+    from src.models.device_models import Signal
+
+    app = QApplication.instance() or QApplication([])
+    dm = DeviceManager(str(tmp_path / "devices.json"))
+    batches, singles = [], []
+    dm.signal_updates.connect(lambda items: batches.append(list(items)))
+    dm.signal_updated.connect(lambda name, sig: singles.append(sig.address))
+    signals = [Signal(name=f"s{i}", address=f"a{i}") for i in range(20)]
+
+    def worker():
+        for _ in range(3):
+            for sig in signals:
+                dm._core.emit('signal_updated', 'IED', sig)
+    t = threading.Thread(target=worker)
+    t.start()
+    t.join()
+    assert batches == []               # nothing crossed threads yet
+    deadline = time.time() + 2
+    while not batches and time.time() < deadline:
+        app.processEvents()
+    assert len(batches) == 1 and [s.address for _, s in batches[0]] == [s.address for s in signals]
+    assert singles == [s.address for s in signals]
+
+    # Emitted on the GUI thread itself: delivered synchronously
+    dm._core.emit('signal_updated', 'IED', signals[0])
+    assert len(batches) == 2 and singles[-1] == 'a0'
+
+
+def test_qobject_subclasses_keep_qt_event_handling():
+    pytest.importorskip("PySide6")
+    pytest.importorskip("pymodbus")
+    from types import SimpleNamespace
+    from PySide6.QtCore import QCoreApplication, QEvent, QObject
+    from PySide6.QtWidgets import QApplication
+    from src.core.protocol_gateway import ProtocolGateway
+    from src.protocols.modbus.slave_server import ModbusSlaveServer, ModbusSlaveConfig
+
+    QApplication.instance() or QApplication([])
+    dm = SimpleNamespace(signal_updated=SimpleNamespace(connect=lambda cb: None, disconnect=lambda cb: None))
+    gw = ProtocolGateway(dm, ModbusSlaveServer(ModbusSlaveConfig()))
+    before = len(gw._slots)
+
+    child = QObject(gw)                  # delivers a QChildEvent to the gateway
+    QCoreApplication.sendEvent(gw, QEvent(QEvent.Type.User))
+    child.deleteLater()
+    QCoreApplication.processEvents()
+
+    assert len(gw._slots) == before
+    assert 'QChildEvent' not in metrics.REGISTRY.render_text()
@@ -0,0 +1,147 @@
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+import zipfile
+
+from src.core.device_manager_core import DeviceManagerCore
+from src.core.headless import HeadlessService, LocalApiServer
+from src.models.device_models import DeviceConfig, DeviceType, Node, Signal
+
+
+class _FakeProtocol:
+    def __init__(self):
+        self.writes = []
+
+    def read_signal(self, signal):
+        signal.value = (signal.value or 0) + 1
+        return signal
+
+    def write_signals(self, writes):
+        self.writes.extend((s.address, v) for s, v in writes)
+        return [True] * len(writes)
+
+
+def _dm(tmp_path):
+    dm = DeviceManagerCore(str(tmp_path / "devices.json"))
+    dm.add_device(DeviceConfig(name="PLC", ip_address="127.0.0.1", port=0, device_type=DeviceType.UNKNOWN),
+                  save=False, run_offline_discovery=False)
+    root = Node(name="PLC", signals=[Signal(name=f"r{i}", address=f"1:3:{i}", value=i) for i in range(3)])
+    dm._devices["PLC"].root_node = root
+    dm._assign_unique_addresses("PLC", root)
+    dm._protocols["PLC"] = _FakeProtocol()
+    return dm
+
+
+def _call(api, path, body=None, token=None, headers=None):
+    req = urllib.request.Request(f"http://127.0.0.1:{api.port}{path}",
+                                 data=None if body is None else json.dumps(body).encode(),
+                                 headers=headers or ({} if body is None else {'Content-Type': 'application/json'}))
+    if token:
+        req.add_header('Authorization', f"Bearer {token}")
+    with urllib.request.urlopen(req, timeout=5) as resp:
+        return json.loads(resp.read())
+
+
+def test_local_api_values_writes_and_stream(tmp_path):
+    dm = _dm(tmp_path)
+    api = LocalApiServer(dm, port=0, token="s3cret")
+    api.start()
+    try:
+        try:
+            _call(api, "/api/devices")
+            assert False, "request without token was accepted"
+        except urllib.error.HTTPError as e:
+            assert e.code == 401
+
+        assert _call(api, "/api/devices", token="s3cret")[0]['name'] == "PLC"
+        assert _call(api, "/api/values?tag=PLC::1:3:1&tag=PLC::1:3:2", token="s3cret") == \
+            {"PLC::1:3:1": 1, "PLC::1:3:2": 2}
+        assert _call(api, "/api/read", {"tags": ["PLC::1:3:0"], "timeout": 2.0}, token="s3cret") == {"PLC::1:3:0": 1}
+        assert _call(api, "/api/write", {"values": {"PLC::1:3:2": 7}}, token="s3cret") == {"PLC::1:3:2": True}
+        assert dm._protocols["PLC"].writes == [("1:3:2", 7)]
+
+        # Stream only tag 1; updates of other tags are filtered out
+        stream = urllib.request.urlopen(
+            f"http://127.0.0.1:{api.port}/api/stream?tag=PLC::1:3:1&token=s3cret", timeout=5)
+        assert stream.readline() == b": connected\n"
+        stream.readline()
+        sigs = dm._devices["PLC"].root_node.signals
+        for sig in (sigs[0], sigs[1]):
+            dm._on_signal_update("PLC", sig)
+        event = json.loads(stream.readline()[len(b"data: "):])
+        assert event['tag'] == "PLC::1:3:1" and event['value'] == 1
+        stream.close()
+        assert _call(api, "/api/stats", token="s3cret")['api']['requests'] >= 6
+    finally:
+        api.stop()
+
+
+def _status(api, path, body=None, headers=None):
+    try:
+        _call(api, path, body, headers=headers)
+    except urllib.error.HTTPError as e:
+        return e.code
+    return 200
+
+
+def test_local_api_refuses_browser_cross_origin_requests(tmp_path):
+    dm = _dm(tmp_path)
+    api = LocalApiServer(dm, port=0)
+    api.start()
+    try:
+        write = {"values": {"PLC::1:3:2": 7}}
+        # Simple CORS request from a web page: text/plain body, foreign Origin
+        assert _status(api, "/api/write", write, {'Content-Type': 'text/plain',
+                                                  'Origin': 'http://evil.example'}) == 403
+        assert _status(api, "/api/write", write, {'Content-Type': 'text/plain'}) == 415
+        # DNS rebinding: same-origin for the browser, but the Host is not loopback
+        assert _status(api, "/api/values?tag=PLC::1:3:1", None,
+                       {'Host': f'evil.example:{api.port}', 'Origin': f'http://evil.example:{api.port}'}) == 403
+        assert dm._protocols["PLC"].writes == []
+
+        assert _status(api, "/api/write", write, {'Content-Type': 'application/json; charset=utf-8',
+                                                  'Origin': f'http://127.0.0.1:{api.port}'}) == 200
+        assert dm._protocols["PLC"].writes == [("1:3:2", 7)]
+    finally:
+        api.stop()
+
+
+def test_headless_service_runs_a_bundle_and_polls_its_watch_list(tmp_path, monkeypatch):
+    monkeypatch.setenv('SCADASCOUT_HISTORIAN', '0')
+    monkeypatch.setenv('HOME', str(tmp_path))
+    bundle = tmp_path / "plant.mss"
+    devices = {'devices': [DeviceConfig(name="PLC", ip_address="127.0.0.1", port=0,
+                                        device_type=DeviceType.UNKNOWN).to_dict()], 'folders': {}}
+    watch = {'poll_interval_ms': 100, 'signals': [
+        {'device_name': 'PLC', 'signal_address': '1:3:0'}, {'device_name': 'PLC', 'signal_address': 'missing'}]}
+    with zipfile.ZipFile(bundle, 'w') as z:
+        z.writestr("devices.json", json.dumps(devices))
+        z.writestr("watchlist.json", json.dumps(watch))
+        z.writestr("project.json", json.dumps({'name': 'plant'}))
+
+    service = HeadlessService(str(bundle), state_dir=str(tmp_path / "state"), api_port=0, connect=False)
+    (tmp_path / "state").mkdir()
+    service.start()
+    try:
+        assert service.api_token and service.api.authorized({}, {}) is False
+        dm = service.device_manager
+        assert [d.config.name for d in dm.get_all_devices()] == ["PLC"]
+        # Model arrives after start-up (as with background SCD discovery)
+        root = Node(name="PLC", signals=[Signal(name="r0", address="1:3:0", value=0)])
+        dm._devices["PLC"].root_node = root
+        dm._assign_unique_addresses("PLC", root)
+        dm._protocols["PLC"] = _FakeProtocol()
+
+        deadline = time.time() + 3.0
+        while time.time() < deadline and (root.signals[0].value or 0) < 3:
+            time.sleep(0.02)
+        assert root.signals[0].value >= 3
+
+        stats = _call(service.api, "/api/stats", token=service.api_token)
+        assert stats['polling']['PLC']['completed'] >= 3
+        assert 'headless/watch_poll' in stats['scheduler']
+    finally:
+        service.stop()
+    assert not any(t.name == "LocalApiServer" for t in threading.enumerate())
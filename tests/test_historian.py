@@ -0,0 +1,70 @@
+import time
+
+import numpy as np
+
+from src.core.historian import Historian, QUALITY_CODES, downsample
+
+
+def test_deadband_and_heartbeat(tmp_path):
+    h = Historian(str(tmp_path), deadband=0.5, heartbeat=10.0)
+    t0 = time.time()
+    assert h.record("IED::T", t0, 20.0)
+    assert not h.record("IED::T", t0 + 1, 20.3)          # inside deadband
+    assert h.record("IED::T", t0 + 2, 21.0)
+    assert not h.record("IED::T", t0 + 1.5, 30.0)        # out of order
+    assert h.record("IED::T", t0 + 13, 21.0)             # heartbeat
+    assert h.record("IED::T", t0 + 14, 21.0, QUALITY_CODES["Invalid"])  # quality change
+    assert not h.record("IED::T", t0 + 15, "on")         # non numeric
+    assert list(h.query("IED::T")['value']) == [20.0, 21.0, 21.0, 21.0]
+    assert h.stats['suppressed'] == 1 and h.stats['out_of_order'] == 1
+
+
+def test_flush_reopen_and_range_query(tmp_path):
+    h = Historian(str(tmp_path))
+    base = time.time() - 3600
+    for i in range(1000):
+        for s in range(20):
+            h.record(f"IED{s}::MMXU1.TotW", base + i, float((i * (s + 1)) % 97))
+        if i == 499:
+            h.flush()
+    h.close()
+
+    h2 = Historian(str(tmp_path))
+    assert len(h2.keys()) == 20
+    full = h2.query("IED7::MMXU1.TotW")
+    assert len(full['t']) == 1000
+    assert np.allclose(full['t'], base + np.arange(1000))
+    assert np.array_equal(full['value'], (np.arange(1000) * 8 % 97).astype(float))
+
+    part = h2.query("IED7::MMXU1.TotW", base + 450, base + 549.5)
+    assert len(part['t']) == 100 and abs(part['t'][0] - (base + 450)) < 1e-5  # stored with us resolution
+
+    h2.record("IED7::MMXU1.TotW", base + 2000, 1.0)
+    assert len(h2.query("IED7::MMXU1.TotW", base + 990)['t']) == 11
+
+
+def test_downsample_min_max_avg():
+    t = np.arange(100, dtype=float)
+    v = np.arange(100, dtype=float)
+    q = np.zeros(100, dtype=np.uint8)
+    q[55] = 2
+    d = downsample(t, v, q, 10, 0.0, 100.0)
+    assert list(d['count']) == [10] * 10
+    assert d['min'][5] == 50 and d['max'][5] == 59 and d['avg'][5] == 54.5
+    assert d['quality'][5] == 2 and d['quality'][4] == 0
+
+
+def test_retention_by_age_and_size(tmp_path):
+    h = Historian(str(tmp_path), retention_seconds=3600)
+    now = time.time()
+    h.record("a", now - 7200, 1.0)
+    h.flush()
+    h.record("a", now - 10, 2.0)
+    h.flush()
+    assert list(h.query("a")['value']) == [2.0]
+    assert h.stats['blocks_deleted'] == 1
+
+    h.max_bytes = 1
+    h.record("a", now - 5, 3.0)
+    h.flush()
+    assert list(h.query("a")['value']) == [3.0]
@@ -0,0 +1,97 @@
+import random
+import threading
+import time
+import urllib.request
+
+from src.core import metrics
+from src.core.device_manager_core import DeviceManagerCore
+from src.core.workers import ModbusWorker
+from src.models.device_models import DeviceConfig, DeviceType, Signal
+
+
+def test_histogram_percentiles_and_text_format():
+    registry = metrics.MetricsRegistry()
+    latency = registry.histogram('t_read_seconds', 'Read latency', ('device',))
+    errors = registry.counter('t_errors_total', 'Errors', ('device',))
+    depth = registry.gauge('t_depth', 'Depth')
+    assert registry.histogram('t_read_seconds', 'Read latency', ('device',)) is latency
+
+    rng = random.Random(1)
+    samples = sorted(rng.uniform(0.0001, 2.0) for _ in range(20000))
+    child = latency.labels('IED 1')
+    for s in samples:
+        child.observe(s)
+    for q in (0.5, 0.9, 0.99):
+        exact = samples[int(q * len(samples)) - 1]
+        assert abs(child.percentile(q) - exact) / exact < 0.07
+    assert child.max == samples[-1] and child.count == len(samples)
+
+    errors.labels('IED "1"').inc(2)
+    pending = [1, 2, 3]
+    depth.set_function(lambda: len(pending))
+
+    text = registry.render_text()
+    assert '# TYPE t_read_seconds histogram' in text
+    assert 't_read_seconds_bucket{device="IED 1",le="+Inf"} 20000' in text
+    assert 't_read_seconds_count{device="IED 1"} 20000' in text
+    assert 't_errors_total{device="IED \\"1\\""} 2' in text
+    assert 't_depth 3' in text
+    buckets = [int(line.rsplit(' ', 1)[1]) for line in text.splitlines() if line.startswith('t_read_seconds_bucket')]
+    assert buckets == sorted(buckets)
+
+    rows = {r['name']: r for r in registry.snapshot()}
+    assert rows['t_depth']['value'] == 3
+    assert rows['t_read_seconds']['p99'] > rows['t_read_seconds']['p50']
+
+
+class _SlowClient:
+    def read_signal(self, signal):
+        time.sleep(0.002)
+        if signal.address == "bad":
+            raise IOError("timeout")
+        signal.value = 1
+        return signal
+
+
+def test_modbus_worker_records_queue_and_read_latency():
+    worker = ModbusWorker(_SlowClient(), "M1")
+    thread = threading.Thread(target=worker.run, daemon=True)
+    thread.start()
+    try:
+        reads = metrics.histogram('scadascout_read_seconds', '', ('device',)).labels('M1')
+        errors = metrics.counter('scadascout_read_errors_total', '', ('device',)).labels('M1')
+        before, errors_before = reads.count, errors.value
+        worker.enqueue({'action': 'read_batch', 'signals': [Signal(name="a", address="1"), Signal(name="b", address="bad")]})
+        worker.enqueue({'action': 'read', 'signal': Signal(name="c", address="2")})
+        deadline = time.time() + 5
+        while reads.count < before + 3 and time.time() < deadline:
+            time.sleep(0.01)
+        assert reads.count == before + 3
+        assert errors.value == errors_before + 1
+        assert reads.max >= 0.002
+        assert 'scadascout_worker_queue_depth{device="M1"} 0' in metrics.render_text()
+        assert 'scadascout_worker_task_seconds_count{device="M1",action="read_batch"}' in metrics.render_text()
+    finally:
+        worker.stop()
+        thread.join(timeout=2)
+    assert 'scadascout_worker_queue_depth{device="M1"}' not in metrics.render_text()
+
+
+def test_read_routes_and_headless_metrics_endpoint(tmp_path):
+    from src.core.headless import LocalApiServer
+
+    dm = DeviceManagerCore(str(tmp_path / "devices.json"))
+    dm.add_device(DeviceConfig(name="Off", ip_address="127.0.0.1", port=0, device_type=DeviceType.UNKNOWN),
+                  save=False, run_offline_discovery=False)
+    dm.read_signal("Off", Signal(name="x", address="1"))
+
+    api = LocalApiServer(dm, port=0)
+    api.start()
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{api.port}/metrics", timeout=5) as resp:
+            assert resp.headers['Content-Type'].startswith('text/plain')
+            text = resp.read().decode()
+    finally:
+        api.stop()
+    assert 'scadascout_read_requests_total{device="Off",route="disconnected"} 1' in text
+    assert '# TYPE scadascout_event_dispatch_seconds histogram' in text
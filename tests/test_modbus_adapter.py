@@ -25,3 +25,94 @@ def test_modbus_adapter_connect_disconnect():
     # If connected was True, ensure server is not running after disconnect
     if connected:
         assert not getattr(adapter.server, 'running', False)
+
+
+class _FakeClient:
+    """Register/coil tables behind the pymodbus call signatures; records each request."""
+
+    def __init__(self, bad_address=None):
+        self.registers = list(range(5000))
+        self.coils = [False] * 5000
+        self.requests = []
+        self.bad_address = bad_address
+
+    def _result(self, start, count, **values):
+        from types import SimpleNamespace
+        error = self.bad_address is not None and start <= self.bad_address < start + count
+        return SimpleNamespace(isError=lambda: error, exception_code=2 if error else None, **values)
+
+    def read_holding_registers(self, address, count=1, device_id=1):
+        self.requests.append(('read', address, count))
+        return self._result(address, count, registers=self.registers[address:address + count])
+
+    def read_coils(self, address, count=1, device_id=1):
+        self.requests.append(('read_coils', address, count))
+        return self._result(address, count, bits=self.coils[address:address + count])
+
+    def write_registers(self, address, values, device_id=1):
+        self.requests.append(('write', address, len(values)))
+        self.registers[address:address + len(values)] = values
+        return self._result(address, len(values))
+
+    def write_register(self, address, value, device_id=1):
+        self.requests.append(('write', address, 1))
+        self.registers[address] = value
+        return self._result(address, 1)
+
+    def write_coils(self, address, values, device_id=1):
+        self.requests.append(('write_coils', address, len(values)))
+        self.coils[address:address + len(values)] = values
+        return self._result(address, len(values))
+
+
+def _tcp_adapter(client):
+    from src.protocols.modbus.adapter import ModbusTCPAdapter
+    adapter = ModbusTCPAdapter(DeviceConfig(name="PLC", ip_address="127.0.0.1", port=502,
+                                            device_type=DeviceType.MODBUS_TCP,
+                                            protocol_params={'change_filter': False}))
+    adapter.client, adapter.connected = client, True
+    return adapter
+
+
+def test_tcp_adapter_reads_contiguous_signals_in_spans():
+    from src.models.device_models import ModbusDataType, Signal, SignalQuality
+
+    client = _FakeClient()
+    adapter = _tcp_adapter(client)
+    reported = []
+    adapter.set_data_callback(reported.append)
+    signals = [Signal(name=f"HR{i}", address=f"1:3:{i}") for i in range(3000)]
+    signals.append(Signal(name="F", address="1:3:4000", modbus_data_type=ModbusDataType.UINT32))
+    signals.append(Signal(name="C", address="1:1:7"))
+    client.coils[7] = True
+
+    adapter.read_signals(signals)
+    assert len(client.requests) == 24 + 2          # ceil(3000 / 125) spans + two lone signals
+    assert max(count for _, _, count in client.requests) == 125
+    assert [s.value for s in signals[:3000]] == list(range(3000)) and signals[-1].value is True
+    assert len(reported) == len(signals) and all(s.quality == SignalQuality.GOOD for s in signals)
+
+    # A rejected span is retried per signal; only the bad address fails
+    client = _FakeClient(bad_address=12)
+    adapter = _tcp_adapter(client)
+    signals = [Signal(name=f"HR{i}", address=f"1:3:{i}") for i in range(10, 15)]
+    adapter.read_signals(signals)
+    assert [s.quality for s in signals].count(SignalQuality.INVALID) == 1 and signals[2].error
+
+
+def test_tcp_adapter_writes_contiguous_pairs_in_one_request():
+    from src.models.device_models import ModbusDataType, Signal
+
+    client = _FakeClient()
+    adapter = _tcp_adapter(client)
+    writes = [(Signal(name=f"HR{i}", address=f"1:3:{100 + i}"), 7 * i) for i in range(200)]
+    writes.append((Signal(name="U32", address="1:3:300", modbus_data_type=ModbusDataType.UINT32), 70000))
+    writes.append((Signal(name="U16", address="1:3:302"), 9))
+    writes += [(Signal(name=f"C{i}", address=f"1:1:{i}"), i % 2) for i in range(10)]
+    writes.append((Signal(name="IR", address="1:4:0"), 1))   # input registers are read-only
+
+    oks = adapter.write_signals(writes)
+    assert oks == [True] * 212 + [False]
+    assert sorted(client.requests) == [('write', 100, 123), ('write', 223, 80), ('write_coils', 0, 10)]
+    assert client.registers[100:300] == [7 * i for i in range(200)]
+    assert client.registers[300:303] == [1, 4464, 9] and client.coils[:4] == [False, True, False, True]
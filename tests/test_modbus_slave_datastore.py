@@ -0,0 +1,117 @@
+import os
+import subprocess
+import sys
+import textwrap
+
+from src.models.device_models import SlaveRegisterBlock
+from src.protocols.modbus.slave_server import ModbusSlaveServer, ModbusSlaveConfig, CallbackDataBlock, merge_ranges
+
+
+def test_ranges_merge_and_validate_by_segment():
+    assert merge_ranges([(100, 10), (0, 50), (50, 25), (105, 20)]) == [(0, 75), (100, 25)]
+
+    block = CallbackDataBlock([(0, 50), (50, 25), (100, 10)])
+    assert [(seg.start, seg.count) for seg in block.segments] == [(0, 75), (100, 10)]
+    assert block.size == 85
+    assert block.validate(40, 35)            # spans the merged blocks
+    assert not block.validate(70, 10)        # runs into the gap
+    assert not block.validate(110, 1)
+    assert not block.validate(0, 0)
+
+
+def test_slice_reads_writes_and_import():
+    config = ModbusSlaveConfig(register_blocks=[
+        SlaveRegisterBlock("HR", "holding", 1000, 200),
+        SlaveRegisterBlock("IR", "input", 0, 10),
+    ])
+    server = ModbusSlaveServer(config)
+    hr = server.holding_registers_block
+
+    hr.setValues(1100, [1, -1, 70000, True])
+    assert hr.getValues(1099, 6) == [0, 1, 65535, 4464, 1, 0]
+    hr.setValues(1199, [5, 6])               # would overrun the block: ignored
+    assert hr.getValues(1199, 1) == [0]
+    assert hr.getValues(5, 2) == [0, 0]      # unknown addresses read as default
+
+    calls = []
+    server.set_callbacks(on_read=lambda a, c: calls.append((a, c)))
+    hr.getValues(1000, 125)
+    server.set_callbacks(on_read=None)
+    hr.getValues(1000, 125)
+    assert calls == [(1000, 125)]
+
+    assert server.import_register_data({3: 7, 9: 8, 50: 9}, "input") == 1    # 50 is not configured
+    data = server.get_all_registers("input")
+    assert len(data) == 10 and data[3] == 7 and data[9] == 8 and 50 not in data
+    assert server.get_all_registers("holding")[1101] == 65535
+
+
+def test_shared_register_image_driven_by_another_process():
+    config = ModbusSlaveConfig(register_blocks=[
+        SlaveRegisterBlock("HR", "holding", 0, 5000),
+        SlaveRegisterBlock("CO", "coils", 0, 16),
+    ])
+    server = ModbusSlaveServer(config)
+    server.holding_registers_block.setValues(10, [42])
+    image = server.share_registers()
+    try:
+        assert server.holding_registers_block.getValues(10, 1) == [42]
+        seq = server.holding_registers_block.change_seq
+
+        driver = textwrap.dedent(f"""
+            import numpy as np
+            from src.protocols.modbus.register_image import RegisterImage
+            image = RegisterImage.attach({image.name!r})
+            regs = image.view("holding", 0, 5000)
+            regs[:] = np.arange(5000) * 3
+            image.bump("holding")
+            image.write("coils", 3, [1])
+            image.close()
+        """)
+        subprocess.run([sys.executable, "-c", driver], check=True, timeout=60,
+                       cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+        assert server.holding_registers_block.getValues(4990, 5) == [(4990 + i) * 3 & 0xFFFF for i in range(5)]
+        assert server.holding_registers_block.change_seq == seq + 1
+        assert server.read_coil(3) is True
+
+        server.write_register(7, 9)
+        assert image.view("holding", 7)[0] == 9
+    finally:
+        server.release_shared_registers()
+    assert server.register_image is None
+    assert server.read_register(7) == 9
+
+
+def test_shared_register_image_is_only_replaced_when_its_owner_is_gone():
+    import struct
+    import uuid
+
+    import pytest
+
+    from src.protocols.modbus.register_image import RegisterImage
+
+    name = f"ss-test-{uuid.uuid4().hex[:12]}"
+    config = ModbusSlaveConfig(register_blocks=[SlaveRegisterBlock("HR", "holding", 0, 10)])
+    first, second = ModbusSlaveServer(config), ModbusSlaveServer(config)
+    image = first.share_registers(name)
+    try:
+        with pytest.raises(FileExistsError):
+            second.share_registers(name)
+        assert second.register_image is None
+        first.write_register(1, 77)
+        assert int(image.view("holding", 1)[0]) == 77
+
+        # Owner crashed: the header names a process that no longer exists
+        dead = subprocess.run([sys.executable, "-c", "import os; print(os.getpid())"],
+                              check=True, capture_output=True, text=True).stdout.strip()
+        struct.pack_into("<I", image._shm.buf, 44, int(dead))
+        image.owner = False           # as if its process had died without cleaning up
+        second.share_registers(name)
+        assert second.register_image.owner_pid == os.getpid()
+        second.write_register(1, 5)
+        assert int(second.register_image.view("holding", 1)[0]) == 5
+        assert first.read_register(1) == 77
+    finally:
+        second.release_shared_registers()
+        first.release_shared_registers()
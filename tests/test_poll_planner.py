@@ -0,0 +1,102 @@
+from types import SimpleNamespace
+
+from src.core.poll_planner import PollPlanner
+
+
+def _item(device, i):
+    return SimpleNamespace(device_name=device, watch_id=f"{device}::sig{i}")
+
+
+def test_plan_groups_by_device_and_skips_outstanding():
+    planner = PollPlanner(timeout_s=10.0)
+    items = [_item("A", i) for i in range(3)] + [_item("B", i) for i in range(2)]
+
+    batches = planner.plan(items, now=100.0)
+    assert {d: len(b) for d, b in batches.items()} == {"A": 3, "B": 2}
+    for device, batch in batches.items():
+        planner.mark_sent(device, [w.watch_id for w in batch], now=100.0)
+
+    # Only one of A's reads came back before the next cycle
+    assert planner.complete("A::sig0", now=100.25) == 250.0
+    batches = planner.plan(items, now=101.0)
+    assert [w.watch_id for w in batches["A"]] == ["A::sig0"]
+    assert "B" not in batches
+
+    stats = planner.stats()
+    assert stats["A"]["skipped"] == 2 and stats["A"]["overruns"] == 1
+    assert stats["B"]["skipped"] == 2 and stats["B"]["outstanding"] == 2
+    assert stats["A"]["last_latency_ms"] == 250.0
+
+
+def test_outstanding_reads_expire():
+    planner = PollPlanner(timeout_s=5.0)
+    items = [_item("A", 0)]
+    planner.mark_sent("A", ["A::sig0"], now=0.0)
+    assert planner.plan(items, now=1.0) == {}
+    batches = planner.plan(items, now=6.0)
+    assert len(batches["A"]) == 1
+    assert planner.stats()["A"]["timeouts"] == 1
+
+
+def test_iec_worker_batch_reports_failed_reads():
+    from src.core.workers import IEC61850Worker
+    from src.models.device_models import Signal, SignalQuality
+
+    emitted = []
+
+    class _Client:
+        def read_signal(self, signal):
+            if signal.address == "bad":
+                raise RuntimeError("decode failed")
+            emitted.append(signal.address)
+            return signal
+
+        def _emit_update(self, signal):
+            emitted.append(signal.address)
+
+    worker = IEC61850Worker(_Client(), "IED", subscription_manager=None)
+    signals = [Signal(name=a, address=a) for a in ("a", "bad", "c")]
+    worker._handle_task({'action': 'read_batch', 'signals': signals})
+    worker.stop()
+    assert emitted == ["a", "bad", "c"]   # every outstanding read gets an answer
+    assert signals[1].quality == SignalQuality.INVALID and signals[1].error == "decode failed"
+
+
+def test_batch_reads_without_a_worker_are_bounded_and_coalesced(tmp_path):
+    import threading
+    import time
+
+    from src.core.device_manager_core import DeviceManagerCore
+    from src.models.device_models import DeviceConfig, DeviceType, Signal
+
+    class _SlowProtocol:
+        def __init__(self):
+            self.active = 0
+            self.max_active = 0
+            self.reads = []
+            self.release = threading.Event()
+
+        def read_signal(self, signal):
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            self.release.wait(2.0)
+            self.reads.append(signal.address)
+            self.active -= 1
+            return signal
+
+    dm = DeviceManagerCore(str(tmp_path / "devices.json"))
+    dm.add_device(DeviceConfig(name="PLC", ip_address="127.0.0.1", port=0, device_type=DeviceType.UNKNOWN),
+                  save=False, run_offline_discovery=False)
+    proto = dm._protocols["PLC"] = _SlowProtocol()
+    signals = [Signal(name=a, address=a) for a in ("a", "b")]
+    threads_before = threading.active_count()
+
+    for _ in range(50):                       # poll cycles while the device is stuck
+        assert dm.read_signals("PLC", signals) is None
+    assert threading.active_count() <= threads_before + 1
+    proto.release.set()
+    deadline = time.time() + 3.0
+    while time.time() < deadline and "PLC" in dm._batch_reads:
+        time.sleep(0.01)
+    # The first batch, then one follow-up for everything requested meanwhile
+    assert proto.reads == ["a", "b", "a", "b"] and proto.max_active == 1
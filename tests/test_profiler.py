@@ -0,0 +1,75 @@
+import queue
+import threading
+import time
+
+from src.core import profiler
+
+
+def _spin(stop):
+    x = 0
+    while not stop.is_set():
+        x += 1
+    return x
+
+
+def test_sampler_collapses_busy_stacks_and_skips_idle_threads(tmp_path):
+    stop = threading.Event()
+    busy = threading.Thread(target=_spin, args=(stop,), name="Busy Worker", daemon=True)
+    idle = threading.Thread(target=queue.Queue().get, name="Idle", daemon=True)
+    busy.start()
+    idle.start()
+
+    p = profiler.SamplingProfiler()
+    assert p.start(interval=0.002)
+    assert not p.start()
+    time.sleep(0.3)
+    p.stop()
+    stop.set()
+    busy.join()
+    assert not p.running and p.samples > 20
+
+    threads = dict(p.threads())
+    assert threads.get("Busy Worker", 0) > 10
+    assert "Idle" not in threads and p.idle_samples > 0
+
+    lines = p.collapsed().splitlines()
+    assert any(line.startswith("Busy Worker;") and "test_profiler:_spin " in line for line in lines)
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+    spin = next(row for row in p.functions() if row[0] == "test_profiler:_spin")
+    assert spin[1] == threads["Busy Worker"] and 0 < spin[2] <= spin[1]
+
+    collapsed_path, report_path = p.save(str(tmp_path))
+    assert open(collapsed_path).read() == p.collapsed()
+    report = profiler.last_report(str(tmp_path))
+    assert report.startswith("RUNTIME PROFILE") and "Sampler cost" in report and "test_profiler:_spin" in report
+
+
+class _EventLoop:
+    # Blocks in C like QApplication.exec() does
+    exec = staticmethod(time.sleep)
+
+
+def main(loop):
+    return loop.exec(0.5)
+
+
+def test_thread_waiting_in_an_event_loop_is_idle():
+    gui = threading.Thread(target=main, args=(_EventLoop(),), name="GUI", daemon=True)
+    gui.start()
+    p = profiler.SamplingProfiler()
+    p.start(interval=0.002)
+    time.sleep(0.2)
+    p.stop()
+    gui.join()
+    assert "GUI" not in dict(p.threads()) and p.idle_samples > 20
+    assert not any(row[0] == "test_profiler:main" for row in p.functions())
+
+
+def test_timed_run_stops_and_saves_by_itself(tmp_path):
+    p = profiler.SamplingProfiler()
+    p.start(interval=0.005, duration=0.1, save_to=str(tmp_path))
+    deadline = time.time() + 5
+    while p.running and time.time() < deadline:
+        time.sleep(0.01)
+    assert not p.running
+    assert sorted(f.rsplit(".", 1)[1] for f in __import__("os").listdir(tmp_path)) == ["collapsed", "txt"]
@@ -0,0 +1,99 @@
+import os
+import struct
+
+import pytest
+
+from src.core.protocol_decoder import (
+    LatencyHistogram, ProtocolAnalyzer, analyze_capture_file, decode_mms_apdu, iter_tpkt_payloads,
+)
+
+SAMPLE = os.path.join(os.path.dirname(__file__), "..", "sbo.pcapng")
+
+
+def _tcp(src, dst, sport, dport, seq, payload):
+    eth = b"\x00\x11\x22\x33\x44\x55" + b"\x66\x77\x88\x99\xaa\xbb" + b"\x08\x00"
+    tcp = struct.pack("!HHIIBBHHH", sport, dport, seq, 0, 5 << 4, 0x18, 8192, 0, 0)
+    ip = struct.pack("!BBHHHBBH4s4s", 0x45, 0, 20 + len(tcp) + len(payload), 0, 0, 64, 6, 0,
+                     bytes(map(int, src.split("."))), bytes(map(int, dst.split("."))))
+    return eth + ip + tcp + payload
+
+
+def _mbap(tid, fc, body=b"\x00\x00\x00\x01", unit=1):
+    return struct.pack("!HHHB", tid, 0, len(body) + 2, unit) + bytes([fc]) + body
+
+
+def test_mms_pdu_decoding():
+    tpkt = bytes.fromhex("0300002102f0800100010061143012020103a00da10b0202023ca405a103850104")
+    cotps, consumed = iter_tpkt_payloads(tpkt)
+    assert consumed == len(tpkt)
+    apdu = decode_mms_apdu(cotps[0], 3)
+    assert apdu == {'pdu': 'confirmed-response', 'invoke_id': 0x23C, 'service': 'read'}
+
+
+def test_bundled_sbo_capture_pairs_every_request():
+    if not os.path.exists(SAMPLE):
+        pytest.skip("sbo.pcapng not present")
+    report = analyze_capture_file(SAMPLE).report()
+    assert report['frames'] == 211
+    assert report['pending_requests'] == 0
+    (dev,) = report['devices']
+    assert dev['protocol'] == 'MMS' and dev['address'] == '172.16.11.18'
+    assert dev['requests'] == dev['responses'] == dev['response_time']['count'] == 16
+    assert 'read' in dev['per_service'] and 'write' in dev['per_service']
+
+
+def test_modbus_transactions_and_segmented_mms():
+    an = ProtocolAnalyzer()
+    an.feed(10.000, _tcp("10.0.0.1", "10.0.0.9", 40000, 502, 1, _mbap(7, 3)))
+    an.feed(10.004, _tcp("10.0.0.9", "10.0.0.1", 502, 40000, 1, _mbap(7, 3, b"\x02\x00\x2a")))
+    an.feed(10.010, _tcp("10.0.0.1", "10.0.0.9", 40000, 502, 13, _mbap(8, 6)))
+    an.feed(10.020, _tcp("10.0.0.9", "10.0.0.1", 502, 40000, 10, _mbap(8, 0x86, b"\x02")))
+
+    req = bytes.fromhex("0300004c02f08001000100613f303d020103a038a03602020246a430a12ea02c302aa028a1261a0d"
+                        "475053303145434230314342311a154353574931244f5024506f73247374566100000000000000")
+    req = req[:0x4c]
+    rsp = bytes.fromhex("0300002102f0800100010061143012020103a00da10b02020246a405a103850104")
+    # Request split over two TCP segments
+    an.feed(20.0, _tcp("10.0.0.1", "10.0.0.18", 50000, 102, 100, req[:30]))
+    an.feed(20.0, _tcp("10.0.0.1", "10.0.0.18", 50000, 102, 130, req[30:]))
+    # Retransmission of the first half must not break framing
+    an.feed(20.0, _tcp("10.0.0.1", "10.0.0.18", 50000, 102, 100, req[:30]))
+    an.feed(20.002, _tcp("10.0.0.18", "10.0.0.1", 102, 50000, 500, rsp))
+
+    report = {d['protocol']: d for d in an.report()['devices']}
+    mb = report['Modbus']
+    assert mb['requests'] == 2 and mb['responses'] == 2 and mb['errors'] == 1
+    assert mb['response_time']['max_ms'] == pytest.approx(10.0, abs=0.01)
+    assert mb['client_gap']['count'] == 1
+    mms = report['MMS']
+    assert mms['requests'] == 1 and mms['response_time']['count'] == 1
+    assert mms['response_time']['max_ms'] == pytest.approx(2.0, abs=0.01)
+    assert "Modbus 10.0.0.9" in an.format_report()
+
+
+def test_goose_state_and_sequence_tracking():
+    def goose(st, sq):
+        ref = b"IED1LD0/LLN0$GO$gcb1"
+        pdu = (b"\x80" + bytes([len(ref)]) + ref + b"\x81\x02\x07\xd0"
+               + b"\x85\x01" + bytes([st]) + b"\x86\x01" + bytes([sq]))
+        body = b"\x61" + bytes([len(pdu)]) + pdu
+        hdr = struct.pack("!HHHH", 0x0001, 8 + len(body), 0, 0)
+        return b"\x01\x0c\xcd\x01\x00\x01" + b"\x00\x11\x22\x33\x44\x55" + b"\x88\xb8" + hdr + body
+
+    an = ProtocolAnalyzer()
+    for i, (st, sq) in enumerate([(1, 0), (1, 1), (1, 3), (2, 0), (2, 1)]):
+        an.feed(1.0 + i, goose(st, sq))
+    (g,) = an.report()['goose']
+    assert g['gocbRef'] == "IED1LD0/LLN0$GO$gcb1"
+    assert g['frames'] == 5 and g['state_changes'] == 1 and g['sq_gaps'] == 1
+
+
+def test_histogram_percentiles():
+    h = LatencyHistogram()
+    for _ in range(90):
+        h.record(0.001)
+    for _ in range(10):
+        h.record(0.4)
+    assert h.percentile(50) == pytest.approx(0.001)
+    assert h.percentile(99) == pytest.approx(0.4)
+    assert h.to_dict()['count'] == 100
@@ -0,0 +1,140 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("PySide6")
+pytest.importorskip("pymodbus")
+
+from PySide6.QtWidgets import QApplication
+
+from src.core.protocol_gateway import ProtocolGateway, GatewayMapping
+from src.models.device_models import ModbusDataType, ModbusEndianness
+from src.protocols.modbus.register_mapping import decode_mapped_value
+from src.protocols.modbus.slave_server import ModbusSlaveServer, ModbusSlaveConfig
+
+
+class _RecordingSlave(ModbusSlaveServer):
+    def __init__(self):
+        super().__init__(ModbusSlaveConfig(holding_registers_count=30000, input_registers_count=100))
+        self.running = True
+        self.bulk_calls = []
+
+    def bulk_write_registers(self, start_address, values):
+        self.bulk_calls.append((start_address, len(values)))
+        return super().bulk_write_registers(start_address, values)
+
+
+def _gateway(slave, interval_ms=50):
+    app = QApplication.instance() or QApplication([])
+    dm = SimpleNamespace(signal_updated=SimpleNamespace(connect=lambda cb: None, disconnect=lambda cb: None))
+    gw = ProtocolGateway(dm, slave, batch_interval_ms=interval_ms)
+    return gw
+
+
+def _update(gw, device, address, value):
+    gw._on_signal_updated(device, SimpleNamespace(address=address, value=value))
+
+
+def test_batched_flush_writes_contiguous_runs_with_multi_register_types():
+    slave = _RecordingSlave()
+    gw = _gateway(slave)
+    gw.add_mapping(GatewayMapping("IED", "MMXU1.TotW", "holding", 10,
+                                  data_type=ModbusDataType.FLOAT32,
+                                  endianness=ModbusEndianness.LITTLE_ENDIAN))
+    gw.add_mapping(GatewayMapping("IED", "MMXU1.Hz", "holding", 12,
+                                  data_type=ModbusDataType.INT32))
+    gw.add_mapping(GatewayMapping("IED", "XCBR1.Pos", "holding", 14, scale=10))
+    gw.add_mapping(GatewayMapping("IED", "Far", "holding", 100))
+    gw.start()
+
+    _update(gw, "IED", "MMXU1.TotW", 1.0)
+    _update(gw, "IED", "MMXU1.TotW", 123.5)  # coalesced, only the latest is written
+    _update(gw, "IED", "MMXU1.Hz", -70000)
+    _update(gw, "IED", "XCBR1.Pos", -1.5)
+    _update(gw, "IED", "Far", True)
+    assert slave.bulk_calls == []
+
+    assert gw.flush() == 4
+    assert slave.bulk_calls == [(10, 5), (100, 1)]
+
+    regs = slave.holding_registers_block.getValues(10, 5)
+    assert decode_mapped_value(regs[0:2], ModbusDataType.FLOAT32, ModbusEndianness.LITTLE_ENDIAN) == 123.5
+    assert decode_mapped_value(regs[2:4], ModbusDataType.INT32) == -70000
+    assert regs[4] == (-15) & 0xFFFF
+    assert slave.read_register(100) == 1
+
+
+def test_deadband_suppresses_small_changes():
+    slave = _RecordingSlave()
+    gw = _gateway(slave)
+    gw.add_mapping(GatewayMapping("IED", "T", "holding", 0, deadband=0.5))
+    gw.start()
+
+    _update(gw, "IED", "T", 20.0)
+    assert gw.flush() == 1
+    _update(gw, "IED", "T", 20.4)
+    assert gw.flush() == 0
+    assert gw.stats['suppressed'] == 1
+    _update(gw, "IED", "T", 21.0)
+    assert gw.flush() == 1
+    assert slave.read_register(0) == 21
+
+
+def test_failed_write_is_retried_with_the_same_value():
+    slave = _RecordingSlave()
+    failing = {'on': True}
+    real_write = slave.bulk_write_registers
+    slave.bulk_write_registers = lambda start, values: False if failing['on'] else real_write(start, values)
+    gw = _gateway(slave)
+    gw.add_mapping(GatewayMapping("IED", "T", "holding", 0, deadband=0.5))
+    gw.start()
+
+    far = gw.add_mapping(GatewayMapping("IED", "Far", "holding", 40000))     # beyond the slave's registers
+    _update(gw, "IED", "T", 20.0)
+    _update(gw, "IED", "Far", 1.0)
+    assert gw.flush() == 0
+    assert gw._flush_timer_active()
+    failing['on'] = False
+    # Requeued: written on the next flush without another update
+    assert gw.flush() == 1
+    assert slave.read_register(0) == 20
+    assert list(gw._pending) == [far]      # the out-of-range write was reported as failed
+    assert not slave.bulk_write_registers(40000, [1])
+    gw.remove_mapping(far)
+
+    gw.set_update_interval(0)
+    failing['on'] = True
+    _update(gw, "IED", "T", 30.0)
+    failing['on'] = False
+    _update(gw, "IED", "T", 30.0)
+    assert slave.read_register(0) == 30
+
+
+def test_immediate_mode_and_input_registers():
+    slave = _RecordingSlave()
+    gw = _gateway(slave, interval_ms=0)
+    gw.add_mapping(GatewayMapping("IED", "V", "input", 4, data_type=ModbusDataType.FLOAT32))
+    gw.start()
+
+    _update(gw, "IED", "V", 230.25)
+    regs = slave.input_registers_block.getValues(4, 2)
+    assert decode_mapped_value(regs, ModbusDataType.FLOAT32) == 230.25
+
+
+def test_bulk_bridge_of_many_points_is_fast():
+    slave = _RecordingSlave()
+    gw = _gateway(slave)
+    n = 10000
+    for i in range(n):
+        gw.add_mapping(GatewayMapping("IED", f"P{i}", "holding", i * 2, data_type=ModbusDataType.FLOAT32))
+    gw.start()
+
+    t0 = time.perf_counter()
+    for i in range(n):
+        _update(gw, "IED", f"P{i}", i * 0.5)
+    assert gw.flush() == n
+    elapsed = time.perf_counter() - t0
+
+    assert slave.bulk_calls == [(0, 2 * n)]
+    assert elapsed < 2.0
@@ -0,0 +1,49 @@
+import pytest
+
+pytest.importorskip("PySide6")
+
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import QApplication
+
+from src.protocols.modbus.slave_server import CallbackDataBlock
+from src.ui.models.register_table_model import RegisterTableModel
+
+
+def test_rows_read_live_storage_and_refresh_reports_only_changes():
+    app = QApplication.instance() or QApplication([])
+    block = CallbackDataBlock([(0, 65536)])
+    model = RegisterTableModel()
+    writes = []
+    model.set_block(block, lambda address, value: (writes.append(address), block.setValues(address, [value])))
+    assert model.rowCount() == 65536
+
+    ranges = []
+    model.dataChanged.connect(lambda first, last: ranges.append((first.row(), last.row())))
+    assert model.refresh() == 0
+
+    block.setValues(100, [1, 2, 3])
+    block.setValues(40000, [7])
+    block.setValues(500, [0])                 # unchanged value: not reported
+    assert model.refresh() == 4
+    assert ranges == [(100, 102), (40000, 40000)]
+    assert model.data(model.index(40000, RegisterTableModel.COL_HEX)) == "0x0007"
+
+    assert model.setData(model.index(7, RegisterTableModel.COL_VALUE), "0x10")
+    assert writes == [7] and block.getValues(7, 1) == [16]
+    rejected = []
+    model.edit_rejected.connect(rejected.append)
+    assert not model.setData(model.index(7, RegisterTableModel.COL_VALUE), "70000")
+    assert not model.setData(model.index(7, RegisterTableModel.COL_VALUE), "abc")
+    assert len(rejected) == 2 and "65535" in rejected[0] and "integer" in rejected[1]
+    assert not model.flags(model.index(7, RegisterTableModel.COL_ADDRESS)) & Qt.ItemIsEditable
+
+
+def test_rows_follow_segments():
+    app = QApplication.instance() or QApplication([])
+    block = CallbackDataBlock([(1000, 10), (5000, 5)])
+    model = RegisterTableModel()
+    model.set_block(block)
+    assert model.rowCount() == 15
+    assert model.address_at(9) == 1009 and model.address_at(10) == 5000
+    assert model.row_of(5004) == 14 and model.row_of(20) is None
+    assert not model.flags(model.index(0, RegisterTableModel.COL_VALUE)) & Qt.ItemIsEditable
@@ -30,3 +30,41 @@ def test_rename_updates_saved_scripts_and_choices(tmp_path):
     assert any(k.startswith("dev_new::") for k in dm._script_tag_manager._choices.keys())
     assert "dev_new" in dm._devices
     assert "dev_old" not in dm._devices
+
+
+def test_token_resolution_uses_index_and_per_device_cache(tmp_path):
+    from src.models.device_models import Node, Signal
+
+    dm = DeviceManagerCore(str(tmp_path / "devices.json"))
+    tags = dm._script_tag_manager
+
+    def _tree(prefix, n):
+        root = Node(name=prefix)
+        root.children = [Node(name=f"LN{i}", signals=[Signal(name="v", address=f"LD/LN{i}.v")]) for i in range(n)]
+        return root
+
+    for name in ("A", "B", "C"):
+        dm.add_device(DeviceConfig(name=name, ip_address="10.0.0.1", port=0, device_type=DeviceType.UNKNOWN),
+                      save=False, run_offline_discovery=False)
+        dm._devices[name].root_node = _tree(name, 50)
+        dm._assign_unique_addresses(name, dm._devices[name].root_node)
+
+    def _no_scan(*args, **kwargs):
+        raise AssertionError("token resolution walked the device trees")
+    dm.list_unique_addresses = _no_scan
+    dm.get_signal_by_unique_address = _no_scan
+
+    code_a = "x = ctx.get({{TAG:A::LD/LN1.v}})\ny = ctx.get('{{TAG:Gone::LD/LN2.v}}')"
+    code_b = "z = ctx.get({{TAG:B::LD/LN3.v}})"
+    assert tags.resolve_code(code_a) == "x = ctx.get('A::LD/LN1.v')\ny = ctx.get('A::LD/LN2.v')"
+    assert tags.resolve_code(code_b) == "z = ctx.get('B::LD/LN3.v')"
+    assert tags.get_candidates("X::LD/LN4.v") == ["A::LD/LN4.v", "B::LD/LN4.v", "C::LD/LN4.v"]
+
+    # Re-indexing C touches neither script's resolution
+    dm._assign_unique_addresses("C", dm._devices["C"].root_node)
+    assert set(tags._resolved_cache) == {code_a, code_b}
+
+    # Removing A drops only the script that depends on it
+    dm.remove_device("A", save=False)
+    assert set(tags._resolved_cache) == {code_b}
+    assert tags.resolve_code(code_a) == "x = ctx.get('B::LD/LN1.v')\ny = ctx.get('B::LD/LN2.v')"
@@ -37,3 +37,53 @@ def test_user_script_manager_tick(tmp_path):
     # Check file has at least 2 lines
     data = outfile.read_text().strip().splitlines()
     assert len(data) >= 2
+
+
+def test_bulk_tag_api_batches_per_device(tmp_path):
+    import numpy as np
+    from src.core.device_manager_core import DeviceManagerCore
+    from src.core.script_runtime import ScriptContext
+    from src.models.device_models import DeviceConfig, DeviceType, Node, Signal
+
+    class _Proto:
+        def __init__(self):
+            self.writes = []
+
+        def read_signal(self, sig):
+            sig.value = float(sig.address.split('.')[-1]) * 2
+            return sig
+
+        def write_signals(self, writes):
+            self.writes.append(list(writes))
+            return [True] * len(writes)
+
+    dm = DeviceManagerCore(str(tmp_path / 'devices.json'))
+    tags = []
+    for dev in ('A', 'B'):
+        dm.add_device(DeviceConfig(name=dev, ip_address='127.0.0.1', port=0, device_type=DeviceType.UNKNOWN),
+                      save=False, run_offline_discovery=False)
+        root = Node(name=dev)
+        for i in range(300):
+            root.children.append(Node(name=f'LN{i}', signals=[Signal(name='v', address=f'LN{i}.v.{i}', value=i)]))
+        dm._devices[dev].root_node = root
+        dm._assign_unique_addresses(dev, root)
+        dm._protocols[dev] = _Proto()
+        tags += [f'{dev}::LN{i}.v.{i}' for i in range(300)]
+
+    batches = []
+    read_signals = dm.read_signals
+    dm.read_signals = lambda name, sigs: batches.append((name, len(sigs))) or read_signals(name, sigs)
+
+    ctx = ScriptContext(dm)
+    assert ctx.get_many(tags[:3] + ['A::missing']) == {'A::LN0.v.0': 0, 'A::LN1.v.1': 1, 'A::LN2.v.2': 2, 'A::missing': None}
+
+    values = ctx.read_many(tags + ['A::missing'], timeout=5.0, as_array=True)
+    assert sorted(batches) == [('A', 300), ('B', 300)]
+    assert np.isnan(values[-1])
+    assert np.array_equal(values[:300], np.arange(300) * 2.0)
+    assert values[:600].sum() == 2 * 2 * sum(range(300))
+
+    result = ctx.set_many({tags[0]: 1, tags[1]: 2, tags[300]: 3})
+    assert result == {tags[0]: True, tags[1]: True, tags[300]: True}
+    assert [len(w) for w in dm._protocols['A'].writes] == [2]
+    assert [len(w) for w in dm._protocols['B'].writes] == [1]
@@ -0,0 +1,82 @@
+import threading
+import time
+
+from src.core.script_scheduler import ScriptScheduler
+from src.core.script_runtime import UserScriptManager
+
+
+def _dm():
+    dm = type('DM', (), {})()
+    dm.get_signal_by_unique_address = lambda x: None
+    dm.parse_unique_address = lambda x: (None, None)
+    return dm
+
+
+def test_many_jobs_share_a_bounded_pool_and_overruns_are_counted():
+    sched = ScriptScheduler(max_workers=3)
+    counts = {}
+    lock = threading.Lock()
+
+    def work(i):
+        with lock:
+            counts[i] = counts.get(i, 0) + 1
+
+    try:
+        for i in range(50):
+            sched.add(i, work, 0.02, i)
+        sched.add('slow', time.sleep, 0.02, 0.07)
+        time.sleep(0.3)
+        # dispatcher + 3 workers, however many jobs there are
+        assert sched.thread_count() <= 4
+        assert all(counts.get(i, 0) >= 5 for i in range(50))
+
+        slow = sched.stats('slow')
+        assert slow['runs'] >= 2
+        assert slow['overruns'] >= slow['runs']   # every run misses at least two deadlines
+        assert slow['max_duration_ms'] >= 60
+        assert sched.stats(0)['max_jitter_ms'] >= 0
+
+        assert sched.remove(0)
+        before = counts[0]
+        time.sleep(0.08)
+        assert counts[0] <= before + 1
+    finally:
+        sched.shutdown()
+
+
+def test_jitter_includes_time_queued_for_a_worker():
+    sched = ScriptScheduler(max_workers=2)
+    try:
+        start = time.monotonic() + 0.05
+        for i in range(6):
+            sched.add(i, time.sleep, 10.0, 0.2, first_run=start)
+        time.sleep(0.8)
+        jitters = sorted(sched.stats(i)['last_jitter_ms'] for i in range(6))
+        durations = [sched.stats(i)['last_duration_ms'] for i in range(6)]
+        # Two run at once; the others wait one and two sleeps for a worker
+        assert jitters[1] < 100 and 150 < jitters[2] < 300 and jitters[5] > 350
+        assert all(190 <= d < 300 for d in durations)
+    finally:
+        sched.shutdown()
+
+
+def test_async_tick_script_runs_on_scheduler_with_stats():
+    mgr = UserScriptManager(_dm(), scheduler=ScriptScheduler(max_workers=1))
+    code = """
+import asyncio
+hits = []
+async def tick(ctx):
+    await asyncio.sleep(0.001)
+    hits.append(1)
+    ctx.hits = len(hits)
+"""
+    mgr.start_script('a', code, interval=0.03)
+    try:
+        time.sleep(0.2)
+        stats = mgr.get_script_stats('a')
+        assert stats['runs'] >= 3 and stats['errors'] == 0
+        assert set(mgr.get_script_stats()) == {'a'}
+    finally:
+        mgr.stop_script('a')
+    assert mgr.get_script_stats('a') is None
+    assert mgr.list_scripts() == []
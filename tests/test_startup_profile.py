@@ -0,0 +1,48 @@
+import os
+import subprocess
+import sys
+
+from src.utils import startup_profile
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+def _run(code, *flags):
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    return subprocess.run([sys.executable, *flags, "-c", code], cwd=ROOT, env=env,
+                          capture_output=True, text=True, timeout=120)
+
+
+def test_heavy_stacks_are_not_imported_until_used():
+    code = """
+import sys
+from src.core.packet_capture import PacketCaptureWorker
+from src.protocols.iec61850.adapter import IEC61850Adapter
+from src.protocols.modbus.adapter import ModbusTCPAdapter
+from src.ui.widgets.signals_view import SignalsViewWidget
+from src.models.device_models import DeviceConfig, DeviceType
+PacketCaptureWorker()
+IEC61850Adapter(DeviceConfig(name='a', ip_address='127.0.0.1', port=102, device_type=DeviceType.IEC61850_IED))
+ModbusTCPAdapter(DeviceConfig(name='b', ip_address='127.0.0.1', port=502, device_type=DeviceType.MODBUS_TCP))
+heavy = ['scapy.all', 'pymodbus.client', 'src.protocols.iec61850.iec61850_wrapper', 'PySide6.QtCharts', 'opcua']
+print(','.join(m for m in heavy if m in sys.modules))
+"""
+    result = _run(code)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == ""
+
+
+def test_importtime_log_is_parsed_into_report(tmp_path):
+    result = _run("import src.core.device_manager_core", "-X", "importtime")
+    rows = startup_profile.parse_importtime(result.stderr)
+    names = {r[0]: r for r in rows}
+    assert names["src.core.device_manager_core"][3] == 0
+    assert names["src.core.script_tag_manager"][3] >= 1
+    assert all(cumulative >= self_us for _, self_us, cumulative, _ in rows)
+
+    log = tmp_path / "importtime.log"
+    log.write_text(result.stderr)
+    report = startup_profile.write_report(str(tmp_path / "profile.txt"), str(log))
+    assert "Slowest top-level imports" in report
+    assert "src.core.device_manager_core" in report
+    assert startup_profile.last_report(str(tmp_path / "profile.txt")) == report
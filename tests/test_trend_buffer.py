@@ -0,0 +1,132 @@
+import time
+
+import numpy as np
+import pytest
+
+from src.core.trend_buffer import TrendBuffer, MinMaxCache, minmax_decimate, lttb, decimate
+
+
+def test_ring_buffer_wraps_and_windows():
+    buf = TrendBuffer(capacity=100)
+    for i in range(250):
+        assert buf.append(float(i), float(i) * 2)
+    assert len(buf) == 100
+    assert buf.first_time == 150.0 and buf.last_time == 249.0
+    # Out-of-order samples are rejected
+    assert not buf.append(10.0, 0.0)
+
+    t, v = buf.window()
+    assert np.array_equal(t, np.arange(150, 250, dtype=float))
+    assert np.array_equal(v, t * 2)
+
+    t, _ = buf.window(180.0, 220.5)
+    assert t[0] == 180.0 and t[-1] == 220.0 and len(t) == 41
+
+    buf2 = TrendBuffer(capacity=10)
+    buf2.extend(np.arange(5.0), np.arange(5.0))
+    buf2.prepend(np.arange(-8.0, 0.0), np.arange(-8.0, 0.0))
+    t, _ = buf2.window()
+    assert np.array_equal(t, np.arange(-5.0, 5.0))
+
+
+def test_decimation_bounds_points_and_keeps_extremes():
+    n = 500_000
+    x = np.arange(n, dtype=float)
+    y = np.sin(x / 5000.0)
+    y[123_457] = 25.0
+    y[400_001] = -25.0
+
+    mx, my = minmax_decimate(x, y, 1000)
+    assert len(mx) <= 2 * 1001
+    assert np.all(np.diff(mx) > 0)
+    assert my.max() == 25.0 and my.min() == -25.0
+
+    lx, ly = lttb(x, y, 2000)
+    assert len(lx) == 2000
+    assert lx[0] == x[0] and lx[-1] == x[-1]
+    assert ly.max() == 25.0 and ly.min() == -25.0
+
+    sx, _ = decimate(x[:100], y[:100], 2000, 'lttb')
+    assert len(sx) == 100
+
+
+def test_minmax_cache_matches_full_decimation_while_sliding():
+    rng = np.random.default_rng(1)
+    buf = TrendBuffer(capacity=300_000)
+    cache = MinMaxCache()
+    span, buckets = 20_000.0, 500
+    x = np.arange(200_000, dtype=float) * 0.1
+    y = rng.normal(size=len(x))
+    buf.extend(x[:150_000], y[:150_000])
+    for chunk in range(150_000, 200_000, 5_000):
+        buf.extend(x[chunk:chunk + 5_000], y[chunk:chunk + 5_000])
+        end = buf.last_time
+        got = cache.get(buf, end - span, end, buckets)
+        full = minmax_decimate(*buf.window(end - span, end), buckets, end - span, end)
+        assert np.array_equal(got[0], full[0])
+        assert np.array_equal(got[1], full[1])
+
+
+def test_trend_chart_plots_only_selected_signals_decimated():
+    pytest.importorskip("PySide6")
+    from PySide6.QtWidgets import QApplication
+    from src.models.device_models import Signal
+    from src.ui.widgets.trend_chart import TrendChartWidget
+
+    app = QApplication.instance() or QApplication([])
+    chart = TrendChartWidget(max_points=200)
+    plotted = Signal(name="P", address="LD/MMXU1.TotW.mag.f")
+    other = Signal(name="Q", address="LD/MMXU1.TotVAr.mag.f")
+    assert chart.add_signal("IED", plotted)
+    assert not chart.add_signal("IED", plotted)
+
+    trace = chart._traces["IED::LD/MMXU1.TotW.mag.f"]
+    now = time.time()
+    t = np.linspace(now - 500, now - 1, 50_000)
+    trace.buffer.extend(t, np.sin(t))
+    plotted.value = 12.5
+    chart.on_signal_updated("IED", plotted)
+    other.value = 3.0
+    chart.on_signal_updated("IED", other)
+
+    chart.redraw()
+    assert 0 < trace.series.count() <= 202
+    assert chart.series_keys() == ["IED::LD/MMXU1.TotW.mag.f"]
+
+
+def test_plot_selected_needs_a_selection_and_confirms_large_ones(monkeypatch):
+    pytest.importorskip("PySide6")
+    from types import SimpleNamespace
+
+    from PySide6.QtWidgets import QApplication, QMessageBox
+    from src.models.device_models import Signal
+    from src.ui.widgets.signals_view import SignalsViewWidget
+
+    app = QApplication.instance() or QApplication([])
+    dm = SimpleNamespace(device_added=SimpleNamespace(connect=lambda cb: None),
+                         signal_updates=SimpleNamespace(connect=lambda cb: None))
+    view = SignalsViewWidget(dm)
+    view._get_current_device_name = lambda: "IED"
+    view.table_model.set_signals([Signal(name=f"S{i}", address=f"LD/GGIO1.AnIn{i}.mag.f") for i in range(40)])
+    plotted = []
+    view.add_signal_to_trend = lambda device, signal: plotted.append(signal.name)
+    prompts = []
+    monkeypatch.setattr(QMessageBox, "information", lambda *a: prompts.append("hint"))
+    answer = {'reply': QMessageBox.No}
+    monkeypatch.setattr(QMessageBox, "question", lambda *a: prompts.append("confirm") or answer['reply'])
+
+    view._on_plot_selected_clicked()
+    assert prompts == ["hint"] and plotted == []
+
+    view.table_view.selectAll()
+    view._on_plot_selected_clicked()
+    assert prompts == ["hint", "confirm"] and plotted == []
+    answer['reply'] = QMessageBox.Yes
+    view._on_plot_selected_clicked()
+    assert len(plotted) == 40
+
+    view.table_view.clearSelection()
+    view.table_view.selectRow(3)
+    plotted.clear()
+    view._on_plot_selected_clicked()
+    assert plotted == ["S3"] and prompts.count("confirm") == 2
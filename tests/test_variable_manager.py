@@ -72,6 +72,30 @@ def test_continuous_variable_updates():
     vm.stop_all()
 
 
+def test_reads_from_ticks_do_not_starve_a_shared_pool():
+    from src.core.script_scheduler import ScriptScheduler
+
+    dm = _FakeDM()
+    dm._sig.value = 7
+    scheduler = ScriptScheduler(max_workers=2)
+    vm = VariableManager(dm, scheduler=scheduler)
+    h = vm.create(None, 'v', 'DEV::a')
+    results, done = [], threading.Barrier(3)
+
+    def tick():
+        start = time.monotonic()
+        results.append((h.read(timeout=2.0), time.monotonic() - start))
+        done.wait(timeout=5)
+
+    # As many ticks as workers, all blocking on read() at once
+    for i in range(2):
+        scheduler.add(('tick', i), tick, 60.0)
+    done.wait(timeout=5)
+    assert [v for v, _ in results] == [7, 7]
+    assert max(t for _, t in results) < 0.5
+    scheduler.shutdown()
+
+
 def test_script_scope_cleanup_on_stop():
     # Integration (no Qt): fake DeviceManager with a VariableManager so UserScriptManager
     # can exercise bind/unbind lifecycle without pulling GUI dependencies.
@@ -0,0 +1,60 @@
+import pytest
+
+pytest.importorskip("PySide6")
+
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import QApplication
+
+from src.core.watch_list_manager import WatchedSignal
+from src.models.device_models import Signal, SignalQuality
+from src.ui.models.watch_list_model import WatchListModel
+
+
+def _watched(n):
+    return [WatchedSignal(device_name="IED", signal=Signal(name=f"S{i}", address=f"LD/GGIO1.Ind{i}.stVal"),
+                          watch_id=f"IED::LD/GGIO1.Ind{i}.stVal") for i in range(n)]
+
+
+def test_updates_are_keyed_and_coalesced_into_ranges():
+    app = QApplication.instance() or QApplication([])
+    model = WatchListModel()
+    watched = _watched(10)
+    model.set_watched(watched)
+    assert model.rowCount() == 10
+
+    changes = []
+    model.dataChanged.connect(lambda tl, br, roles=None: changes.append((tl.row(), br.row())))
+
+    for i in (2, 3, 4, 7):
+        sig = Signal(name=f"S{i}", address=watched[i].signal.address, value=i * 10, quality=SignalQuality.GOOD)
+        model.update_signal(watched[i].watch_id, sig, 5)
+    model.update_signal("IED::unknown", Signal(name="x", address="x"), None)
+    assert changes == []
+
+    model.flush()
+    assert changes == [(2, 4), (7, 7)]
+
+    idx = model.index(3, WatchListModel.COL_VALUE)
+    assert model.data(idx) == "0x1E (30)"
+    assert model.data(model.index(3, WatchListModel.COL_RTT)) == "5"
+    assert model.data(model.index(3, WatchListModel.COL_QUALITY), Qt.BackgroundRole) is \
+        model.data(model.index(4, WatchListModel.COL_QUALITY), Qt.BackgroundRole)
+
+
+def test_variable_rows_survive_refresh_and_removal_reindexes():
+    app = QApplication.instance() or QApplication([])
+    model = WatchListModel()
+    watched = _watched(3)
+    model.set_watched(watched)
+    model.add_variable(None, "v1", "IED::LD/X", value=1)
+    assert model.data(model.index(3, WatchListModel.COL_QUALITY)) == "VAR"
+
+    model.set_watched(watched[1:])
+    assert model.rowCount() == 3
+    assert model.row_of("var::v1") == 2
+
+    model.remove_ident(watched[1].watch_id)
+    assert model.row_of(watched[2].watch_id) == 0
+    model.update_variable(None, "v1", 42, None)
+    model.flush()
+    assert model.data(model.index(1, WatchListModel.COL_VALUE)) == "42"
@@ -0,0 +1,48 @@
+import pytest
+
+pytest.importorskip("PySide6")
+
+from PySide6.QtCore import QObject, Signal as QtSignal
+from PySide6.QtWidgets import QApplication
+
+from src.core.watch_list_manager import WatchListManager
+from src.models.device_models import Signal
+
+
+class _FakeDeviceManager(QObject):
+    signal_updated = QtSignal(str, object)
+
+    def __init__(self):
+        super().__init__()
+        self.batches = []
+
+    def read_signals(self, device_name, signals):
+        self.batches.append((device_name, [s.address for s in signals]))
+        return None  # dispatched; answered later via signal_updated
+
+
+def test_poll_sends_one_batch_per_device_and_skips_outstanding():
+    app = QApplication.instance() or QApplication([])
+    dm = _FakeDeviceManager()
+    wm = WatchListManager(dm)
+    for i in range(50):
+        wm.add_signal("IED1", Signal(name=f"s{i}", address=f"a{i}"))
+    wm.add_signal("IED2", Signal(name="x", address="x"))
+    wm._kick_timer.stop()
+    wm._poll_timer.stop()
+
+    wm._poll_all_signals()
+    assert sorted((d, len(a)) for d, a in dm.batches) == [("IED1", 50), ("IED2", 1)]
+
+    # Only IED2 answered; the next cycle must not re-request IED1's reads
+    received = []
+    wm.signal_updated.connect(lambda wid, sig, rtt: received.append(wid))
+    dm.signal_updated.emit("IED2", Signal(name="x", address="x", value=1))
+    assert received == ["IED2::x"]
+
+    dm.batches.clear()
+    wm._poll_all_signals()
+    assert dm.batches == [("IED2", ["x"])]
+    stats = wm.get_poll_statistics()
+    assert stats["IED1"]["skipped"] == 50
+    assert stats["IED1"]["outstanding"] == 50